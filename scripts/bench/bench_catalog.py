@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""Benchmark the build entry points on synthetic 1k / 10k / 100k catalogs.
+
+  python3 scripts/bench/bench_catalog.py                      # 1k, every case, 5 runs each
+  python3 scripts/bench/bench_catalog.py --sizes 1k 10k 100k --repeat 3
+  python3 scripts/bench/bench_catalog.py --case gallery.reconcile --case page.check
+  python3 scripts/bench/bench_catalog.py --compare main       # vs the last run recorded at main
+  python3 scripts/bench/bench_catalog.py --list
+
+Each (size, case) runs in a fresh child process pointed at the synth.py tree
+for that size: the case's setup (untimed) and run alternate --repeat times,
+and the child reports every run's wall time plus its peak RSS (its own or its
+worker pool's, whichever is larger). The report gives the median and best run.
+
+Results are appended, one JSON line per invocation, to a history file
+(default .build/bench-history.jsonl) tagged with the git commit, branch and a
+dirty flag. To compare a PR: run on main, run on the branch, then
+``--compare main`` prints each case's median change against the most recent
+history entry for main's commit (same size + case).
+"""
+from __future__ import annotations
+
+import argparse
+import contextlib
+import datetime
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import build_gallery as bg  # noqa: E402
+import build_item_page as bip  # noqa: E402
+import catalog  # noqa: E402
+import synth  # noqa: E402
+
+ROOT = bip.ROOT
+HISTORY = os.path.join(ROOT, ".build", "bench-history.jsonl")
+SIZES = ("1k",)
+REPEAT = 5
+
+
+# ---------------------------------------------------------------------------
+# Cases: name -> (setup(root) -> state, run(state)). Only run() is timed.
+# ---------------------------------------------------------------------------
+
+def _cli(main, argv):
+    """Call a script's main() with ``argv``, output discarded; SystemExit is a result."""
+    saved = sys.argv
+    sys.argv = ["bench"] + argv
+    try:
+        with open(os.devnull, "w") as null, contextlib.redirect_stdout(null), \
+                contextlib.redirect_stderr(null):
+            try:
+                main()
+            except SystemExit:
+                pass
+    finally:
+        sys.argv = saved
+
+
+def _forget(root, *names):
+    for name in names:
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(os.path.join(root, ".build", name))
+
+
+def _batch_csv_main():
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                    "labels"))
+    import build_batch_csv
+    return build_batch_csv.main
+
+
+def _gallery_state(root):
+    with open(bg.INDEX, encoding="utf-8") as fh:
+        return fh.read(), bg.load_items()
+
+
+def _pages_state(root):
+    items = catalog.load(root)
+    return [(os.path.join(it.dir, "index.html"), it.label) for it in items.values()
+            if it.error is None and os.path.isfile(os.path.join(it.dir, "index.html"))]
+
+
+def _page_build_setup(root):
+    _forget(root, "pages.json")  # no manifest: every page is rendered
+    return root
+
+
+def _page_build_warm_setup(root):
+    if not os.path.isfile(os.path.join(root, ".build", "pages.json")):
+        _cli(bip.main, ["--all"])  # a full build first, so the timed one is a no-op
+    return root
+
+
+CASES = {
+    "page.build": (_page_build_setup,
+                   lambda root: _cli(bip.main, ["--all"])),
+    "page.build.warm": (_page_build_warm_setup,
+                        lambda root: _cli(bip.main, ["--all"])),
+    "page.check": (_page_build_setup,
+                   lambda root: _cli(bip.main, ["--all", "--check"])),
+    "check_page": (_pages_state,
+                   lambda pages: [bip.check_page(p, label) for p, label in pages]),
+    "catalog.load": (lambda root: _forget(root, "catalog.pickle") or root,
+                     lambda root: catalog.load(root)),
+    "gallery.reconcile": (_gallery_state,
+                          lambda s: bg.reconcile(s[0], s[1])),
+    "gallery.relink_cards": (_gallery_state,
+                             lambda s: bg.relink_cards(s[0])),
+    "gallery.rebadge": (_gallery_state,
+                        lambda s: bg.rebadge(s[0], s[1])),
+    "batch_csv": (lambda root: (_batch_csv_main(), root),
+                  lambda s: _cli(s[0], ["--root", s[1], "--output",
+                                        os.path.join(s[1], ".build", "batch.csv")])),
+}
+
+
+def _peak_rss_kb() -> int:
+    """Peak RSS of this process or of its largest reaped child (a --jobs worker), in KiB.
+
+    Linux carries ru_maxrss across fork + exec, so a worker would inherit the
+    parent's high-water mark; /proc's VmHWM is per address space and is used
+    for this process when available.
+    """
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    with contextlib.suppress(OSError, ValueError):
+        with open("/proc/self/status", encoding="ascii") as fh:
+            for line in fh:
+                if line.startswith("VmHWM:"):
+                    own = int(line.split()[1])
+    return max(own, resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+
+
+def run_case(case: str, root: str, repeat: int) -> dict:
+    """Time ``case`` against the tree at ``root`` in this process."""
+    synth.point_at(root)
+    setup, run = CASES[case]
+    times = []
+    for _ in range(repeat):
+        state = setup(root)
+        start = time.perf_counter()
+        run(state)
+        times.append(time.perf_counter() - start)
+    return {"times": times, "peak_rss_kb": _peak_rss_kb()}
+
+
+def measure(case: str, root: str, repeat: int) -> dict:
+    """Run ``case`` in a fresh interpreter; returns its run_case() result."""
+    out = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--worker", case, "--root", root,
+         "--repeat", str(repeat)],
+        check=True, capture_output=True, text=True,
+    ).stdout
+    return json.loads(out.splitlines()[-1])
+
+
+# ---------------------------------------------------------------------------
+# History.
+# ---------------------------------------------------------------------------
+
+def _git(*argv) -> str:
+    try:
+        return subprocess.run(["git", "-C", ROOT, *argv], check=True,
+                              capture_output=True, text=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def append_history(path: str, record: dict) -> None:
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "a", encoding="utf-8") as fh:
+        fh.write(json.dumps(record, sort_keys=True) + "\n")
+
+
+def read_history(path: str) -> list:
+    try:
+        with open(path, encoding="utf-8") as fh:
+            return [json.loads(line) for line in fh if line.strip()]
+    except OSError:
+        return []
+
+
+def baseline(history: list, commit: str) -> dict:
+    """(size, case) -> median seconds from the newest history entries at ``commit``."""
+    base = {}
+    for record in history:
+        if record.get("commit") == commit:
+            for r in record["results"]:
+                base[(r["size"], r["case"])] = r["median_s"]
+    return base
+
+
+def compare(results: list, base: dict) -> list:
+    """Report lines: each result's median against ``base`` (+ is slower)."""
+    lines = []
+    for r in results:
+        was = base.get((r["size"], r["case"]))
+        if was is None:
+            lines.append(f"  {r['size']:>7} {r['case']:<22} {'(no baseline)':>12}")
+            continue
+        delta = (r["median_s"] - was) / was * 100 if was else 0.0
+        lines.append(f"  {r['size']:>7} {r['case']:<22} {was * 1000:>10.1f} -> "
+                     f"{r['median_s'] * 1000:>10.1f} ms  {delta:+6.1f}%")
+    return lines
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Benchmark the build scripts on synthetic catalogs.")
+    ap.add_argument("--sizes", nargs="+", default=list(SIZES), metavar="N",
+                    help="catalog sizes (1k, 10k, 100k, 2500 ...)")
+    ap.add_argument("--case", action="append", choices=sorted(CASES),
+                    help="run only this case (repeatable; default all)")
+    ap.add_argument("--repeat", type=int, default=REPEAT, help="timed runs per case")
+    ap.add_argument("--seed", type=int, default=0, help="synthetic catalog seed")
+    ap.add_argument("--history", default=HISTORY, help="JSON-lines history file to append to")
+    ap.add_argument("--no-history", action="store_true", help="don't record this run")
+    ap.add_argument("--compare", metavar="REV", help="compare medians with the last run at REV")
+    ap.add_argument("--list", action="store_true", help="list the cases and exit")
+    ap.add_argument("--worker", help=argparse.SUPPRESS)
+    ap.add_argument("--root", help=argparse.SUPPRESS)
+    args = ap.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_case(args.worker, args.root, args.repeat)))
+        return 0
+    if args.list:
+        print("\n".join(sorted(CASES)))
+        return 0
+
+    cases = args.case or list(CASES)
+    history = read_history(args.history)  # before this run is added
+    results = []
+    print(f"  {'size':>7} {'case':<22} {'median ms':>10} {'best ms':>10} {'peak RSS MB':>12}")
+    for size in args.sizes:
+        n = synth.parse_size(size)
+        root = synth.generate(n, args.seed)
+        for case in cases:
+            r = measure(case, root, args.repeat)
+            row = {"size": n, "case": case, "runs": len(r["times"]),
+                   "median_s": round(statistics.median(r["times"]), 6),
+                   "best_s": round(min(r["times"]), 6),
+                   "peak_rss_mb": round(r["peak_rss_kb"] / 1024, 1)}
+            results.append(row)
+            print(f"  {n:>7} {case:<22} {row['median_s'] * 1000:>10.1f} "
+                  f"{row['best_s'] * 1000:>10.1f} {row['peak_rss_mb']:>12.1f}")
+
+    if not args.no_history:
+        append_history(args.history, {
+            "date": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+            "commit": _git("rev-parse", "HEAD"),
+            "branch": _git("rev-parse", "--abbrev-ref", "HEAD"),
+            "dirty": bool(_git("status", "--porcelain", "--untracked-files=no")),
+            "python": platform.python_version(),
+            "seed": args.seed,
+            "results": results,
+        })
+        print(f"Recorded in {args.history}")
+    if args.compare:
+        commit = _git("rev-parse", args.compare)
+        base = baseline(history, commit)
+        if not base:
+            print(f"No history for {args.compare} ({commit[:12] or 'unknown rev'}) in {args.history}")
+            return 1
+        print(f"Median vs {args.compare} ({commit[:12]}):")
+        print("\n".join(compare(results, base)))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
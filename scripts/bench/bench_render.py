@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""Micro-benchmark: per-page template fill cost, str.replace chain vs compiled.
+
+  python3 scripts/bench/bench_render.py             # RG-0055, 20k renders
+  python3 scripts/bench/bench_render.py --sku RG-0009 -n 50000
+
+Times three things on one real label: the pre-compiled-template fill (one
+``str.replace`` per token over the whole template, as render_page used to do),
+the compiled ``PAGE_TEMPLATE.render`` fill, and the full ``render_page`` call
+(derivations + fill). Reports the best of --repeat runs in microseconds/page.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import build_item_page as bip  # noqa: E402
+
+
+def legacy_fill(values: dict) -> str:
+    """The old render_page fill: sequential ``str.replace`` over the full template."""
+    out = bip._TEMPLATE
+    for name in bip.PAGE_TEMPLATE.tokens:
+        out = out.replace(f"__{name}__", values[name])
+    return out
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Benchmark render_page's template fill.")
+    ap.add_argument("--sku", default="RG-0055", help="item whose label.json to render")
+    ap.add_argument("-n", "--number", type=int, default=20000, help="renders per timing run")
+    ap.add_argument("--repeat", type=int, default=5, help="timing runs (best is reported)")
+    args = ap.parse_args()
+
+    item_dir = os.path.join(bip.ROOT, args.sku)
+    with open(os.path.join(item_dir, "label.json"), encoding="utf-8") as fh:
+        label = json.load(fh)
+    values = bip.page_values(args.sku, label, item_dir)
+    assert legacy_fill(values) == bip.PAGE_TEMPLATE.render(values), "fills disagree"
+
+    cases = [
+        ("str.replace chain (before)", lambda: legacy_fill(values)),
+        ("compiled join (after)", lambda: bip.PAGE_TEMPLATE.render(values)),
+        ("render_page end-to-end", lambda: bip.render_page(args.sku, label, item_dir)),
+    ]
+    print(f"{args.sku}: template {len(bip._TEMPLATE)} chars, "
+          f"{len(bip.PAGE_TEMPLATE.tokens)} distinct tokens")
+    results = {}
+    for name, fn in cases:
+        best = min(timeit.repeat(fn, number=args.number, repeat=args.repeat))
+        results[name] = best / args.number * 1e6
+        print(f"  {name:<28} {results[name]:8.2f} us/page")
+    before, after = results[cases[0][0]], results[cases[1][0]]
+    print(f"  fill speedup: {before / after:.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""Synthetic large-catalog generator for the build-script benchmarks.
+
+  python3 scripts/bench/synth.py 10k                  # -> .build/bench/catalog-10000-s0/
+  python3 scripts/bench/synth.py 1000 --seed 7 --out /tmp/cat
+  python3 scripts/bench/synth.py 100k --force         # regenerate even if current
+
+Writes an items/-shaped tree of N ``RG-*`` folders plus a matching gallery
+``index.html`` (the real page's shell around synthetic cards). Label shapes are
+mixed the way the real catalog is:
+
+  curated  40%  Listed, a full ``page`` block (RG-0055 style)
+  legacy   30%  Listed, no page block, hand-curated card with a baked New badge
+  sold     15%  Sold, with an archive ``status.json`` (every other one also state Sold)
+  buy       5%  Listed with a Square buy link and a ``buy/`` redirect dir
+  draft    10%  Draft, no page, no card
+
+Every item has label.json, a header-only hero.png (imgprobe reads just the
+IHDR) and, unless Draft, an index.html rendered by build_item_page. About one
+Listed item in 100 is left out of the gallery (reconcile's insert work) and one
+in 10 gets a card.png after its card was rendered (relink_cards' work).
+
+SKUs are zero-padded to one width per catalog (RG-0001... for 1k, RG-00001...
+for 10k, RG-000001... for 100k) so string order is SKU order. Output is
+deterministic in (N, seed); a tree whose ``synth.json`` matches is reused.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import shutil
+import struct
+import sys
+import zlib
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import build_gallery as bg  # noqa: E402
+import build_images  # noqa: E402
+import build_item_page as bip  # noqa: E402
+import catalog  # noqa: E402
+import imgprobe  # noqa: E402
+
+ROOT = bip.ROOT  # the real items/ tree (gallery shell source)
+OUT_DIR = os.path.join(ROOT, ".build", "bench")
+
+# Bump when the generated tree's shape changes (invalidates reused trees).
+SYNTH_VERSION = 1
+KINDS = (("curated", 40), ("legacy", 30), ("sold", 15), ("buy", 5), ("draft", 10))
+UNCARDED_EVERY = 100  # one Listed item in N has no card yet
+LATE_CARD_EVERY = 10  # one carded item in N gets card.png after its card
+
+CATEGORIES = ("Collectibles", "Books & Paper", "Ceramics & Glass", "Furniture",
+              "Kitchen", "Toys & Games", "Tools", "Home Decor")
+MAKERS = ("Kreamer", "Pyrex", "Fiesta", "Singer", "Hoffman", "Avon", "Orion", "Dover")
+NOUNS = ("Storage Tin", "Mixing Bowl", "Table Lamp", "Sewing Cabinet", "Radio",
+         "Jewelry Box", "Cookbook", "Tool Chest", "Plush Toy", "Serving Tray")
+
+
+def parse_size(text: str) -> int:
+    """``1000``, ``10k`` or ``1m`` -> an item count."""
+    t = text.strip().lower()
+    mult = {"k": 1000, "m": 1000000}.get(t[-1:], 1)
+    return int(float(t.rstrip("km")) * mult)
+
+
+def sku_width(n: int) -> int:
+    return max(4, len(str(n)))
+
+
+def png_header(width: int, height: int) -> bytes:
+    """A minimal PNG whose IHDR says width x height."""
+    def chunk(kind, data):
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+    ihdr = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    return imgprobe.PNG_SIGNATURE + chunk(b"IHDR", ihdr) + chunk(b"IEND", b"")
+
+
+def point_at(root: str) -> None:
+    """Aim the build modules (ROOT, the gallery paths) at another items/ tree."""
+    for mod in (bip, bg, catalog, imgprobe, build_images):
+        mod.ROOT = root
+    bg.INDEX = os.path.join(root, "index.html")
+    bg.FEED = os.path.join(root, "items.json")
+    imgprobe._CACHE = None
+
+
+def kind_of(rng: random.Random) -> str:
+    roll = rng.randrange(100)
+    for kind, share in KINDS:
+        if roll < share:
+            return kind
+        roll -= share
+    return KINDS[-1][0]
+
+
+def make_label(sku: str, kind: str, rng: random.Random) -> dict:
+    """A synthetic label.json of the given shape."""
+    maker, noun = rng.choice(MAKERS), rng.choice(NOUNS)
+    year = rng.randrange(1890, 2005)
+    height, width = rng.randrange(3, 40), rng.randrange(3, 30)
+    label = {
+        "sku": sku,
+        "product_name": f"{maker} {noun} — {rng.choice(('Boxed', 'Original', 'As-Found'))} ({year})",
+        "attributes": f"{maker} • {noun} • c. {year} • {height}in × {width}in",
+        "price": f"{rng.randrange(5, 400)}.{rng.choice(('00', '50', '99'))}",
+        "condition": rng.choice(("Good", "Very good", "Fair — as found")),
+        "condition_notes": f"A {noun.lower()} by {maker} with honest wear for its age. " * rng.randrange(1, 4),
+        "qr_code_url": f"https://richmondgeneral.github.io/items/{sku}/",
+        "added_at": f"20{rng.randrange(24, 27)}-{rng.randrange(1, 13):02d}-{rng.randrange(1, 29):02d}",
+        "state": "Draft" if kind == "draft" else "Listed",
+        "reporting_category_note": rng.choice(CATEGORIES),
+        "photos": {"hero": "hero.png"},
+    }
+    if kind == "curated":
+        label["page"] = {
+            "seo_title": f"{maker} {noun} ({year})",
+            "seo_description": f"{maker} {noun.lower()}, c. {year}; honest wear, sold as found.",
+            "card_title": f"{maker} {noun} &mdash; {year}",
+            "era_line": f"{maker} &bull; c.{year}",
+            "story": f"A {noun.lower()} from {maker}, made around {year}. " * rng.randrange(2, 6),
+            "details": {"Maker": maker, "Era": f"c.{year}",
+                        "Dimensions": f"{height}&Prime; H &times; {width}&Prime; W"},
+        }
+        label["estimates"] = {"circa": {"value": f"c. {year}", "est": True},
+                              "dimensions_in": {"height": height, "width": width}}
+    if kind in ("curated", "buy"):
+        label["fulfillment"] = rng.choice(("local_pickup_only", "ship_or_pickup"))
+        label["channels"] = {"square": {"status": "listed",
+                                        "buy_link": f"https://square.link/u/{sku[3:]}x"}}
+        label["qr_codes"] = {"buy": {"file": "qr-buy.png", "url": label["channels"]["square"]["buy_link"]}}
+    if kind == "sold" and rng.randrange(2):
+        label["state"] = "Sold"
+    return label
+
+
+def buy_redirect(sku: str, link: str) -> str:
+    return (f"<!--\n    RICHMOND GENERAL — {sku} · BUY REDIRECT LAYER\n-->\n"
+            f'<!DOCTYPE html>\n<html><head><meta http-equiv="refresh" content="0; url={link}">'
+            f"</head><body><a href=\"{link}\">Buy {sku}</a></body></html>\n")
+
+
+def write_item(root: str, n: int, seed: int, i: int):
+    """Write RG-i under ``root``; returns its gallery card block, or None."""
+    sku = f"RG-{i:0{sku_width(n)}d}"
+    rng = random.Random(f"{seed}:{i}")
+    kind = kind_of(rng)
+    label = make_label(sku, kind, rng)
+    item_dir = os.path.join(root, sku)
+    os.makedirs(item_dir, exist_ok=True)
+    with open(os.path.join(item_dir, "label.json"), "w", encoding="utf-8") as fh:
+        json.dump(label, fh, ensure_ascii=False, indent=2)
+    with open(os.path.join(item_dir, "hero.png"), "wb") as fh:
+        fh.write(png_header(rng.randrange(600, 2400), rng.randrange(600, 2400)))
+    if "qr_codes" in label:
+        with open(os.path.join(item_dir, "qr-buy.png"), "wb") as fh:
+            fh.write(png_header(300, 300))
+    if kind == "sold":
+        with open(os.path.join(item_dir, "status.json"), "w", encoding="utf-8") as fh:
+            json.dump({"sku": sku, "status": "sold", "sold_price": float(label["price"])}, fh)
+    if kind == "buy":
+        os.makedirs(os.path.join(item_dir, "buy"), exist_ok=True)
+        with open(os.path.join(item_dir, "buy", "index.html"), "w", encoding="utf-8") as fh:
+            fh.write(buy_redirect(sku, label["channels"]["square"]["buy_link"]))
+    if kind == "draft":
+        return None
+    with open(os.path.join(item_dir, "index.html"), "w", encoding="utf-8") as fh:
+        fh.write(bip.render_page(sku, label, item_dir))
+    if kind != "sold" and i % UNCARDED_EVERY == 0:
+        return None
+    card = bg.render_card(bg.card_fields(sku, label), lazy=i > bg.FIRST_SCREEN)
+    if kind == "legacy":
+        card = card.replace('                    <span class="item-sku">',
+                            '                    <span class="item-badge">New</span>\n'
+                            '                    <span class="item-sku">', 1)
+    if i % LATE_CARD_EVERY == 0:
+        with open(os.path.join(item_dir, "card.png"), "wb") as fh:
+            fh.write(png_header(680, 400))
+    return sku, card
+
+
+def gallery_shell(text: str) -> str:
+    """The real gallery page with every card removed (the placeholder stays)."""
+    doc = bg.Gallery(text)
+    at = doc.placeholder
+    return doc.gaps[0] + doc.cards[at][1] + doc.gaps[at + 1]
+
+
+def default_out(n: int, seed: int) -> str:
+    return os.path.join(OUT_DIR, f"catalog-{n}-s{seed}")
+
+
+def generate(n: int, seed: int = 0, out: str | None = None, force: bool = False) -> str:
+    """Build (or reuse) the N-item catalog for ``seed``; returns its root."""
+    out = os.path.abspath(out or default_out(n, seed))
+    marker = os.path.join(out, "synth.json")
+    meta = {"version": SYNTH_VERSION, "items": n, "seed": seed}
+    try:
+        with open(marker, encoding="utf-8") as fh:
+            if not force and json.load(fh) == meta:
+                return out
+    except (OSError, ValueError):
+        pass
+    with open(bg.INDEX, encoding="utf-8") as fh:
+        shell = gallery_shell(fh.read())
+    if os.path.isdir(out):
+        shutil.rmtree(out)
+    os.makedirs(out)
+    real_root = bip.ROOT
+    point_at(out)
+    try:
+        cards = dict(filter(None, (write_item(out, n, seed, i) for i in range(1, n + 1))))
+        doc = bg.Gallery(shell)
+        doc.insert(cards)
+        with open(os.path.join(out, "index.html"), "w", encoding="utf-8") as fh:
+            fh.write(bg.ensure_lqip_js(bg.recount(str(doc))))
+        imgprobe.flush()
+    finally:
+        point_at(real_root)
+    with open(marker, "w", encoding="utf-8") as fh:
+        json.dump(meta, fh)
+        fh.write("\n")
+    return out
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Generate a synthetic items/ catalog for benchmarks.")
+    ap.add_argument("size", help="item count: 1000, 10k, 100k ...")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--out", help="output dir (default .build/bench/catalog-<N>-s<seed>)")
+    ap.add_argument("--force", action="store_true", help="regenerate even if the tree is current")
+    args = ap.parse_args()
+    print(generate(parse_size(args.size), args.seed, args.out, args.force))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
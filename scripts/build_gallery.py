@@ -12,7 +12,9 @@ This script replaces that step with a deterministic, idempotent reconcile:
   build_gallery.py            # apply: insert a card for every Listed/Sold item
   build_gallery.py --apply    #   that is missing one (default mode)
   build_gallery.py --check    # gate: exit 1 if any Listed/Sold item lacks a card
+  build_gallery.py --check --since origin/main  # gate only the items changed since REV
   build_gallery.py --dry-run  # show what would change, write nothing
+  build_gallery.py --stream   # opt-in: static first screenful, rest from items.json
 
 Design guarantees
 -----------------
@@ -22,18 +24,40 @@ Design guarantees
 * Cards are derived from items/RG-XXXX/label.json. An item belongs in the
   gallery when its `state` is Listed or Sold.
 
+Every write also refreshes `items/items.json`, a compact feed (one record per
+gallery item, from `card_fields` — so label-derived, not the curated card copy) that `--check` requires to be current. A page
+switched with `--stream [N]` keeps only its first N static cards and appends the
+rest from the feed in batches as the visitor scrolls; filter tabs then work on
+the in-memory feed. On a streamed page `--apply` only refreshes the feed and the
+item count — new items appear without touching the HTML.
+
+index.html and items.json are written through output.py: a file whose bytes
+would not change is left alone (so a no-op run writes nothing), and a changed one
+is replaced atomically.
+
 `--check` is the verification gate: wire it into the listing workflow / reconcile
-so a Listed item can never silently miss the grid again.
+so a Listed item can never silently miss the grid again. With `--since REV` it
+loads only the labels of the items `git diff` touches since REV (gitscope.py)
+and checks their cards and feed records; a change to index.html, items.json or
+a generator script checks everything.
 """
 from __future__ import annotations
 
 import argparse
-import glob
+import bisect
+import html
 import json
 import os
 import re
 import sys
 
+import build_images
+import buildprof
+import catalog
+import gitscope
+import imgprobe
+import output
+
 ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))  # items/
 INDEX = os.path.join(ROOT, "index.html")
 PLACEHOLDER = "<!-- Coming Soon Placeholder -->"
@@ -45,11 +69,13 @@ GALLERY_STATES = {"Listed", "Sold"}
 # data-added (from label.json added_at), and this script injects the badge only
 # when within NEW_DAYS of now — so it disappears on its own with no rebuild, and
 # editing/re-committing an old item never re-flags it as new. NEW_DAYS lives here
-# (one source of truth). Sold badges stay server-rendered.
+# (one source of truth; the streamed-gallery renderer reuses it). Sold badges
+# stay server-rendered.
+NEW_DAYS = 30
 NEW_BADGE_JS = """    <!-- NEW_BADGE: client-side, auto-expiring New badge from data-added -->
     <script>
       (() => {
-        const NEW_DAYS = 30;
+        const NEW_DAYS = """ + str(NEW_DAYS) + """;
         const now = Date.now();
         document.querySelectorAll('.item-card[data-added]:not([data-status="sold"])').forEach(card => {
           const t = Date.parse(card.dataset.added);
@@ -66,6 +92,132 @@ NEW_BADGE_JS = """    <!-- NEW_BADGE: client-side, auto-expiring New badge from
     </script>
 """
 
+# Cards built from a build_images thumbnail carry its blurred placeholder in
+# data-lqip; this paints it behind each not-yet-loaded thumbnail (they are
+# loading="lazy") so the grid has content at first paint. Injected once by
+# reconcile / --update-card when some card has a placeholder.
+LQIP_JS = """    <!-- LQIP: blurred placeholder behind each lazy card thumbnail until it loads -->
+    <script>
+      document.querySelectorAll('img[data-lqip]').forEach(function (img) {
+        if (img.complete && img.naturalWidth) return;
+        img.style.background = 'center / contain no-repeat url("' + img.dataset.lqip + '")';
+        img.addEventListener('load', function () { img.style.background = ''; }, {once: true});
+      });
+    </script>
+"""
+
+
+def ensure_lqip_js(text: str) -> str:
+    """Inject LQIP_JS before </body> when a card has data-lqip and the page lacks it."""
+    if "data-lqip=" not in text or "LQIP:" in text:
+        return text
+    return text.replace("</body>", LQIP_JS + "</body>", 1)
+
+
+# Compact catalog feed (items/items.json): one record per gallery item (see
+# gallery_skus), built from card_fields(), in ascending-SKU order. ``thumb``
+# ({webp, src, lqip}, paths relative to the item folder) and ``width``/``height``
+# (the fitted card size) let a streamed card load the same small thumbnail, at
+# the same reserved size, as a static one; both are null when unknown.
+FEED = os.path.join(ROOT, "items.json")
+FEED_FIELDS = ("sku", "slug", "category", "title", "era", "price", "image", "thumb",
+               "width", "height", "sold", "added")
+
+# Optional STREAMED gallery (--stream): index.html keeps only the first
+# screenful of static cards; STREAM_JS fetches items.json and appends the rest
+# in BATCH-sized chunks as the Coming Soon tile nears the viewport
+# (IntersectionObserver). Filter tabs re-render from the in-memory feed, so DOM
+# size and first paint stay flat however large the catalog grows. The marker
+# comment is how every mode recognises a streamed page.
+STREAM_MARKER = "GALLERY_STREAM:"
+FIRST_SCREEN = 12
+STREAM_BATCH = 24
+STREAM_JS = """    <!-- GALLERY_STREAM: first screenful is static; the rest streams from items.json -->
+    <script>
+      (() => {
+        const BATCH = __BATCH__;
+        const NEW_DAYS = __NEW_DAYS__;
+        const grid = document.querySelector('.items-grid');
+        const tail = grid && grid.querySelector('.coming-soon');
+        if (!grid || !tail || !window.fetch) return;
+        const esc = s => String(s).replace(/[&<>"]/g, c => ({'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;'})[c]);
+        const money = p => String(p).replace(/\\$([0-9]+)\\.00\\b/g, '$$$1');
+        const now = Date.now();
+        const isNew = f => !f.sold && f.added && (now - Date.parse(f.added)) / 86400000 <= NEW_DAYS;
+        // Same markup as render_card(): build_images.thumb_html() when there is a thumbnail.
+        const img = f => {
+          const attrs = ' loading="lazy" decoding="async"' +
+            (f.width ? ` width="${f.width}" height="${f.height}"` : '') +
+            ' style="max-width: 100%; max-height: 200px; object-fit: contain; border-radius: 4px;"';
+          if (!f.thumb) return `<img src="./${esc(f.sku)}/${esc(f.image)}" alt="${esc(f.title)}"${attrs}>`;
+          return '<picture style="display:contents">' +
+            `<source type="image/webp" srcset="./${esc(f.sku)}/${esc(f.thumb.webp)}">` +
+            `<img src="./${esc(f.sku)}/${esc(f.thumb.src)}" alt="${esc(f.title)}" data-lqip="${esc(f.thumb.lqip)}"${attrs}>` +
+            '</picture>';
+        };
+        const lqip = () => grid.querySelectorAll('img[data-lqip]:not([data-lqip-done])').forEach(el => {
+          el.dataset.lqipDone = '';
+          if (el.complete && el.naturalWidth) return;
+          el.style.background = 'center / contain no-repeat url("' + el.dataset.lqip + '")';
+          el.addEventListener('load', () => { el.style.background = ''; }, {once: true});
+        });
+        const card = f => `<a href="./${esc(f.sku)}/" class="item-card" data-category="${esc(f.slug)}"` +
+          (f.sold ? ' data-status="sold"' : '') +
+          (/card\\.png$/.test(f.image) ? ' data-img="card"' : '') +
+          (f.added ? ` data-added="${esc(f.added)}"` : '') + `>
+            <div class="item-image">` +
+          (f.sold ? '<span class="item-badge sold">Sold</span>' : isNew(f) ? '<span class="item-badge">New</span>' : '') + `
+              <span class="item-sku">${esc(f.sku)}</span>
+              ${img(f)}
+            </div>
+            <div class="item-info">
+              <p class="item-category">${esc(f.category)}</p>
+              <h3 class="item-title">${esc(f.title)}</h3>
+              <p class="item-era">${esc(f.era)}</p>
+              <div class="item-footer">` +
+          (f.sold ? `<span class="item-price sold">Sold · ${esc(money(f.price))}</span>`
+                  : `<span class="item-price">${esc(money(f.price))}</span>`) + `
+                <span class="view-story">${f.sold ? 'View Archive' : 'View Story'}
+                  <svg viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2"><path d="M5 12h14M12 5l7 7-7 7"/></svg>
+                </span>
+              </div>
+            </div>
+          </a>`;
+        let feed = [], queue = [];
+        const more = () => {
+          if (!queue.length) return;
+          tail.insertAdjacentHTML('beforebegin', queue.splice(0, BATCH).map(card).join(''));
+          lqip();
+        };
+        const io = 'IntersectionObserver' in window
+          ? new IntersectionObserver(es => { if (es.some(e => e.isIntersecting)) more(); }, {rootMargin: '800px'})
+          : null;
+        fetch('./items.json').then(r => r.json()).then(data => {
+          feed = data;
+          const shown = new Set([...grid.querySelectorAll('.item-card')].map(a => a.getAttribute('href')));
+          queue = feed.filter(f => !shown.has(`./${f.sku}/`));
+          const count = document.getElementById('item-count');
+          if (count) count.textContent = feed.filter(f => !f.sold).length;
+          if (io) { io.observe(tail); more(); } else { while (queue.length) more(); }
+        }).catch(() => {});
+        document.querySelectorAll('.filter-tab').forEach(tab => tab.addEventListener('click', () => {
+          if (!feed.length) return;
+          const want = tab.dataset.filter;
+          grid.querySelectorAll('.item-card').forEach(a => a.remove());
+          queue = feed.filter(f => want === 'all' || f.slug === want);
+          more();
+          if (!io) while (queue.length) more();
+        }));
+      })();
+    </script>
+""".replace("__BATCH__", str(STREAM_BATCH)).replace("__NEW_DAYS__", str(NEW_DAYS))
+
+# Card images render at most 200px tall in a >=280px grid column; about the
+# column width on phones, a third of the content width on desktop.
+CARD_SIZES = "(max-width: 640px) 90vw, 340px"
+# The card image box (CSS px): images are fitted inside it for width/height.
+CARD_BOX = (340, 200)
+
 # reporting-category text -> data-category filter slug (first keyword wins).
 # Slugs must match the filter tabs in index.html:
 #   all / tech / books / media / wearables / pottery / furniture / collectibles
@@ -118,6 +270,14 @@ def is_sold(label: dict) -> bool:
                if isinstance(c, dict))
 
 
+HERO_DEFAULTS = build_images.HERO_DEFAULTS
+
+
+def hero_name(sku: str, label: dict) -> str:
+    """The item's hero file name: photos.hero, else the first HERO_DEFAULTS file present."""
+    return build_images.hero_file(label, os.path.join(ROOT, sku))
+
+
 def card_fields(sku: str, label: dict) -> dict:
     product = label.get("product_name", sku)
     # Card title: trim the descriptive tail after an em-dash; the rest goes to the era line.
@@ -127,10 +287,22 @@ def card_fields(sku: str, label: dict) -> dict:
     attrs = label.get("attributes", "") or ""
     segs = [s.strip() for s in re.split(r"[•·]", attrs) if s.strip()]
     era = " • ".join(segs[:3]) if segs else repcat
-    hero = label.get("photos", {}).get("hero") or "hero.png"
+    hero = hero_name(sku, label)
     # Prefer the uniform transparent card.png (matte.py output) when present;
     # fall back to the raw hero so un-matted items still render.
     image = "card.png" if os.path.isfile(os.path.join(ROOT, sku, "card.png")) else hero
+    # build_images output for that image: its small card thumbnail (+ LQIP) when
+    # present, else its responsive derivatives.
+    item_dir = os.path.join(ROOT, sku)
+    thumb = build_images.thumb_for(item_dir, image)
+    variants = None if thumb else build_images.variants_for(item_dir, image)
+    # Intrinsic size fitted to the card box, so the grid doesn't reflow as images load.
+    if thumb:
+        dims = ((thumb["width"] + 1) // 2, (thumb["height"] + 1) // 2)  # thumbs are 2x
+    elif variants:
+        dims = (variants["width"], variants["height"])
+    else:
+        dims = imgprobe.size(os.path.join(item_dir, image))
     price = str(label.get("price", "")).strip()
     if price and not price.startswith("$"):
         price = "$" + price
@@ -143,6 +315,9 @@ def card_fields(sku: str, label: dict) -> dict:
         "hero": hero,
         "image": image,
         "transparent": image == "card.png",
+        "thumb": thumb,
+        "variants": variants,
+        "dims": imgprobe.fit(dims, CARD_BOX) if dims else None,
         "added": label.get("added_at", ""),
         "price": price or "$0",
         "alt": attr_escape(product),
@@ -150,8 +325,12 @@ def card_fields(sku: str, label: dict) -> dict:
     }
 
 
-def render_card(f: dict) -> str:
-    """Render a single 12-space-indented card block (comment + anchor), no trailing newline."""
+def render_card(f: dict, lazy: bool = True) -> str:
+    """Render a single 12-space-indented card block (comment + anchor), no trailing newline.
+
+    ``lazy`` cards defer their image (``loading="lazy" decoding="async"``); cards
+    in the first screenful are rendered with ``lazy=False`` so they load at once.
+    """
     if f["sold"]:
         status_attr = ' data-status="sold"'
         badge_line = '                    <span class="item-badge sold">Sold</span>\n'
@@ -163,6 +342,19 @@ def render_card(f: dict) -> str:
         price = f'<span class="item-price">{f["price"]}</span>'
         cta = "View Story"
     img_attr = ' data-img="card"' if f.get("transparent") else ""
+    img_style = 'style="max-width: 100%; max-height: 200px; object-fit: contain; border-radius: 4px;"'
+    if f.get("dims"):
+        img_style = f'width="{f["dims"][0]}" height="{f["dims"][1]}" ' + img_style
+    if lazy:
+        img_style = 'loading="lazy" decoding="async" ' + img_style
+    if f.get("thumb"):
+        img = build_images.thumb_html(f["thumb"], f'./{f["sku"]}/{build_images.IMG_DIR}/',
+                                      alt=f["alt"], img_attrs=" " + img_style)
+    elif f.get("variants"):
+        img = build_images.picture_html(f["variants"], f'./{f["sku"]}/{build_images.IMG_DIR}/',
+                                        alt=f["alt"], sizes=CARD_SIZES, img_attrs=" " + img_style)
+    else:
+        img = f'<img src="./{f["sku"]}/{f["image"]}" alt="{f["alt"]}" {img_style}>'
     added_attr = f' data-added="{f["added"]}"' if f.get("added") else ""
     return (
         f'            <!-- {f["sku"]}: {f["title"]} -->\n'
@@ -170,7 +362,7 @@ def render_card(f: dict) -> str:
         f'                <div class="item-image">\n'
         f'{badge_line}'
         f'                    <span class="item-sku">{f["sku"]}</span>\n'
-        f'                    <img src="./{f["sku"]}/{f["image"]}" alt="{f["alt"]}" style="max-width: 100%; max-height: 200px; object-fit: contain; border-radius: 4px;">\n'
+        f'                    {img}\n'
         f'                </div>\n'
         f'                <div class="item-info">\n'
         f'                    <p class="item-category">{f["category"]}</p>\n'
@@ -190,27 +382,154 @@ def render_card(f: dict) -> str:
     )
 
 
-def load_items() -> dict:
-    """sku -> label dict, for every items/RG-XXXX/label.json."""
+def load_items(only=None) -> dict:
+    """sku -> label dict, for every items/RG-XXXX/label.json (via the shared catalog).
+
+    ``only`` limits it to those SKUs.
+    """
     out = {}
-    for lj in glob.glob(os.path.join(ROOT, "RG-*", "label.json")):
-        sku = os.path.basename(os.path.dirname(lj))
-        try:
-            out[sku] = json.load(open(lj, encoding="utf-8"))
-        except (json.JSONDecodeError, OSError) as e:
-            print(f"  ! skipping {sku}: {e}", file=sys.stderr)
+    with buildprof.phase("label_load"):
+        loaded = catalog.load(ROOT, only=only)
+    for sku, item in loaded.items():
+        if item.error is not None:
+            print(f"  ! skipping {sku}: {item.error}", file=sys.stderr)
+            continue
+        out[sku] = item.label
     return out
 
 
+# ---------------------------------------------------------------------------
+# Parse-once gallery model. index.html is split ONCE into literal gaps and card
+# blocks; every operation edits the model and the text is serialized once, so
+# work is linear in the file size rather than O(cards x file size).
+# ---------------------------------------------------------------------------
+
+# A card block: its `<!-- RG-XXXX ... -->` comment line through its closing
+# </a>. Group 1 is the line's indentation, which is kept apart from the block.
+_CARD_RE = re.compile(
+    r'(?ms)^([ \t]*)(<!-- (RG-\d{4,})\b[^\n]*-->\n[ \t]*<a href="\./\3/" class="item-card".*?</a>)'
+)
+_PLACEHOLDER_RE = re.compile(r"(?m)^[ \t]*" + re.escape(PLACEHOLDER))
+_ANCHOR_RE = re.compile(r'<a href="\./(RG-\d{4,})/" class="item-card"[^>]*>')
+
+# Between an inserted card and whatever follows it (matches the hand-built grid).
+CARD_SEP = "\n\n"
+CARD_INDENT = " " * 12
+
+
+class Gallery:
+    """items/index.html as ``gaps[0] card[0] gaps[1] card[1] ... gaps[n]``.
+
+    Each card is ``[sku, indent, block]``. The Coming Soon placeholder line is
+    held as a pseudo-card ``[None, indent, ""]`` so "insert before the
+    placeholder" is just another card position. ``str(gallery)`` reproduces the
+    text byte-for-byte, and untouched cards are never re-rendered.
+    """
+
+    def __init__(self, text: str):
+        self.gaps = []
+        self.cards = []
+        pos = 0
+        with buildprof.phase("parse"):
+            for m in _CARD_RE.finditer(text):
+                self._add_gap(text[pos:m.start()])
+                self.cards.append([m.group(3), m.group(1), m.group(2)])
+                pos = m.end()
+            self._add_gap(text[pos:])
+            self._reindex()
+
+    def _add_gap(self, gap: str) -> None:
+        pm = None if self._has_placeholder() else _PLACEHOLDER_RE.search(gap)
+        if pm is None:
+            self.gaps.append(gap)
+            return
+        line = gap[pm.start():pm.end()]
+        indent = line[:len(line) - len(PLACEHOLDER)]
+        self.gaps.append(gap[:pm.start()])
+        self.cards.append([None, indent, ""])
+        self.gaps.append(gap[pm.start() + len(indent):])
+
+    def _has_placeholder(self) -> bool:
+        return any(card[0] is None for card in self.cards)
+
+    def _reindex(self):
+        self.index = {}
+        self.placeholder = None
+        for i, card in enumerate(self.cards):
+            if card[0] is None:
+                self.placeholder = i
+            else:
+                self.index.setdefault(card[0], i)
+
+    def __str__(self) -> str:
+        parts = [self.gaps[0]]
+        for card, gap in zip(self.cards, self.gaps[1:]):
+            parts += (card[1], card[2], gap)
+        return "".join(parts)
+
+    def spans(self) -> dict:
+        """sku -> (start, end) offsets of each card (indent included), in one pass."""
+        out = {}
+        pos = len(self.gaps[0])
+        for card, gap in zip(self.cards, self.gaps[1:]):
+            end = pos + len(card[1]) + len(card[2])
+            if card[0] is not None:
+                out.setdefault(card[0], (pos, end))
+            pos = end + len(gap)
+        return out
+
+    def block(self, sku):
+        i = self.index.get(sku)
+        return None if i is None else self.cards[i][2]
+
+    def set_block(self, sku, block: str) -> None:
+        self.cards[self.index[sku]][2] = block
+
+    def replace(self, sku, rendered: str) -> None:
+        """Swap in a render_card() block; its own indentation replaces the old."""
+        card = self.cards[self.index[sku]]
+        card[2] = rendered.lstrip(" \t")
+        card[1] = rendered[:len(rendered) - len(card[2])]
+
+    def insert(self, rendered: dict) -> None:
+        """Insert render_card() blocks (sku -> text) at their ascending-SKU position.
+
+        Each new card goes before the lowest-SKU existing card above it, else
+        before the placeholder. The displaced line is re-indented to
+        CARD_INDENT after CARD_SEP — the same bytes the old string-splicing
+        reconcile produced. One rebuild of the card list for any number of inserts.
+        """
+        existing = sorted(self.index)
+        before = {}  # card index -> new skus to insert ahead of it, ascending
+        for sku in sorted(rendered):
+            k = bisect.bisect_right(existing, sku)
+            at = self.index[existing[k]] if k < len(existing) else self.placeholder
+            if at is None:
+                raise SystemExit("ERROR: placeholder anchor not found in index.html")
+            before.setdefault(at, []).append(sku)
+
+        gaps, cards = [], []
+        for i, card in enumerate(self.cards):
+            new = before.get(i, ())
+            for n, sku in enumerate(new):
+                text = rendered[sku]
+                block = text.lstrip(" \t")
+                gaps.append(self.gaps[i] if n == 0 else CARD_SEP)
+                cards.append([sku, text[:len(text) - len(block)] if n == 0 else CARD_INDENT, block])
+            if new:
+                gaps.append(CARD_SEP)
+                cards.append([card[0], CARD_INDENT, card[2]])
+            else:
+                gaps.append(self.gaps[i])
+                cards.append(card)
+        gaps.append(self.gaps[-1])
+        self.gaps, self.cards = gaps, cards
+        self._reindex()
+
+
 def carded_skus(text: str) -> dict:
     """sku -> char index of the start of its comment line, for cards in the grid."""
-    out = {}
-    pat = re.compile(
-        r'(?m)^[ \t]*<!-- (RG-\d{4})\b[^\n]*-->\n[ \t]*<a href="\./\1/" class="item-card"'
-    )
-    for m in pat.finditer(text):
-        out[m.group(1)] = m.start()
-    return out
+    return {sku: span[0] for sku, span in Gallery(text).spans().items()}
 
 
 def should_be_carded(items: dict) -> set:
@@ -218,67 +537,301 @@ def should_be_carded(items: dict) -> set:
             if str(lab.get("state", "")).strip() in GALLERY_STATES}
 
 
-def recount(text: str) -> str:
-    """Set the static #item-count to the number of non-sold cards (mirrors the page JS)."""
-    cards = re.findall(r'<a [^>]*class="item-card"[^>]*>', text)
-    available = sum(1 for c in cards if 'data-status="sold"' not in c)
+def recount(text: str, available=None) -> str:
+    """Set the static #item-count to the number of non-sold cards (mirrors the page JS).
+
+    A streamed page only holds the first screenful, so callers pass the feed's
+    non-sold count as ``available`` instead.
+    """
+    if available is None:
+        cards = re.findall(r'<a [^>]*class="item-card"[^>]*>', text)
+        available = sum(1 for c in cards if 'data-status="sold"' not in c)
     return re.sub(
         r'(<div class="stat-number" id="item-count">)\d*(</div>)',
         rf'\g<1>{available}\g<2>', text, count=1,
     )
 
 
+def gallery_skus(text: str, items: dict) -> list:
+    """Every SKU the gallery shows, ascending: the same insert-only membership as the grid.
+
+    That is every carded item (legacy cards predate label `state`), every item
+    already in the feed of a streamed page, and every Listed/Sold item
+    reconcile would insert (its hero image exists). Items without a loaded
+    label.json are left out.
+    """
+    shown = set(carded_skus(text))
+    if is_streamed(text):
+        shown |= feed_skus()
+    shown |= {sku for sku in should_be_carded(items) if not hero_problem(sku, items[sku])}
+    return sorted(sku for sku in shown if sku in items)
+
+
+def build_feed(items: dict, skus, text: str = "") -> list:
+    """The items.json records for ``skus``, in order; see record_for().
+
+    ``sold`` also honors status.json (the archive lifecycle file), which is
+    what marks the older hand-curated cards sold.
+    """
+    with buildprof.phase("feed"):
+        skus = list(skus)
+        with buildprof.phase("label_load"):
+            loaded = catalog.load(ROOT, only=set(skus))
+        archived = {sku for sku, item in loaded.items() if item.status_sold}
+        doc = Gallery(text) if text else None
+        previous = read_feed() if text and is_streamed(text) else {}
+        return [record_for(sku, items[sku], sku in archived, doc, previous) for sku in skus]
+
+
+def record_for(sku: str, label: dict, archived: bool = False, doc=None, previous=None) -> dict:
+    """One items.json record, from the most faithful source available.
+
+    A card already in the page (``doc``) is the record: hand-curated cards carry
+    copy, category and image that label.json doesn't, and streaming must redraw
+    them unchanged. On a streamed page a card dropped earlier keeps its
+    ``previous`` record. Otherwise the record is derived from the label.
+    """
+    block = doc.block(sku) if doc is not None else None
+    if block:
+        r = card_record(block)
+        r["sold"] = r["sold"] or archived or is_sold(label)
+        return r
+    if previous and sku in previous:
+        return dict(previous[sku], sold=previous[sku]["sold"] or archived or is_sold(label))
+    return feed_record(sku, label, archived)
+
+
+_TAG_RE = re.compile(r"<[^>]+>")
+
+
+def _attr(tag: str, name: str):
+    m = re.search(r'\s' + re.escape(name) + r'="([^"]*)"', tag)
+    return html.unescape(m.group(1)) if m else None
+
+
+def _inner(block: str, tag: str, cls: str) -> str:
+    m = re.search(rf'<{tag} class="{cls}[^"]*"[^>]*>(.*?)</{tag}>', block, re.S)
+    return html.unescape(_TAG_RE.sub("", m.group(1))).strip() if m else ""
+
+
+def card_record(block: str) -> dict:
+    """The items.json record a card block shows: href, image, category, copy, badges."""
+    anchor = _ANCHOR_RE.search(block)
+    sku = anchor.group(1)
+    a = anchor.group(0)
+    img = re.search(r"<img\s[^>]*>", block)
+    img = img.group(0) if img else ""
+    prefix = f"./{sku}/"
+
+    def rel(url):
+        return url[len(prefix):] if url and url.startswith(prefix) else url
+
+    src = rel(_attr(img, "src")) or ""
+    thumb = None
+    if _attr(img, "data-lqip"):
+        webp = re.search(r'<source type="image/webp" srcset="([^"\s,]+)">', block)
+        thumb = {"webp": rel(html.unescape(webp.group(1))) if webp else src, "src": src,
+                 "lqip": _attr(img, "data-lqip")}
+    if thumb or src.startswith(build_images.IMG_DIR + "/"):
+        # A derivative: keep the source name (a card.png card is drawn transparent).
+        src = "card.png" if _attr(a, "data-img") == "card" else src
+    price = _inner(block, "span", "item-price")
+    width, height = _attr(img, "width"), _attr(img, "height")
+    if width and height and width.isdigit() and height.isdigit():
+        dims = (int(width), int(height))
+    else:  # hand-written markup: size the placeholder from the image itself
+        dims = imgprobe.size(os.path.join(ROOT, sku, src))
+        dims = imgprobe.fit(dims, CARD_BOX) if dims else (None, None)
+    return {
+        "sku": sku,
+        "slug": _attr(a, "data-category") or "collectibles",
+        "category": _inner(block, "p", "item-category"),
+        "title": _inner(block, "h3", "item-title"),
+        "era": _inner(block, "p", "item-era"),
+        "price": re.sub(r"^Sold\s*·\s*", "", price),
+        "image": src,
+        "thumb": thumb,
+        "width": dims[0],
+        "height": dims[1],
+        "sold": _attr(a, "data-status") == "sold",
+        "added": _attr(a, "data-added") or "",
+    }
+
+
+def feed_record(sku: str, label: dict, archived: bool = False) -> dict:
+    """One items.json record; ``archived`` is the item's status.json sold flag."""
+    f = card_fields(sku, label)
+    f["sold"] = f["sold"] or archived
+    thumb = f["thumb"]
+    if thumb:
+        d = build_images.IMG_DIR
+        f["thumb"] = {"webp": f"{d}/{thumb['webp']}", "src": f"{d}/{thumb['fallback']}",
+                      "lqip": thumb["lqip"]}
+    f["width"], f["height"] = f["dims"] or (None, None)
+    return {k: f[k] for k in FEED_FIELDS}
+
+
+def stale_records(text: str, items: dict, scope: set) -> bool:
+    """True when items.json's records for the ``scope`` SKUs aren't what --apply would write.
+
+    ``items`` holds the labels of (at least) the scope SKUs; only their records
+    are rebuilt and compared, so the cost follows the size of the scope.
+    """
+    try:
+        current = {r["sku"]: r for r in json.loads(read_feed_text() or "[]")}
+    except (ValueError, TypeError, KeyError):
+        return True
+    scoped = {sku: items[sku] for sku in scope if sku in items}
+    want = {r["sku"]: r for r in build_feed(scoped, gallery_skus(text, scoped), text)}
+    return {sku: r for sku, r in current.items() if sku in scope} != want
+
+
+def feed_text(feed: list) -> str:
+    """Compact, deterministic serialization (one record per line keeps diffs readable)."""
+    rows = (json.dumps(r, ensure_ascii=False, separators=(",", ":")) for r in feed)
+    return "[\n" + ",\n".join(rows) + "\n]\n"
+
+
+def read_feed_text() -> str:
+    try:
+        with open(FEED, encoding="utf-8") as fh:
+            return fh.read()
+    except OSError:
+        return ""
+
+
+def read_feed() -> dict:
+    """sku -> record from the items.json on disk; {} when it is absent or unreadable."""
+    try:
+        return {r["sku"]: r for r in json.loads(read_feed_text() or "[]")}
+    except (ValueError, TypeError, KeyError):
+        return {}
+
+
+def feed_skus() -> set:
+    """SKUs in the items.json on disk; empty when it is absent or unreadable."""
+    try:
+        return {r["sku"] for r in json.loads(read_feed_text() or "[]")}
+    except (ValueError, TypeError, KeyError):
+        return set()
+
+
+def write_feed(feed: list) -> bool:
+    """Write items.json when its bytes would change (atomically). Returns True if written."""
+    with buildprof.phase("write"):
+        return output.write_text(FEED, feed_text(feed)) == output.WRITTEN
+
+
+def write_index(text: str) -> bool:
+    """Write items/index.html when its bytes would change (atomically). Returns True if written."""
+    with buildprof.phase("write"):
+        return output.write_text(INDEX, text) == output.WRITTEN
+
+
+def is_streamed(text: str) -> bool:
+    return STREAM_MARKER in text
+
+
+def available_count(feed: list) -> int:
+    return sum(1 for r in feed if not r["sold"])
+
+
+def stream(text: str, feed: list, first: int = FIRST_SCREEN):
+    """Switch the gallery to streamed mode: keep the first ``first`` static cards.
+
+    Later cards are dropped from the HTML (with the gap that follows each) and
+    STREAM_JS is injected once; the browser appends them from items.json.
+    Returns (text, dropped_skus). Re-running with a new ``first`` re-trims.
+    """
+    doc = Gallery(text)
+    keep_gaps, keep_cards, dropped = [doc.gaps[0]], [], []
+    seen = 0
+    for card, gap in zip(doc.cards, doc.gaps[1:]):
+        if card[0] is not None:
+            seen += 1
+            if seen > first:
+                dropped.append(card[0])
+                continue
+        keep_cards.append(card)
+        keep_gaps.append(gap)
+    doc.gaps, doc.cards = keep_gaps, keep_cards
+    text = str(doc)
+    if not is_streamed(text):
+        text = text.replace("</body>", STREAM_JS + "</body>", 1)
+    return recount(text, available_count(feed)), dropped
+
+
 def _card_span(text, sku):
     """(start, end) char offsets of a card block: its comment line through its closing </a>, or None."""
-    m = re.search(
-        rf'(?m)^[ \t]*<!-- {re.escape(sku)}\b[^\n]*-->\n[ \t]*<a href="\./{re.escape(sku)}/" class="item-card".*?</a>',
-        text, re.S)
-    return (m.start(), m.end()) if m else None
+    return Gallery(text).spans().get(sku)
+
+
+def first_screen(doc: Gallery) -> set:
+    """SKUs of the first FIRST_SCREEN cards in page order (rendered without lazy loading)."""
+    return set([card[0] for card in doc.cards if card[0]][:FIRST_SCREEN])
 
 
 def update_card(text, sku, items):
     """Re-render one card in place from items[sku]'s label; byte-preserve all others. Returns (text, changed_bool)."""
-    span = _card_span(text, sku)
-    if not span or sku not in items:
+    doc = Gallery(text)
+    if sku not in doc.index or sku not in items:
         return text, False
-    block = render_card(card_fields(sku, items[sku]))
-    text = text[:span[0]] + block + text[span[1]:]
-    return recount(text), True
+    with buildprof.phase("render", sku):
+        card = render_card(card_fields(sku, items[sku]), lazy=sku not in first_screen(doc))
+    doc.replace(sku, card)
+    return ensure_lqip_js(recount(str(doc))), True
+
+
+def hero_problem(sku: str, label: dict):
+    """Why an item can't be shown yet (its hero image is missing), or None."""
+    hero = hero_name(sku, label)
+    if not os.path.isfile(os.path.join(ROOT, sku, hero)):
+        return f"hero image '{hero}' missing"
+    return None
 
 
 def reconcile(text: str, items: dict):
-    existing = carded_skus(text)
-    want = should_be_carded(items)
-    missing = sorted(want - set(existing))
+    with buildprof.phase("reconcile"):
+        return _reconcile(text, items)
+
+
+def _render(sku: str, f: dict, lazy: bool = True) -> str:
+    with buildprof.phase("render", sku):
+        return render_card(f, lazy)
+
 
-    pm = re.search(r'(?m)^[ \t]*' + re.escape(PLACEHOLDER), text)
-    if not pm:
+def _reconcile(text: str, items: dict):
+    doc = Gallery(text)
+    if doc.placeholder is None:
         raise SystemExit("ERROR: placeholder anchor not found in index.html")
-    placeholder_pos = pm.start()
+    missing = sorted(should_be_carded(items) - set(doc.index))
 
-    # Compute insertion (pos, sku, block) against the ORIGINAL text.
-    inserts = []
+    rendered = {}
     skipped = []
     for sku in missing:
-        item_dir = os.path.join(ROOT, sku)
-        hero = items[sku].get("photos", {}).get("hero") or "hero.png"
-        if not os.path.isfile(os.path.join(item_dir, hero)):
-            skipped.append((sku, f"hero image '{hero}' missing"))
+        why = hero_problem(sku, items[sku])
+        if why:
+            skipped.append((sku, why))
             continue
-        higher = sorted(s for s in existing if s > sku)
-        pos = existing[higher[0]] if higher else placeholder_pos
-        block = render_card(card_fields(sku, items[sku]))
-        inserts.append((pos, sku, block))
+        rendered[sku] = card_fields(sku, items[sku])
+    doc.insert({sku: _render(sku, f) for sku, f in rendered.items()})
+    # Cards that landed in the first screenful load eagerly.
+    for sku in first_screen(doc).intersection(rendered):
+        doc.set_block(sku, _render(sku, rendered[sku], lazy=False).lstrip(" \t"))
 
-    # Apply from highest pos to lowest; for equal pos, higher sku first so final order ascends.
-    for pos, sku, block in sorted(inserts, key=lambda t: (t[0], t[1]), reverse=True):
-        text = text[:pos] + block + "\n\n            " + text[pos:].lstrip(" \t")
-
-    inserted = [sku for _, sku, _ in inserts]
-    text = recount(text)
+    inserted = list(rendered)
+    text = ensure_lqip_js(recount(str(doc)))
     return text, inserted, skipped, missing
 
 
+def _add_anchor_attr(block: str, attr: str, value: str) -> str:
+    """Append ``attr="value"`` to the card's <a class="item-card"> tag unless already set."""
+    def add(m):
+        tag = m.group(0)
+        return tag if f"{attr}=" in tag else tag[:-1] + f' {attr}="{value}">'
+    return _ANCHOR_RE.sub(add, block, count=1)
+
+
 def relink_cards(text: str, only=None):
     """Opt-in: switch EXISTING cards to card.png where the file now exists.
 
@@ -286,23 +839,21 @@ def relink_cards(text: str, only=None):
     generated card.png for items. Adds data-img="card" so CSS can color behind.
     `only` (a set of SKUs) limits the relink to those items.
     """
+    doc = Gallery(text)
     changed = []
-    for sku in sorted(carded_skus(text)):
+    for sku in sorted(doc.index):
         if only and sku not in only:
             continue
         if not os.path.isfile(os.path.join(ROOT, sku, "card.png")):
             continue
-        if re.search(rf'src="\./{sku}/card\.png"', text):
-            continue  # already linked
-        text = re.sub(rf'(src="\./{sku}/)[^"]+\.(?:png|jpe?g|jpg)"',
-                      r'\1card.png"', text, count=1)
-
-        def _add_attr(m):
-            tag = m.group(0)
-            return tag if "data-img=" in tag else tag[:-1] + ' data-img="card">'
-        text = re.sub(rf'<a href="\./{sku}/" class="item-card"[^>]*>', _add_attr, text, count=1)
+        block = doc.block(sku)
+        if f'src="./{sku}/card.png"' in block or "<picture" in block:
+            continue  # already linked (or served from build_images derivatives)
+        block = re.sub(rf'(src="\./{sku}/)[^"]+\.(?:png|jpe?g|jpg)"',
+                       r'\1card.png"', block, count=1)
+        doc.set_block(sku, _add_anchor_attr(block, "data-img", "card"))
         changed.append(sku)
-    return text, changed
+    return (str(doc) if changed else text), changed
 
 
 def rebadge(text: str, items: dict):
@@ -312,19 +863,19 @@ def rebadge(text: str, items: dict):
     each item's label.json onto its carded anchor, and ensures NEW_BADGE_JS is present.
     """
     text, removed = re.subn(r'[ \t]*<span class="item-badge">New</span>\n', '', text)
+    doc = Gallery(text)
     stamped = []
-    for sku in sorted(carded_skus(text)):
+    for sku in sorted(doc.index):
         added = (items.get(sku) or {}).get("added_at")
-        if not added or re.search(rf'<a href="\./{sku}/"[^>]*data-added=', text):
+        block = doc.block(sku)
+        if not added or re.search(rf'<a href="\./{sku}/"[^>]*data-added=', block):
             continue
-
-        def _add(m):
-            tag = m.group(0)
-            return tag if "data-added=" in tag else tag[:-1] + f' data-added="{added}">'
-        new = re.sub(rf'<a href="\./{sku}/" class="item-card"[^>]*>', _add, text, count=1)
-        if new != text:
-            text = new
+        new = _add_anchor_attr(block, "data-added", added)
+        if new != block:
+            doc.set_block(sku, new)
             stamped.append(sku)
+    if stamped:
+        text = str(doc)
     if "NEW_BADGE:" not in text:
         text = text.replace("</body>", NEW_BADGE_JS + "</body>", 1)
     return text, removed, stamped
@@ -342,27 +893,88 @@ def main() -> int:
                    help="switch existing cards to the date-driven auto-expiring New badge (opt-in)")
     g.add_argument("--update-card", metavar="RG-XXXX",
                    help="re-render ONE existing card in place from its label.json (byte-preserves all others)")
+    g.add_argument("--stream", type=int, nargs="?", const=FIRST_SCREEN, metavar="N",
+                   help=f"streamed gallery: keep the first N static cards (default {FIRST_SCREEN}), "
+                        "load the rest from items.json as the page scrolls")
     ap.add_argument("--sku", nargs="*", default=None,
                     help="limit --relink-cards to these SKUs (e.g. --sku RG-0002)")
+    gitscope.add_arguments(ap)
+    buildprof.add_arguments(ap)
     args = ap.parse_args()
+    if args.since and not args.check:
+        ap.error("--since only scopes --check")
+    with buildprof.session("build_gallery", args):
+        rc = run(args)
+    if output.TALLY.total():
+        print(f"outputs: {output.TALLY.summary()}")
+    return rc
+
+
+def check(text: str, items: dict, stale_feed: bool, scope=None) -> int:
+    """The --check report: 0 when the gallery is in sync, else 1.
+
+    ``scope`` (a set of SKUs, from --since) limits the orphan-card check to
+    those SKUs; ``items`` and ``stale_feed`` are then already limited to them.
+    """
+    streamed = is_streamed(text)
+    existing = set(carded_skus(text))
+    want = should_be_carded(items)
+    # A streamed page only carries the first screenful; the feed covers the rest.
+    missing = [] if streamed else sorted(want - existing)
+    # Also flag cards that point at an item dir which no longer exists.
+    orphans = sorted(sku for sku in existing if (scope is None or sku in scope)
+                     and not os.path.isdir(os.path.join(ROOT, sku)))
+    if not missing and not orphans and not stale_feed:
+        how = "in items.json" if streamed else "all carded"
+        which = "" if scope is None else f" of {len(scope)} changed"
+        print(f"OK: gallery in sync — {len(want)} Listed/Sold items{which}, {how}.")
+        return 0
+    if missing:
+        print(f"FAIL: {len(missing)} Listed/Sold item(s) missing a gallery card:")
+        for sku in missing:
+            print(f"  - {sku}  ({items[sku].get('product_name','?')})")
+    if orphans:
+        print(f"FAIL: {len(orphans)} gallery card(s) point at a missing item dir: {', '.join(orphans)}")
+    if stale_feed:
+        print(f"FAIL: {os.path.basename(FEED)} is stale (labels changed since it was written)")
+    print("\nRun: python items/scripts/build_gallery.py --apply")
+    return 1
 
+
+def run(args) -> int:
+    """main() after argument parsing."""
     text = open(INDEX, encoding="utf-8").read()
+    scope = gitscope.affected(args.since, ROOT) if args.since else None
+    if scope is not None:
+        # --check --since: only the changed items' labels are read.
+        items = load_items(only=scope)
+        with buildprof.phase("check"):
+            return check(text, items, stale_records(text, items, scope), scope)
     items = load_items()
+    feed = build_feed(items, gallery_skus(text, items), text)
+    streamed = is_streamed(text)
+
+    if args.stream is not None:
+        new_text, dropped = stream(text, feed, max(args.stream, 0))
+        write_feed(feed)
+        write_index(new_text)
+        print(f"Streamed gallery: {len(Gallery(new_text).index)} static card(s), "
+              f"{len(dropped)} moved to {os.path.basename(FEED)} ({len(feed)} feed record(s)).")
+        return 0
 
     if args.relink_cards:
         new_text, changed = relink_cards(text, only=set(args.sku) if args.sku else None)
         if not changed:
             print("No cards to relink (no card.png present for existing cards).")
             return 0
-        with open(INDEX, "w", encoding="utf-8") as fh:
-            fh.write(new_text)
+        write_index(new_text)
+        write_feed(feed)
         print(f"Relinked {len(changed)} card(s) to card.png: {', '.join(changed)}")
         return 0
 
     if args.rebadge:
         new_text, removed, stamped = rebadge(text, items)
-        with open(INDEX, "w", encoding="utf-8") as fh:
-            fh.write(new_text)
+        write_index(new_text)
         print(f"Rebadge: removed {removed} baked 'New' badge(s), stamped data-added on "
               f"{len(stamped)} card(s); auto-expiring JS ensured.")
         return 0
@@ -371,8 +983,10 @@ def main() -> int:
         sku = args.update_card
         new_text, changed = update_card(text, sku, items)
         if changed:
-            with open(INDEX, "w", encoding="utf-8") as fh:
-                fh.write(new_text)
+            if streamed:
+                new_text = recount(new_text, available_count(feed))
+            write_index(new_text)
+            write_feed(feed)
             print(f"Updated card: {sku}")
             return 0
         if _card_span(text, sku) is None:
@@ -385,27 +999,27 @@ def main() -> int:
         return 1
 
     if args.check:
-        existing = set(carded_skus(text))
-        want = should_be_carded(items)
-        missing = sorted(want - existing)
-        # Also flag cards that point at an item dir which no longer exists.
-        orphans = sorted(sku for sku in existing
-                         if not os.path.isdir(os.path.join(ROOT, sku)))
-        if not missing and not orphans:
-            print(f"OK: gallery in sync — {len(want)} Listed/Sold items, all carded.")
+        with buildprof.phase("check"):
+            return check(text, items, read_feed_text() != feed_text(feed))
+
+    if streamed:
+        # New items reach a streamed page through the feed; only the count moves.
+        new_text = recount(text, available_count(feed))
+        if args.dry_run:
+            print(f"Streamed gallery: {len(feed)} feed record(s) (--dry-run: nothing written)")
             return 0
-        if missing:
-            print(f"FAIL: {len(missing)} Listed/Sold item(s) missing a gallery card:")
-            for sku in missing:
-                print(f"  - {sku}  ({items[sku].get('product_name','?')})")
-        if orphans:
-            print(f"FAIL: {len(orphans)} gallery card(s) point at a missing item dir: {', '.join(orphans)}")
-        print("\nRun: python items/scripts/build_gallery.py --apply")
-        return 1
+        wrote = write_feed(feed)
+        if new_text != text:
+            write_index(new_text)
+        print(f"Streamed gallery: {len(feed)} feed record(s); "
+              f"{os.path.basename(FEED)} {'written' if wrote else 'unchanged'}.")
+        return 0
 
     new_text, inserted, skipped, missing = reconcile(text, items)
     for sku, why in skipped:
         print(f"  ! skipped {sku}: {why} (intake incomplete)")
+    if not args.dry_run and write_feed(feed):
+        print(f"Wrote {FEED}")
     if not inserted:
         print(f"Gallery already in sync ({len(should_be_carded(items))} Listed/Sold items, no cards to add).")
         return 0
@@ -413,11 +1027,13 @@ def main() -> int:
     if args.dry_run:
         print("(--dry-run: nothing written)")
         return 0
-    with open(INDEX, "w", encoding="utf-8") as fh:
-        fh.write(new_text)
+    write_index(new_text)
     print(f"Wrote {INDEX}")
     return 0
 
 
 if __name__ == "__main__":
-    raise SystemExit(main())
+    try:
+        raise SystemExit(main())
+    finally:
+        imgprobe.flush()
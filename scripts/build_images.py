@@ -0,0 +1,481 @@
+#!/usr/bin/env python3
+"""Responsive image derivatives for item photos (WebP / AVIF / fallback, width-stepped).
+
+Item pages load the full-size cutout (RG-0055's is 2.6 MB) and gallery cards
+the ~1 MB card.png, whatever the screen — on a phone scanning a shop-floor QR
+code that is most of the page weight. This stage writes, per item, resized
+copies of every role image (``photos.hero`` / ``cutout`` / ``card`` /
+``square``) at WIDTHS in AVIF and WebP, plus a fallback up to FALLBACK_MAX wide
+(PNG when the source has alpha, progressive JPEG otherwise):
+
+  RG-XXXX/img/cutout-640.webp, cutout-640.avif, cutout-640.png, ...
+  RG-XXXX/img/thumb.webp, thumb.png   # 2x gallery card thumbnail (+ inline LQIP)
+  RG-XXXX/img/manifest.json     # source name -> sha256, size, variants; "thumb"
+
+build_item_page.render_page and build_gallery.render_card read the manifest and
+emit ``<picture>`` + ``srcset``/``sizes``; without a manifest entry they emit the
+plain ``<img>`` exactly as before. Gallery cards use the small thumbnail of the
+image they show (card.png, else the hero) and carry its blurred LQIP data URI
+in ``data-lqip``, painted behind the thumbnail until it loads.
+
+  build_images.py                  # every item, incremental (default)
+  build_images.py --sku RG-0055    # just these items
+  build_images.py --check          # exit 1 if any derivative set is missing/stale
+  build_images.py --full           # ignore recorded hashes, re-derive everything
+  build_images.py --jobs 8         # worker processes (default: CPU count)
+
+Incremental: a source is re-derived only when its sha256 differs from the one
+recorded in the manifest (or a variant file is gone). Hashes are cached in
+.build/hashes.json by (mtime_ns, size), so a no-op run reads no image bytes.
+Encoding needs Pillow (``pip install Pillow``; AVIF needs Pillow >= 11.3 or the
+pillow-avif-plugin — without it AVIF is skipped). Reading manifests and
+``--check`` are pure stdlib.
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import html
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import catalog
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))  # items/
+
+# Bump when the encoder settings change so every derivative is rebuilt.
+DERIVE_VERSION = 1
+WIDTHS = (320, 640, 1024, 1600)
+# Role -> default file name when label.json `photos` does not name one.
+ROLES = {"hero": "hero.png", "cutout": "cutout.png", "card": "card.png", "square": "square.png"}
+# An unnamed hero is the first of these present (as build_gallery and square_images look it up).
+HERO_DEFAULTS = ("hero.jpeg", "hero.png")
+IMG_DIR = "img"
+MANIFEST = "manifest.json"
+
+# <source> order matters: the browser takes the first type it supports.
+MODERN_FORMATS = ("avif", "webp")
+MIME = {"avif": "image/avif", "webp": "image/webp", "png": "image/png", "jpeg": "image/jpeg"}
+QUALITY = {"avif": 55, "webp": 80, "jpeg": 82}
+# Only browsers without WebP use the fallback, so its large widths are skipped.
+FALLBACK_MAX = 1024
+
+# Gallery card thumbnail: fitted into twice the card's 340x200 CSS image box, so
+# it is sharp at 2x density. LQIP_WIDTH is the blurred inline placeholder's width.
+THUMB_BOX = (680, 400)
+THUMB_STEM = "thumb"
+LQIP_WIDTH = 16
+
+
+# ---------------------------------------------------------------------------
+# Source discovery + content hashes.
+# ---------------------------------------------------------------------------
+
+def role_sources(label: dict, item_dir) -> list:
+    """Distinct existing source file names for an item's role images, role order."""
+    photos = label.get("photos") or {}
+    out = []
+    for role, default in ROLES.items():
+        name = photos.get(role) if isinstance(photos.get(role), str) else None
+        name = name or (hero_file(label, item_dir) if role == "hero" else default)
+        if name not in out and os.path.isfile(os.path.join(str(item_dir), name)):
+            out.append(name)
+    return out
+
+
+def hero_file(label: dict, item_dir) -> str:
+    """photos.hero, else the first HERO_DEFAULTS file present (else ROLES' hero.png)."""
+    hero = (label.get("photos") or {}).get("hero")
+    if isinstance(hero, str) and hero:
+        return hero
+    return next((n for n in HERO_DEFAULTS if os.path.isfile(os.path.join(str(item_dir), n))),
+                ROLES["hero"])
+
+
+def thumb_source(label: dict, item_dir):
+    """The image a gallery card shows (build_gallery.card_fields): card.png, else the hero."""
+    if os.path.isfile(os.path.join(str(item_dir), "card.png")):
+        return "card.png"
+    hero = hero_file(label, item_dir)
+    return hero if os.path.isfile(os.path.join(str(item_dir), hero)) else None
+
+
+def _hash_cache_path() -> str:
+    return os.path.join(ROOT, ".build", "hashes.json")
+
+
+def load_hash_cache() -> dict:
+    try:
+        with open(_hash_cache_path(), encoding="utf-8") as fh:
+            data = json.load(fh)
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def save_hash_cache(cache: dict) -> None:
+    path = _hash_cache_path()
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump(cache, fh, sort_keys=True)
+        os.replace(tmp, path)
+    except OSError:
+        pass  # a read-only tree just re-hashes next time
+
+
+def file_sha256(path, cache: dict | None = None) -> str:
+    """sha256 of a file's bytes, memoized in ``cache`` by (mtime_ns, size)."""
+    st = os.stat(path)
+    key = os.path.abspath(str(path))
+    hit = (cache or {}).get(key)
+    if hit and hit[0] == st.st_mtime_ns and hit[1] == st.st_size:
+        return hit[2]
+    h = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(1 << 20), b""):
+            h.update(chunk)
+    digest = h.hexdigest()
+    if cache is not None:
+        cache[key] = [st.st_mtime_ns, st.st_size, digest]
+    return digest
+
+
+# ---------------------------------------------------------------------------
+# Manifest (read side — used by the page and gallery generators).
+# ---------------------------------------------------------------------------
+
+def manifest_path(item_dir) -> str:
+    return os.path.join(str(item_dir), IMG_DIR, MANIFEST)
+
+
+def load_manifest(item_dir) -> dict:
+    """``RG-XXXX/img/manifest.json`` as a dict; an empty manifest when absent/unreadable."""
+    try:
+        with open(manifest_path(item_dir), encoding="utf-8") as fh:
+            data = json.load(fh)
+    except (OSError, ValueError):
+        data = {}
+    if not isinstance(data, dict) or data.get("version") != DERIVE_VERSION:
+        data = {}
+    data.setdefault("version", DERIVE_VERSION)
+    data.setdefault("sources", {})
+    return data
+
+
+def variants_for(item_dir, name: str):
+    """Manifest entry for source ``name`` (a file in item_dir), or None if not derived."""
+    if item_dir is None:
+        return None
+    entry = load_manifest(item_dir)["sources"].get(name)
+    return entry if entry and entry.get("variants") else None
+
+
+def thumb_for(item_dir, name: str):
+    """The card thumbnail entry when it was made from source ``name``, else None."""
+    thumb = load_manifest(item_dir).get("thumb")
+    return thumb if thumb and thumb.get("source") == name else None
+
+
+def _srcset(prefix: str, rows) -> str:
+    return ", ".join(f"{html.escape(prefix + f, quote=True)} {w}w" for w, f in rows)
+
+
+def picture_html(entry: dict, prefix: str, *, alt: str, sizes: str, img_attrs: str = "") -> str:
+    """A ``<picture>`` for one manifest entry; ``prefix`` is the URL of the img/ dir.
+
+    ``alt`` must already be attribute-escaped; ``img_attrs`` is appended to the
+    ``<img>`` verbatim (class, style). The fallback ``src`` is the largest
+    fallback variant no wider than FALLBACK_MAX. ``display:contents`` keeps the
+    wrapper out of layout so existing ``img`` CSS applies unchanged.
+    """
+    variants = entry["variants"]
+    parts = ['<picture style="display:contents">']
+    for fmt in MODERN_FORMATS:
+        if variants.get(fmt):
+            parts.append(f'<source type="{MIME[fmt]}" srcset="{_srcset(prefix, variants[fmt])}" '
+                         f'sizes="{sizes}">')
+    fallback = entry["fallback"]
+    rows = variants[fallback]
+    src = next((f for w, f in reversed(rows) if w <= FALLBACK_MAX), rows[0][1])
+    parts.append(f'<img src="{html.escape(prefix + src, quote=True)}" '
+                 f'srcset="{_srcset(prefix, rows)}" sizes="{sizes}" alt="{alt}"{img_attrs}>')
+    parts.append("</picture>")
+    return "".join(parts)
+
+
+def thumb_html(thumb: dict, prefix: str, *, alt: str, img_attrs: str = "") -> str:
+    """A ``<picture>`` for a card thumbnail (webp + fallback) with its LQIP.
+
+    ``data-lqip`` carries the blurred placeholder data URI; the gallery's
+    LQIP script paints it behind the ``<img>`` until the thumbnail loads. Size
+    and loading attributes come from the caller via ``img_attrs``.
+    """
+    return ('<picture style="display:contents">'
+            f'<source type="image/webp" srcset="{html.escape(prefix + thumb["webp"], quote=True)}">'
+            f'<img src="{html.escape(prefix + thumb["fallback"], quote=True)}" '
+            f'alt="{alt}" data-lqip="{thumb["lqip"]}"{img_attrs}>'
+            "</picture>")
+
+
+# ---------------------------------------------------------------------------
+# Derivation (write side — needs Pillow, runs in worker processes).
+# ---------------------------------------------------------------------------
+
+def target_widths(width: int) -> list:
+    """WIDTHS below the source width, plus the source width itself if under the cap."""
+    out = [w for w in WIDTHS if w < width]
+    if width <= WIDTHS[-1]:
+        out.append(width)
+    return out
+
+
+def variant_name(stem: str, width: int, fmt: str) -> str:
+    return f"{stem}-{width}.{'jpg' if fmt == 'jpeg' else fmt}"
+
+
+def require_pillow():
+    """(Image, ImageOps) from Pillow, or exit with an install hint."""
+    try:
+        from PIL import Image, ImageOps
+    except ImportError:
+        raise SystemExit("ERROR: build_images.py needs Pillow to encode (pip install Pillow)")
+    return Image, ImageOps
+
+
+def _avif_supported(Image) -> bool:
+    try:
+        import pillow_avif  # noqa: F401  (registers the AVIF plugin)
+    except ImportError:
+        pass
+    return ".avif" in Image.registered_extensions()
+
+
+def derive_job(item_dir: str, name: str, digest: str) -> dict:
+    """Write every variant of ``item_dir/name``; returns its manifest entry.
+
+    Top-level and picklable for the process pool. Orientation is baked in
+    (EXIF transpose) and metadata dropped, so variants display upright.
+    """
+    Image, ImageOps = require_pillow()
+    out_dir = os.path.join(item_dir, IMG_DIR)
+    os.makedirs(out_dir, exist_ok=True)
+    stem = os.path.splitext(name)[0]
+    with Image.open(os.path.join(item_dir, name)) as im:
+        im = ImageOps.exif_transpose(im)
+        alpha = im.mode in ("RGBA", "LA", "PA") or (im.mode == "P" and "transparency" in im.info)
+        im = im.convert("RGBA" if alpha else "RGB")
+        width, height = im.size
+        fallback = "png" if alpha else "jpeg"
+        formats = [f for f in MODERN_FORMATS if f != "avif" or _avif_supported(Image)] + [fallback]
+        variants = {fmt: [] for fmt in formats}
+        for w in target_widths(width):
+            h = max(1, round(height * w / width))
+            resized = im if w == width else im.resize((w, h), Image.LANCZOS)
+            for fmt in formats:
+                if fmt == fallback and w > FALLBACK_MAX and variants[fmt]:
+                    continue
+                fname = variant_name(stem, w, fmt)
+                _save(resized, out_dir, fname, fmt)
+                variants[fmt].append([w, fname])
+    return {"sha256": digest, "width": width, "height": height,
+            "fallback": fallback, "variants": variants}
+
+
+def _save(im, out_dir: str, fname: str, fmt: str) -> None:
+    """Encode ``im`` to out_dir/fname atomically with the stage's settings for ``fmt``."""
+    opts = {"optimize": True} if fmt == "png" else {"quality": QUALITY[fmt]}
+    if fmt == "jpeg":
+        opts.update(optimize=True, progressive=True)
+    if fmt == "webp":
+        opts["method"] = 6
+    tmp = os.path.join(out_dir, f".{fname}.{os.getpid()}.tmp")
+    im.save(tmp, format=fmt.upper(), **opts)
+    os.replace(tmp, os.path.join(out_dir, fname))
+
+
+def derive_thumb_job(item_dir: str, name: str, digest: str) -> dict:
+    """Write the card thumbnail (WebP + fallback) and its LQIP; returns the manifest ``thumb``.
+
+    The LQIP is the source shrunk to LQIP_WIDTH px and blurred, inlined as a
+    base64 WebP data URI (a few hundred bytes) that the page stretches behind
+    the thumbnail until it loads.
+    """
+    import base64
+    import io
+
+    Image, ImageOps = require_pillow()
+    from PIL import ImageFilter
+
+    out_dir = os.path.join(item_dir, IMG_DIR)
+    os.makedirs(out_dir, exist_ok=True)
+    with Image.open(os.path.join(item_dir, name)) as im:
+        im = ImageOps.exif_transpose(im)
+        alpha = im.mode in ("RGBA", "LA", "PA") or (im.mode == "P" and "transparency" in im.info)
+        im = im.convert("RGBA" if alpha else "RGB")
+        thumb = im.copy()
+        thumb.thumbnail(THUMB_BOX, Image.LANCZOS)
+        fallback = "png" if alpha else "jpeg"
+        files = {fmt: f"{THUMB_STEM}.{'jpg' if fmt == 'jpeg' else fmt}" for fmt in ("webp", fallback)}
+        for fmt, fname in files.items():
+            _save(thumb, out_dir, fname, fmt)
+        tiny = im.resize((LQIP_WIDTH, max(1, round(im.height * LQIP_WIDTH / im.width))),
+                         Image.BILINEAR).filter(ImageFilter.GaussianBlur(1))
+        buf = io.BytesIO()
+        tiny.save(buf, format="WEBP", quality=30)
+    return {"source": name, "sha256": digest, "width": thumb.width, "height": thumb.height,
+            "webp": files["webp"], "fallback": files[fallback],
+            "lqip": "data:image/webp;base64," + base64.b64encode(buf.getvalue()).decode("ascii")}
+
+
+def _entry_complete(item_dir, entry: dict) -> bool:
+    out_dir = os.path.join(str(item_dir), IMG_DIR)
+    return all(os.path.isfile(os.path.join(out_dir, f))
+               for rows in entry.get("variants", {}).values() for _, f in rows)
+
+
+def _thumb_files(thumb) -> list:
+    return [thumb["webp"], thumb["fallback"]] if thumb else []
+
+
+def plan(item_dir, label: dict, hashes: dict, full: bool = False):
+    """(manifest, stale, removed) for one item.
+
+    ``stale`` lists ``(kind, source name, sha256)`` jobs — kind "variants" for a
+    role image, "thumb" for the card thumbnail; ``removed`` lists the manifest
+    keys to drop (source names, or "thumb" when the item has no card image).
+    """
+    manifest = load_manifest(item_dir)
+    d = str(item_dir)
+    sources = role_sources(label, item_dir)
+    stale = []
+    for name in sources:
+        digest = file_sha256(os.path.join(d, name), hashes)
+        entry = manifest["sources"].get(name)
+        if full or not entry or entry.get("sha256") != digest or not _entry_complete(item_dir, entry):
+            stale.append(("variants", name, digest))
+    removed = sorted(set(manifest["sources"]) - set(sources))
+
+    name = thumb_source(label, item_dir)
+    thumb = manifest.get("thumb")
+    if name is None:
+        if thumb:
+            removed.append("thumb")
+    else:
+        digest = file_sha256(os.path.join(d, name), hashes)
+        if (full or not thumb or thumb.get("source") != name or thumb.get("sha256") != digest
+                or not all(os.path.isfile(os.path.join(d, IMG_DIR, f)) for f in _thumb_files(thumb))):
+            stale.append(("thumb", name, digest))
+    return manifest, stale, removed
+
+
+def _prune(item_dir, manifest: dict) -> None:
+    """Delete img/ variant files no manifest entry references any more."""
+    out_dir = os.path.join(str(item_dir), IMG_DIR)
+    keep = {f for e in manifest["sources"].values() for rows in e["variants"].values() for _, f in rows}
+    keep.update(_thumb_files(manifest.get("thumb")))
+    keep.add(MANIFEST)
+    try:
+        names = os.listdir(out_dir)
+    except OSError:
+        return
+    for fname in names:
+        if fname not in keep and not fname.startswith("."):
+            os.remove(os.path.join(out_dir, fname))
+
+
+def save_manifest(item_dir, manifest: dict) -> None:
+    path = manifest_path(item_dir)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    manifest["sources"] = dict(sorted(manifest["sources"].items()))
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as fh:
+        json.dump(manifest, fh, indent=2)
+        fh.write("\n")
+    os.replace(tmp, path)
+
+
+_JOBS = {"variants": derive_job, "thumb": derive_thumb_job}
+
+
+def _job(kind: str, item_dir: str, name: str, digest: str) -> dict:
+    return _JOBS[kind](item_dir, name, digest)
+
+
+def _run(jobs_list, jobs: int) -> list:
+    if jobs <= 1 or len(jobs_list) <= 1:
+        return [_job(*a) for a in jobs_list]
+    with ProcessPoolExecutor(max_workers=min(jobs, len(jobs_list))) as pool:
+        return list(pool.map(_job, *zip(*jobs_list)))
+
+
+def _label(kind: str, name: str) -> str:
+    return f"{name} (thumb)" if kind == "thumb" else name
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Build responsive image derivatives + manifests.")
+    ap.add_argument("--sku", nargs="*", default=None, help="limit to these SKUs")
+    ap.add_argument("--check", action="store_true",
+                    help="exit 1 if any role image lacks up-to-date derivatives")
+    ap.add_argument("--full", action="store_true", help="ignore recorded hashes; re-derive all")
+    ap.add_argument("--jobs", type=int, default=os.cpu_count() or 1,
+                    help="worker processes for encoding (default: CPU count)")
+    args = ap.parse_args()
+
+    items = catalog.load(ROOT)
+    skus = sorted(args.sku) if args.sku else list(items)
+    hashes = load_hash_cache()
+    work, plans = [], {}
+    for sku in skus:
+        item = items.get(sku)
+        if item is None or item.error is not None:
+            print(f"  ! skipping {sku}: {item.error if item else 'no label.json'}", file=sys.stderr)
+            continue
+        manifest, stale, removed = plan(item.dir, item.label, hashes, full=args.full)
+        if stale or removed:
+            plans[sku] = (item.dir, manifest, stale, removed)
+            work.extend((kind, item.dir, name, digest) for kind, name, digest in stale)
+    save_hash_cache(hashes)
+
+    if args.check:
+        if not plans:
+            print(f"OK: image derivatives up to date for {len(skus)} item(s).")
+            return 0
+        print(f"FAIL: {len(plans)} item(s) with missing/stale derivatives:")
+        for sku, (_, _, stale, removed) in plans.items():
+            names = [_label(k, n) for k, n, _ in stale] + [f"{n} (removed)" for n in removed]
+            print(f"  - {sku}: {', '.join(names)}")
+        print("\nRun: python3 scripts/build_images.py")
+        return 1
+
+    if not plans:
+        print(f"Image derivatives up to date ({len(skus)} item(s), nothing to encode).")
+        return 0
+    require_pillow()  # fail before spawning workers
+    print(f"Encoding {len(work)} source image(s) across {len(plans)} item(s) "
+          f"with {max(1, min(args.jobs, len(work)))} worker(s)...")
+    results = iter(_run(work, args.jobs))
+    for sku, (item_dir, manifest, stale, removed) in plans.items():
+        for kind, name, _ in stale:
+            if kind == "thumb":
+                manifest["thumb"] = next(results)
+            else:
+                manifest["sources"][name] = next(results)
+        for name in removed:
+            if name == "thumb":
+                manifest.pop("thumb", None)
+            else:
+                del manifest["sources"][name]
+        save_manifest(item_dir, manifest)
+        _prune(item_dir, manifest)
+        print(f"  + {sku}: {', '.join(_label(k, n) for k, n, _ in stale) or '-'}"
+              + (f" (dropped {', '.join(removed)})" if removed else ""))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
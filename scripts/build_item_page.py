@@ -10,6 +10,8 @@ field is absent, a mechanical fallback is derived from the structured data.
 The page format reproduced here is the RG-0055 flip-card (the canonical template):
 inline <style>, a flip handler, and a view-time price formatter that strips a
 trailing ``.00`` visually (so the SOURCE keeps ``$65.00`` — never pre-strip it).
+When build_images.py has derived the front image, it is emitted as a responsive
+``<picture>`` (AVIF/WebP/fallback ``srcset``) instead of the full-size file.
 
 HTML-escaping rule
 ------------------
@@ -28,7 +30,29 @@ Usage
   build_item_page.py --all --check --managed-only  # drift-check only generator-managed
                                         # items (label has a `page` block); the CI gate
                                         # uses this so legacy hand-curated pages don't fail
+  build_item_page.py --all --managed-only  # (re)generate only generator-managed pages
   build_item_page.py RG-0055 --force    # write even if protected / sold
+  build_item_page.py --all --full       # ignore the build manifest; redo every SKU
+  build_item_page.py --all --jobs 8     # render / check over 8 worker processes
+  build_item_page.py --all --check --since origin/main  # only items changed since REV
+  build_item_page.py --watch            # regenerate page + gallery card on every save
+
+``--all`` and ``--all --check`` consult a build manifest (``.build/pages.json``)
+recording, per SKU, a fingerprint of everything the page depends on (label.json,
+status.json, the existing index.html, img/manifest.json, qr-buy.png / cutout /
+buy-dir presence, and the size of the hero and QR images the page names)
+plus the template text, GENERATOR_VERSION and the generator sources. SKUs whose inputs are unchanged
+since the last run are not re-read, re-rendered or re-checked — a recorded drift
+result is replayed, so the exit code is the same as a full run. The SKUs that do
+need work are spread over ``--jobs`` worker processes (default: CPU count);
+output is still printed in SKU order. Pages go through output.py: a page whose
+bytes would not change is left untouched, a changed one is replaced atomically,
+and the run ends with its written / unchanged / skipped counts.
+
+``--all --since REV`` narrows the run to the items ``git diff`` touches since
+REV (see gitscope.py); a change to a shared input — the template, this
+generator — still covers every item. The CI gate uses it so a PR's drift check
+scales with the PR rather than the catalog.
 
 Living-test pages (TILT/iridescent RG-0001, variant-stack RG-0011/0027, the
 RG-0027 /buy/ redirect) and Sold pages are PROTECTED: they are skipped unless
@@ -37,16 +61,42 @@ RG-0027 /buy/ redirect) and Sold pages are PROTECTED: they are skipped unless
 from __future__ import annotations
 
 import argparse
-import glob
+import contextlib
+import hashlib
 import html
+import io
 import json
 import os
 import re
 import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import build_images
+import buildprof
+import catalog
+import gitscope
+import imgprobe
+import labelschema
+import output
+import page_template
 
 ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))  # items/
 PAGES_BASE = "https://richmondgeneral.github.io/items"
 
+# Bump whenever a change to this file alters rendered output, skip rules or
+# check_page, so every build-manifest entry goes stale at once. The manifest key
+# also hashes the generator sources (GENERATOR_SOURCES), so a forgotten bump
+# still invalidates it.
+GENERATOR_VERSION = "2"
+
+# --jobs fans SKUs out over a process pool, but spinning up workers costs more
+# than rendering a few dozen pages, so smaller batches always run in-process.
+POOL_MIN_ITEMS = 64
+
+# Rendered width of the front image: the card is max 420px wide with a padded
+# image well; on phones it spans the viewport less the page + well padding.
+HERO_SIZES = "(max-width: 460px) calc(100vw - 5rem), 370px"
+
 # Approx max length for the SEO meta description (truncate at a word boundary).
 SEO_DESC_MAX = 155
 
@@ -236,6 +286,51 @@ def _cutout_name(label: dict) -> str:
     return photos.get("cutout") or photos.get("hero") or "hero.jpeg"
 
 
+def _dims_attrs(dims) -> str:
+    return f' width="{dims[0]}" height="{dims[1]}"' if dims else ""
+
+
+def _probe(item_dir, name):
+    return None if item_dir is None else imgprobe.size(os.path.join(str(item_dir), name))
+
+
+def hero_picture(label: dict, item_dir, alt: str) -> str:
+    """The front image element: a responsive <picture> when build_images derived
+    the main image, else the plain ``<img>`` (``alt`` already escaped).
+
+    It is the page's largest paint, so it carries its intrinsic width/height
+    (header probe, or the derivative manifest) and ``fetchpriority="high"``.
+    """
+    src = main_image(label)
+    entry = build_images.variants_for(item_dir, src[2:])
+    if entry is None:
+        attrs = _dims_attrs(_probe(item_dir, src[2:])) + ' fetchpriority="high"'
+        return f'<img src="{src}" alt="{alt}" class="item-image"{attrs}>'
+    attrs = _dims_attrs((entry["width"], entry["height"])) + ' fetchpriority="high"'
+    return build_images.picture_html(entry, f"./{build_images.IMG_DIR}/", alt=alt,
+                                     sizes=HERO_SIZES, img_attrs=' class="item-image"' + attrs)
+
+
+def hero_preload(label: dict, item_dir) -> str:
+    """``<link rel=preload>`` for the hero, so it is fetched before CSS/fonts settle.
+
+    With derivatives it preloads the first modern format's srcset (typed, so a
+    browser that can't use it skips the hint rather than fetching twice).
+    """
+    src = main_image(label)
+    entry = build_images.variants_for(item_dir, src[2:])
+    if entry is None:
+        return f'<link rel="preload" as="image" href="{src}" fetchpriority="high">'
+    prefix = f"./{build_images.IMG_DIR}/"
+    for fmt in build_images.MODERN_FORMATS:
+        rows = entry["variants"].get(fmt)
+        if rows:
+            srcset = ", ".join(f"{prefix}{f} {w}w" for w, f in rows)
+            return (f'<link rel="preload" as="image" type="{build_images.MIME[fmt]}" '
+                    f'imagesrcset="{srcset}" imagesizes="{HERO_SIZES}" fetchpriority="high">')
+    return f'<link rel="preload" as="image" href="{src}" fetchpriority="high">'
+
+
 def qr_buy_file(label: dict, item_dir) -> str:
     """``qr_codes.buy.file`` if set, else qr-buy.png if it exists, else qr-code.png."""
     qr = (label.get("qr_codes") or {}).get("buy") or {}
@@ -263,8 +358,10 @@ def fulfillment_line(label: dict) -> str:
 
 # ---------------------------------------------------------------------------
 # Template (RG-0055, the canonical format). Dynamic spans are __TOKEN__ markers
-# replaced by str.replace — NOT str.format — because the CSS/JS bodies are full
-# of literal { } braces. The two trailing <script> blocks are preserved verbatim.
+# — NOT str.format fields — because the CSS/JS bodies are full of literal { }
+# braces. It is compiled once (PAGE_TEMPLATE, see page_template.py) into literal
+# segments + slots, so a render is a single join. The two trailing <script>
+# blocks are preserved verbatim.
 # ---------------------------------------------------------------------------
 
 _TEMPLATE = """<!DOCTYPE html>
@@ -275,6 +372,7 @@ _TEMPLATE = """<!DOCTYPE html>
 <meta name="description" content="__SEO_DESC__">
 <meta property="og:title" content="__SEO_TITLE__ | Richmond General"><meta property="og:description" content="__SEO_DESC__">
 <meta property="og:image" content="__OG_IMAGE__"><meta property="og:url" content="https://richmondgeneral.github.io/items/__SKU__/"><meta property="og:type" content="product">
+__HERO_PRELOAD__
 <link href="https://fonts.googleapis.com/css2?family=Playfair+Display:wght@400;600;700&family=Source+Sans+Pro:wght@300;400;600&display=swap" rel="stylesheet">
 <style>
 :root { --rg-gold:#C9A961; --rg-cream:#F5F1E8; --rg-charcoal:#2C2C2C; --rg-brown:#6B4423; --rg-shadow:rgba(44,44,44,0.15); }
@@ -323,7 +421,7 @@ body { font-family:'Source Sans Pro',sans-serif; background:linear-gradient(135d
 <body>
 <div class="card-container"><div class="flip-card" tabindex="0" role="button" aria-expanded="false" aria-label="__ARIA_LABEL__">
 <div class="card-face card-front">
-<div class="item-image-container"><span class="sku-badge">__SKU__</span><img src="__MAIN_IMAGE__" alt="__IMG_ALT__" class="item-image"></div>
+<div class="item-image-container"><span class="sku-badge">__SKU__</span>__HERO_PICTURE__</div>
 <div class="front-info"><h1 class="item-title">__CARD_TITLE__</h1><p class="item-era">__ERA_LINE__</p>
 <div class="front-footer"><span class="item-price">__PRICE__</span>
 <span class="flip-hint"><svg class="flip-icon" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2"><path d="M17 1l4 4-4 4"/><path d="M3 11V9a4 4 0 0 1 4-4h14"/><path d="M7 23l-4-4 4-4"/><path d="M21 13v2a4 4 0 0 1-4 4H3"/></svg>Tap for story</span></div></div></div>
@@ -336,7 +434,7 @@ body { font-family:'Source Sans Pro',sans-serif; background:linear-gradient(135d
 <div class="detail-item"><p class="detail-label">Dimensions</p><p class="detail-value">__DETAIL_DIMENSIONS__</p></div>
 <div class="detail-item"><p class="detail-label">Condition</p><p class="detail-value">__DETAIL_CONDITION__</p></div>
 </div></div>
-<div class="back-footer"><div class="qr-section"><div class="qr-code"><img src="./__QR_BUY__" alt="Scan to buy"></div><div class="qr-text"><strong>Scan to Buy</strong>__FULFILLMENT__</div></div>
+<div class="back-footer"><div class="qr-section"><div class="qr-code"><img src="./__QR_BUY__" alt="Scan to buy"__QR_IMG_ATTRS__></div><div class="qr-text"><strong>Scan to Buy</strong>__FULFILLMENT__</div></div>
 <a href="__BUY_LINK__" class="buy-button">Buy Now</a></div>
 <div class="brand-strip">RICHMOND GENERAL &middot; <a href="https://www.richmondgeneral.com">richmondgeneral.com</a></div></div>
 </div></div>
@@ -350,6 +448,21 @@ document.querySelector('.buy-button')?.addEventListener('click',(e)=>e.stopPropa
 </body></html>
 """
 
+PAGE_TEMPLATE = page_template.Template(_TEMPLATE)
+
+# Extra slot names so template/rg-item-card-template.html (``{{TOKEN}}``) renders
+# from the same values: card-template name -> RG-0055 template name.
+_CARD_TEMPLATE_ALIASES = {
+    "ITEM_TITLE": "CARD_TITLE",
+    "STORY_TEXT": "STORY",
+    "SEO_DESCRIPTION": "SEO_DESC",
+    "MAKER": "DETAIL_MAKER",
+    "ERA": "DETAIL_ERA",
+    "CONDITION": "DETAIL_CONDITION",
+    "IMAGE_URL": "MAIN_IMAGE",
+    "PAYMENT_LINK_URL": "BUY_LINK",
+}
+
 
 def _price_str(label: dict) -> str:
     """Price as it must appear in the SOURCE: ``$65.00`` (two decimals, never pre-stripped)."""
@@ -379,12 +492,12 @@ def _img_alt(label: dict) -> str:
     return _attr_title(label)
 
 
-def render_page(sku: str, label: dict, item_dir=None) -> str:
-    """Fill the RG-0055 template from ``label``.
+def page_values(sku: str, label: dict, item_dir=None) -> dict:
+    """Token name -> rendered (already escaped) value for every page slot.
 
     Curated ``page.*`` text is inserted as-is (trusted entities); mechanically
-    derived text is html-escaped. The two trailing <script> blocks are verbatim.
-    og:image is the absolute GitHub Pages URL of the cutout (or hero fallback).
+    derived text is html-escaped. og:image is the absolute GitHub Pages URL of
+    the cutout (or hero fallback). Also carries the card-template aliases.
     """
     page = _page(label)
 
@@ -395,14 +508,17 @@ def render_page(sku: str, label: dict, item_dir=None) -> str:
         return html.escape(str(derive()))
 
     seo_t = field("seo_title", lambda: seo_title(label))
-    seo_d = field("seo_description", lambda: seo_description(label))
+    with buildprof.phase("derive.seo_description", sku):
+        seo_d = field("seo_description", lambda: seo_description(label))
     title = field("card_title", lambda: card_title(label))
-    era = field("era_line", lambda: era_line(label))
+    with buildprof.phase("derive.era_line", sku):
+        era = field("era_line", lambda: era_line(label))
     story_html = field("story", lambda: story(label))
 
     # Details: curated dict (as-is) vs derived (escaped). dims_str already emits
     # the &Prime;/&times; entities, so derived dims must NOT be re-escaped.
-    det = details(label)
+    with buildprof.phase("derive.details", sku):
+        det = details(label)
     if isinstance(page.get("details"), dict):
         dmaker = str(det.get("Maker", ""))
         dera = str(det.get("Era", ""))
@@ -422,31 +538,56 @@ def render_page(sku: str, label: dict, item_dir=None) -> str:
 
     cutout = _cutout_name(label)
     og_image = f"{PAGES_BASE}/{sku}/{cutout}"
-
-    repl = {
-        "__SEO_TITLE__": seo_t,
-        "__SEO_DESC__": seo_d,
-        "__OG_IMAGE__": og_image,
-        "__SKU__": html.escape(sku),
-        "__ARIA_LABEL__": aria,
-        "__MAIN_IMAGE__": main_image(label),
-        "__IMG_ALT__": img_alt,
-        "__CARD_TITLE__": title,
-        "__ERA_LINE__": era,
-        "__PRICE__": _price_str(label),
-        "__STORY__": story_html,
-        "__DETAIL_MAKER__": dmaker,
-        "__DETAIL_ERA__": dera,
-        "__DETAIL_DIMENSIONS__": ddim,
-        "__DETAIL_CONDITION__": dcond,
-        "__QR_BUY__": qr_buy_file(label, item_dir),
-        "__FULFILLMENT__": html.escape(fulfillment_line(label)),
-        "__BUY_LINK__": html.escape(buy_link(label), quote=True),
+    qr = qr_buy_file(label, item_dir)
+    price = _price_str(label)
+
+    values = {
+        "SEO_TITLE": seo_t,
+        "SEO_DESC": seo_d,
+        "OG_IMAGE": og_image,
+        "SKU": html.escape(sku),
+        "ARIA_LABEL": aria,
+        "MAIN_IMAGE": main_image(label),
+        "HERO_PICTURE": hero_picture(label, item_dir, img_alt),
+        "HERO_PRELOAD": hero_preload(label, item_dir),
+        "IMG_ALT": img_alt,
+        "CARD_TITLE": title,
+        "ERA_LINE": era,
+        "PRICE": price,
+        "STORY": story_html,
+        "DETAIL_MAKER": dmaker,
+        "DETAIL_ERA": dera,
+        "DETAIL_DIMENSIONS": ddim,
+        "DETAIL_CONDITION": dcond,
+        "QR_BUY": qr,
+        # The QR sits on the card's back face: never needed for first paint.
+        "QR_IMG_ATTRS": _dims_attrs(_probe(item_dir, qr)) + ' loading="lazy" decoding="async"',
+        "FULFILLMENT": html.escape(fulfillment_line(label)),
+        "BUY_LINK": html.escape(buy_link(label), quote=True),
     }
-    out = _TEMPLATE
-    for token, value in repl.items():
-        out = out.replace(token, value)
-    return out
+    for alias, name in _CARD_TEMPLATE_ALIASES.items():
+        values[alias] = values[name]
+    # The card template writes ``${{PRICE}}`` and ``src="{{QR_CODE_URL}}"``.
+    values["QR_CODE_URL"] = "./" + qr
+    values["ORIGIN"] = html.escape(str((label.get("identity") or {}).get("maker_location") or ""))
+    return values
+
+
+def render_page(sku: str, label: dict, item_dir=None, template=None) -> str:
+    """Fill the RG-0055 template (or another compiled ``template``) from ``label``.
+
+    ``template`` is a page_template.Template; the default is PAGE_TEMPLATE.
+    ``{{TOKEN}}`` templates (the card template convention) print the ``$``
+    themselves, so they get a bare-number PRICE. See page_values for the
+    escaping rules.
+    """
+    with buildprof.phase("render", sku):
+        values = page_values(sku, label, item_dir)
+        if template is None:
+            return PAGE_TEMPLATE.render(values)
+        if template.pattern is page_template.BRACE_TOKENS:
+            values["PRICE"] = values["PRICE"].lstrip("$")
+        return template.render(values)
 
 
 # ---------------------------------------------------------------------------
@@ -503,14 +644,7 @@ def is_protected(html_text: str) -> bool:
 def _read_status(item_dir) -> dict:
     if item_dir is None:
         return {}
-    p = os.path.join(str(item_dir), "status.json")
-    if not os.path.isfile(p):
-        return {}
-    try:
-        with open(p, encoding="utf-8") as fh:
-            return json.load(fh)
-    except (OSError, json.JSONDecodeError):
-        return {}
+    return catalog.read_status(item_dir)
 
 
 def should_skip(label: dict, item_dir) -> bool:
@@ -525,8 +659,8 @@ def should_skip(label: dict, item_dir) -> bool:
 # ---------------------------------------------------------------------------
 
 def _load_label(item_dir) -> dict:
-    with open(os.path.join(str(item_dir), "label.json"), encoding="utf-8") as fh:
-        return json.load(fh)
+    """label.json checked against the shared schema (raises LabelSchemaError)."""
+    return labelschema.LABEL.check(catalog.read_label(item_dir))
 
 
 def would_skip(item_dir, label: dict) -> str | None:
@@ -541,7 +675,8 @@ def would_skip(item_dir, label: dict) -> str | None:
     index = os.path.join(str(item_dir), "index.html")
     if os.path.isfile(index):
         try:
-            with open(index, encoding="utf-8") as fh:
+            with buildprof.phase("protected_read", label.get("sku")), \
+                    open(index, encoding="utf-8") as fh:
                 existing = fh.read()
         except OSError:
             existing = ""
@@ -553,11 +688,12 @@ def would_skip(item_dir, label: dict) -> str | None:
     return None
 
 
-def write_page(sku: str, item_dir, label: dict, force: bool = False):
-    """Write items/<sku>/index.html. Returns the path, or None when skipped.
+def write_page(sku: str, item_dir, label: dict, force: bool = False) -> str:
+    """Write items/<sku>/index.html via output.write_text; returns the outcome.
 
-    Skips (returns None, prints why) when the item is Sold OR the existing page
-    is protected, unless ``force`` is set.
+    ``output.WRITTEN`` / ``output.UNCHANGED`` (same bytes: the file is not
+    touched), or ``output.SKIPPED`` (prints why) when the item is Sold OR the
+    existing page is protected, unless ``force`` is set.
     """
     index = os.path.join(str(item_dir), "index.html")
 
@@ -565,19 +701,15 @@ def write_page(sku: str, item_dir, label: dict, force: bool = False):
         reason = would_skip(item_dir, label)
         if reason:
             print(f"  - skip {sku}: {reason} (use --force to regenerate)")
-            return None
+            return output.skip()
 
     out = render_page(sku, label, item_dir)
-    with open(index, "w", encoding="utf-8") as fh:
-        fh.write(out)
-    return index
+    with buildprof.phase("write", sku):
+        return output.write_text(index, out)
 
 
 def _all_skus():
-    return sorted(
-        os.path.basename(os.path.dirname(p))
-        for p in glob.glob(os.path.join(ROOT, "RG-*", "label.json"))
-    )
+    return catalog.discover(ROOT)
 
 
 def managed_skus(items: dict) -> list:
@@ -593,6 +725,243 @@ def managed_skus(items: dict) -> list:
     return sorted(sku for sku, label in items.items() if _page(label))
 
 
+def check_item(sku: str, item_dir, label=None) -> dict:
+    """Drift-check one item from its label (read from disk unless given) + page.
+
+    Returns a JSON-able result ``{"managed", "failed", "lines"}`` where
+    ``lines`` is exactly what ``--check`` prints for the item (empty when in
+    sync). An unreadable label is reported as unmanaged + failed with
+    ``"label_error": True``, so ``--managed-only`` skips it (still saying why)
+    while a plain ``--check`` fails on it.
+    """
+    index = os.path.join(str(item_dir), "index.html")
+    try:
+        if label is None:
+            with buildprof.phase("label_load", sku):
+                label = _load_label(item_dir)
+    except (OSError, ValueError) as e:  # incl. JSON / schema errors
+        return {"managed": False, "failed": True, "label_error": True,
+                "lines": [f"  ! {sku}: cannot read label.json: {e}"]}
+    managed = bool(_page(label))
+    if not os.path.isfile(index):
+        # No page yet for a Listed/Sold item is itself a problem; for
+        # others it's fine. Only flag Listed/Sold.
+        if str(label.get("state") or "").strip() in ("Listed", "Sold"):
+            return {"managed": managed, "failed": True,
+                    "lines": [f"  ! {sku}: no index.html (Listed/Sold item)"]}
+        return {"managed": managed, "failed": False, "lines": []}
+    drift = check_page(index, label)
+    if drift:
+        return {"managed": managed, "failed": True,
+                "lines": [f"DRIFT {sku}:"] + [f"    - {d}" for d in drift]}
+    return {"managed": managed, "failed": False, "lines": []}
+
+
+# ---------------------------------------------------------------------------
+# Build manifest (.build/pages.json): incremental --all / --all --check.
+#
+# Each entry holds a stat-only signature of the item's inputs (mtime_ns + size,
+# no reads) and a sha256 of their CONTENT. A matching signature means fresh
+# without opening anything; a changed signature with an unchanged digest (a
+# touch, a checkout) is also fresh. Results recorded against an entry ("build",
+# "check") are only reused while it stays fresh.
+# ---------------------------------------------------------------------------
+
+# Files whose CONTENT feeds the page (index.html: would_skip / check_page read it;
+# img/manifest.json: build_images derivatives behind the hero <picture>).
+_CONTENT_INPUTS = ("label.json", "status.json", "index.html", "img/manifest.json")
+# Paths whose PRESENCE changes what render_page / would_skip do.
+_PRESENCE_INPUTS = ("qr-buy.png", "cutout.png", "buy")
+
+
+def size_inputs(label: dict, item_dir) -> list:
+    """Images whose probed width/height the page carries (hero_picture, QR_IMG_ATTRS).
+
+    Named by the same helpers render_page uses, so resizing or recompressing
+    one (image_budget.py --fix) re-renders the page.
+    """
+    names = [main_image(label)[2:], qr_buy_file(label, item_dir)]
+    return list(dict.fromkeys(names))
+
+
+def _label_size_inputs(item_dir) -> list:
+    try:
+        label = catalog.read_label(item_dir)
+    except (OSError, ValueError):
+        return []
+    return size_inputs(label, item_dir) if isinstance(label, dict) else []
+
+
+def _manifest_path() -> str:
+    return os.path.join(ROOT, ".build", "pages.json")
+
+
+# Modules whose code shapes a rendered page: this file (template, fields, skip
+# rules), the template engine, and the <picture>/srcset helpers.
+GENERATOR_SOURCES = (__file__, page_template.__file__, build_images.__file__, imgprobe.__file__)
+_source_digest = None
+
+
+def _sources_digest() -> str:
+    global _source_digest
+    if _source_digest is None:
+        h = hashlib.sha256()
+        for path in GENERATOR_SOURCES:
+            with open(path, "rb") as fh:
+                h.update(fh.read() + b"\0")
+        _source_digest = h.hexdigest()
+    return _source_digest
+
+
+def _manifest_key() -> str:
+    """Global key: a template, generator version or generator source change
+    invalidates every entry."""
+    key = f"{GENERATOR_VERSION}\0{_sources_digest()}\0{_TEMPLATE}"
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+
+def _stat_sig(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_mtime_ns, st.st_size]
+
+
+def input_signature(item_dir, sizes=None) -> dict:
+    """Cheap stat-only fingerprint of an item's page inputs.
+
+    ``sizes`` are the size_inputs() names recorded with a manifest entry; when
+    omitted they are taken from label.json (its one read).
+    """
+    d = str(item_dir)
+    sig = {name: _stat_sig(os.path.join(d, name)) for name in _CONTENT_INPUTS}
+    for name in _PRESENCE_INPUTS:
+        sig[name] = os.path.exists(os.path.join(d, name))
+    for name in _label_size_inputs(d) if sizes is None else sizes:
+        sig[f"{name}:size"] = _stat_sig(os.path.join(d, name))
+    return sig
+
+
+def input_digest(item_dir, sizes=None) -> str:
+    """sha256 over the content of an item's page inputs + the presence flags."""
+    d = str(item_dir)
+    sizes = _label_size_inputs(d) if sizes is None else sizes
+    h = hashlib.sha256()
+    for name in _CONTENT_INPUTS:
+        h.update(name.encode("utf-8") + b"\0")
+        try:
+            with open(os.path.join(d, name), "rb") as fh:
+                h.update(fh.read())
+        except OSError:
+            h.update(b"\0missing")
+        h.update(b"\0")
+    for name in _PRESENCE_INPUTS:
+        h.update(f"{name}={os.path.exists(os.path.join(d, name))}\0".encode("utf-8"))
+    for name in sizes:
+        h.update(f"{name}:size={imgprobe.size(os.path.join(d, name))}\0".encode("utf-8"))
+    return h.hexdigest()
+
+
+def load_manifest() -> dict:
+    """sku -> entry from .build/pages.json; {} when absent, corrupt or stale-keyed."""
+    try:
+        with open(_manifest_path(), encoding="utf-8") as fh:
+            data = json.load(fh)
+    except (OSError, json.JSONDecodeError):
+        return {}
+    if not isinstance(data, dict) or data.get("key") != _manifest_key():
+        return {}
+    pages = data.get("pages")
+    return pages if isinstance(pages, dict) else {}
+
+
+def save_manifest(pages: dict) -> None:
+    """Write .build/pages.json atomically, and only when it changed (not tallied)."""
+    path = _manifest_path()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    data = {"key": _manifest_key(), "generator": GENERATOR_VERSION, "pages": pages}
+    output.write_text(path, json.dumps(data, indent=1, sort_keys=True) + "\n", tally=None)
+
+
+def fresh_entry(entry, item_dir):
+    """``entry`` if the item's inputs are unchanged since it was recorded, else None.
+
+    A touched-but-identical item gets its signature refreshed in place so the
+    next run is back on the no-read fast path.
+    """
+    if not isinstance(entry, dict):
+        return None
+    if isinstance(entry.get("sizes"), list):
+        sig = input_signature(item_dir, entry["sizes"])
+        if sig == entry.get("sig"):
+            return entry
+    sizes = _label_size_inputs(item_dir)
+    if entry.get("digest") == input_digest(item_dir, sizes):
+        entry.update(sig=input_signature(item_dir, sizes), sizes=sizes)
+        return entry
+    return None
+
+
+def new_entry(item_dir) -> dict:
+    """A fresh manifest entry for the item's CURRENT inputs (no results yet)."""
+    sizes = _label_size_inputs(item_dir)
+    return {"sig": input_signature(item_dir, sizes), "digest": input_digest(item_dir, sizes),
+            "sizes": sizes}
+
+
+# ---------------------------------------------------------------------------
+# Per-SKU jobs. Module-level (picklable) and ROOT-free — everything a worker
+# needs arrives as arguments — so they run the same in-process or in a pool.
+# ---------------------------------------------------------------------------
+
+def _check_job(sku: str, item_dir: str, label=None) -> dict:
+    """Drift-check one item; returns a manifest entry carrying the "check" result."""
+    entry = new_entry(item_dir)
+    with buildprof.phase("check", sku):
+        entry["check"] = check_item(sku, item_dir, label)
+    return entry
+
+
+def _build_job(sku: str, item_dir: str, force: bool, label=None) -> dict:
+    """Generate one page; returns ``{"lines", "rc", "entry"}`` (entry None on error).
+
+    ``label`` is the catalog's already-parsed label (None: read it here).
+    write_page's own progress output is captured so the parent can print every
+    SKU's lines in order regardless of which worker finished first; its output
+    outcome comes back too, since a worker's output.TALLY is not the parent's.
+    """
+    try:
+        if label is None:
+            with buildprof.phase("label_load", sku):
+                label = _load_label(item_dir)
+    except (OSError, ValueError) as e:  # incl. JSON / schema errors
+        return {"lines": [f"  ! {sku}: cannot read label.json: {e}"], "rc": 1,
+                "entry": None, "outcome": None}
+    buf = io.StringIO()
+    with contextlib.redirect_stdout(buf):
+        outcome = write_page(sku, item_dir, label, force=force)
+        if outcome == output.WRITTEN:
+            print(f"  wrote {os.path.join(item_dir, 'index.html')}")
+    # Recorded AFTER the write, so the new index.html is part of the entry.
+    entry = new_entry(item_dir)
+    entry["build"] = "skipped" if outcome == output.SKIPPED else "wrote"
+    return {"lines": buf.getvalue().splitlines(), "rc": 0, "entry": entry, "outcome": outcome}
+
+
+def run_jobs(fn, arg_tuples: list, jobs: int) -> list:
+    """``[fn(*args) for args in arg_tuples]``, over a process pool when worthwhile.
+
+    Results come back in input order. ``jobs <= 1`` or a batch smaller than
+    POOL_MIN_ITEMS runs in-process.
+    """
+    if jobs <= 1 or len(arg_tuples) < POOL_MIN_ITEMS:
+        return [fn(*args) for args in arg_tuples]
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        chunk = max(1, len(arg_tuples) // (jobs * 4))
+        return list(pool.map(fn, *zip(*arg_tuples), chunksize=chunk))
+
+
 def main() -> int:
     ap = argparse.ArgumentParser(
         description="Generate items/RG-XXXX/index.html from label.json (single source of truth)."
@@ -602,22 +971,66 @@ def main() -> int:
     ap.add_argument("--check", action="store_true",
                     help="report drift vs label.json; exit non-zero if any page drifts")
     ap.add_argument("--managed-only", action="store_true",
-                    help="with --all --check, restrict to generator-managed items "
-                         "(label.json has a truthy `page` block); skip legacy "
-                         "hand-curated pages so their expected differences don't fail")
+                    help="with --all, restrict to generator-managed items "
+                         "(label.json has a truthy `page` block): --check skips legacy "
+                         "hand-curated pages so their expected differences don't fail, "
+                         "and generating leaves them untouched")
     ap.add_argument("--force", action="store_true",
                     help="write even if the page is protected (living-test/sold/buy-redirect)")
     ap.add_argument("--dry-run", action="store_true",
                     help="print the first ~40 lines / a report; write nothing")
+    ap.add_argument("--full", action="store_true",
+                    help="with --all, ignore the .build/pages.json manifest and "
+                         "re-process every SKU (the manifest is still rewritten)")
+    ap.add_argument("--jobs", type=int, default=os.cpu_count() or 1, metavar="N",
+                    help="worker processes for rendering / checking (default: CPU count)")
+    ap.add_argument("--watch", action="store_true",
+                    help="stay running: regenerate a page + its gallery card whenever the "
+                         "item's label.json / status.json / images change (see watch.py)")
+    ap.add_argument("--poll", action="store_true",
+                    help="with --watch, poll file stats instead of using inotify")
+    gitscope.add_arguments(ap)
+    buildprof.add_arguments(ap)
     args = ap.parse_args()
 
-    if args.all:
-        skus = _all_skus()
-    elif args.sku:
-        skus = [args.sku]
-    else:
+    if args.watch:
+        import watch  # imports this module; only needed for --watch
+        return watch.run(poll=args.poll)
+    if not (args.all or args.sku):
         ap.error("provide a SKU or --all")
         return 2
+    if args.since and not args.all:
+        ap.error("--since narrows --all")
+    if args.profile is not None:
+        args.jobs = 1  # phases are recorded in this process
+    with buildprof.session("build_item_page", args):
+        return run(args)
+
+
+def run(args) -> int:
+    """main() after argument parsing: generate, --check or --dry-run."""
+    labels = {}  # sku -> pre-parsed label from the shared catalog (--all only)
+    scope = None  # --since: the changed SKUs (None: every item)
+    if args.all:
+        if args.since:
+            scope = gitscope.affected(args.since, ROOT)
+        with buildprof.phase("label_load"):
+            items = catalog.load(ROOT, only=scope)
+        skus = list(items)
+        if scope is not None:
+            print(f"--since {args.since}: {len(skus)} changed item(s)")
+        labels = {sku: it.label for sku, it in items.items() if it.error is None}
+    else:
+        skus = [args.sku]
+
+    # The manifest only drives --all runs that write or check; --force changes
+    # what a generate run produces, so it never reuses recorded results.
+    use_manifest = args.all and not args.dry_run
+    manifest = load_manifest() if use_manifest and not (args.full or args.force) else {}
+    pages = {}  # the manifest written back: only SKUs seen this run
+    if scope is not None and use_manifest:
+        pages = load_manifest()  # ...plus, on a --since run, everyone else's entries
+    unchanged = 0
 
     # --check mode: compare on-disk pages to label-derived values.
     if args.check:
@@ -625,71 +1038,72 @@ def main() -> int:
         # whose label.json carries a truthy `page` block), so legacy hand-curated
         # pages (no page block) don't false-fail the CI drift gate. It only
         # affects --all; a single-SKU --check still checks that SKU.
-        skipped_unmanaged = 0
-        if args.managed_only and args.all:
-            labels = {}
-            for sku in skus:
-                try:
-                    labels[sku] = _load_label(os.path.join(ROOT, sku))
-                except (OSError, json.JSONDecodeError) as e:
-                    print(f"  ! {sku}: cannot read label.json: {e}")
-                    labels[sku] = {}
-            managed = set(managed_skus(labels))
-            skipped_unmanaged = len(skus) - len(managed)
-            skus = [sku for sku in skus if sku in managed]
-
+        managed_only = args.managed_only and args.all
         any_drift = False
-        drifted = 0
+        checked = drifted = skipped_unmanaged = 0
+
+        # Reuse fresh recorded results; everything else is checked (in parallel).
+        entries = {}
         for sku in skus:
-            item_dir = os.path.join(ROOT, sku)
-            index = os.path.join(item_dir, "index.html")
-            try:
-                label = _load_label(item_dir)
-            except (OSError, json.JSONDecodeError) as e:
-                print(f"  ! {sku}: cannot read label.json: {e}")
-                any_drift = True
-                drifted += 1
-                continue
-            if not os.path.isfile(index):
-                # No page yet for a Listed/Sold item is itself a problem; for
-                # others it's fine. Only flag Listed/Sold.
-                if str(label.get("state") or "").strip() in ("Listed", "Sold"):
-                    print(f"  ! {sku}: no index.html (Listed/Sold item)")
-                    any_drift = True
-                    drifted += 1
+            entry = fresh_entry(manifest.get(sku), os.path.join(ROOT, sku))
+            if entry is not None and "check" in entry:
+                entries[sku] = entry
+        unchanged = len(entries)
+        stale = [sku for sku in skus if sku not in entries]
+        entries.update(zip(stale, run_jobs(
+            _check_job, [(sku, os.path.join(ROOT, sku), labels.get(sku)) for sku in stale],
+            args.jobs)))
+        if use_manifest:
+            pages.update(entries)
+
+        for sku in skus:
+            result = entries[sku]["check"]
+            if managed_only and not result["managed"]:
+                # An unreadable label is unmanaged: say why, but don't fail on it.
+                if result.get("label_error"):
+                    for line in result["lines"]:
+                        print(line)
+                skipped_unmanaged += 1
                 continue
-            drift = check_page(index, label)
-            if drift:
+            checked += 1
+            for line in result["lines"]:
+                print(line)
+            if result["failed"]:
                 any_drift = True
                 drifted += 1
-                print(f"DRIFT {sku}:")
-                for d in drift:
-                    print(f"    - {d}")
 
-        if args.managed_only and args.all:
+        if use_manifest:
+            save_manifest(pages)
+            if unchanged:
+                print(f"manifest: {unchanged} of {len(skus)} item(s) unchanged since "
+                      f"the last check (use --full to recheck everything)")
+        if managed_only:
             print(
-                f"managed pages checked: {len(skus)}, drifted: {drifted}, "
+                f"managed pages checked: {checked}, drifted: {drifted}, "
                 f"skipped (unmanaged): {skipped_unmanaged}"
             )
         if not any_drift:
-            if not (args.managed_only and args.all):
-                print(f"OK: {len(skus)} page(s) in sync with label.json.")
+            if not managed_only:
+                print(f"OK: {checked} page(s) in sync with label.json.")
             return 0
         return 1
 
-    # Generate (or dry-run) mode.
-    rc = 0
-    for sku in skus:
-        item_dir = os.path.join(ROOT, sku)
-        try:
-            label = _load_label(item_dir)
-        except (OSError, json.JSONDecodeError) as e:
-            print(f"  ! {sku}: cannot read label.json: {e}")
-            rc = 1
-            continue
-
-        if args.dry_run:
-            # Show what WOULD happen, write nothing.
+    # --all --managed-only leaves legacy hand-curated pages alone (an unreadable
+    # label stays in, so it is still reported).
+    if args.all and args.managed_only:
+        skus = [sku for sku in skus if sku not in labels or _page(labels[sku])]
+
+    # Dry-run mode: show what WOULD happen, write nothing.
+    if args.dry_run:
+        rc = 0
+        for sku in skus:
+            item_dir = os.path.join(ROOT, sku)
+            try:
+                label = _load_label(item_dir)
+            except (OSError, ValueError) as e:  # incl. JSON / schema errors
+                print(f"  ! {sku}: cannot read label.json: {e}")
+                rc = 1
+                continue
             if not args.force:
                 reason = would_skip(item_dir, label)
                 if reason:
@@ -700,13 +1114,42 @@ def main() -> int:
             for line in out.splitlines()[:40]:
                 print(line)
             print("=== (truncated; nothing written) ===")
-            continue
+        return rc
 
-        path = write_page(sku, item_dir, label, force=args.force)
-        if path:
-            print(f"  wrote {path}")
+    # Generate mode.
+    todo = []
+    for sku in skus:
+        entry = fresh_entry(manifest.get(sku), os.path.join(ROOT, sku)) if use_manifest else None
+        if entry is not None and "build" in entry:
+            pages[sku] = entry
+            unchanged += 1
+        else:
+            todo.append(sku)
+    results = run_jobs(
+        _build_job, [(sku, os.path.join(ROOT, sku), args.force, labels.get(sku)) for sku in todo],
+        args.jobs)
+    rc = 0
+    tally = output.Tally()
+    for sku, result in zip(todo, results):
+        for line in result["lines"]:
+            print(line)
+        rc = max(rc, result["rc"])
+        if result["outcome"]:
+            tally.add(result["outcome"])
+        if use_manifest and result["entry"] is not None:
+            pages[sku] = result["entry"]  # unreadable labels aren't recorded: retried next run
+    if use_manifest:
+        save_manifest(pages)
+        if unchanged:
+            print(f"manifest: {unchanged} of {len(skus)} item(s) unchanged, not regenerated "
+                  f"(use --full to rebuild everything)")
+    if tally.total():
+        print(f"pages: {tally.summary()}")
     return rc
 
 
 if __name__ == "__main__":
-    raise SystemExit(main())
+    try:
+        raise SystemExit(main())
+    finally:
+        imgprobe.flush()
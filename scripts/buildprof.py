@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""Per-phase, per-SKU build profiler shared by the page, gallery and CSV generators.
+
+The generators mark their phases inline:
+
+    with buildprof.phase("render", sku):
+        out = render_page(sku, label, item_dir)
+
+and get a ``--profile`` flag from ``add_arguments`` / ``session``:
+
+  build_item_page.py --all --profile            # JSON -> .build/profile-build_item_page.json
+  build_gallery.py --check --profile out.json   # ... or to a chosen path
+  build_item_page.py --all --profile --profile-dump cprofile     # + .build/profile-*.prof
+  build_item_page.py --all --profile --profile-dump tracemalloc  # + a tracemalloc snapshot
+
+Per phase and per (SKU, phase) the report records calls, wall time and the
+net bytes allocated (tracemalloc's traced-memory delta, so memory a phase
+frees again does not count). Phases nest (``derive.*`` runs inside
+``render``); a SKU's total is the sum of its outermost phases. A sorted text
+summary of the slowest phases and SKUs goes to stderr.
+
+Profiling runs in one process (the generators drop ``--jobs`` to 1) and traces
+allocations, so absolute times read higher than an unprofiled run; compare
+profiles with profiles. Without ``--profile``, ``phase()`` returns a shared
+no-op context manager.
+"""
+from __future__ import annotations
+
+import contextlib
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))  # items/
+
+DUMPS = ("cprofile", "tracemalloc")
+SUMMARY_ROWS = 10
+
+_NULL = contextlib.nullcontext()
+_ACTIVE = None  # the Recorder while a --profile session runs
+
+
+class Recorder:
+    """Accumulates (calls, seconds, net bytes) per phase and per (SKU, phase)."""
+
+    def __init__(self):
+        self.phases = {}  # name -> [calls, seconds, bytes]
+        self.skus = {}    # sku -> {name -> [calls, seconds, bytes]}
+        self.totals = {}  # sku -> seconds in outermost phases
+        self.depth = {}   # sku -> current nesting depth
+
+    @contextlib.contextmanager
+    def phase(self, name: str, sku=None):
+        depth = self.depth.get(sku, 0)
+        self.depth[sku] = depth + 1
+        mem = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            allocated = tracemalloc.get_traced_memory()[0] - mem
+            self.depth[sku] = depth
+            for row in (self.phases.setdefault(name, [0, 0.0, 0]),
+                        *([self.skus.setdefault(sku, {}).setdefault(name, [0, 0.0, 0])]
+                          if sku is not None else [])):
+                row[0] += 1
+                row[1] += elapsed
+                row[2] += allocated
+            if sku is not None and depth == 0:
+                self.totals[sku] = self.totals.get(sku, 0.0) + elapsed
+
+
+def phase(name: str, sku=None):
+    """Context manager timing ``name`` (for ``sku``) while profiling; a no-op otherwise."""
+    return _NULL if _ACTIVE is None else _ACTIVE.phase(name, sku)
+
+
+def _row(r) -> dict:
+    return {"calls": r[0], "seconds": round(r[1], 6), "net_bytes": r[2]}
+
+
+def report(rec: Recorder, tool: str, wall: float, peak: int) -> dict:
+    """The JSON-able profile of one run."""
+    return {
+        "tool": tool,
+        "argv": sys.argv[1:],
+        "wall_seconds": round(wall, 6),
+        "peak_traced_bytes": peak,
+        "phases": {name: _row(r) for name, r in sorted(rec.phases.items())},
+        "skus": {sku: {"seconds": round(rec.totals.get(sku, 0.0), 6),
+                       "phases": {name: _row(r) for name, r in sorted(phases.items())}}
+                 for sku, phases in sorted(rec.skus.items())},
+    }
+
+
+def summary(data: dict, rows: int = SUMMARY_ROWS) -> str:
+    """Text summary: the slowest phases, then the slowest SKUs with their top phase."""
+    lines = [f"profile: {data['tool']} {' '.join(data['argv'])}".rstrip(),
+             f"  wall {data['wall_seconds'] * 1000:.1f} ms, "
+             f"peak traced {data['peak_traced_bytes'] / 1048576:.1f} MB",
+             "  phase                         calls     total ms   net KB"]
+    by_time = sorted(data["phases"].items(), key=lambda kv: -kv[1]["seconds"])
+    for name, r in by_time[:rows]:
+        lines.append(f"  {name:<28} {r['calls']:>6} {r['seconds'] * 1000:>12.2f} "
+                     f"{r['net_bytes'] / 1024:>8.1f}")
+    skus = sorted(data["skus"].items(), key=lambda kv: -kv[1]["seconds"])
+    if skus:
+        lines.append(f"  slowest SKUs ({len(skus)} profiled)        ms   top phase")
+        for sku, s in skus[:rows]:
+            top = max(s["phases"].items(), key=lambda kv: kv[1]["seconds"])[0]
+            lines.append(f"  {sku:<28} {s['seconds'] * 1000:>12.2f}   {top}")
+    return "\n".join(lines)
+
+
+def add_arguments(ap) -> None:
+    """Add ``--profile [PATH]`` and ``--profile-dump {cprofile,tracemalloc}`` to a parser."""
+    ap.add_argument("--profile", nargs="?", const="", default=None, metavar="PATH",
+                    help="record per-SKU / per-phase wall time + allocations; write a JSON "
+                         "report (default .build/profile-<tool>.json) and print a summary")
+    ap.add_argument("--profile-dump", choices=DUMPS, default=None,
+                    help="with --profile, also dump a whole-run cProfile or tracemalloc snapshot")
+
+
+def _default_path(tool: str, ext: str) -> str:
+    return os.path.join(ROOT, ".build", f"profile-{tool}{ext}")
+
+
+@contextlib.contextmanager
+def session(tool: str, args):
+    """Profile the enclosed run when ``args.profile`` is set (else a no-op)."""
+    global _ACTIVE
+    if getattr(args, "profile", None) is None:
+        yield
+        return
+    rec = Recorder()
+    prof = None
+    if args.profile_dump == "cprofile":
+        import cProfile
+        prof = cProfile.Profile()
+    tracemalloc.start(25 if args.profile_dump == "tracemalloc" else 1)
+    _ACTIVE = rec
+    start = time.perf_counter()
+    if prof:
+        prof.enable()
+    try:
+        yield
+    finally:
+        if prof:
+            prof.disable()
+        wall = time.perf_counter() - start
+        _ACTIVE = None
+        peak = tracemalloc.get_traced_memory()[1]
+        snapshot = tracemalloc.take_snapshot() if args.profile_dump == "tracemalloc" else None
+        tracemalloc.stop()
+        data = report(rec, tool, wall, peak)
+        path = args.profile or _default_path(tool, ".json")
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as fh:
+            json.dump(data, fh, indent=1)
+            fh.write("\n")
+        print(summary(data), file=sys.stderr)
+        print(f"  report: {path}", file=sys.stderr)
+        if prof:
+            prof.dump_stats(_default_path(tool, ".prof"))
+            print(f"  cProfile: {_default_path(tool, '.prof')}", file=sys.stderr)
+        if snapshot:
+            snapshot.dump(_default_path(tool, ".tracemalloc"))
+            print(f"  tracemalloc: {_default_path(tool, '.tracemalloc')}", file=sys.stderr)
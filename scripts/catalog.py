@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""Shared catalog loader: every items/RG-XXXX/label.json (+ status.json), parsed once.
+
+build_item_page, build_gallery, labels/build_batch_csv and validate.py all
+need "every item's label"; this module is the one place that finds and parses
+them. ``load()`` returns ``sku -> Item`` and keeps an on-disk cache
+(``.build/catalog.pickle``) keyed per item by the (mtime_ns, size) of its
+label.json and status.json, so a warm start stats each item and skips JSON
+parsing for everything unchanged. Back-to-back tools in CI share one parse.
+
+Loading is LENIENT: an unreadable label, or one that fails the shared schema
+(labelschema.LABEL: not an object, wrong types, bad formats, unknown page keys),
+yields an Item with ``error`` set and an empty ``label``. Callers decide
+whether that is fatal (build_batch_csv) or a skip (build_gallery), but every
+tool rejects the same labels with the same JSON-pointer messages.
+
+  catalog.py --list      # one SKU per line
+  catalog.py --sold      # SKUs whose status.json says "sold"
+  catalog.py --refresh   # rebuild the cache from scratch
+"""
+from __future__ import annotations
+
+import argparse
+import glob
+import json
+import os
+import pickle
+from dataclasses import dataclass, field
+
+import labelschema
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))  # items/
+
+# Bump when the cached tuple layout or the parse rules (incl. the schema) change.
+CACHE_VERSION = 2
+
+
+@dataclass(frozen=True)
+class Item:
+    """One catalog item as loaded from its folder."""
+
+    sku: str
+    dir: str
+    label: dict = field(default_factory=dict)   # {} when label.json is unusable
+    status: dict = field(default_factory=dict)  # status.json, {} when absent/bad
+    error: str | None = None                    # why the label couldn't be used
+
+    @property
+    def state(self) -> str:
+        return str(self.label.get("state") or "").strip()
+
+    @property
+    def status_sold(self) -> bool:
+        """True when status.json marks the item sold (the archive lifecycle file)."""
+        return str(self.status.get("status") or "").strip().lower() == "sold"
+
+
+def discover(root=None, *, with_label: bool = True) -> list:
+    """Sorted RG-* folder names under ``root``; only those with a label.json by default."""
+    root = str(root or ROOT)
+    if with_label:
+        paths = glob.glob(os.path.join(root, "RG-*", "label.json"))
+        return sorted(os.path.basename(os.path.dirname(p)) for p in paths)
+    return sorted(os.path.basename(p) for p in glob.glob(os.path.join(root, "RG-*"))
+                  if os.path.isdir(p))
+
+
+def read_label(item_dir) -> dict:
+    """Parse ``item_dir/label.json``. Raises OSError / json.JSONDecodeError."""
+    with open(os.path.join(str(item_dir), "label.json"), encoding="utf-8") as fh:
+        return json.load(fh)
+
+
+def read_status(item_dir) -> dict:
+    """``item_dir/status.json`` as a dict; {} when absent or unreadable."""
+    p = os.path.join(str(item_dir), "status.json")
+    if not os.path.isfile(p):
+        return {}
+    try:
+        with open(p, encoding="utf-8") as fh:
+            data = json.load(fh)
+    except (OSError, json.JSONDecodeError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _stat_sig(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _parse(item_dir) -> tuple:
+    """(label, status, error) for one item folder — the cached payload."""
+    try:
+        label = read_label(item_dir)
+    except json.JSONDecodeError as e:
+        return {}, read_status(item_dir), f"Invalid JSON: {e}"
+    except OSError as e:
+        return {}, read_status(item_dir), str(e)
+    problems = labelschema.LABEL.errors(label)
+    if problems:
+        return {}, read_status(item_dir), labelschema.describe(problems)
+    return label, read_status(item_dir), None
+
+
+def cache_path(root=None) -> str:
+    return os.path.join(str(root or ROOT), ".build", "catalog.pickle")
+
+
+def _read_cache(path) -> dict:
+    try:
+        with open(path, "rb") as fh:
+            data = pickle.load(fh)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get("version") != CACHE_VERSION:
+        return {}
+    return data.get("items") or {}
+
+
+def _write_cache(path, entries: dict) -> None:
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as fh:
+            pickle.dump({"version": CACHE_VERSION, "items": entries}, fh,
+                        protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+    except OSError:
+        pass  # a read-only tree just runs uncached
+
+
+def load(root=None, *, use_cache: bool = True, only=None) -> dict:
+    """sku -> Item for every RG-*/label.json under ``root`` (sorted by SKU).
+
+    Items whose label.json / status.json (mtime_ns, size) match the cache are
+    served from it without opening the files; the rest are parsed and the
+    cache rewritten. ``use_cache=False`` neither reads nor writes it.
+
+    ``only`` (a set of SKUs) loads just those items that have a label.json,
+    without listing the catalog; cache entries for other items are kept.
+    """
+    root = str(root or ROOT)
+    path = cache_path(root)
+    cached = _read_cache(path) if use_cache else {}
+    if only is None:
+        skus = discover(root)
+        entries = {}
+    else:
+        skus = sorted(sku for sku in only
+                      if os.path.isfile(os.path.join(root, sku, "label.json")))
+        entries = dict(cached)
+    items = {}
+    dirty = False
+    for sku in skus:
+        item_dir = os.path.join(root, sku)
+        sig = (_stat_sig(os.path.join(item_dir, "label.json")),
+               _stat_sig(os.path.join(item_dir, "status.json")))
+        hit = cached.get(sku)
+        if hit is not None and hit[0] == sig:
+            payload = hit[1]
+        else:
+            payload = _parse(item_dir)
+            dirty = True
+        entries[sku] = (sig, payload)
+        label, status, error = payload
+        items[sku] = Item(sku=sku, dir=item_dir, label=label, status=status, error=error)
+    if use_cache and (dirty or len(entries) != len(cached)):
+        _write_cache(path, entries)
+    return items
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="List catalog items (shared, cached label loader).")
+    g = ap.add_mutually_exclusive_group()
+    g.add_argument("--list", action="store_true", help="print every SKU with a label.json (default)")
+    g.add_argument("--sold", action="store_true", help="print SKUs whose status.json says sold")
+    ap.add_argument("--root", default=ROOT, help="items/ root containing RG-* folders")
+    ap.add_argument("--refresh", action="store_true", help="ignore and rebuild the cache")
+    args = ap.parse_args()
+
+    if args.refresh:
+        try:
+            os.remove(cache_path(args.root))
+        except OSError:
+            pass
+    items = load(args.root)
+    for sku, item in items.items():
+        if args.sold and not item.status_sold:
+            continue
+        print(sku)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""Which items a change touches: scope the checkers to ``git diff`` since a revision.
+
+  gitscope.py origin/main             # SKUs changed since the merge base with main
+  gitscope.py "$BASE"                 # one SKU per line (every SKU if a shared input changed)
+  build_gallery.py --check --since origin/main
+  build_item_page.py --all --check --managed-only --since origin/main
+
+The changed files are everything between the merge base of REV and HEAD plus
+the working tree (uncommitted and untracked files), so a local run before
+committing sees the same scope CI will. A path under ``RG-XXXX/`` puts that
+SKU in scope (deleted and renamed folders included). A path in SHARED — the
+gallery page and feed, the card template, the validators and the generator
+scripts — can change every item's output, so it widens the scope to the whole
+catalog; so does a REV git can't resolve (a new branch's all-zero "before"
+sha, a shallow clone), with a note on stderr. Gate time then follows the size
+of the change rather than the size of the catalog.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+
+import catalog
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))  # items/
+
+# Changed paths (relative to items/) that put every SKU in scope: a file, or a
+# directory prefix ending in "/".
+SHARED = (
+    "index.html",
+    "items.json",
+    "template/",
+    "validate-item.sh",
+    "audit-items.sh",
+    "scripts/build_gallery.py",
+    "scripts/build_images.py",
+    "scripts/build_item_page.py",
+    "scripts/catalog.py",
+    "scripts/gitscope.py",
+    "scripts/imgprobe.py",
+    "scripts/labelschema.py",
+    "scripts/output.py",
+    "scripts/page_template.py",
+    "scripts/validate.py",
+)
+
+_SKU_PATH = re.compile(r"^(RG-\d{4,})/")
+
+
+def _git(root, *argv) -> str:
+    """stdout of ``git -C root argv``; raises CalledProcessError / OSError."""
+    return subprocess.run(["git", "-C", str(root), *argv], check=True,
+                          capture_output=True, text=True).stdout
+
+
+def changed_files(since: str, root=None) -> list | None:
+    """Paths changed since the merge base of ``since`` and HEAD, working tree included.
+
+    None when git can't answer (unknown revision, not a repository).
+    """
+    root = str(root or ROOT)
+    if not since.strip("0"):
+        return None  # GitHub's "before" sha for a branch's first push
+    try:
+        base = _git(root, "merge-base", since, "HEAD").strip()
+        diff = _git(root, "diff", "--name-only", "--no-renames", "--relative", base)
+        untracked = _git(root, "ls-files", "--others", "--exclude-standard")
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return sorted(set(diff.splitlines()) | set(untracked.splitlines()))
+
+
+def shared_path(path: str, shared=SHARED) -> bool:
+    return any(path == s or (s.endswith("/") and path.startswith(s)) for s in shared)
+
+
+def affected(since: str, root=None, shared=SHARED) -> set | None:
+    """SKUs changed since ``since``, or None when every item is in scope."""
+    paths = changed_files(since, root)
+    if paths is None:
+        print(f"gitscope: can't diff against {since!r}; checking every item", file=sys.stderr)
+        return None
+    widened = [p for p in paths if shared_path(p, shared)]
+    if widened:
+        more = f" (+{len(widened) - 1} more)" if len(widened) > 1 else ""
+        print(f"gitscope: shared input changed: {widened[0]}{more}; checking every item",
+              file=sys.stderr)
+        return None
+    return {m.group(1) for m in map(_SKU_PATH.match, paths) if m}
+
+
+def add_arguments(ap: argparse.ArgumentParser, *flags: str, shared: bool = True) -> None:
+    """Add the shared ``--since REV`` option (under other names via ``flags``; dest stays since)."""
+    note = "; shared inputs widen to every item" if shared else ""
+    ap.add_argument(*(flags or ("--since",)), dest="since", metavar="REV",
+                    help="only items changed since the merge base of REV and HEAD "
+                         f"(git diff + working tree){note}")
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="List the SKUs a change touches since a git revision.")
+    ap.add_argument("since", metavar="REV", help="base revision, e.g. origin/main or a PR base sha")
+    ap.add_argument("--root", default=ROOT, help="items/ root (a git work tree)")
+    args = ap.parse_args()
+    skus = affected(args.since, args.root)
+    if skus is None:
+        skus = catalog.discover(args.root, with_label=False)
+    for sku in sorted(skus):
+        print(sku)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+"""Image byte + pixel budgets for item photos, with an opt-in recompressor.
+
+Every PNG/JPEG directly under an RG-* folder is matched to a role by file name
+(image-budget.json at the repo root: ``pattern`` globs, first match wins) and
+checked against that role's ``max_bytes`` (deployed weight) and
+``max_megapixels`` (decoded size — what a phone holds in memory, ~4 bytes per
+pixel). Sizes come from file headers (imgprobe), so a check reads no pixels.
+
+  image_budget.py                       # every item: list offenders, exit 1 if any
+  image_budget.py RG-0055 RG-0009/hero.png   # just these items / files
+  image_budget.py --annotate ...        # also print GitHub ::error annotations
+  image_budget.py --fix                 # recompress every image (needs Pillow)
+  image_budget.py --fix --jobs 8        # worker processes (default: CPU count)
+
+``--fix`` rewrites an image in place (same name and format) when that saves at
+least MIN_SAVING or is needed to meet its budget:
+
+* metadata is dropped (ICC profile kept) and EXIF orientation baked in;
+* JPEG is re-encoded progressive + optimized with the source's own
+  quantization tables and chroma subsampling (no quality step down);
+* PNG is re-encoded optimized, as an exact palette image when it has at most
+  256 colors and no alpha (flat cards, QR codes);
+* an image over its megapixel budget is downsized to it, and one still over
+  its byte budget is stepped down in size until it fits.
+
+Results are cached in .build/budget.json by the output's sha256 and the
+budget it was fixed for, so a re-run only opens new or edited images. The run
+ends with the total bytes saved.
+"""
+from __future__ import annotations
+
+import argparse
+import fnmatch
+import glob
+import json
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import build_images
+import imgprobe
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))  # items/
+
+# Bump when the encoder settings change so every image is re-examined.
+FIX_VERSION = 1
+IMAGE_EXTS = imgprobe.IMAGE_EXTS
+# Downsizing to meet a byte budget: shrink steps, each aiming a little under.
+SHRINK_TRIES = 6
+SHRINK_MARGIN = 0.95
+# A within-budget image is only rewritten for at least this fraction saved, so
+# re-running on its own output never chips away at a JPEG a generation at a time.
+MIN_SAVING = 0.02
+
+
+def config_path() -> str:
+    return os.path.join(ROOT, "image-budget.json")
+
+
+def load_config(path=None) -> list:
+    """[(role, pattern, max_bytes, max_megapixels)] in match order."""
+    with open(path or config_path(), encoding="utf-8") as fh:
+        roles = json.load(fh)["roles"]
+    return [(role, spec["pattern"], int(spec["max_bytes"]), float(spec["max_megapixels"]))
+            for role, spec in roles.items()]
+
+
+def role_for(name: str, config: list):
+    """The first config row whose pattern matches ``name`` (case-insensitive), or None."""
+    name = name.lower()
+    for row in config:
+        if fnmatch.fnmatch(name, row[1].lower()):
+            return row
+    return None
+
+
+def collect(targets=()) -> list:
+    """Image paths for ``targets`` (RG-* folders or files); every item when empty.
+
+    Relative targets are resolved against ROOT, and only against the current
+    directory when ROOT has no such path.
+    """
+    if not targets:
+        targets = sorted(glob.glob(os.path.join(ROOT, "RG-*")))
+    out = []
+    for t in targets:
+        if not os.path.isabs(t):
+            rooted = os.path.join(ROOT, t)
+            t = rooted if os.path.exists(rooted) or not os.path.exists(t) else os.path.abspath(t)
+        if os.path.isdir(t):
+            out.extend(sorted(os.path.join(t, n) for n in os.listdir(t)
+                              if n.lower().endswith(IMAGE_EXTS)))
+        elif os.path.isfile(t) and t.lower().endswith(IMAGE_EXTS):
+            out.append(t)
+    return out
+
+
+def check(path: str, config: list) -> list:
+    """Budget violations for one image, as human-readable strings ([] if within budget)."""
+    row = role_for(os.path.basename(path), config)
+    if row is None:
+        return []
+    role, _, max_bytes, max_mp = row
+    problems = []
+    size = os.path.getsize(path)
+    if size > max_bytes:
+        problems.append(f"{size / 1048576:.2f} MB > {max_bytes / 1048576:.2f} MB ({role})")
+    dims = imgprobe.size(path)
+    if dims is None:
+        problems.append("unreadable image header")
+    elif dims[0] * dims[1] > max_mp * 1e6:
+        problems.append(f"{dims[0]}x{dims[1]} = {dims[0] * dims[1] / 1e6:.1f} MP > "
+                        f"{max_mp:g} MP ({role})")
+    return problems
+
+
+# ---------------------------------------------------------------------------
+# --fix: recompression (Pillow), one image per worker job.
+# ---------------------------------------------------------------------------
+
+def _cache_path() -> str:
+    return os.path.join(ROOT, ".build", "budget.json")
+
+
+def load_cache() -> dict:
+    try:
+        with open(_cache_path(), encoding="utf-8") as fh:
+            data = json.load(fh)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get("version") != FIX_VERSION:
+        return {}
+    return data.get("done", {})
+
+
+def save_cache(done: dict) -> None:
+    path = _cache_path()
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump({"version": FIX_VERSION, "done": done}, fh, sort_keys=True)
+        os.replace(tmp, path)
+    except OSError:
+        pass  # a read-only tree just re-examines next time
+
+
+def _encode(im, fmt: str, opts: dict) -> bytes:
+    import io
+    buf = io.BytesIO()
+    im.save(buf, format=fmt, **opts)
+    return buf.getvalue()
+
+
+def _exact_palette(im, Image):
+    """``im`` as a P image with the same pixels when it has <= 256 colors and no alpha, else None."""
+    if im.mode not in ("RGB", "L"):
+        return None
+    colors = im.getcolors(256)
+    if colors is None:
+        return None
+    rgb = im.convert("RGB")
+    palette = [c for _, c in colors] if im.mode == "RGB" else [(c, c, c) for _, c in colors]
+    pal_img = Image.new("P", (1, 1))
+    pal_img.putpalette([v for c in palette for v in c] + [0] * (768 - 3 * len(palette)))
+    out = rgb.quantize(palette=pal_img, dither=Image.Dither.NONE)
+    return out if out.convert("RGB").tobytes() == rgb.tobytes() else None
+
+
+def fix_job(path: str, max_bytes: int, max_mp: float) -> dict:
+    """Recompress ``path`` in place when smaller or needed for its budget; returns a report row.
+
+    Top-level and picklable for the process pool. The file keeps its name and
+    format; nothing is written unless the result saves at least MIN_SAVING or
+    the original breaks its budget.
+    """
+    Image, ImageOps = build_images.require_pillow()
+    from PIL import JpegImagePlugin
+
+    before = os.path.getsize(path)
+    with Image.open(path) as src:
+        fmt = "JPEG" if src.format == "MPO" else src.format  # iPhone JPEGs open as MPO
+        if fmt not in ("JPEG", "PNG"):
+            return {"path": path, "before": before, "after": before, "action": "skipped"}
+        icc = src.info.get("icc_profile")
+        opts = {"optimize": True}
+        if icc:
+            opts["icc_profile"] = icc
+        if fmt == "JPEG":
+            opts.update(progressive=True, qtables=src.quantization)
+            sampling = JpegImagePlugin.get_sampling(src)
+            if sampling >= 0:
+                opts["subsampling"] = sampling
+        elif src.mode == "P" and "transparency" in src.info:
+            opts["transparency"] = src.info["transparency"]
+        rotated = src.getexif().get(0x0112, 1) != 1
+        im = ImageOps.exif_transpose(src)
+        im.load()
+
+    actions = ["rotated"] if rotated else []
+    over = before > max_bytes or im.width * im.height > max_mp * 1e6
+    if im.width * im.height > max_mp * 1e6:
+        scale = math.sqrt(max_mp * 1e6 / (im.width * im.height))
+        im = im.resize((max(1, int(im.width * scale)), max(1, int(im.height * scale))), Image.LANCZOS)
+        actions.append(f"resized to {im.width}x{im.height}")
+    if fmt == "PNG":
+        pal = _exact_palette(im, Image)
+        if pal is not None:
+            im = pal
+            opts.pop("transparency", None)
+            actions.append("palette")
+    data = _encode(im, fmt, opts)
+    for _ in range(SHRINK_TRIES):
+        if len(data) <= max_bytes:
+            break
+        scale = math.sqrt(max_bytes / len(data)) * SHRINK_MARGIN
+        im = im.resize((max(1, int(im.width * scale)), max(1, int(im.height * scale))), Image.LANCZOS)
+        data = _encode(im, fmt, opts)
+        actions = [a for a in actions if not a.startswith("resized")] + [
+            f"resized to {im.width}x{im.height}"]
+
+    if over or len(data) <= before * (1 - MIN_SAVING):
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as fh:
+            fh.write(data)
+        os.replace(tmp, path)
+        return {"path": path, "before": before, "after": len(data),
+                "action": ", ".join(["recompressed"] + actions)}
+    return {"path": path, "before": before, "after": before, "action": "already optimal"}
+
+
+def _job(args):
+    return fix_job(*args)
+
+
+def _run(jobs_list, jobs: int) -> list:
+    if jobs <= 1 or len(jobs_list) <= 1:
+        return [_job(a) for a in jobs_list]
+    with ProcessPoolExecutor(max_workers=min(jobs, len(jobs_list))) as pool:
+        return list(pool.map(_job, jobs_list))
+
+
+def _done_key(digest: str, max_bytes: int, max_mp: float) -> str:
+    """Cache key: identical bytes fixed for the same budget never need another pass."""
+    return f"{digest}:{max_bytes}:{max_mp:g}"
+
+
+def fix(paths: list, config: list, jobs: int) -> list:
+    """Run fix_job over every path not already recorded as done; returns the report rows."""
+    hashes = build_images.load_hash_cache()
+    done = load_cache()
+    work = []
+    for path in paths:
+        row = role_for(os.path.basename(path), config)
+        if row is None:
+            continue
+        digest = build_images.file_sha256(path, hashes)
+        if _done_key(digest, row[2], row[3]) in done:
+            continue
+        work.append((path, row[2], row[3]))
+    if work:
+        build_images.require_pillow()  # fail before spawning workers
+    results = _run(work, jobs)
+    for (path, max_bytes, max_mp), r in zip(work, results):
+        if r["action"] != "skipped":
+            done[_done_key(build_images.file_sha256(path, hashes), max_bytes, max_mp)] = r["action"]
+    build_images.save_hash_cache(hashes)
+    save_cache(done)
+    return results
+
+
+def _rel(path: str) -> str:
+    return os.path.relpath(path, ROOT)
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Check (and optionally fix) image byte/pixel budgets.")
+    ap.add_argument("targets", nargs="*", help="RG-* folders or image files (default: every item)")
+    ap.add_argument("--config", default=None, help="budget file (default: image-budget.json)")
+    ap.add_argument("--fix", action="store_true", help="recompress images in place (needs Pillow)")
+    ap.add_argument("--annotate", action="store_true",
+                    help="print GitHub ::error annotations for offenders")
+    ap.add_argument("--jobs", type=int, default=os.cpu_count() or 1,
+                    help="worker processes for --fix (default: CPU count)")
+    args = ap.parse_args()
+
+    config = load_config(args.config)
+    paths = collect(args.targets)
+
+    if args.fix:
+        results = fix(paths, config, args.jobs)
+        changed = [r for r in results if r["after"] != r["before"]]
+        for r in changed:
+            print(f"  ~ {_rel(r['path'])}: {r['before'] / 1024:.0f} KB -> "
+                  f"{r['after'] / 1024:.0f} KB ({r['action']})")
+        saved = sum(r["before"] - r["after"] for r in results)
+        print(f"Recompressed {len(changed)} of {len(results)} examined image(s) "
+              f"({len(paths) - len(results)} cached); saved {saved / 1048576:.2f} MB.")
+
+    offenders = [(p, problems) for p in paths for problems in [check(p, config)] if problems]
+    if not offenders:
+        print(f"OK: {len(paths)} image(s) within budget.")
+        return 0
+    print(f"FAIL: {len(offenders)} of {len(paths)} image(s) over budget:")
+    for path, problems in offenders:
+        print(f"  - {_rel(path)}: {'; '.join(problems)}")
+        if args.annotate:
+            print(f"::error file={_rel(path)}::{_rel(path)} over image budget: {'; '.join(problems)}")
+    if not args.fix:
+        print("\nRun: python3 scripts/image_budget.py --fix" + "".join(f" {t}" for t in args.targets))
+    return 1
+
+
+if __name__ == "__main__":
+    try:
+        raise SystemExit(main())
+    finally:
+        imgprobe.flush()
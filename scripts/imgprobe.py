@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""Header-only image probe: pixel size + EXIF orientation of PNG / JPEG files.
+
+The generators need each image's intrinsic size to emit ``width``/``height``
+(so pages don't reflow as images arrive) but must not import Pillow or decode
+pixels to get it. This reads only the container headers:
+
+* PNG  — the IHDR chunk right after the signature (first 24 bytes), then the
+  chunk headers up to IDAT, seeking past payloads, for an ``eXIf`` chunk.
+* JPEG — markers up to the first SOFn frame header; an APP1 ``Exif`` segment
+  on the way supplies the orientation tag (0x0112).
+
+``size(path)`` is the DISPLAY size: orientations 5–8 (rotated 90°) swap width
+and height, matching what the browser shows. Results are cached per file in
+.build/probe.json, keyed by (mtime_ns, size) like the other build caches, so a
+warm run is one stat per image.
+
+  imgprobe.py RG-0055/cutout.png ...   # print WxH (+ orientation) per file
+  imgprobe.py --all                    # every image in every RG-* folder, timed
+"""
+from __future__ import annotations
+
+import argparse
+import glob
+import json
+import os
+import struct
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))  # items/
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+# SOF0-3, 5-7, 9-11, 13-15 carry the frame size; C4 (DHT), C8 (JPG), CC (DAC) don't.
+_SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+# Markers with no length field.
+_STANDALONE = {0x01, *range(0xD0, 0xD8)}
+IMAGE_EXTS = (".png", ".jpg", ".jpeg")
+
+
+def _exif_orientation(tiff: bytes) -> int:
+    """Orientation (1-8) from a TIFF-structured EXIF block; 1 if absent."""
+    if len(tiff) < 8 or tiff[:2] not in (b"II", b"MM"):
+        return 1
+    end = "<" if tiff[:2] == b"II" else ">"
+    (ifd,) = struct.unpack(end + "I", tiff[4:8])
+    if ifd + 2 > len(tiff):
+        return 1
+    (count,) = struct.unpack(end + "H", tiff[ifd:ifd + 2])
+    for i in range(count):
+        at = ifd + 2 + 12 * i
+        if at + 12 > len(tiff):
+            break
+        tag, typ, _, value = struct.unpack(end + "HHI4s", tiff[at:at + 12])
+        if tag == 0x0112 and typ == 3:  # SHORT, left-justified in the value field
+            (orientation,) = struct.unpack(end + "H", value[:2])
+            return orientation if 1 <= orientation <= 8 else 1
+    return 1
+
+
+def _probe_jpeg(fh):
+    orientation = 1
+    while True:
+        b = fh.read(1)
+        if not b:
+            return None
+        if b != b"\xff":
+            continue
+        marker = fh.read(1)
+        while marker == b"\xff":  # fill bytes
+            marker = fh.read(1)
+        if not marker:
+            return None
+        m = marker[0]
+        if m in _STANDALONE or m == 0xD8:
+            continue
+        if m in (0xD9, 0xDA):  # EOI / start of scan: no frame header before it
+            return None
+        raw = fh.read(2)
+        if len(raw) < 2:
+            return None
+        (length,) = struct.unpack(">H", raw)
+        if m in _SOF_MARKERS:
+            data = fh.read(5)
+            if len(data) < 5:
+                return None
+            height, width = struct.unpack(">xHH", data)
+            return width, height, orientation
+        if m == 0xE1 and orientation == 1:
+            data = fh.read(length - 2)
+            if data.startswith(b"Exif\0\0"):
+                orientation = _exif_orientation(data[6:])
+            continue
+        fh.seek(length - 2, os.SEEK_CUR)
+
+
+def _png_orientation(fh) -> int:
+    """Orientation from an eXIf chunk; chunks are walked (seeking) up to IDAT."""
+    fh.seek(8)
+    while True:
+        head = fh.read(8)
+        if len(head) < 8:
+            return 1
+        length, kind = struct.unpack(">I4s", head)
+        if kind == b"eXIf":
+            return _exif_orientation(fh.read(length))
+        if kind in (b"IDAT", b"IEND"):  # eXIf must precede the image data
+            return 1
+        fh.seek(length + 4, os.SEEK_CUR)  # payload + CRC
+
+
+def probe(path):
+    """(width, height, orientation) as stored in the file, or None if not PNG/JPEG."""
+    try:
+        with open(path, "rb") as fh:
+            head = fh.read(24)
+            if head.startswith(PNG_SIGNATURE) and head[12:16] == b"IHDR":
+                width, height = struct.unpack(">II", head[16:24])
+                return width, height, _png_orientation(fh)
+            if head.startswith(b"\xff\xd8"):
+                fh.seek(2)
+                return _probe_jpeg(fh)
+    except (OSError, struct.error):
+        return None
+    return None
+
+
+# ---------------------------------------------------------------------------
+# Cached display-size lookup (what the generators call).
+# ---------------------------------------------------------------------------
+
+_CACHE: dict | None = None
+_DIRTY = False
+
+
+def cache_path() -> str:
+    return os.path.join(ROOT, ".build", "probe.json")
+
+
+def _cache() -> dict:
+    global _CACHE
+    if _CACHE is None:
+        try:
+            with open(cache_path(), encoding="utf-8") as fh:
+                data = json.load(fh)
+        except (OSError, ValueError):
+            data = {}
+        _CACHE = data if isinstance(data, dict) else {}
+    return _CACHE
+
+
+def flush() -> None:
+    """Persist new probe results to .build/probe.json (a no-op when nothing changed)."""
+    global _DIRTY
+    if not _DIRTY:
+        return
+    path = cache_path()
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump(_CACHE, fh, sort_keys=True)
+        os.replace(tmp, path)
+    except OSError:
+        pass  # a read-only tree just re-probes next time
+    _DIRTY = False
+
+
+def info(path):
+    """Cached ``probe(path)``; None for a missing or unrecognized file."""
+    global _DIRTY
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    key = os.path.abspath(str(path))
+    cache = _cache()
+    hit = cache.get(key)
+    if hit and hit[0] == st.st_mtime_ns and hit[1] == st.st_size:
+        return tuple(hit[2]) if hit[2] else None
+    result = probe(path)
+    cache[key] = [st.st_mtime_ns, st.st_size, list(result) if result else None]
+    _DIRTY = True
+    return result
+
+
+def size(path):
+    """(width, height) as displayed (EXIF rotation applied), or None."""
+    result = info(path)
+    if result is None:
+        return None
+    width, height, orientation = result
+    return (height, width) if orientation >= 5 else (width, height)
+
+
+def fit(dims, box):
+    """``dims`` scaled down (never up) to fit inside ``box``, as whole pixels."""
+    width, height = dims
+    scale = min(1.0, box[0] / width, box[1] / height)
+    return max(1, round(width * scale)), max(1, round(height * scale))
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Print image sizes from file headers only.")
+    ap.add_argument("paths", nargs="*", help="image files")
+    ap.add_argument("--all", action="store_true", help="every PNG/JPEG in every RG-* folder")
+    args = ap.parse_args()
+
+    paths = list(args.paths)
+    if args.all:
+        paths += sorted(p for p in glob.glob(os.path.join(ROOT, "RG-*", "*"))
+                        if p.lower().endswith(IMAGE_EXTS))
+    start = time.perf_counter()
+    rows = [(p, info(p)) for p in paths]
+    elapsed = time.perf_counter() - start
+    flush()
+    for p, result in rows:
+        if result is None:
+            print(f"{p}: not a PNG/JPEG")
+        else:
+            w, h, o = result
+            print(f"{p}: {w}x{h}" + (f" (orientation {o})" if o != 1 else ""))
+    print(f"probed {len(paths)} file(s) in {elapsed * 1000:.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -7,22 +7,23 @@ from __future__ import annotations
 
 import argparse
 import csv
+import io
 import json
 import re
+import sys
 from dataclasses import dataclass
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 
-SKU_RE = re.compile(r"^RG-\d{4}$")
-REQUIRED_FIELDS = (
-    "sku",
-    "product_name",
-    "attributes",
-    "price",
-    "condition",
-    "condition_notes",
-    "qr_code_url",
-)
+import buildprof  # noqa: E402
+import catalog  # noqa: E402
+import labelschema  # noqa: E402
+import output  # noqa: E402
+
+
+SKU_RE = re.compile(r"^RG-\d{4,}$")
+REQUIRED_FIELDS = labelschema.PRINT_FIELDS
 CSV_COLUMNS = (
     "Product Name",
     "Attributes",
@@ -85,15 +86,12 @@ def parse_args() -> argparse.Namespace:
         action="store_true",
         help="Skip missing label.json files instead of failing.",
     )
+    buildprof.add_arguments(parser)
     return parser.parse_args()
 
 
 def discover_skus(root: Path) -> list[str]:
-    return sorted(
-        entry.name
-        for entry in root.iterdir()
-        if entry.is_dir() and SKU_RE.match(entry.name)
-    )
+    return [sku for sku in catalog.discover(root, with_label=False) if SKU_RE.match(sku)]
 
 
 def as_nonempty_str(payload: dict[str, object], field: str, *, allow_empty: bool = False) -> str:
@@ -119,32 +117,22 @@ def load_label(label_path: Path, expected_sku: str) -> LabelRecord:
         payload = json.loads(label_path.read_text(encoding="utf-8"))
     except json.JSONDecodeError as exc:
         raise LabelError(f"Invalid JSON: {exc}") from exc
+    return validate_label(payload, expected_sku)
 
-    if not isinstance(payload, dict):
-        raise LabelError("Root JSON value must be an object.")
 
-    missing = [field for field in REQUIRED_FIELDS if field not in payload]
-    if missing:
-        raise LabelError(f"Missing required field(s): {', '.join(missing)}.")
-
-    sku = as_nonempty_str(payload, "sku")
-    if sku != expected_sku:
-        raise LabelError(f"Field 'sku' ({sku}) does not match folder ({expected_sku}).")
-    if not SKU_RE.match(sku):
-        raise LabelError(f"Field 'sku' is invalid: {sku}.")
-
-    qr_code_url = as_nonempty_str(payload, "qr_code_url")
-    if not qr_code_url.startswith("http://") and not qr_code_url.startswith("https://"):
-        raise LabelError("Field 'qr_code_url' must be an absolute URL.")
+def validate_label(payload: object, expected_sku: str) -> LabelRecord:
+    problems = labelschema.PRINT_LABEL.errors(payload, expected_sku)
+    if problems:
+        raise LabelError(labelschema.describe(problems))
 
     return LabelRecord(
-        sku=sku,
+        sku=as_nonempty_str(payload, "sku"),
         product_name=as_nonempty_str(payload, "product_name"),
         attributes=as_nonempty_str(payload, "attributes"),
         price=normalize_price(as_nonempty_str(payload, "price")),
         condition=as_nonempty_str(payload, "condition"),
         condition_notes=as_nonempty_str(payload, "condition_notes", allow_empty=True),
-        qr_code_url=qr_code_url,
+        qr_code_url=as_nonempty_str(payload, "qr_code_url"),
     )
 
 
@@ -154,6 +142,11 @@ def sku_sort_key(sku: str) -> tuple[str, int]:
 
 def main() -> None:
     args = parse_args()
+    with buildprof.session("build_batch_csv", args):
+        build(args)
+
+
+def build(args: argparse.Namespace) -> None:
     root = Path(args.root).resolve()
     output_path = Path(args.output).resolve()
 
@@ -164,32 +157,42 @@ def main() -> None:
 
     records: list[LabelRecord] = []
     skipped: list[str] = []
+    with buildprof.phase("label_load"):
+        items = catalog.load(root)
+    with buildprof.phase("discover"):
+        skus = discover_skus(root)
 
-    for sku in discover_skus(root):
+    for sku in skus:
         if selected and sku not in selected:
             continue
         label_path = root / sku / "label.json"
-        if not label_path.exists():
+        item = items.get(sku)
+        if item is None:
             if args.allow_missing:
                 skipped.append(sku)
                 continue
             raise SystemExit(f"Missing required label file: {label_path}")
 
         try:
-            records.append(load_label(label_path, sku))
+            if item.error is not None:
+                raise LabelError(item.error)
+            with buildprof.phase("validate", sku):
+                records.append(validate_label(item.label, sku))
         except LabelError as exc:
             raise SystemExit(f"{label_path}: {exc}") from exc
 
     records.sort(key=lambda row: sku_sort_key(row.sku))
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
-    with output_path.open("w", newline="", encoding="utf-8") as handle:
-        writer = csv.DictWriter(handle, fieldnames=list(CSV_COLUMNS))
-        writer.writeheader()
-        for record in records:
-            writer.writerow(record.to_csv_row())
+    buffer = io.StringIO(newline="")
+    writer = csv.DictWriter(buffer, fieldnames=list(CSV_COLUMNS))
+    writer.writeheader()
+    for record in records:
+        writer.writerow(record.to_csv_row())
+    with buildprof.phase("write"):
+        outcome = output.write_text(str(output_path), buffer.getvalue())
 
-    print(f"Wrote {output_path}")
+    print(f"{'Wrote' if outcome == output.WRITTEN else 'Unchanged'} {output_path}")
     print(f"Records: {len(records)}")
     if skipped:
         print(f"Skipped missing labels ({len(skipped)}): {', '.join(skipped)}")
@@ -0,0 +1,409 @@
+#!/usr/bin/env python3
+"""The label.json schema, compiled once into validator closures.
+
+Every loader checks a label against the same declarative SCHEMA, so a bad
+label fails the same way everywhere — the catalog (and with it the gallery,
+the page generator, preview and watch), build_batch_csv and validate.py:
+
+    problems = labelschema.LABEL.errors(label, sku="RG-0055")   # [] when valid
+    label = labelschema.LABEL.check(label, sku)                 # or raise LabelSchemaError
+
+Each problem carries a JSON pointer (RFC 6901) to the offending value:
+``/channels/square/price: expected string, got number``. Every problem is
+reported, not just the first.
+
+SCHEMA describes the fields the scripts read: the print-label fields, ``page``,
+``channels.*``, ``qr_codes``, ``estimates``, ``photos``, ``shipping`` and
+``hero_qa``. Only ``sku`` is required, because the renderers fall back for
+absent fields. A declared field must have the right type and format when
+present. Objects are open (labels carry free-form notes), except ``page``, whose
+keys are the generator's. PRINT_LABEL adds the fields a printed label needs
+(build_batch_csv, validate-item).
+
+The spec is plain data. ``compile_schema`` walks it ONCE and returns a closure
+per node; validating a label only calls closures, with pointers for declared
+keys precomputed. No spec is interpreted per label. Spec keywords: ``type``
+(a name or a tuple of names), ``enum``, ``pattern`` (full match),
+``nonempty``, ``min``, ``required``, ``properties``, ``additional``,
+``values`` (every value of a mapping), ``items`` and ``length``.
+
+  labelschema.py                 # check every RG-*/label.json; exit 1 on any problem
+  labelschema.py RG-0007 --print # one label against the print-label profile
+  labelschema.py --json
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import re
+import sys
+
+import catalog
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))  # items/
+
+# ---------------------------------------------------------------------------
+# The schema.
+# ---------------------------------------------------------------------------
+
+STR = {"type": "string"}
+TEXT = {"type": "string", "nonempty": True}
+URL = {"type": "string", "pattern": r"https?://\S+"}
+PRICE = {"type": "string", "pattern": r"\$?\d+(\.\d{1,2})?"}
+DATE = {"type": "string", "pattern": r"\d{4}-\d{2}-\d{2}"}
+BOOL = {"type": "boolean"}
+NUMBER = {"type": "number", "min": 0}
+COUNT = {"type": "integer", "min": 0}
+
+
+def array(items: dict, **kw) -> dict:
+    return {"type": "array", "items": items, **kw}
+
+
+def obj(properties: dict | None = None, **kw) -> dict:
+    return {"type": "object", "properties": properties or {}, **kw}
+
+
+CHANNEL = obj({
+    "status": TEXT,
+    "url": {"type": ("string", "null"), "pattern": r"https?://\S+"},
+    "price": PRICE,
+    "buy_link": {"type": "string", "pattern": r"(https?://\S+)?"},  # "" until listed
+    "object_id": STR,
+    "variation_id": STR,
+    "payment_link_id": STR,
+    "item_id": STR,
+    "categories": array(TEXT),
+    "image_ids": array(TEXT),
+    "inventory_qty": COUNT,
+    "quantity": COUNT,
+    "retired_payment_links": array(obj({"id": TEXT, "slug": STR, "reason": STR})),
+    "note": STR,
+})
+
+ESTIMATE = obj({
+    "value": {"type": ("string", "number", "null")},
+    "best_guess_year": {"type": ("integer", "null")},
+    "est": BOOL,
+    "confidence": STR,
+    "basis": STR,
+    "refine_with": STR,
+})
+
+SCHEMA = obj({
+    "sku": {"type": "string", "pattern": r"RG-\d{4,}"},
+    "product_name": TEXT,
+    "attributes": STR,
+    "price": PRICE,
+    "condition": STR,
+    "condition_notes": STR,
+    "qr_code_url": URL,
+    "state": {"enum": ("Draft", "Listed", "Sold")},
+    "fulfillment": {"enum": ("ship_or_pickup", "local_pickup_only", "pickup_only")},
+    "pickup_location": STR,
+    "added_at": DATE,
+    "target_channels": array(TEXT),
+    "reporting_category_note": STR,
+    "pricing_report": STR,
+    "page": obj({
+        "seo_title": STR,
+        "seo_description": STR,
+        "card_title": STR,
+        "era_line": STR,
+        "story": STR,
+        "details": obj(values=STR),
+    }, additional=False),
+    "channels": obj(values=CHANNEL),
+    "qr_codes": obj(values=obj({"url": URL, "file": TEXT, "use": STR, "status": STR})),
+    "identity": obj({"maker": STR, "maker_location": STR}),
+    "estimates": obj({
+        "circa": ESTIMATE,
+        "weight_lb": ESTIMATE,
+        "dimensions_in": obj(dict.fromkeys(("height", "width", "depth", "diameter"), NUMBER)),
+        "refinement_log": array({"type": ("string", "object"),
+                                 "properties": {"date": DATE, "note": STR}}),
+    }),
+    "photos": obj({
+        "hero": TEXT,
+        "cutout": TEXT,
+        "square": TEXT,
+        "card": TEXT,
+        "details": array(TEXT),
+        "needed": array(STR),
+    }),
+    "shipping": obj({
+        "box_in": array(NUMBER, length=3),
+        "weight_oz": NUMBER,
+        "weight_lb_est": NUMBER,
+        "fragile": BOOL,
+        "shippable": BOOL,
+        "local_pickup_only": BOOL,
+        "oversize": BOOL,
+        "est": BOOL,
+        "carrier": STR,
+        "packaging": STR,
+        "method": STR,
+        "notes": STR,
+    }),
+    "hero_qa": obj({
+        "status": {"enum": ("pass", "fail")},
+        "checked_at": STR,
+        "checker": STR,
+        "checks": obj({"bg_ok": BOOL, "defects_ok": BOOL, "full_face": BOOL,
+                       "upright": BOOL, "level_deg": {"type": "number"}}),
+        "reasons": array(STR),
+    }, required=("status",)),
+}, required=("sku",))
+
+# The printed label's fields (labels/build_batch_csv.py, validate-item.sh).
+PRINT_FIELDS = ("sku", "product_name", "attributes", "price", "condition",
+                "condition_notes", "qr_code_url")
+PRINT_SCHEMA = dict(SCHEMA, required=PRINT_FIELDS,
+                    properties=dict(SCHEMA["properties"], attributes=TEXT, condition=TEXT))
+
+
+# ---------------------------------------------------------------------------
+# The compiler.
+# ---------------------------------------------------------------------------
+
+class LabelSchemaError(ValueError):
+    """A label that fails the schema; ``problems`` lists every (pointer, message)."""
+
+    def __init__(self, problems: list):
+        self.problems = problems
+        super().__init__(describe(problems))
+
+
+def describe(problems: list, limit: int = 3) -> str:
+    """``/price: expected string, got number; /state: ... (+2 more)``."""
+    text = "; ".join(f"{p or '/'}: {m}" for p, m in problems[:limit])
+    more = len(problems) - limit
+    return text + (f" (+{more} more)" if more > 0 else "")
+
+
+_ESCAPED = {}
+
+
+def _escape(key) -> str:
+    """``/key`` as a JSON-pointer segment (memoized: labels repeat their keys)."""
+    seg = _ESCAPED.get(key)
+    if seg is None:
+        seg = _ESCAPED[key] = "/" + str(key).replace("~", "~0").replace("/", "~1")
+    return seg
+
+
+# JSON type name -> the Python types json.load produces for it. Checked with
+# ``type(v) in ...`` so bool (a subclass of int) is never a number.
+_TYPES = {
+    "string": (str,),
+    "boolean": (bool,),
+    "integer": (int,),
+    "number": (int, float),
+    "object": (dict,),
+    "array": (list,),
+    "null": (type(None),),
+}
+_JSON_NAMES = {str: "string", bool: "boolean", int: "number", float: "number",
+               dict: "object", list: "array", type(None): "null"}
+
+
+def _type_name(v) -> str:
+    return _JSON_NAMES.get(type(v), type(v).__name__)
+
+
+def _string_check(spec: dict):
+    """nonempty + pattern for string values (other types pass through)."""
+    nonempty = bool(spec.get("nonempty"))
+    pattern = spec.get("pattern")
+    match = re.compile(pattern).fullmatch if pattern else None
+
+    def check(v, ptr, out):
+        if type(v) is not str:
+            return
+        s = v.strip()
+        if nonempty and not s:
+            out.append((ptr, "must not be empty"))
+        elif match is not None and not match(s):
+            out.append((ptr, f"{v!r} does not match {pattern}"))
+    return check
+
+
+def _enum_check(spec: dict):
+    allowed = frozenset(spec["enum"])
+    shown = ", ".join(map(repr, spec["enum"]))
+
+    def check(v, ptr, out):
+        try:
+            ok = v in allowed
+        except TypeError:  # unhashable
+            ok = False
+        if not ok:
+            out.append((ptr, f"must be one of {shown}, got {v!r}"))
+    return check
+
+
+def _min_check(spec: dict):
+    low = spec["min"]
+
+    def check(v, ptr, out):
+        if type(v) in (int, float) and v < low:
+            out.append((ptr, f"must be >= {low}, got {v}"))
+    return check
+
+
+def _object_check(spec: dict):
+    required = tuple((key, _escape(key)) for key in spec.get("required", ()))
+    props = {key: (_escape(key), compile_schema(sub))
+             for key, sub in (spec.get("properties") or {}).items()}
+    values = compile_schema(spec["values"]) if "values" in spec else None
+    closed = spec.get("additional", True) is False
+
+    def check(v, ptr, out):
+        if type(v) is not dict:
+            return
+        for key, suffix in required:
+            if key not in v:
+                out.append((ptr + suffix, "required field is missing"))
+        for key, item in v.items():
+            hit = props.get(key)
+            if hit is not None:
+                hit[1](item, ptr + hit[0], out)
+            elif values is not None:
+                values(item, ptr + _escape(key), out)
+            elif closed:
+                out.append((ptr + _escape(key), "unknown field"))
+    return check
+
+
+def _array_check(spec: dict):
+    items = compile_schema(spec["items"]) if "items" in spec else None
+    length = spec.get("length")
+
+    def check(v, ptr, out):
+        if type(v) is not list:
+            return
+        if length is not None and len(v) != length:
+            out.append((ptr, f"expected {length} items, got {len(v)}"))
+        if items is not None:
+            for i, item in enumerate(v):
+                items(item, f"{ptr}/{i}", out)
+    return check
+
+
+def compile_schema(spec: dict):
+    """A closure ``check(value, pointer, out)`` appending (pointer, message) to ``out``.
+
+    Each node becomes one closure: the type test, then only the keyword checks
+    the node declares (a plain string field is just the type test).
+    """
+    checks = []
+    if "enum" in spec:
+        checks.append(_enum_check(spec))
+    if spec.get("nonempty") or "pattern" in spec:
+        checks.append(_string_check(spec))
+    if "min" in spec:
+        checks.append(_min_check(spec))
+    if "required" in spec or "properties" in spec or "values" in spec or "additional" in spec:
+        checks.append(_object_check(spec))
+    if "items" in spec or "length" in spec:
+        checks.append(_array_check(spec))
+
+    types = spec.get("type")
+    if types is None:
+        typeset, want = None, ""
+    else:
+        names = (types,) if isinstance(types, str) else tuple(types)
+        typeset = frozenset(t for n in names for t in _TYPES[n])
+        want = " or ".join(names)
+
+    if typeset is None:
+        checks = tuple(checks)
+
+        def check(v, ptr, out):
+            for c in checks:
+                c(v, ptr, out)
+    elif not checks:
+        def check(v, ptr, out):
+            if type(v) not in typeset:
+                out.append((ptr, f"expected {want}, got {_type_name(v)}"))
+    elif len(checks) == 1:
+        only = checks[0]
+
+        def check(v, ptr, out):
+            if type(v) not in typeset:
+                out.append((ptr, f"expected {want}, got {_type_name(v)}"))
+            else:
+                only(v, ptr, out)
+    else:
+        checks = tuple(checks)
+
+        def check(v, ptr, out):
+            if type(v) not in typeset:
+                out.append((ptr, f"expected {want}, got {_type_name(v)}"))
+                return
+            for c in checks:
+                c(v, ptr, out)
+    return check
+
+
+class Validator:
+    """A compiled schema for whole labels."""
+
+    def __init__(self, spec: dict):
+        self._check = compile_schema(spec)
+
+    def errors(self, label, sku: str | None = None) -> list:
+        """Every (pointer, message) problem; ``sku`` is the folder the label came from."""
+        out = []
+        self._check(label, "", out)
+        if sku is not None and isinstance(label, dict) and isinstance(label.get("sku"), str) \
+                and label["sku"] != sku:
+            out.append(("/sku", f"{label['sku']!r} does not match folder ({sku})"))
+        return out
+
+    def check(self, label, sku: str | None = None):
+        """``label`` itself when valid; raises LabelSchemaError otherwise."""
+        problems = self.errors(label, sku)
+        if problems:
+            raise LabelSchemaError(problems)
+        return label
+
+
+LABEL = Validator(SCHEMA)
+PRINT_LABEL = Validator(PRINT_SCHEMA)
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Check RG-*/label.json files against the label schema.")
+    ap.add_argument("skus", nargs="*", metavar="SKU", help="only these items (default: all)")
+    ap.add_argument("--root", default=ROOT, help="items/ root containing RG-* folders")
+    ap.add_argument("--print", dest="print_label", action="store_true",
+                    help="also require the printed-label fields (qr_code_url, ...)")
+    ap.add_argument("--json", action="store_true", help="print {sku: [[pointer, message], ...]}")
+    args = ap.parse_args()
+
+    validator = PRINT_LABEL if args.print_label else LABEL
+    report = {}
+    skus = args.skus or catalog.discover(args.root)
+    for sku in skus:
+        try:
+            label = catalog.read_label(os.path.join(args.root, sku))
+        except (OSError, ValueError) as e:
+            report[sku] = [["", f"cannot read label.json: {e}"]]
+            continue
+        problems = validator.errors(label, sku)
+        if problems:
+            report[sku] = [list(p) for p in problems]
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        for sku, problems in report.items():
+            for ptr, message in problems:
+                print(f"{sku}/label.json#{ptr}: {message}")
+        print(f"{len(skus) - len(report)} of {len(skus)} label(s) valid.", file=sys.stderr)
+    return 1 if report else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""Skip-unchanged, atomic writes for generated files (pages, gallery, feed, CSV).
+
+Every generator writes its outputs through ``write_text``:
+
+    outcome = output.write_text(path, html)   # "written" or "unchanged"
+
+The new bytes are compared with the file on disk first; identical content is
+not rewritten, so its mtime stays put (rsync and the Pages deploy diff see no
+change). Anything else goes to a temp file beside the target and is moved into
+place with ``os.replace``, so an interrupted run leaves either the old file or
+the new one — never a truncated page. An existing file keeps its permissions.
+
+Each outcome is tallied in ``TALLY`` (``output.skip()`` records files a
+generator chose not to touch, e.g. protected pages), and the generators print
+``TALLY.summary()``: ``3 written, 51 unchanged, 2 skipped``. A regeneration
+that changes nothing does zero writes.
+"""
+from __future__ import annotations
+
+import os
+import stat
+
+WRITTEN = "written"
+UNCHANGED = "unchanged"
+SKIPPED = "skipped"
+OUTCOMES = (WRITTEN, UNCHANGED, SKIPPED)
+
+
+class Tally:
+    """Counts of written / unchanged / skipped outputs."""
+
+    def __init__(self):
+        self.counts = dict.fromkeys(OUTCOMES, 0)
+
+    def add(self, outcome: str, n: int = 1) -> str:
+        self.counts[outcome] += n
+        return outcome
+
+    def total(self) -> int:
+        return sum(self.counts.values())
+
+    def summary(self) -> str:
+        return ", ".join(f"{self.counts[o]} {o}" for o in OUTCOMES)
+
+
+TALLY = Tally()  # this process's outputs
+
+
+def unchanged(path: str, data: bytes) -> bool:
+    """True when ``path`` already holds exactly ``data`` (sizes compared before reading)."""
+    try:
+        if os.path.getsize(path) != len(data):
+            return False
+        with open(path, "rb") as fh:
+            return fh.read() == data
+    except OSError:
+        return False
+
+
+def write_bytes(path: str, data: bytes, tally: Tally | None = TALLY) -> str:
+    """Atomically replace ``path`` with ``data`` unless it already matches.
+
+    Returns WRITTEN or UNCHANGED (also counted in ``tally``; None counts nothing).
+    """
+    if unchanged(path, data):
+        return tally.add(UNCHANGED) if tally else UNCHANGED
+    try:
+        mode = stat.S_IMODE(os.stat(path).st_mode)
+    except OSError:
+        mode = None
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp, "wb") as fh:
+            fh.write(data)
+        if mode is not None:
+            os.chmod(tmp, mode)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+    return tally.add(WRITTEN) if tally else WRITTEN
+
+
+def write_text(path: str, text: str, tally: Tally | None = TALLY) -> str:
+    """``write_bytes`` for UTF-8 text (newlines written as given)."""
+    return write_bytes(path, text.encode("utf-8"), tally)
+
+
+def skip(tally: Tally | None = TALLY) -> str:
+    """Record an output the generator deliberately left alone; returns SKIPPED."""
+    return tally.add(SKIPPED) if tally else SKIPPED
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""Precompiled token templates for the page generators.
+
+A page template is mostly literal HTML/CSS/JS with a handful of token slots.
+Filling it with one ``str.replace`` per token copies the whole document once
+per token; instead a template is compiled ONCE into alternating literal
+segments and slot names, and rendering is a single ``"".join`` of a list whose
+slot positions are filled from a values dict.
+
+Two token syntaxes are in use:
+
+* ``__TOKEN__`` — build_item_page's inline RG-0055 template (the CSS/JS bodies
+  are full of literal ``{ }`` braces, so ``str.format`` is out).
+* ``{{TOKEN}}`` — ``template/rg-item-card-template.html``, the hand-copy
+  master template.
+
+Substitution is single-pass: a value that happens to contain a token string is
+inserted verbatim, never re-expanded. A slot whose name is missing from the
+values dict keeps its literal token text (the old ``str.replace`` behavior).
+"""
+from __future__ import annotations
+
+import os
+import re
+
+UNDERSCORE_TOKENS = re.compile(r"__([A-Z][A-Z0-9_]*?)__")
+BRACE_TOKENS = re.compile(r"\{\{([A-Z][A-Z0-9_]*)\}\}")
+
+
+class Template:
+    """A template compiled into literal segments and named slots."""
+
+    def __init__(self, text: str, pattern: re.Pattern = UNDERSCORE_TOKENS):
+        self.text = text
+        self.pattern = pattern
+        parts = []    # literal strings, with placeholders at the slot positions
+        slots = []    # (index into parts, token name, raw token text)
+        pos = 0
+        for m in pattern.finditer(text):
+            if m.start() > pos:
+                parts.append(text[pos:m.start()])
+            slots.append((len(parts), m.group(1), m.group(0)))
+            parts.append(m.group(0))
+            pos = m.end()
+        if pos < len(text):
+            parts.append(text[pos:])
+        self._parts = parts
+        self._slots = tuple(slots)
+        self.tokens = frozenset(name for _, name, _ in slots)
+
+    def render(self, values: dict) -> str:
+        """Fill every slot from ``values`` (keyed by bare token name) in one join."""
+        parts = self._parts.copy()
+        for i, name, raw in self._slots:
+            parts[i] = values.get(name, raw)
+        return "".join(parts)
+
+
+_FILE_CACHE: dict = {}
+
+
+def _read(path) -> str:
+    with open(path, encoding="utf-8") as fh:
+        return fh.read()
+
+
+def load(path, pattern: re.Pattern | None = None) -> Template:
+    """Compile a template file, cached per (path, mtime, size).
+
+    ``pattern`` defaults to whichever token syntax the file uses.
+    """
+    st = os.stat(path)
+    key = (os.path.abspath(str(path)), st.st_mtime_ns, st.st_size,
+           pattern.pattern if pattern is not None else None)
+    tpl = _FILE_CACHE.get(key)
+    if tpl is None:
+        text = _read(path)
+        if pattern is None:
+            pattern = BRACE_TOKENS if BRACE_TOKENS.search(text) else UNDERSCORE_TOKENS
+        tpl = _FILE_CACHE[key] = Template(text, pattern)
+    return tpl
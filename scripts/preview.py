@@ -0,0 +1,391 @@
+#!/usr/bin/env python3
+"""Local preview server: item pages rendered on demand from label.json.
+
+``python3 -m http.server`` only shows what was last written to disk, so every
+preview needed a regen first. This server renders instead:
+
+  preview.py                 # http://localhost:4173/
+  preview.py --port 8000 --no-reload
+
+* ``/RG-XXXX/`` is ``build_item_page.render_page`` of the item's label.json,
+  rendered in memory (nothing is written). Items the generator would skip
+  (Sold, protected living-test pages, /buy/ redirects) are served from disk,
+  exactly as a regen would leave them.
+* ``/`` is the gallery with pending ``build_gallery.reconcile`` inserts applied,
+  and ``/items.json`` the feed a write would produce.
+* Every other path is the file on disk.
+
+Rendered pages sit in an LRU (PAGE_CACHE entries) keyed by the same stat-only
+input signature ``build_item_page --all`` uses (label.json, status.json,
+img/manifest.json, the probed images, ...), so a label, image or derivative
+change is picked up on the next request; an edit to the generator modules
+(the page template lives in build_item_page.py) reloads them and empties the
+cache. HTML/JSON/CSS/JS responses carry an ETag (a matching If-None-Match gets
+a 304) and are gzipped for clients that accept it; the gzip copy has its own
+ETag and every response sends ``Vary: Accept-Encoding``.
+
+Live reload: HTML gets a small EventSource script; a watcher thread (watch.py's
+inotify / polling source) tells open tabs to reload when an item's inputs
+change.
+"""
+from __future__ import annotations
+
+import argparse
+import collections
+import gzip
+import hashlib
+import http.server
+import importlib
+import os
+import re
+import sys
+import threading
+import time
+from urllib.parse import unquote, urlsplit
+
+import build_gallery
+import build_images
+import build_item_page
+import catalog
+import page_template
+import watch
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))  # items/
+
+PORT = 4173  # the port .lighthouserc.yml serves on
+PAGE_CACHE = 256
+RELOAD_PATH = "/__livereload"
+RELOAD_JS = ('<script>/* preview.py live reload */'
+             f'new EventSource("{RELOAD_PATH}").onmessage = function () {{ location.reload(); }};'
+             '</script>\n')
+# Generator modules, in dependency order: an edit to any of them reloads all.
+CODE_MODULES = (page_template, build_images, build_item_page, build_gallery)
+TEXT_TYPES = {".html": "text/html; charset=utf-8", ".json": "application/json",
+              ".css": "text/css; charset=utf-8", ".js": "text/javascript; charset=utf-8",
+              ".svg": "image/svg+xml", ".txt": "text/plain; charset=utf-8"}
+_ITEM_PATH = re.compile(r"^/(RG-\d{4,})/(?:index\.html)?$")
+
+
+class Response:
+    """A cacheable body with its ETags; the gzip copy is made on first use.
+
+    The gzip copy is a different representation, so it has its own ETag
+    (``"<hash>-gz"``): a 304 never tells a cache to reuse the wrong encoding.
+    """
+
+    def __init__(self, body: bytes, content_type: str):
+        self.body = body
+        self.content_type = content_type
+        digest = hashlib.sha1(body).hexdigest()[:20]
+        self.etag = f'"{digest}"'
+        self.gz_etag = f'"{digest}-gz"'
+        self._gz = None
+
+    @property
+    def gz(self) -> bytes:
+        if self._gz is None:
+            self._gz = gzip.compress(self.body, compresslevel=6, mtime=0)
+        return self._gz
+
+
+def inject_reload(html_text: str) -> str:
+    """``html_text`` with RELOAD_JS before its last ``</body>`` (appended when there is none)."""
+    at = html_text.rfind("</body>")
+    if at < 0:
+        return html_text + RELOAD_JS
+    return html_text[:at] + RELOAD_JS + html_text[at:]
+
+
+def accepts_gzip(accept_encoding: str) -> bool:
+    """Whether an Accept-Encoding header allows gzip (``gzip;q=0`` refuses it)."""
+    weights = {}
+    for part in accept_encoding.split(","):
+        coding, *params = [p.strip() for p in part.split(";")]
+        q = 1.0
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if coding:
+            weights[coding.lower()] = q
+    return weights.get("gzip", weights.get("x-gzip", weights.get("*", 0.0))) > 0
+
+
+def _stat_sig(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+class Preview:
+    """Render caches + the live-reload generation counter, shared by handler threads."""
+
+    def __init__(self, root: str = ROOT, live_reload: bool = True):
+        self.root = root
+        self.live_reload = live_reload
+        self.lock = threading.Lock()
+        self.pages = collections.OrderedDict()  # sku -> (signature, Response)
+        self.gallery = {}                       # path -> (signature, Response)
+        self.static = {}                        # path -> (stat sig, Response)
+        self.code_sig = self._code_sig()
+        self.generation = 0
+        self.changed = threading.Condition()
+
+    # -- invalidation ------------------------------------------------------
+
+    @staticmethod
+    def _code_sig():
+        return tuple(_stat_sig(m.__file__) for m in CODE_MODULES)
+
+    def _check_code(self) -> None:
+        """Reload the generator modules (and drop every cache) if one was edited."""
+        sig = self._code_sig()
+        if sig == self.code_sig:
+            return
+        for module in CODE_MODULES:
+            importlib.reload(module)
+        self.pages.clear()
+        self.gallery.clear()
+        self.code_sig = sig
+
+    def notify(self, skus) -> None:
+        """Inputs of ``skus`` changed: drop their cached pages + the gallery, ping open tabs."""
+        with self.lock:
+            for sku in skus:
+                self.pages.pop(sku, None)
+            self.gallery.clear()
+        with self.changed:
+            self.generation += 1
+            self.changed.notify_all()
+
+    # -- rendering ---------------------------------------------------------
+
+    def _html(self, text: str) -> Response:
+        if self.live_reload:
+            text = inject_reload(text)
+        return Response(text.encode("utf-8"), TEXT_TYPES[".html"])
+
+    def page(self, sku: str):
+        """The rendered /RG-XXXX/ page, or None when the item has no usable label."""
+        item_dir = os.path.join(self.root, sku)
+        sig = build_item_page.input_signature(item_dir)
+        with self.lock:
+            self._check_code()
+            hit = self.pages.get(sku)
+            if hit and hit[0] == sig:
+                self.pages.move_to_end(sku)
+                return hit[1]
+        try:
+            label = catalog.read_label(item_dir)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(label, dict):
+            return None
+        if build_item_page.would_skip(item_dir, label):
+            path = os.path.join(item_dir, "index.html")
+            if not os.path.isfile(path):
+                return None
+            with open(path, encoding="utf-8") as fh:
+                text = fh.read()
+        else:
+            text = build_item_page.render_page(sku, label, item_dir)
+        resp = self._html(text)
+        with self.lock:
+            self.pages[sku] = (sig, resp)
+            self.pages.move_to_end(sku)
+            while len(self.pages) > PAGE_CACHE:
+                self.pages.popitem(last=False)
+        return resp
+
+    def _gallery_sig(self):
+        # The item directory's stat catches a hero appearing or going away
+        # (hero_problem); the named files catch a hero or card being replaced.
+        names = ("label.json", "status.json", "card.png") + build_gallery.HERO_DEFAULTS
+        items = tuple((sku, _stat_sig(os.path.join(self.root, sku)),
+                       *(_stat_sig(os.path.join(self.root, sku, n)) for n in names))
+                      for sku in catalog.discover(self.root))
+        return (_stat_sig(os.path.join(self.root, "index.html")), items, self.code_sig)
+
+    def _labels(self) -> dict:
+        """sku -> label dict for every readable label under this server's root."""
+        return {sku: item.label for sku, item in catalog.load(self.root).items()
+                if item.error is None}
+
+    def gallery_page(self, path: str) -> Response:
+        """``/`` (reconciled index.html) or ``/items.json`` (the feed), cached until a change."""
+        with self.lock:
+            self._check_code()
+        sig = self._gallery_sig()
+        with self.lock:
+            hit = self.gallery.get(path)
+            if hit and hit[0] == sig:
+                return hit[1]
+        with open(os.path.join(self.root, "index.html"), encoding="utf-8") as fh:
+            text = fh.read()
+        items = self._labels()
+        try:
+            text, *_ = build_gallery.reconcile(text, items)
+        except SystemExit as e:  # no placeholder: show the page as it is
+            print(f"  ! gallery: {e}", file=sys.stderr)
+        if path == "/items.json":
+            feed = build_gallery.build_feed(items, build_gallery.gallery_skus(text, items), text)
+            resp = Response(build_gallery.feed_text(feed).encode("utf-8"), TEXT_TYPES[".json"])
+        else:
+            resp = self._html(text)
+        with self.lock:
+            self.gallery[path] = (sig, resp)
+        return resp
+
+    def static_text(self, fs_path: str, ext: str):
+        """A text file from disk (live reload injected into HTML), cached by stat."""
+        sig = _stat_sig(fs_path)
+        if sig is None:
+            return None
+        with self.lock:
+            hit = self.static.get(fs_path)
+            if hit and hit[0] == sig:
+                return hit[1]
+        with open(fs_path, "rb") as fh:
+            body = fh.read()
+        if ext == ".html":
+            resp = self._html(body.decode("utf-8", errors="replace"))
+        else:
+            resp = Response(body, TEXT_TYPES[ext])
+        with self.lock:
+            self.static[fs_path] = (sig, resp)
+        return resp
+
+    def resolve(self, url_path: str):
+        """The Response for ``url_path``, or None to fall back to plain file serving."""
+        m = _ITEM_PATH.match(url_path)
+        if m:
+            return self.page(m.group(1))
+        if url_path in ("/", "/index.html", "/items.json"):
+            return self.gallery_page("/items.json" if url_path == "/items.json" else "/")
+        fs_path = os.path.normpath(os.path.join(self.root, url_path.lstrip("/")))
+        if not fs_path.startswith(self.root + os.sep):
+            return None
+        if os.path.isdir(fs_path):
+            if not url_path.endswith("/"):
+                return None  # let the file handler redirect to the slash form
+            fs_path = os.path.join(fs_path, "index.html")
+        ext = os.path.splitext(fs_path)[1].lower()
+        return self.static_text(fs_path, ext) if ext in TEXT_TYPES else None
+
+    def wait_for_change(self, generation: int, timeout: float) -> int:
+        with self.changed:
+            self.changed.wait_for(lambda: self.generation != generation, timeout)
+            return self.generation
+
+
+class Handler(http.server.SimpleHTTPRequestHandler):
+    preview: Preview = None  # set by serve()
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, directory=self.preview.root, **kwargs)
+
+    def log_message(self, fmt, *args):  # no timestamp / client address
+        sys.stderr.write(f"  {self.command} {self.path} {fmt % args}\n")
+
+    def do_GET(self):
+        self._serve(head=False)
+
+    def do_HEAD(self):
+        self._serve(head=True)
+
+    def _serve(self, head: bool) -> None:
+        path = unquote(urlsplit(self.path).path)
+        if path == RELOAD_PATH:
+            return self._events()
+        resp = self.preview.resolve(path)
+        if resp is None:
+            return super().do_HEAD() if head else super().do_GET()
+        use_gz = accepts_gzip(self.headers.get("Accept-Encoding") or "")
+        etag = resp.gz_etag if use_gz else resp.etag
+        etags = [t.strip() for t in (self.headers.get("If-None-Match") or "").split(",")]
+        if etag in etags:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Vary", "Accept-Encoding")
+            self.end_headers()
+            return
+        body = resp.gz if use_gz else resp.body
+        self.send_response(200)
+        self.send_header("Content-Type", resp.content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Vary", "Accept-Encoding")
+        if use_gz:
+            self.send_header("Content-Encoding", "gzip")
+        self.end_headers()
+        if not head:
+            self.wfile.write(body)
+
+    def _events(self) -> None:
+        """Server-sent events: one ``reload`` message per change, until the tab goes away."""
+        generation = self.preview.generation  # before the headers: no change is missed
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        try:
+            while True:
+                new = self.preview.wait_for_change(generation, timeout=15)
+                self.wfile.write(b"data: reload\n\n" if new != generation else b": ping\n\n")
+                self.wfile.flush()
+                generation = new
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+
+def _watch_loop(preview: Preview, poll: bool) -> None:
+    source = watch.open_source(preview.root, poll)
+    pending = {}
+    while True:
+        now = time.monotonic()
+        timeout = None if not pending else max(0.0, min(pending.values()) + watch.DEBOUNCE - now)
+        for sku in source.wait(timeout):
+            pending[sku] = time.monotonic()
+        now = time.monotonic()
+        ready = [sku for sku, t in pending.items() if now - t >= watch.DEBOUNCE]
+        if ready:
+            for sku in ready:
+                del pending[sku]
+            preview.notify(ready)
+
+
+def serve(port: int = PORT, live_reload: bool = True, poll: bool = False, root: str = ROOT):
+    preview = Preview(root, live_reload)
+    handler = type("PreviewHandler", (Handler,), {"preview": preview})
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", port), handler)
+    server.daemon_threads = True
+    if live_reload:
+        threading.Thread(target=_watch_loop, args=(preview, poll), daemon=True).start()
+    return server
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Preview server: item pages rendered from label.json.")
+    ap.add_argument("--port", type=int, default=PORT, help=f"port (default {PORT})")
+    ap.add_argument("--no-reload", action="store_true", help="no live-reload script or watcher")
+    ap.add_argument("--poll", action="store_true", help="watch by polling instead of inotify")
+    args = ap.parse_args()
+    server = serve(args.port, not args.no_reload, args.poll)
+    print(f"Preview: http://localhost:{args.port}/  (Ctrl-C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
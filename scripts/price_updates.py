@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""Reprice Square variations from label.json, a few batch calls for the whole catalog.
+
+A label's ``price`` is what the item should sell for; ``channels.square.price``
+is what Square was last set to. Where they differ, the item needs an update:
+
+  price_updates.py                         # diff: every label whose Square price is stale
+  price_updates.py --live                  # ... diffing unrecorded prices against Square
+  price_updates.py --write                 # ... and save rg-inventory/price-updates-<today>.json
+  price_updates.py --apply FILE --dry-run  # fetch live variations, show what would change
+  price_updates.py --apply FILE            # apply it, then record the new channels.square.price
+
+A listed label with a ``variation_id`` but no recorded ``channels.square.price``
+can't be diffed offline; it is reported as "Square price unknown". ``--live``
+fetches those variations (one BatchRetrieveCatalogObjects call per 1000) and
+diffs the label against the live price instead.
+
+A price-update file is a JSON list of ``{variation_id, amount_cents, sku,
+note}``, the format of rg-inventory/price-updates-2026-02-15.json. ``--apply``
+first fetches every listed variation in BatchRetrieveCatalogObjects calls of
+1000 IDs. It skips the ones already at the target amount, then sends the rest
+back with the version it just read, in BatchUpsertCatalogObjects calls of up
+to 10,000 objects. A variation edited in between fails with VERSION_MISMATCH
+instead of being overwritten. Applying a file twice is a no-op. After a
+successful apply, each label's ``channels.square.price`` is set to the price
+Square now has. Only labels whose formatting survives a JSON round trip are
+rewritten; the rest are listed for a hand edit.
+"""
+from __future__ import annotations
+
+import argparse
+import datetime
+import json
+import os
+import sys
+
+import catalog
+import output
+import squareapi
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))  # items/
+UPDATES_DIR = "rg-inventory"
+SKIP_STATUSES = ("delisted", "deleted", "archived")
+
+
+def _dollars(amount: int) -> str:
+    return f"${amount / 100:.2f}"
+
+
+def _listed(items: dict, skus=None):
+    """(sku, variation_id, label cents, recorded Square cents) for each priced, listed label."""
+    for sku, item in sorted(items.items()):
+        if item.error or (skus and sku not in skus):
+            continue
+        square = (item.label.get("channels") or {}).get("square") or {}
+        if not square.get("variation_id") or square.get("status") in SKIP_STATUSES:
+            continue
+        want = squareapi.cents(item.label.get("price"))
+        if want is not None:
+            yield sku, square["variation_id"], want, squareapi.cents(square.get("price"))
+
+
+def deltas(items: dict, skus=None) -> list:
+    """Price updates for every label whose ``price`` differs from ``channels.square.price``."""
+    return [{"variation_id": vid, "amount_cents": want, "sku": sku,
+             "note": f"{_dollars(have)} -> {_dollars(want)}"}
+            for sku, vid, want, have in _listed(items, skus) if have is not None and want != have]
+
+
+def unknown(items: dict, skus=None) -> list:
+    """Would-be updates for the labels with no ``channels.square.price`` to diff against."""
+    return [{"variation_id": vid, "amount_cents": want, "sku": sku}
+            for sku, vid, want, have in _listed(items, skus) if have is None]
+
+
+def live_deltas(client, updates: list) -> tuple:
+    """(updates, missing): ``updates`` diffed against the live Square variation prices."""
+    changes, _, missing = plan(client, updates)
+    now = [dict(u, note=f"{_dollars(cur) if cur is not None else 'unpriced'} -> "
+                        f"{_dollars(u['amount_cents'])} (live)")
+           for u, _, cur in changes]
+    return now, missing
+
+
+def dumps(updates: list) -> str:
+    """One update per line, as the hand-made files are laid out."""
+    rows = ",\n".join(f"  {json.dumps(u, ensure_ascii=False)}" for u in updates)
+    return f"[\n{rows}\n]\n" if updates else "[]\n"
+
+
+def load_updates(path: str) -> list:
+    with open(path, encoding="utf-8") as fh:
+        updates = json.load(fh)
+    if not isinstance(updates, list):
+        raise ValueError(f"{path}: expected a JSON list of price updates")
+    for n, u in enumerate(updates):
+        if not (isinstance(u, dict) and isinstance(u.get("variation_id"), str)
+                and type(u.get("amount_cents")) is int and u["amount_cents"] >= 0):
+            raise ValueError(f"{path}[{n}]: needs variation_id (string) and amount_cents (int >= 0)")
+    return updates
+
+
+def plan(client, updates: list) -> tuple:
+    """(changes, unchanged, missing): changes are (update, variation object, current cents)."""
+    objects, _ = client.batch_retrieve([u["variation_id"] for u in updates], related=False)
+    changes, unchanged, missing = [], [], []
+    for u in updates:
+        var = objects.get(u["variation_id"])
+        if var is None or var.get("type") != "ITEM_VARIATION" or var.get("is_deleted"):
+            missing.append(u)
+            continue
+        money = (var.get("item_variation_data") or {}).get("price_money") or {}
+        if money.get("amount") == u["amount_cents"]:
+            unchanged.append(u)
+        else:
+            changes.append((u, var, money.get("amount")))
+    return changes, unchanged, missing
+
+
+def repriced(var: dict, amount: int) -> dict:
+    """The retrieved variation with a new price; its ``version`` is kept for the conflict check."""
+    data = dict(var.get("item_variation_data") or {})
+    currency = (data.get("price_money") or {}).get("currency", "USD")
+    data.update(pricing_type="FIXED_PRICING", price_money={"amount": amount, "currency": currency})
+    return {"type": "ITEM_VARIATION", "id": var["id"], "version": var.get("version"),
+            "present_at_all_locations": var.get("present_at_all_locations", True),
+            "item_variation_data": data}
+
+
+def record(root: str, updates: list) -> list:
+    """Set ``channels.square.price`` on each updated label; returns SKUs left to edit by hand."""
+    by_sku = {u["sku"]: u for u in updates if u.get("sku")}
+    by_hand = []
+    for sku, u in sorted(by_sku.items()):
+        path = os.path.join(root, sku, "label.json")
+        try:
+            with open(path, encoding="utf-8") as fh:
+                text = fh.read()
+            label = json.loads(text)
+        except (OSError, ValueError):
+            by_hand.append(sku)
+            continue
+        square = (label.get("channels") or {}).get("square")
+        ascii_ = next((a for a in (False, True)
+                       if json.dumps(label, indent=2, ensure_ascii=a) + "\n" == text), None)
+        if not isinstance(square, dict) or square.get("variation_id") != u["variation_id"] \
+                or ascii_ is None:
+            by_hand.append(sku)
+            continue
+        square["price"] = f"{u['amount_cents'] / 100:.2f}"
+        output.write_text(path, json.dumps(label, indent=2, ensure_ascii=ascii_) + "\n")
+    return by_hand
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Diff and apply Square variation prices from label.json.")
+    ap.add_argument("--root", default=ROOT, help="items/ root containing RG-* folders")
+    ap.add_argument("--sku", action="append", default=[], help="only this item (repeatable)")
+    ap.add_argument("--write", nargs="?", const="", metavar="PATH",
+                    help="write the diff as a price-update file "
+                         "(default: rg-inventory/price-updates-<today>.json)")
+    ap.add_argument("--live", action="store_true",
+                    help="diff labels without a recorded Square price against Square itself")
+    ap.add_argument("--apply", metavar="FILE", help="apply a price-update file to Square")
+    ap.add_argument("--dry-run", action="store_true", help="with --apply: show, don't upsert")
+    ap.add_argument("--base-url", default=squareapi.API_BASE,
+                    help="Square API base URL, e.g. a local square_standin.py "
+                         "(default: $SQUARE_API_BASE or production)")
+    args = ap.parse_args()
+
+    if not args.apply:
+        items = catalog.load(args.root)
+        updates, unpriced = deltas(items, set(args.sku)), unknown(items, set(args.sku))
+        if args.live and unpriced:
+            try:
+                with squareapi.Client(squareapi.resolve_token(), base=args.base_url) as client:
+                    live, unpriced = live_deltas(client, unpriced)
+            except squareapi.SquareError as e:
+                print(f"ERROR: {e}", file=sys.stderr)
+                return 1
+            updates = sorted(updates + live, key=lambda u: u["sku"])
+            for u in unpriced:
+                print(f"{u['sku']}  {u['variation_id']}  NOT FOUND in Square", file=sys.stderr)
+        else:
+            for u in unpriced:
+                print(f"{u['sku']}  {u['variation_id']}  Square price unknown "
+                      "(no channels.square.price; --live compares with Square)", file=sys.stderr)
+        for u in updates:
+            print(f"{u['sku']}  {u['variation_id']}  {u['note']}")
+        print(f"{len(updates)} label(s) priced differently from Square"
+              + (f", {len(unpriced)} unknown" if unpriced else "") + ".", file=sys.stderr)
+        if args.write is not None and updates:
+            path = args.write or os.path.join(
+                args.root, UPDATES_DIR, f"price-updates-{datetime.date.today().isoformat()}.json")
+            print(f"{output.write_text(path, dumps(updates))}: {path}", file=sys.stderr)
+        return 0
+
+    try:
+        updates = load_updates(args.apply)
+    except (OSError, ValueError) as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        return 1
+    if args.sku:
+        updates = [u for u in updates if u.get("sku") in args.sku]
+    try:
+        client = squareapi.Client(squareapi.resolve_token(), base=args.base_url)
+        changes, unchanged, missing = plan(client, updates)
+        for u, _, current in changes:
+            now = _dollars(current) if current is not None else "unpriced"
+            print(f"{u.get('sku', '?')}  {u['variation_id']}  {now} -> {_dollars(u['amount_cents'])}")
+        for u in missing:
+            print(f"{u.get('sku', '?')}  {u['variation_id']}  NOT FOUND in Square", file=sys.stderr)
+        print(f"{len(changes)} to change, {len(unchanged)} already current, "
+              f"{len(missing)} missing.", file=sys.stderr)
+        if args.dry_run:
+            return 1 if missing else 0
+        if changes:
+            client.batch_upsert([repriced(var, u["amount_cents"]) for u, var, _ in changes])
+    except squareapi.SquareError as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        return 1
+    for sku in record(args.root, [u for u, _, _ in changes] + unchanged):
+        print(f"{sku}: update channels.square.price in label.json by hand", file=sys.stderr)
+    print(f"Applied {len(changes)} price(s).\n{client.stats.summary()}", file=sys.stderr)
+    return 1 if missing else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
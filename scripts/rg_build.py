@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+"""rg-build: rebuild the site's stale targets, in dependency order.
+
+Publishing used to be a hand-run sequence (build_images.py, build_item_page.py,
+build_gallery.py --apply, maybe --relink-cards, build_batch_csv.py,
+verify_flip_hint.py, validate-item.sh). rg-build models it as a DAG of targets, each with declared
+inputs and outputs:
+
+  images          labels, hero/cutout/card/square images -> RG-*/img/ derivatives
+  pages           images, labels, status, template code -> RG-*/index.html
+                  (generator-managed pages only; hand-curated ones are left alone)
+  gallery         images, labels, status, card images -> index.html, items.json
+  relink-cards    card.png -> gallery cards (opt-in: only when named)
+  csv             labels -> qa-artifacts/labels/rg-labels-batch.csv
+  lint.flip-hint  pages -> verify_flip_hint.py
+  lint.items      pages, labels, images -> one validate.py --json run over the stale SKUs
+  lint            lint.flip-hint + lint.items
+
+  rg-build                    # every stale default target
+  rg-build gallery csv        # these targets (and their stale dependencies)
+  rg-build --list             # targets with their dependencies and stale/fresh state
+  rg-build --dry-run          # what would run
+  rg-build --force            # ignore the recorded state; run everything selected
+  rg-build -j 2               # at most 2 targets at once (default: CPU count)
+
+A target is stale when the (mtime_ns, size) of any path its input/output globs
+match differs from what was recorded after its last successful run in
+``.build/rg-build.json`` (new and deleted paths count too). Since the
+generators skip unchanged writes (output.py), a run that changes nothing
+leaves every downstream target fresh. A failed target records nothing, so it
+is retried next time, and its dependents are not run. Per-SKU targets
+(``lint.items``) run once, in one process, for just the SKUs whose paths
+changed. They read pass/fail per SKU from the command's JSON output and record
+each passing SKU separately.
+
+Each stage runs as its own process (the generators are never imported here,
+so ``rg-build --help`` starts instantly); independent targets run in parallel
+and a target's output is printed, whole, when it finishes.
+"""
+from __future__ import annotations
+
+import argparse
+import glob
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))  # items/
+
+# Bump when the recorded-state layout changes.
+STATE_VERSION = 1
+
+PY = sys.executable
+LABELS = ("RG-*/label.json", "RG-*/status.json")
+
+
+@dataclass(frozen=True)
+class Target:
+    """One buildable target. ``command`` runs once; ``per_sku`` runs once for the
+    stale SKUs, with ``{skus}`` expanded to them and ``{jobs}`` to -j, and prints
+    a JSON list of ``{"sku", "passed", ...}`` records. Neither: a phony group of
+    its deps."""
+
+    name: str
+    help: str
+    deps: tuple = ()
+    inputs: tuple = ()   # globs relative to the root
+    outputs: tuple = ()
+    command: tuple = ()
+    per_sku: tuple = ()
+    default: bool = True
+
+
+TARGETS = (
+    Target("images", "responsive image derivatives + card thumbnails",
+           inputs=("RG-*/label.json", "RG-*/hero.*", "RG-*/cutout.png", "RG-*/card.png",
+                   "RG-*/square.png", "scripts/build_images.py"),
+           outputs=("RG-*/img/*",),
+           command=(PY, "scripts/build_images.py")),
+    Target("pages", "item pages from label.json", deps=("images",),
+           inputs=LABELS + ("RG-*/img/manifest.json", "RG-*/hero.*", "RG-*/cutout.png",
+                            "RG-*/qr-buy.png", "RG-*/buy", "scripts/build_item_page.py",
+                            "scripts/page_template.py", "scripts/build_images.py",
+                            "scripts/catalog.py", "scripts/labelschema.py", "scripts/output.py"),
+           outputs=("RG-*/index.html",),
+           command=(PY, "scripts/build_item_page.py", "--all", "--managed-only")),
+    Target("gallery", "gallery cards + items.json", deps=("images",),
+           inputs=LABELS + ("RG-*/hero.*", "RG-*/card.png", "RG-*/img/manifest.json",
+                            "scripts/build_gallery.py", "scripts/build_images.py",
+                            "scripts/catalog.py", "scripts/labelschema.py", "scripts/output.py"),
+           outputs=("index.html", "items.json"),
+           command=(PY, "scripts/build_gallery.py", "--apply")),
+    Target("relink-cards", "switch existing cards to card.png", deps=("gallery",),
+           inputs=("RG-*/card.png",), outputs=("index.html",),
+           command=(PY, "scripts/build_gallery.py", "--relink-cards"), default=False),
+    Target("csv", "batch label CSV",
+           inputs=LABELS + ("scripts/labels/build_batch_csv.py",),
+           outputs=("qa-artifacts/labels/rg-labels-batch.csv",),
+           command=(PY, "scripts/labels/build_batch_csv.py")),
+    Target("lint.flip-hint", "Tap for Story chip on every page", deps=("pages",),
+           inputs=("RG-*/index.html", "scripts/ui/verify_flip_hint.py"),
+           command=(PY, "scripts/ui/verify_flip_hint.py")),
+    Target("lint.items", "validate.py per item", deps=("pages",),
+           inputs=LABELS + ("RG-*/index.html", "RG-*/hero.*", "RG-*/qr-code.png",
+                            "scripts/validate.py", "scripts/labelschema.py"),
+           per_sku=(PY, "scripts/validate.py", "--json", "--jobs", "{jobs}", "{skus}")),
+    Target("lint", "all page lints", deps=("lint.flip-hint", "lint.items")),
+)
+
+
+# ---------------------------------------------------------------------------
+# State: path -> [mtime_ns, size] per target, recorded after a successful run.
+# ---------------------------------------------------------------------------
+
+def _state_path(root: str) -> str:
+    return os.path.join(root, ".build", "rg-build.json")
+
+
+def load_state(root: str) -> dict:
+    try:
+        with open(_state_path(root), encoding="utf-8") as fh:
+            data = json.load(fh)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get("version") != STATE_VERSION:
+        return {}
+    return data.get("targets", {})
+
+
+def save_state(root: str, targets: dict) -> None:
+    path = _state_path(root)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as fh:
+        json.dump({"version": STATE_VERSION, "targets": targets}, fh, sort_keys=True)
+        fh.write("\n")
+    os.replace(tmp, path)
+
+
+def fingerprint(root: str, target: Target) -> dict:
+    """path -> [mtime_ns, size] for every path the target's globs match now."""
+    sigs = {}
+    for pattern in target.inputs + target.outputs:
+        for rel in glob.glob(pattern, root_dir=root):
+            try:
+                st = os.stat(os.path.join(root, rel))
+            except OSError:
+                continue
+            sigs[rel] = [st.st_mtime_ns, st.st_size]
+    return sigs
+
+
+def changed_paths(now: dict, recorded: dict) -> set:
+    """Paths that are new, changed or gone since ``recorded``."""
+    return {p for p in now.keys() | recorded.keys() if now.get(p) != recorded.get(p)}
+
+
+def sku_of(path: str):
+    """The RG-* folder a path belongs to, or None for a site-wide path."""
+    head = path.split("/", 1)[0]
+    return head if head.startswith("RG-") else None
+
+
+# ---------------------------------------------------------------------------
+# Running.
+# ---------------------------------------------------------------------------
+
+def select(targets: dict, names) -> list:
+    """``names`` (default: every default target) plus their dependencies, in build order."""
+    order, seen = [], set()
+
+    def visit(name, chain=()):
+        if name in chain:
+            raise SystemExit(f"rg-build: dependency cycle: {' -> '.join(chain + (name,))}")
+        if name in seen:
+            return
+        for dep in targets[name].deps:
+            visit(dep, chain + (name,))
+        seen.add(name)
+        order.append(name)
+
+    for name in names or [t.name for t in targets.values() if t.default]:
+        if name not in targets:
+            raise SystemExit(f"rg-build: unknown target {name!r} (see --list)")
+        visit(name)
+    return order
+
+
+def _run(argv, root: str):
+    proc = subprocess.run(list(argv), cwd=root, capture_output=True, text=True)
+    return proc.returncode, proc.stdout + proc.stderr
+
+
+def _run_skus(target: Target, skus: list, root: str, jobs: int) -> tuple:
+    """Run ``target.per_sku`` once for ``skus``: ({sku: record}, stderr + unparsed stdout)."""
+    argv = []
+    for a in target.per_sku:
+        if a == "{skus}":
+            argv.extend(skus)
+        else:
+            argv.append(a.replace("{jobs}", str(max(1, jobs))))
+    proc = subprocess.run(argv, cwd=root, capture_output=True, text=True)
+    try:
+        records = {r["sku"]: r for r in json.loads(proc.stdout)}
+    except (ValueError, TypeError, KeyError):
+        return {}, proc.stdout + proc.stderr
+    return records, proc.stderr
+
+
+def _failures(record: dict) -> str:
+    """The failing checks of one per-SKU record, one per line."""
+    lines = [f"  {c.get('section', '')}: {c.get('message', '')}"
+             for c in record.get("checks") or [] if c.get("level") == "fail"]
+    return "".join(line + "\n" for line in lines)
+
+
+def build_target(target: Target, root: str, recorded: dict, force: bool, jobs: int):
+    """Run ``target`` if stale. Returns (status, output, state-to-record or None).
+
+    status is "fresh", "ran" or "failed".
+    """
+    now = fingerprint(root, target)
+    if not (target.command or target.per_sku):
+        return "fresh", "", None
+    stale = set(now) if force or recorded is None else changed_paths(now, recorded)
+    if recorded is not None and not stale and not force:
+        return "fresh", "", None
+
+    if target.command:
+        rc, out = _run(target.command, root)
+        return ("ran" if rc == 0 else "failed"), out, (fingerprint(root, target) if rc == 0 else None)
+
+    # Per SKU: a site-wide path (the script) makes every SKU stale.
+    all_skus = {sku_of(p) for p in now} - {None}
+    skus = all_skus if force or recorded is None or any(sku_of(p) is None for p in stale) \
+        else {sku_of(p) for p in stale} & all_skus
+    records, out = _run_skus(target, sorted(skus), root, jobs) if skus else ({}, "")
+    failed = {sku for sku in skus if not (records.get(sku) or {}).get("passed")}
+    out += "".join(f"--- {sku}\n{_failures(records.get(sku) or {})}" for sku in sorted(failed))
+    out += f"{len(skus) - len(failed)} of {len(skus)} item(s) passed\n"
+    # Keep the record of passing / untouched SKUs; failing ones stay stale.
+    after = fingerprint(root, target)
+    keep = {p: s for p, s in after.items() if sku_of(p) not in failed}
+    return ("failed" if failed else "ran"), out, keep
+
+
+def build(names=None, root: str = ROOT, force: bool = False, jobs: int = 0,
+          dry_run: bool = False, targets=TARGETS, log=print) -> int:
+    """Bring ``names`` (default targets if None) up to date. Returns an exit code."""
+    table = {t.name: t for t in targets}
+    order = select(table, names)
+    jobs = jobs or os.cpu_count() or 1
+    state = load_state(root)
+
+    if dry_run:
+        for name in order:
+            target, recorded = table[name], state.get(name)
+            if not (target.command or target.per_sku):
+                continue
+            if force or recorded is None or changed_paths(fingerprint(root, target), recorded):
+                log(f"would run {name}")
+            else:
+                log(f"fresh      {name}")
+        return 0
+
+    status = {}
+    pending = list(order)
+    running = {}
+    rc = 0
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        while pending or running:
+            for name in list(pending):
+                deps = table[name].deps
+                if not all(d in status for d in deps):
+                    continue
+                failed = [d for d in deps if status[d] in ("failed", "blocked")]
+                if failed:
+                    pending.remove(name)
+                    status[name] = "blocked"
+                    log(f"== {name}: not run ({', '.join(failed)} failed)")
+                    rc = 1
+                elif len(running) < jobs:
+                    pending.remove(name)
+                    running[pool.submit(build_target, table[name], root, state.get(name),
+                                        force, jobs)] = (name, time.perf_counter())
+            if not running:
+                continue
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for fut in done:
+                name, start = running.pop(fut)
+                result, out, record = fut.result()
+                status[name] = result
+                if record is not None:
+                    state[name] = record
+                    save_state(root, state)
+                if not (table[name].command or table[name].per_sku):
+                    continue  # a group: its members were reported
+                if result == "fresh":
+                    log(f"== {name}: up to date")
+                    continue
+                log(f"== {name}: {'ok' if result == 'ran' else 'FAILED'} "
+                    f"({time.perf_counter() - start:.1f}s)")
+                if out.strip():
+                    log(out.rstrip("\n"))
+                if result == "failed":
+                    rc = 1
+    return rc
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(
+        prog="rg-build", description="Rebuild the site's stale targets in dependency order.",
+        epilog="targets: " + ", ".join(t.name + ("" if t.default else " (opt-in)") for t in TARGETS))
+    ap.add_argument("targets", nargs="*", help="targets to build (default: every default target)")
+    ap.add_argument("--list", action="store_true", help="list targets, their deps and staleness")
+    ap.add_argument("--dry-run", action="store_true", help="show what would run; run nothing")
+    ap.add_argument("--force", action="store_true", help="run every selected target")
+    ap.add_argument("-j", "--jobs", type=int, default=0, metavar="N",
+                    help="targets (and per-SKU checks) run at once (default: CPU count)")
+    args = ap.parse_args()
+
+    if args.list:
+        state = load_state(ROOT)
+        for t in TARGETS:
+            recorded = state.get(t.name)
+            if not (t.command or t.per_sku):
+                mark = "group"
+            elif recorded is None or changed_paths(fingerprint(ROOT, t), recorded):
+                mark = "stale"
+            else:
+                mark = "fresh"
+            deps = f" <- {', '.join(t.deps)}" if t.deps else ""
+            print(f"  {t.name:<16} {mark:<6} {t.help}{deps}{'' if t.default else '  (opt-in)'}")
+        return 0
+    return build(args.targets, force=args.force, jobs=args.jobs, dry_run=args.dry_run)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
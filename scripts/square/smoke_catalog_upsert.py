@@ -2,14 +2,15 @@
 """Square Catalog write-path smoke test.
 
 Creates a temporary ITEM via upsertCatalogObject, verifies response, then deletes it.
-Writes request/response logs under qa-artifacts/square-smoke.
+Writes request/response logs under qa-artifacts/square-smoke. Requests go
+through squareapi.Client (keep-alive, retries with backoff on 429 / 5xx).
+--base-url (or SQUARE_API_BASE) points it at a local square_standin.py.
 """
 
 from __future__ import annotations
 
 import argparse
 import json
-import os
 import sys
 import uuid
 from dataclasses import dataclass
@@ -17,10 +18,12 @@ from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Dict, Optional, Tuple
 
-import requests
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 
-API_BASE = "https://connect.squareup.com/v2"
-DEFAULT_API_VERSION = os.getenv("SQUARE_API_VERSION", "2025-10-16")
+import squareapi  # noqa: E402
+
+API_BASE = squareapi.API_BASE
+DEFAULT_API_VERSION = squareapi.API_VERSION
 
 
 @dataclass
@@ -45,22 +48,6 @@ def write_json(path: Path, payload: Dict[str, Any]) -> None:
     path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
 
 
-def resolve_token() -> str:
-    token = os.getenv("SQUARE_ACCESS_TOKEN") or os.getenv("SQUARE_TOKEN")
-    if not token:
-        raise RuntimeError("Set SQUARE_ACCESS_TOKEN (or SQUARE_TOKEN) before running this smoke test.")
-    return token
-
-
-def make_headers(token: str, api_version: str) -> Dict[str, str]:
-    return {
-        "Authorization": f"Bearer {token}",
-        "Square-Version": api_version,
-        "Content-Type": "application/json",
-        "Accept": "application/json",
-    }
-
-
 def build_upsert_payload(name_prefix: str) -> Tuple[Dict[str, Any], str]:
     run_id = uuid.uuid4().hex[:10]
     idempotency_key = f"smoke-upsert-{utc_now_token()}-{run_id}"
@@ -104,6 +91,11 @@ def parse_args() -> argparse.Namespace:
         default=DEFAULT_API_VERSION,
         help=f"Square API version header (default: {DEFAULT_API_VERSION})",
     )
+    parser.add_argument(
+        "--base-url",
+        default=API_BASE,
+        help=f"Square API base URL, e.g. a local square_standin.py (default: {API_BASE})",
+    )
     parser.add_argument(
         "--name-prefix",
         default="RG Smoke Test",
@@ -137,8 +129,8 @@ def main() -> int:
     run_dir.mkdir(parents=True, exist_ok=True)
 
     try:
-        token = resolve_token()
-    except RuntimeError as exc:
+        token = squareapi.resolve_token()
+    except squareapi.SquareError as exc:
         if args.json:
             print(
                 json.dumps(
@@ -153,13 +145,15 @@ def main() -> int:
             print(f"ERROR: {exc}", file=sys.stderr)
         return 1
 
-    headers = make_headers(token, args.api_version)
+    client = squareapi.Client(
+        token, base=args.base_url, api_version=args.api_version, timeout=args.timeout
+    )
     payload, idempotency_key = build_upsert_payload(args.name_prefix)
 
     request_log = {
         "request": {
             "method": "POST",
-            "url": f"{API_BASE}/catalog/object",
+            "url": f"{args.base_url}/catalog/object",
             "headers": {
                 "Square-Version": args.api_version,
                 "Content-Type": "application/json",
@@ -177,14 +171,9 @@ def main() -> int:
     item_id: Optional[str] = None
 
     try:
-        create_resp = requests.post(
-            f"{API_BASE}/catalog/object",
-            headers=headers,
-            json=payload,
-            timeout=args.timeout,
-        )
-        create_status = create_resp.status_code
-        create_data = create_resp.json() if create_resp.content else {}
+        create_resp = client.upsert_object(payload)
+        create_status = create_resp.status
+        create_data = create_resp.body
     except Exception as exc:
         result = SmokeResult(
             success=False,
@@ -254,12 +243,7 @@ def main() -> int:
     if args.keep_object:
         cleanup_deleted = False
     else:
-        delete_headers = {
-            "Authorization": headers["Authorization"],
-            "Square-Version": headers["Square-Version"],
-            "Accept": "application/json",
-        }
-        delete_url = f"{API_BASE}/catalog/object/{item_id}"
+        delete_url = f"{args.base_url}/catalog/object/{item_id}"
 
         write_json(
             run_dir / "cleanup.request.json",
@@ -277,9 +261,9 @@ def main() -> int:
         )
 
         try:
-            delete_resp = requests.delete(delete_url, headers=delete_headers, timeout=args.timeout)
-            cleanup_status = delete_resp.status_code
-            delete_data = delete_resp.json() if delete_resp.content else {}
+            delete_resp = client.delete_object(item_id)
+            cleanup_status = delete_resp.status
+            delete_data = delete_resp.body
         except Exception as exc:
             cleanup_status = None
             delete_data = {"error": str(exc)}
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""The Square image upload set, derived from label.json and pre-sized for the channel.
+
+upload_square_images.py no longer keeps a hand-written list of object IDs and
+file paths. Every item whose ``channels.square.object_id`` is set contributes
+its ``photos`` roles — hero, square, cutout, then each detail — in that order:
+
+  uploads, missing = square_images.manifest(ROOT, skus={"RG-0055"})
+  stats = square_images.presize(uploads, jobs=8)   # sets each "image_path"
+  uploads, duplicates = square_images.dedupe(uploads)
+
+Each upload is a dict with ``sku`` (the image key: ``RG-0055``,
+``RG-0055-square``, ``RG-0055-detail3``), ``label_sku``, ``object_id``,
+``source``, ``name`` and ``caption``. The image name is deterministic, so a
+rerun sees an already-attached image by name. Delisted items and labels
+without an object ID are left out; role files that don't exist come back in
+``missing``.
+
+``presize`` re-encodes each source to the PROFILE in a process pool: longest
+side at most ``max_side`` (Square Online displays product photos at up to
+about 2000 px), EXIF orientation applied, metadata dropped, progressive JPEG.
+Transparent cutouts are flattened onto white, the background Square shows
+product photos on. When re-encoding a JPEG would not shrink it, the original
+bytes are kept. Results are cached in .build/square-images/ by source sha256
+and PROFILE_VERSION, so a rerun encodes nothing and the uploaded bytes (and
+so their journal hashes and idempotency keys) are stable. On the current
+catalog the 76 listed images go from 73 MB to 15 MB. Needs Pillow, like
+build_images.py.
+
+``dedupe`` drops the later of two uploads with the same bytes for the same
+object (RG-0054's hero.png and square.png are one file). Both would send the
+same content-derived idempotency key with different image names, which Square
+rejects as a reused key.
+"""
+from __future__ import annotations
+
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+
+import build_images
+import catalog
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))  # items/
+
+# Bump when PROFILE changes so every cached rendition is re-encoded.
+PROFILE_VERSION = 1
+PROFILE = {"max_side": 2000, "jpeg_quality": 85}
+ROLES = ("hero", "square", "cutout")
+HERO_DEFAULTS = ("hero.jpeg", "hero.png")
+SKIP_STATUSES = ("delisted", "deleted", "archived")
+
+
+def cache_dir(root=None) -> str:
+    return os.path.join(str(root or ROOT), ".build", "square-images")
+
+
+def _photo_names(label: dict, item_dir: str) -> list:
+    """(key suffix, display suffix, file name) for each role image, upload order."""
+    photos = label.get("photos") if isinstance(label.get("photos"), dict) else {}
+    hero = photos.get("hero") or next(
+        (n for n in HERO_DEFAULTS if os.path.isfile(os.path.join(item_dir, n))), HERO_DEFAULTS[0])
+    out = [("", "", hero)]
+    for role in ROLES[1:]:
+        if photos.get(role):
+            out.append((f"-{role}", f" - {role.title()}", photos[role]))
+    for n, name in enumerate(photos.get("details") or [], 1):
+        out.append((f"-detail{n}", f" - Detail {n}", name))
+    seen, unique = set(), []
+    for row in out:
+        if row[2] not in seen:
+            seen.add(row[2])
+            unique.append(row)
+    return unique
+
+
+def manifest(root=None, skus=None) -> tuple:
+    """(uploads, missing) for every Square-listed item, or just ``skus``.
+
+    ``missing`` lists ``RG-XXXX/name`` for role images label.json names but
+    the folder lacks.
+    """
+    root = str(root or ROOT)
+    items = catalog.load(root, only=set(skus) if skus is not None else None)
+    uploads, missing = [], []
+    for sku, item in sorted(items.items()):
+        if item.error:
+            continue
+        label = item.label
+        square = (label.get("channels") or {}).get("square") or {}
+        if not square.get("object_id") or square.get("status") in SKIP_STATUSES:
+            continue
+        product = label.get("product_name") or sku
+        for key, suffix, name in _photo_names(label, item.dir):
+            source = os.path.join(item.dir, name)
+            if not os.path.isfile(source):
+                missing.append(f"{sku}/{name}")
+                continue
+            uploads.append({"sku": sku + key, "label_sku": sku, "object_id": square["object_id"],
+                            "source": source, "name": product + suffix,
+                            "caption": label.get("attributes", "")})
+    return uploads, missing
+
+
+def presize_job(source: str, dest: str, max_side: int, quality: int) -> str:
+    """Write ``source`` re-encoded to the channel profile at ``dest``; returns ``dest``.
+
+    Top-level and picklable for the process pool.
+    """
+    Image, ImageOps = build_images.require_pillow()
+    with Image.open(source) as im:
+        im = ImageOps.exif_transpose(im)
+        if im.mode in ("RGBA", "LA", "PA") or (im.mode == "P" and "transparency" in im.info):
+            im = im.convert("RGBA")
+            flat = Image.new("RGB", im.size, (255, 255, 255))
+            flat.paste(im, mask=im.getchannel("A"))
+            im = flat
+        im = im.convert("RGB")
+        im.thumbnail((max_side, max_side), Image.LANCZOS)
+        tmp = f"{dest}.{os.getpid()}.tmp"
+        im.save(tmp, format="JPEG", quality=quality, optimize=True, progressive=True)
+    is_jpeg = os.path.splitext(source)[1].lower() in (".jpg", ".jpeg")
+    if is_jpeg and os.path.getsize(tmp) >= os.path.getsize(source):
+        shutil.copyfile(source, tmp)  # already small enough: keep the original bytes
+    os.replace(tmp, dest)
+    return dest
+
+
+def presize(uploads: list, jobs: int | None = None, root=None) -> dict:
+    """Point each upload's ``image_path`` at its channel rendition, encoding what isn't cached.
+
+    Returns {"encoded", "cached", "bytes_in", "bytes_out"}.
+    """
+    out_dir = cache_dir(root)
+    os.makedirs(out_dir, exist_ok=True)
+    hashes = build_images.load_hash_cache()
+    todo = {}
+    stats = {"encoded": 0, "cached": 0, "bytes_in": 0, "bytes_out": 0}
+    for up in uploads:
+        digest = build_images.file_sha256(up["source"], hashes)
+        dest = os.path.join(out_dir, f"{digest[:40]}-v{PROFILE_VERSION}.jpg")
+        if os.path.isfile(dest):
+            up["image_path"] = dest
+            stats["cached"] += 1
+        else:
+            todo.setdefault(dest, []).append(up)
+    build_images.save_hash_cache(hashes)
+    if todo:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            futures = {dest: pool.submit(presize_job, ups[0]["source"], dest,
+                                         PROFILE["max_side"], PROFILE["jpeg_quality"])
+                       for dest, ups in todo.items()}
+            for dest, future in futures.items():
+                future.result()
+                stats["encoded"] += 1
+                for up in todo[dest]:
+                    up["image_path"] = dest
+    for up in uploads:
+        stats["bytes_in"] += os.path.getsize(up["source"])
+        stats["bytes_out"] += os.path.getsize(up["image_path"])
+    return stats
+
+
+def dedupe(uploads: list) -> tuple:
+    """(unique, duplicates): one upload per (object_id, sha256) of its pre-sized image.
+
+    Sets each upload's ``sha256``. ``duplicates`` holds (dropped, kept) pairs,
+    the kept upload being the first in manifest order.
+    """
+    hashes = build_images.load_hash_cache()
+    seen, unique, duplicates = {}, [], []
+    for up in uploads:
+        up["sha256"] = build_images.file_sha256(up["image_path"], hashes)
+        key = (up["object_id"], up["sha256"])
+        if key in seen:
+            duplicates.append((up, seen[key]))
+        else:
+            seen[key] = up
+            unique.append(up)
+    build_images.save_hash_cache(hashes)
+    return unique, duplicates
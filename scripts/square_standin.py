@@ -0,0 +1,448 @@
+#!/usr/bin/env python3
+"""A local stand-in for the Square endpoints the scripts call, with latency and fault injection.
+
+The Square tools can be exercised offline, in CI or under load, against this
+in-memory server instead of connect.squareup.com:
+
+  square_standin.py --port 8787                      # base URL http://127.0.0.1:8787/v2
+  square_standin.py --latency lognormal:40,0.6 --rate-429 0.1 --rate-5xx 0.02 --seed 7
+  square_standin.py --state seed.json                # start from saved catalog objects
+
+  SQUARE_ACCESS_TOKEN=test python3 scripts/square/smoke_catalog_upsert.py \\
+      --base-url http://127.0.0.1:8787/v2
+  SQUARE_API_BASE=http://127.0.0.1:8787/v2 python3 upload_square_images.py --sku RG-0055
+
+Endpoints (Square Connect v2 shapes, trimmed to the fields the scripts read):
+UpsertCatalogObject, DeleteCatalogObject, RetrieveCatalogObject,
+BatchRetrieveCatalogObjects, BatchUpsertCatalogObjects, CreateCatalogImage
+(multipart), and Create/Retrieve/Delete payment links. Objects get 24-char
+IDs, ``#temp`` IDs are mapped in ``id_mappings``, and every write bumps
+``version``. An upsert carrying a stale version fails with VERSION_MISMATCH.
+Writes are idempotent by ``idempotency_key``: a replay returns the first
+response. Variations are stored as their own objects and nested back into
+their ITEM on read, as Square does.
+
+Faults, per request, drawn from one seeded RNG: ``--latency`` (``fixed:MS``,
+``uniform:LO,HI``, ``lognormal:MEDIAN_MS,SIGMA``); a 429 with
+``Retry-After`` (``--rate-429``); a 500/503 (``--rate-5xx``); and
+``--rate-conflict``, which bumps a target object's version before a
+versioned upsert, as a concurrent Dashboard edit would. ``GET
+/_standin/stats`` returns per-endpoint request counts and injected faults;
+``GET /_standin/state`` returns the objects.
+
+Tests start it in-process:
+
+    with square_standin.serve(Config(rate_429=0.2, seed=1)) as standin:
+        client = squareapi.Client("test", base=standin.base_url)
+"""
+from __future__ import annotations
+
+import argparse
+import collections
+import contextlib
+import copy
+import json
+import math
+import random
+import re
+import string
+import threading
+import time
+from dataclasses import dataclass
+from email.parser import BytesParser
+from email.policy import HTTP
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+PREFIX = "/v2"
+_ID_CHARS = string.ascii_uppercase + string.digits
+
+
+@dataclass
+class Config:
+    latency: str = "fixed:0"     # fixed:MS | uniform:LO,HI | lognormal:MEDIAN_MS,SIGMA
+    rate_429: float = 0.0
+    rate_5xx: float = 0.0
+    rate_conflict: float = 0.0
+    retry_after: float = 1.0     # seconds, sent with injected 429s
+    seed: int | None = None
+
+
+def latency_sampler(spec: str, rng: random.Random):
+    """A zero-argument callable returning one delay in seconds for ``spec``."""
+    kind, _, args = spec.partition(":")
+    try:
+        nums = [float(a) for a in args.split(",")] if args else []
+        if kind == "fixed" and len(nums) == 1:
+            return lambda: nums[0] / 1000
+        if kind == "uniform" and len(nums) == 2:
+            return lambda: rng.uniform(*nums) / 1000
+        if kind == "lognormal" and len(nums) == 2:
+            mu = math.log(max(nums[0], 1e-3))
+            return lambda: rng.lognormvariate(mu, nums[1]) / 1000
+    except ValueError:
+        pass
+    raise ValueError(f"bad latency spec {spec!r} (fixed:MS, uniform:LO,HI, lognormal:MEDIAN_MS,SIGMA)")
+
+
+class ApiError(Exception):
+    def __init__(self, status: int, code: str, detail: str, category="INVALID_REQUEST_ERROR"):
+        super().__init__(detail)
+        self.status, self.body = status, {"errors": [{"category": category, "code": code,
+                                                      "detail": detail}]}
+
+
+class Catalog:
+    """The in-memory Square state; every method runs under ``lock``."""
+
+    def __init__(self, rng: random.Random):
+        self.rng = rng
+        self.lock = threading.Lock()
+        self.objects = {}        # id -> object (variations stored flat)
+        self.links = {}          # payment link id -> link
+        self.replies = {}        # (route, idempotency_key) -> (status, body)
+        self._version = int(time.time() * 1000)
+
+    def new_id(self, n: int = 24) -> str:
+        return "".join(self.rng.choice(_ID_CHARS) for _ in range(n))
+
+    def next_version(self) -> int:
+        self._version += 1
+        return self._version
+
+    # -- reads -----------------------------------------------------------------
+
+    def view(self, oid: str) -> dict:
+        """The stored object as Square returns it: an ITEM with its variations nested."""
+        obj = copy.deepcopy(self.objects[oid])
+        if obj["type"] == "ITEM":
+            obj["item_data"]["variations"] = [
+                copy.deepcopy(v) for v in self.objects.values()
+                if v["type"] == "ITEM_VARIATION" and v["item_variation_data"].get("item_id") == oid]
+        return obj
+
+    def related(self, objs: list) -> list:
+        ids = {i for o in objs for i in (o.get("item_data") or {}).get("image_ids", [])}
+        return [self.view(i) for i in sorted(ids) if i in self.objects]
+
+    def retrieve(self, oid: str) -> dict:
+        if oid not in self.objects:
+            raise ApiError(404, "NOT_FOUND", f"Object with ID `{oid}` not found.")
+        return {"object": self.view(oid)}
+
+    def batch_retrieve(self, body: dict) -> dict:
+        objs = [self.view(i) for i in body.get("object_ids") or [] if i in self.objects]
+        out = {"objects": objs}
+        if body.get("include_related_objects"):
+            out["related_objects"] = self.related(objs)
+        return out
+
+    # -- writes ----------------------------------------------------------------
+
+    def _check_version(self, obj: dict, conflict: bool):
+        current = self.objects.get(obj.get("id"))
+        if current is None or "version" not in obj:
+            return
+        if conflict:
+            current["version"] = self.next_version()  # someone else saved it first
+        if obj["version"] != current["version"]:
+            raise ApiError(400, "VERSION_MISMATCH",
+                           f"Object version does not match for object: {obj['id']}")
+
+    def _store(self, obj: dict, mappings: list, parent: str | None = None) -> dict:
+        obj = copy.deepcopy(obj)
+        cid = obj.get("id") or ""
+        if cid.startswith("#") or cid not in self.objects:
+            oid = self.new_id()
+            if cid:
+                mappings.append({"client_object_id": cid, "object_id": oid})
+        else:
+            oid = cid
+        obj.update(id=oid, version=self.next_version(), is_deleted=False,
+                   updated_at=time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()))
+        obj.setdefault("present_at_all_locations", True)
+        if obj["type"] == "ITEM":
+            data = obj.setdefault("item_data", {})
+            variations = data.pop("variations", None)
+            if oid in self.objects:
+                data.setdefault("image_ids", self.objects[oid]["item_data"].get("image_ids", []))
+            self.objects[oid] = obj
+            for var in variations or []:
+                self._store(var, mappings, parent=oid)
+        else:
+            if obj["type"] == "ITEM_VARIATION":
+                data = obj.setdefault("item_variation_data", {})
+                item_id = parent or data.get("item_id")
+                item_id = next((m["object_id"] for m in mappings
+                                if m["client_object_id"] == item_id), item_id)
+                data["item_id"] = item_id
+            self.objects[oid] = obj
+        return obj
+
+    def upsert(self, body: dict, conflict: bool) -> dict:
+        obj = body.get("object") or {}
+        self._check_version(obj, conflict)
+        mappings = []
+        stored = self._store(obj, mappings)
+        return {"catalog_object": self.view(stored["id"]), "id_mappings": mappings}
+
+    def batch_upsert(self, body: dict, conflict: bool) -> dict:
+        objs = [o for batch in body.get("batches") or [] for o in batch.get("objects") or []]
+        for n, obj in enumerate(objs):  # all-or-nothing, like Square
+            self._check_version(obj, conflict and n == 0)
+        mappings = []
+        stored = [self._store(o, mappings) for o in objs]
+        return {"objects": [self.view(o["id"]) for o in stored], "id_mappings": mappings}
+
+    def delete(self, oid: str) -> dict:
+        if oid not in self.objects:
+            raise ApiError(404, "NOT_FOUND", f"Object with ID `{oid}` not found.")
+        gone = [oid] + [v["id"] for v in list(self.objects.values())
+                        if v["type"] == "ITEM_VARIATION"
+                        and v["item_variation_data"].get("item_id") == oid]
+        for i in gone:
+            del self.objects[i]
+        return {"deleted_object_ids": gone,
+                "deleted_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())}
+
+    def create_image(self, request: dict, data: bytes) -> dict:
+        target = request.get("object_id")
+        if target and target not in self.objects:
+            raise ApiError(404, "NOT_FOUND", f"Object with ID `{target}` not found.")
+        if not data:
+            raise ApiError(400, "INVALID_VALUE", "image_file is required")
+        image = copy.deepcopy(request.get("image") or {"type": "IMAGE", "image_data": {}})
+        image.update(type="IMAGE", id=self.new_id(), version=self.next_version())
+        image.setdefault("image_data", {})["url"] = f"https://standin.invalid/{image['id']}.jpg"
+        self.objects[image["id"]] = image
+        if target and self.objects[target]["type"] == "ITEM":
+            self.objects[target]["item_data"].setdefault("image_ids", []).append(image["id"])
+        return {"image": copy.deepcopy(image)}
+
+    def create_link(self, body: dict) -> dict:
+        if not (body.get("quick_pay") or body.get("order")):
+            raise ApiError(400, "MISSING_REQUIRED_PARAMETER", "quick_pay or order is required")
+        lid = self.new_id(16)
+        link = {"id": lid, "version": 1, "order_id": self.new_id(29),
+                "url": f"https://square.link/u/{self.new_id(8)}",
+                "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())}
+        self.links[lid] = link
+        return {"payment_link": dict(link)}
+
+    def link(self, lid: str, delete: bool = False) -> dict:
+        if lid not in self.links:
+            raise ApiError(404, "NOT_FOUND", f"Payment link `{lid}` not found.")
+        if delete:
+            return {"id": lid, "cancelled_order_id": self.links.pop(lid)["order_id"]}
+        return {"payment_link": dict(self.links[lid])}
+
+
+def _multipart(content_type: str, body: bytes) -> tuple:
+    """(request JSON, image bytes) from a CreateCatalogImage body."""
+    msg = BytesParser(policy=HTTP).parsebytes(
+        f"Content-Type: {content_type}\r\n\r\n".encode("latin-1") + body)
+    request, data = {}, b""
+    for part in msg.iter_parts():
+        name = part.get_param("name", header="content-disposition")
+        payload = part.get_payload(decode=True) or b""
+        if name == "request":
+            request = json.loads(payload)
+        elif name == "image_file":
+            data = payload
+    return request, data
+
+
+# (method, path regex) -> (endpoint name, Catalog call); path is relative to PREFIX.
+ROUTES = [
+    ("GET", r"/catalog/object/([^/]+)", "RetrieveCatalogObject",
+     lambda c, m, b, x: c.retrieve(m[1])),
+    ("DELETE", r"/catalog/object/([^/]+)", "DeleteCatalogObject",
+     lambda c, m, b, x: c.delete(m[1])),
+    ("POST", r"/catalog/object", "UpsertCatalogObject",
+     lambda c, m, b, x: c.upsert(b, x)),
+    ("POST", r"/catalog/batch-retrieve", "BatchRetrieveCatalogObjects",
+     lambda c, m, b, x: c.batch_retrieve(b)),
+    ("POST", r"/catalog/batch-upsert", "BatchUpsertCatalogObjects",
+     lambda c, m, b, x: c.batch_upsert(b, x)),
+    ("POST", r"/catalog/images", "CreateCatalogImage",
+     lambda c, m, b, x: c.create_image(*b)),
+    ("POST", r"/online-checkout/payment-links", "CreatePaymentLink",
+     lambda c, m, b, x: c.create_link(b)),
+    ("GET", r"/online-checkout/payment-links/([^/]+)", "RetrievePaymentLink",
+     lambda c, m, b, x: c.link(m[1])),
+    ("DELETE", r"/online-checkout/payment-links/([^/]+)", "DeletePaymentLink",
+     lambda c, m, b, x: c.link(m[1], delete=True)),
+]
+_ROUTES = [(method, re.compile(pattern + r"/?"), name, call)
+           for method, pattern, name, call in ROUTES]
+_VERSIONED = ("UpsertCatalogObject", "BatchUpsertCatalogObjects")
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: "StandIn"
+
+    def log_message(self, *args):
+        pass
+
+    def _reply(self, status: int, body: dict, headers=()):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for k, v in headers:
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _handle(self, method: str):
+        srv = self.server
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        path = urlsplit(self.path).path
+        if path == "/_standin/stats":
+            with srv.catalog.lock:
+                return self._reply(200, {"requests": dict(srv.requests),
+                                         "faults": dict(srv.faults)})
+        if path == "/_standin/state":
+            with srv.catalog.lock:
+                return self._reply(200, {"objects": list(srv.catalog.objects.values()),
+                                         "payment_links": list(srv.catalog.links.values())})
+        if not self.headers.get("Authorization", "").startswith("Bearer "):
+            return self._reply(401, ApiError(401, "UNAUTHORIZED", "Missing bearer token",
+                                             "AUTHENTICATION_ERROR").body)
+        route = None
+        if path.startswith(PREFIX):
+            route = next(((name, call, m) for meth, rx, name, call in _ROUTES
+                          if meth == method and (m := rx.fullmatch(path[len(PREFIX):]))), None)
+        if route is None:
+            return self._reply(404, ApiError(404, "NOT_FOUND", f"No route {method} {path}").body)
+        name, call, match = route
+
+        with srv.catalog.lock:
+            srv.requests[name] += 1
+            delay = srv.latency()
+            roll = srv.rng.random()
+            fault = None
+            if roll < srv.config.rate_429:
+                fault = 429
+            elif roll < srv.config.rate_429 + srv.config.rate_5xx:
+                fault = srv.rng.choice((500, 503))
+            if fault:
+                srv.faults[str(fault)] += 1
+            conflict = name in _VERSIONED and srv.rng.random() < srv.config.rate_conflict
+        time.sleep(delay)
+        if fault == 429:
+            return self._reply(429, ApiError(429, "RATE_LIMITED", "Rate limit exceeded",
+                                             "RATE_LIMIT_ERROR").body,
+                               [("Retry-After", f"{srv.config.retry_after:g}")])
+        if fault:
+            return self._reply(fault, ApiError(fault, "SERVICE_UNAVAILABLE", "Injected fault",
+                                               "API_ERROR").body)
+        try:
+            if name == "CreateCatalogImage":
+                payload = _multipart(self.headers.get("Content-Type", ""), body)
+                key = payload[0].get("idempotency_key")
+            else:
+                payload = json.loads(body) if body else {}
+                key = payload.get("idempotency_key") if isinstance(payload, dict) else None
+        except ValueError:
+            return self._reply(400, ApiError(400, "INVALID_REQUEST_ERROR", "Malformed body").body)
+
+        with srv.catalog.lock:
+            if key and (name, key) in srv.catalog.replies:
+                return self._reply(*srv.catalog.replies[(name, key)])
+            try:
+                status, out = 200, call(srv.catalog, match, payload, conflict)
+            except ApiError as e:
+                status, out = e.status, e.body
+                if e.body["errors"][0]["code"] == "VERSION_MISMATCH":
+                    srv.faults["version_mismatch"] += 1
+            if key and status == 200:
+                srv.catalog.replies[(name, key)] = (status, out)
+        self._reply(status, out)
+
+    def do_GET(self):
+        self._handle("GET")
+
+    def do_POST(self):
+        self._handle("POST")
+
+    def do_DELETE(self):
+        self._handle("DELETE")
+
+
+class StandIn(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, config: Config = None, host: str = "127.0.0.1", port: int = 0):
+        super().__init__((host, port), Handler)
+        self.config = config or Config()
+        self.rng = random.Random(self.config.seed)
+        self.latency = latency_sampler(self.config.latency, self.rng)
+        self.catalog = Catalog(self.rng)
+        self.requests = collections.Counter()
+        self.faults = collections.Counter()
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}{PREFIX}"
+
+    def load(self, objects: list) -> None:
+        """Seed the catalog with stored objects (as ``/_standin/state`` returns them)."""
+        with self.catalog.lock:
+            for obj in objects:
+                self.catalog.objects[obj["id"]] = copy.deepcopy(obj)
+
+
+@contextlib.contextmanager
+def serve(config: Config = None, objects=()):
+    """A StandIn on a free port, serving from a daemon thread for the ``with`` block."""
+    server = StandIn(config)
+    server.load(list(objects))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Serve an in-memory Square API stand-in.")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8787)
+    ap.add_argument("--latency", default="fixed:0",
+                    help="per-request delay: fixed:MS, uniform:LO,HI or lognormal:MEDIAN_MS,SIGMA")
+    ap.add_argument("--rate-429", type=float, default=0.0, help="fraction of requests rate-limited")
+    ap.add_argument("--rate-5xx", type=float, default=0.0, help="fraction of requests failing 5xx")
+    ap.add_argument("--rate-conflict", type=float, default=0.0,
+                    help="fraction of versioned upserts hit by a concurrent edit")
+    ap.add_argument("--retry-after", type=float, default=1.0, help="Retry-After seconds on 429s")
+    ap.add_argument("--seed", type=int, help="RNG seed for IDs, latency and faults")
+    ap.add_argument("--state", help="JSON file of catalog objects to start from")
+    args = ap.parse_args()
+
+    config = Config(latency=args.latency, rate_429=args.rate_429, rate_5xx=args.rate_5xx,
+                    rate_conflict=args.rate_conflict, retry_after=args.retry_after, seed=args.seed)
+    try:
+        server = StandIn(config, args.host, args.port)
+    except ValueError as e:
+        ap.error(str(e))
+    if args.state:
+        with open(args.state, encoding="utf-8") as fh:
+            data = json.load(fh)
+        server.load(data["objects"] if isinstance(data, dict) else data)
+    print(f"Square stand-in on {server.base_url}  (Ctrl-C to stop)", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,447 @@
+#!/usr/bin/env python3
+"""Pooled, retrying Square API client shared by the Square scripts.
+
+upload_square_images.py and square/smoke_catalog_upsert.py talk to Square
+through one ``Client``:
+
+    client = squareapi.Client(squareapi.resolve_token())
+    resp = client.post("/catalog/object", {"idempotency_key": ..., "object": ...})
+    resp.ok, resp.status, resp.body                        # body is the decoded JSON
+    items = client.catalog_items(object_ids)               # batch-retrieve, 1000 IDs a call
+    for item, resp in client.map(upload, items):           # bounded worker pool
+        ...
+    print(client.stats.summary())                          # per-endpoint latency
+
+Connections are kept alive and reused from a small pool (one per worker), so a
+batch pays the TLS handshake once per worker rather than once per request.
+``map`` runs a callable over a work list on ``workers`` threads with at most
+twice that many tasks queued, so a large batch never reads every image into
+memory at once. Results come back in completion order.
+
+A 429 or 5xx response, or a dropped connection, is retried up to
+``retries`` times. The delay honours ``Retry-After`` when Square sends one,
+and otherwise backs off exponentially (``backoff * 2**attempt``, capped at
+``max_backoff``). Full jitter keeps a pool of workers from retrying in
+lock-step. Every Square write carries an idempotency key, so retrying a POST
+whose response was lost is safe. Other 4xx responses are returned at once for
+the caller to report.
+
+Image uploads are made resumable by ``UploadJournal``, an append-only JSONL
+file mapping (SKU, object ID, image SHA-256) to the Square image ID. Each
+finished upload is fsync'd as its own line, so a crash loses at most the
+upload in flight. A rerun skips every journalled image. The idempotency key is
+derived from the same content hash (``image_idempotency_key``), so an upload
+whose response was lost replays to the same image rather than a duplicate.
+
+Pure stdlib (http.client), so the scripts run wherever python3 does.
+"""
+from __future__ import annotations
+
+import collections
+import hashlib
+import http.client
+import json
+import os
+import queue
+import random
+import re
+import threading
+import time
+import uuid
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from urllib.parse import urlsplit
+
+# SQUARE_API_BASE points every script at another server, e.g. square_standin.py.
+API_BASE = os.getenv("SQUARE_API_BASE", "https://connect.squareup.com/v2")
+API_VERSION = os.getenv("SQUARE_API_VERSION", "2025-10-16")
+
+BATCH_RETRIEVE_LIMIT = 1000  # object_ids per BatchRetrieveCatalogObjects call
+BATCH_UPSERT_BATCH = 1000    # objects per batch in BatchUpsertCatalogObjects
+BATCH_UPSERT_TOTAL = 10000   # objects per BatchUpsertCatalogObjects call
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+_TRANSIENT = (OSError, http.client.HTTPException)  # resets, timeouts, DNS
+# Square object / payment-link IDs are upper-case letters and digits; client IDs
+# start with "#". Route words (batch-retrieve, payment-links) are lower case.
+_ID_SEGMENT = re.compile(r"/(?:#[^/]+|[A-Z0-9]{12,})(?=/|$)")
+
+
+class SquareError(RuntimeError):
+    """A request that never got an HTTP response (connection failures, retries exhausted)."""
+
+
+def resolve_token() -> str:
+    token = os.getenv("SQUARE_ACCESS_TOKEN") or os.getenv("SQUARE_TOKEN")
+    if not token:
+        raise SquareError("Set SQUARE_ACCESS_TOKEN (or SQUARE_TOKEN) before running.")
+    return token
+
+
+@dataclass
+class Response:
+    status: int
+    body: dict
+    headers: dict = field(default_factory=dict)
+    seconds: float = 0.0  # wall time of the final attempt
+    attempts: int = 1
+
+    @property
+    def ok(self) -> bool:
+        return self.status // 100 == 2
+
+    def error_detail(self) -> str:
+        """The first Square error's detail, for one-line reports."""
+        errors = self.body.get("errors") if isinstance(self.body, dict) else None
+        if not errors:
+            return f"HTTP {self.status}"
+        first = errors[0]
+        return first.get("detail") or first.get("code") or str(first)
+
+
+class Stats:
+    """Per-endpoint attempt latencies, statuses and retries; thread-safe."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latency = collections.defaultdict(list)  # endpoint -> [seconds per attempt]
+        self.statuses = collections.Counter()
+        self.retries = 0
+
+    def record(self, endpoint: str, seconds: float, status, retried: bool):
+        with self._lock:
+            self.latency[endpoint].append(seconds)
+            self.statuses[status] += 1
+            self.retries += retried
+
+    def summary(self) -> str:
+        with self._lock:
+            lines = []
+            for endpoint, times in sorted(self.latency.items()):
+                times = sorted(times)
+                p50 = times[len(times) // 2]
+                p95 = times[min(len(times) - 1, int(len(times) * 0.95))]
+                lines.append(f"  {endpoint:<40} {len(times):>5} req  p50 {p50 * 1000:7.1f} ms"
+                             f"  p95 {p95 * 1000:7.1f} ms  max {times[-1] * 1000:7.1f} ms")
+            total = sum(self.statuses.values())
+            statuses = ", ".join(f"{s}: {n}" for s, n in sorted(self.statuses.items(), key=str))
+            lines.append(f"  {total} attempt(s), {self.retries} retried ({statuses or 'none'})")
+            return "\n".join(lines)
+
+
+@dataclass
+class CatalogItem:
+    """What the upload and price tools need from one ITEM: images and variation prices."""
+    id: str
+    version: int | None = None
+    name: str = ""
+    image_ids: list = field(default_factory=list)
+    image_names: dict = field(default_factory=dict)  # image id -> image_data.name
+    variations: dict = field(default_factory=dict)   # variation id -> {"version", "amount"}
+
+    @classmethod
+    def from_object(cls, obj: dict, related: dict) -> "CatalogItem":
+        data = obj.get("item_data") or {}
+        image_ids = list(data.get("image_ids") or [])
+        variations = {}
+        for var in data.get("variations") or []:
+            money = (var.get("item_variation_data") or {}).get("price_money") or {}
+            variations[var["id"]] = {"version": var.get("version"), "amount": money.get("amount")}
+        return cls(id=obj["id"], version=obj.get("version"), name=data.get("name", ""),
+                   image_ids=image_ids,
+                   image_names={i: (related.get(i, {}).get("image_data") or {}).get("name", "")
+                                for i in image_ids},
+                   variations=variations)
+
+    def price_cents(self, variation_id: str = None):
+        """The variation's price (the only variation's when ``variation_id`` is None)."""
+        if variation_id is None and len(self.variations) == 1:
+            variation_id = next(iter(self.variations))
+        return self.variations.get(variation_id, {}).get("amount")
+
+
+def cents(price) -> int | None:
+    """A label price ("$40", "40.00", 40) in cents; None when it isn't a number."""
+    try:
+        return round(float(str(price).replace("$", "").strip()) * 100)
+    except ValueError:
+        return None
+
+
+def sha256_file(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for block in iter(lambda: fh.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def image_idempotency_key(object_id: str, sha256: str) -> str:
+    """The same image bytes on the same object always carry the same key (<= 128 chars)."""
+    return f"img-{object_id}-{sha256[:64]}"
+
+
+class UploadJournal:
+    """Finished image uploads on disk: (sku, object_id, sha256) -> Square image ID."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self.done = {}
+        self._torn = False  # last line cut short by a crash: start on a fresh line
+        try:
+            with open(path, encoding="utf-8") as fh:
+                for line in fh:
+                    self._torn = not line.endswith("\n")
+                    try:
+                        rec = json.loads(line)
+                        self.done[(rec["sku"], rec["object_id"], rec["sha256"])] = rec["image_id"]
+                    except (ValueError, KeyError, TypeError):
+                        continue
+        except FileNotFoundError:
+            pass
+
+    def get(self, sku: str, object_id: str, sha256: str) -> str | None:
+        return self.done.get((sku, object_id, sha256))
+
+    def record(self, sku: str, object_id: str, sha256: str, image_id: str) -> None:
+        line = json.dumps({"sku": sku, "object_id": object_id, "sha256": sha256,
+                           "image_id": image_id, "at": time.strftime("%Y-%m-%dT%H:%M:%S")})
+        with self._lock:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as fh:
+                fh.write(("\n" if self._torn else "") + line + "\n")
+                fh.flush()
+                os.fsync(fh.fileno())
+            self._torn = False
+            self.done[(sku, object_id, sha256)] = image_id
+
+
+def endpoint_name(method: str, path: str) -> str:
+    """``POST /catalog/object/{id}`` — object IDs folded so stats group by endpoint."""
+    return f"{method} {_ID_SEGMENT.sub('/{id}', path.split('?', 1)[0])}"
+
+
+def multipart(request: dict, filename: str, data: bytes, content_type: str) -> tuple:
+    """(body, content-type header) for CreateCatalogImage's request + image_file parts."""
+    boundary = uuid.uuid4().hex
+    head = (f'--{boundary}\r\nContent-Disposition: form-data; name="request"\r\n'
+            f"Content-Type: application/json\r\n\r\n{json.dumps(request)}\r\n"
+            f'--{boundary}\r\nContent-Disposition: form-data; name="image_file"; '
+            f'filename="{filename}"\r\nContent-Type: {content_type}\r\n\r\n')
+    body = head.encode("utf-8") + data + f"\r\n--{boundary}--\r\n".encode("ascii")
+    return body, f"multipart/form-data; boundary={boundary}"
+
+
+class Client:
+    """Square Connect v2 over pooled keep-alive connections."""
+
+    def __init__(self, token: str, *, base: str = API_BASE, api_version: str = API_VERSION,
+                 timeout: float = 30.0, workers: int = 8, retries: int = 5,
+                 backoff: float = 0.5, max_backoff: float = 30.0, sleep=time.sleep):
+        url = urlsplit(base)
+        if url.scheme not in ("http", "https") or not url.hostname:
+            raise ValueError(f"not an http(s) base URL: {base!r}")
+        self.base = base.rstrip("/")
+        self._conn_class = (http.client.HTTPSConnection if url.scheme == "https"
+                            else http.client.HTTPConnection)
+        self._host, self._port, self._prefix = url.hostname, url.port, url.path.rstrip("/")
+        self.api_version = api_version
+        self.timeout = timeout
+        self.workers = workers
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self._sleep = sleep
+        self._headers = {"Authorization": f"Bearer {token}", "Square-Version": api_version,
+                         "Accept": "application/json"}
+        self._pool = queue.LifoQueue(maxsize=workers)
+        self.stats = Stats()
+
+    # -- connections ---------------------------------------------------------
+
+    def _acquire(self):
+        try:
+            return self._pool.get_nowait()
+        except queue.Empty:
+            return self._conn_class(self._host, self._port, timeout=self.timeout)
+
+    def _release(self, conn):
+        try:
+            self._pool.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+    def close(self):
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                return
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # -- requests ------------------------------------------------------------
+
+    def _delay(self, attempt: int, retry_after) -> float:
+        ceiling = min(self.max_backoff, self.backoff * 2 ** attempt)
+        try:
+            floor = min(self.max_backoff, float(retry_after))
+        except (TypeError, ValueError):
+            return random.uniform(0, ceiling)
+        return floor + random.uniform(0, min(ceiling, self.backoff))
+
+    def _attempt(self, method: str, path: str, body, headers: dict) -> tuple:
+        conn = self._acquire()
+        try:
+            conn.request(method, self._prefix + path, body=body, headers=headers)
+            raw = conn.getresponse()
+            data = raw.read()
+        except BaseException:
+            conn.close()
+            raise
+        self._release(conn)
+        try:
+            payload = json.loads(data) if data else {}
+        except ValueError:
+            payload = {"errors": [{"detail": data[:200].decode("utf-8", "replace")}]}
+        return raw.status, payload, {k.lower(): v for k, v in raw.getheaders()}
+
+    def request(self, method: str, path: str, json_body=None, *, body: bytes = None,
+                content_type: str = None) -> Response:
+        """One API call, retried on 429/5xx and dropped connections.
+
+        ``path`` is relative to the base URL (``/catalog/object``). Raises
+        SquareError when every attempt failed without an HTTP response.
+        """
+        headers = dict(self._headers)
+        if json_body is not None:
+            body, content_type = json.dumps(json_body).encode("utf-8"), "application/json"
+        if content_type:
+            headers["Content-Type"] = content_type
+        endpoint = endpoint_name(method, path)
+        for attempt in range(self.retries + 1):
+            last = attempt == self.retries
+            start = time.perf_counter()
+            try:
+                status, payload, resp_headers = self._attempt(method, path, body, headers)
+            except _TRANSIENT as e:
+                self.stats.record(endpoint, time.perf_counter() - start, type(e).__name__, not last)
+                if last:
+                    raise SquareError(f"{method} {path}: {e} (after {attempt + 1} attempt(s))") from e
+                self._sleep(self._delay(attempt, None))
+                continue
+            seconds = time.perf_counter() - start
+            retry = status in RETRY_STATUSES and not last
+            self.stats.record(endpoint, seconds, status, retry)
+            if not retry:
+                return Response(status, payload, resp_headers, seconds, attempt + 1)
+            self._sleep(self._delay(attempt, resp_headers.get("retry-after")))
+        raise AssertionError("unreachable")
+
+    def get(self, path: str) -> Response:
+        return self.request("GET", path)
+
+    def post(self, path: str, json_body: dict) -> Response:
+        return self.request("POST", path, json_body)
+
+    def delete(self, path: str) -> Response:
+        return self.request("DELETE", path)
+
+    # -- catalog -------------------------------------------------------------
+
+    def retrieve_object(self, object_id: str) -> Response:
+        return self.get(f"/catalog/object/{object_id}")
+
+    def upsert_object(self, payload: dict) -> Response:
+        return self.post("/catalog/object", payload)
+
+    def delete_object(self, object_id: str) -> Response:
+        return self.delete(f"/catalog/object/{object_id}")
+
+    def create_image(self, request: dict, filename: str, data: bytes,
+                     content_type: str) -> Response:
+        """CreateCatalogImage: ``request`` JSON plus the image bytes as multipart."""
+        body, ctype = multipart(request, filename, data, content_type)
+        return self.request("POST", "/catalog/images", body=body, content_type=ctype)
+
+    def batch_retrieve(self, object_ids, *, related: bool = True) -> tuple:
+        """({id: object}, {id: related object}) via chunked BatchRetrieveCatalogObjects.
+
+        One request per BATCH_RETRIEVE_LIMIT IDs, sent concurrently; IDs Square
+        doesn't know are simply absent. Raises SquareError on an error response.
+        """
+        ids = list(dict.fromkeys(object_ids))
+        chunks = [ids[i:i + BATCH_RETRIEVE_LIMIT] for i in range(0, len(ids), BATCH_RETRIEVE_LIMIT)]
+        objects, related_objects = {}, {}
+
+        def fetch(chunk):
+            return self.post("/catalog/batch-retrieve",
+                             {"object_ids": chunk, "include_related_objects": related})
+
+        for _, resp in self.map(fetch, chunks):
+            if isinstance(resp, Exception):
+                raise resp
+            if not resp.ok:
+                raise SquareError(f"BatchRetrieveCatalogObjects: {resp.error_detail()}")
+            objects.update((o["id"], o) for o in resp.body.get("objects") or [])
+            related_objects.update((o["id"], o) for o in resp.body.get("related_objects") or [])
+        return objects, related_objects
+
+    def catalog_items(self, object_ids) -> dict:
+        """{id: CatalogItem} for the ITEMs among ``object_ids``, images and prices included."""
+        objects, related = self.batch_retrieve(object_ids)
+        return {oid: CatalogItem.from_object(obj, related) for oid, obj in objects.items()
+                if obj.get("type") == "ITEM" and not obj.get("is_deleted")}
+
+    def batch_upsert(self, objects: list) -> dict:
+        """Upsert ``objects`` via BatchUpsertCatalogObjects; returns {id: upserted object}.
+
+        Objects go in batches of BATCH_UPSERT_BATCH, up to BATCH_UPSERT_TOTAL
+        per call, calls sent in order. Each call's idempotency key is a hash
+        of its body, so rerunning the same change replays instead of
+        re-applying. Raises SquareError on an error response (a stale
+        ``version`` comes back as VERSION_MISMATCH).
+        """
+        out = {}
+        for start in range(0, len(objects), BATCH_UPSERT_TOTAL):
+            chunk = objects[start:start + BATCH_UPSERT_TOTAL]
+            batches = [{"objects": chunk[i:i + BATCH_UPSERT_BATCH]}
+                       for i in range(0, len(chunk), BATCH_UPSERT_BATCH)]
+            digest = hashlib.sha256(json.dumps(batches, sort_keys=True).encode("utf-8"))
+            resp = self.post("/catalog/batch-upsert", {
+                "idempotency_key": f"batch-upsert-{digest.hexdigest()[:64]}", "batches": batches})
+            if not resp.ok:
+                raise SquareError(f"BatchUpsertCatalogObjects: {resp.error_detail()}")
+            out.update((o["id"], o) for o in resp.body.get("objects") or [])
+        return out
+
+    # -- concurrency ---------------------------------------------------------
+
+    def map(self, fn, items, workers: int = None):
+        """Yield ``(item, fn(item))`` on a bounded thread pool, in completion order.
+
+        At most ``2 * workers`` calls are queued at a time. An exception raised
+        by ``fn`` is yielded in place of its result.
+        """
+        workers = workers or self.workers
+        items = iter(items)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            pending = {}
+            while True:
+                for item in items:
+                    pending[pool.submit(fn, item)] = item
+                    if len(pending) >= 2 * workers:
+                        break
+                if not pending:
+                    return
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    try:
+                        result = future.result()
+                    except Exception as e:  # noqa: BLE001 - handed to the caller
+                        result = e
+                    yield pending.pop(future), result
@@ -1,2 +1,49 @@
 import sys, pathlib
 sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1]))
+
+import json
+
+import pytest
+
+import build_gallery as bg
+
+
+def label(sku, state="Listed", name=None):
+    """A minimal label.json for a gallery test item."""
+    return {"sku": sku, "state": state, "product_name": name or f"Item {sku}",
+            "price": "10.00", "added_at": "2025-01-01"}
+
+
+def write_label(root, sku, **kw):
+    """(Re)write ``root/sku/label.json``; returns the label."""
+    lab = label(sku, **kw)
+    (pathlib.Path(root) / sku / "label.json").write_text(json.dumps(lab))
+    return lab
+
+
+def write_item(root, sku, **kw):
+    """An item directory with an (empty) hero.png and its label.json; returns the label."""
+    d = pathlib.Path(root) / sku
+    d.mkdir()
+    (d / "hero.png").write_bytes(b"")
+    return write_label(root, sku, **kw)
+
+
+def index_page(cards=(), count=0):
+    """An index.html skeleton: the item count, the grid with ``cards``, the placeholder."""
+    return (
+        f'<div class="stat-number" id="item-count">{count}</div>\n'
+        '        <div class="items-grid">\n'
+        + "\n\n".join(cards) + "\n\n"
+        "            " + bg.PLACEHOLDER + "\n"
+        "        </div>\n</body>\n"
+    )
+
+
+@pytest.fixture
+def gallery_root(tmp_path, monkeypatch):
+    """tmp_path as the items/ tree build_gallery reads and writes."""
+    monkeypatch.setattr(bg, "ROOT", str(tmp_path))
+    monkeypatch.setattr(bg, "INDEX", str(tmp_path / "index.html"))
+    monkeypatch.setattr(bg, "FEED", str(tmp_path / "items.json"))
+    return tmp_path
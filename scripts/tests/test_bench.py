@@ -0,0 +1,52 @@
+"""Tests for bench/ — the synthetic catalog generator and benchmark history."""
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "bench"))
+
+import bench_catalog  # noqa: E402
+import build_gallery as bg  # noqa: E402
+import build_item_page as bip  # noqa: E402
+import synth  # noqa: E402
+
+
+def test_parse_size_and_sku_width():
+    assert [synth.parse_size(s) for s in ("1k", "10K", "2500", "0.1m")] == [1000, 10000, 2500, 100000]
+    assert synth.sku_width(1000) == 4 and synth.sku_width(100000) == 6
+
+
+def test_generate_mixed_catalog_with_gallery_work(tmp_path):
+    root = synth.generate(120, seed=3, out=str(tmp_path / "cat"))
+    assert bip.ROOT == synth.ROOT  # modules point back at the real tree
+    assert synth.generate(120, seed=3, out=root) == root  # current tree is reused
+
+    labels = {sku: json.loads((tmp_path / "cat" / sku / "label.json").read_text())
+              for sku in os.listdir(root) if sku.startswith("RG-")}
+    assert len(labels) == 120 and "RG-0001" in labels
+    assert any("page" in lab for lab in labels.values())
+    assert any(lab["state"] == "Draft" for lab in labels.values())
+    assert any(os.path.isdir(os.path.join(root, sku, "buy")) for sku in labels)
+
+    synth.point_at(root)
+    try:
+        with open(bg.INDEX, encoding="utf-8") as fh:
+            text = fh.read()
+        items = bg.load_items()
+        _, inserted, skipped, _ = bg.reconcile(text, items)
+        assert inserted and not skipped  # the uncarded Listed item(s)
+        assert "RG-0100" in inserted
+        assert "RG-0001" in bg.carded_skus(text)
+    finally:
+        synth.point_at(synth.ROOT)
+
+
+def test_history_baseline_uses_newest_run_at_commit(tmp_path):
+    path = str(tmp_path / "history.jsonl")
+    for commit, median in (("aaa", 1.0), ("bbb", 5.0), ("aaa", 2.0)):
+        bench_catalog.append_history(path, {"commit": commit, "results": [
+            {"size": 1000, "case": "gallery.reconcile", "median_s": median}]})
+    base = bench_catalog.baseline(bench_catalog.read_history(path), "aaa")
+    assert base == {(1000, "gallery.reconcile"): 2.0}
+    [line] = bench_catalog.compare([{"size": 1000, "case": "gallery.reconcile", "median_s": 3.0}], base)
+    assert line.endswith("+50.0%")
@@ -0,0 +1,182 @@
+"""Tests for build_images.py — responsive derivatives, card thumbnails, their
+manifest, and the <picture> markup the page and gallery generators emit from it."""
+import json
+
+import pytest
+
+import build_gallery as bg
+import build_images as bi
+import build_item_page as bip
+
+
+def _entry(stem="cutout", widths=(320, 640), fallback="png"):
+    return {
+        "sha256": "0" * 64, "width": widths[-1], "height": widths[-1], "fallback": fallback,
+        "variants": {fmt: [[w, bi.variant_name(stem, w, fmt)] for w in widths]
+                     for fmt in ("avif", "webp", fallback)},
+    }
+
+
+def _write_manifest(item_dir, sources):
+    (item_dir / bi.IMG_DIR).mkdir(exist_ok=True)
+    bi.save_manifest(item_dir, {"version": bi.DERIVE_VERSION, "sources": sources})
+    for entry in sources.values():
+        for rows in entry["variants"].values():
+            for _, name in rows:
+                (item_dir / bi.IMG_DIR / name).write_bytes(b"x")
+
+
+def test_role_sources_uses_label_names_then_defaults(tmp_path):
+    for name in ("hero.jpeg", "cutout.png", "card.png"):
+        (tmp_path / name).write_bytes(b"x")
+    label = {"photos": {"hero": "hero.jpeg", "square": "missing.png"}}
+    assert bi.role_sources(label, tmp_path) == ["hero.jpeg", "cutout.png", "card.png"]
+    # An unnamed hero is whichever default file exists, as the gallery card shows it.
+    assert bi.role_sources({}, tmp_path) == ["hero.jpeg", "cutout.png", "card.png"]
+    (tmp_path / "card.png").unlink()
+    assert bi.thumb_source({}, tmp_path) == "hero.jpeg"
+
+
+def test_target_widths_never_upscale():
+    assert bi.target_widths(5000) == [320, 640, 1024, 1600]
+    assert bi.target_widths(1000) == [320, 640, 1000]
+    assert bi.target_widths(200) == [200]
+
+
+def test_file_sha256_is_memoized_by_stat(tmp_path):
+    p = tmp_path / "a.png"
+    p.write_bytes(b"one")
+    cache = {}
+    first = bi.file_sha256(p, cache)
+    assert cache and bi.file_sha256(p, cache) == first
+    p.write_bytes(b"two!")  # new size -> re-hashed
+    assert bi.file_sha256(p, cache) != first
+
+
+def test_plan_is_incremental_by_source_hash(tmp_path):
+    (tmp_path / "cutout.png").write_bytes(b"pixels")
+    label = {"photos": {"cutout": "cutout.png"}}
+    hashes = {}
+    _, stale, _ = bi.plan(tmp_path, label, hashes)
+    assert [(k, n) for k, n, _ in stale] == [("variants", "cutout.png")]
+
+    entry = _entry()
+    entry["sha256"] = stale[0][2]
+    _write_manifest(tmp_path, {"cutout.png": entry, "old.png": _entry("old")})
+    _, stale, removed = bi.plan(tmp_path, label, hashes)
+    assert stale == [] and removed == ["old.png"]
+
+    (tmp_path / bi.IMG_DIR / "cutout-640.webp").unlink()  # a lost variant is stale too
+    assert [n for _, n, _ in bi.plan(tmp_path, label, hashes)[1]] == ["cutout.png"]
+
+
+def test_picture_html_orders_sources_and_picks_fallback_src():
+    out = bi.picture_html(_entry(widths=(320, 640, 1024, 1600)), "./img/",
+                          alt="A &amp; B", sizes="100vw", img_attrs=' class="item-image"')
+    assert out.index("image/avif") < out.index("image/webp") < out.index("<img ")
+    assert 'src="./img/cutout-1024.png"' in out
+    assert 'srcset="./img/cutout-320.webp 320w, ./img/cutout-640.webp 640w' in out
+    assert out.endswith('alt="A &amp; B" class="item-image"></picture>')
+
+
+def test_render_page_emits_picture_only_when_derived(tmp_path):
+    label = {"sku": "RG-0055", "product_name": "Tin", "price": "5.00",
+             "photos": {"cutout": "cutout.png"}}
+    plain = bip.render_page("RG-0055", label, tmp_path)
+    assert '<img src="./cutout.png" alt="Tin" class="item-image" fetchpriority="high">' in plain
+    assert "<picture" not in plain
+
+    _write_manifest(tmp_path, {"cutout.png": _entry()})
+    html = bip.render_page("RG-0055", label, tmp_path)
+    assert '<source type="image/avif" srcset="./img/cutout-320.avif 320w' in html
+    assert f'sizes="{bip.HERO_SIZES}"' in html
+    assert 'src="./cutout.png"' not in html
+
+
+def test_render_card_emits_picture_from_manifest(tmp_path, monkeypatch):
+    monkeypatch.setattr(bg, "ROOT", str(tmp_path))
+    item = tmp_path / "RG-0009"
+    item.mkdir()
+    (item / "card.png").write_bytes(b"x")
+    _write_manifest(item, {"card.png": _entry("card")})
+    card = bg.render_card(bg.card_fields("RG-0009", {"product_name": "Doll", "price": "9"}))
+    assert '<img src="./RG-0009/img/card-640.png"' in card
+    assert 'srcset="./RG-0009/img/card-320.avif 320w' in card
+    assert bg.Gallery(card + "\n").spans()["RG-0009"] == (0, len(card))
+
+
+def _thumb(source="card.png", digest="0" * 64):
+    return {"source": source, "sha256": digest, "width": 680, "height": 341,
+            "webp": "thumb.webp", "fallback": "thumb.png", "lqip": "data:image/webp;base64,AAAA"}
+
+
+def test_thumb_is_replanned_only_when_its_source_changes(tmp_path):
+    (tmp_path / "hero.png").write_bytes(b"hero")
+    label = {"photos": {"hero": "hero.png"}}
+    hashes = {}
+    stale = bi.plan(tmp_path, label, hashes)[1]
+    assert ("thumb", "hero.png") in [(k, n) for k, n, _ in stale]
+
+    digest = bi.file_sha256(tmp_path / "hero.png", hashes)
+    _write_manifest(tmp_path, {"hero.png": dict(_entry("hero"), sha256=digest)})
+    manifest = bi.load_manifest(tmp_path)
+    manifest["thumb"] = _thumb("hero.png", digest)
+    bi.save_manifest(tmp_path, manifest)
+    for name in ("thumb.webp", "thumb.png"):
+        (tmp_path / bi.IMG_DIR / name).write_bytes(b"x")
+    assert bi.plan(tmp_path, label, hashes)[1] == []
+
+    (tmp_path / "card.png").write_bytes(b"card")  # the card now shows card.png
+    stale = bi.plan(tmp_path, label, hashes)[1]
+    assert [(k, n) for k, n, _ in stale if k == "thumb"] == [("thumb", "card.png")]
+
+
+def test_render_card_prefers_thumbnail_with_lqip(tmp_path, monkeypatch):
+    monkeypatch.setattr(bg, "ROOT", str(tmp_path))
+    item = tmp_path / "RG-0009"
+    item.mkdir()
+    (item / "card.png").write_bytes(b"x")
+    _write_manifest(item, {"card.png": _entry("card")})
+    manifest = bi.load_manifest(item)
+    manifest["thumb"] = _thumb()
+    bi.save_manifest(item, manifest)
+
+    card = bg.render_card(bg.card_fields("RG-0009", {"product_name": "Doll", "price": "9"}))
+    assert '<source type="image/webp" srcset="./RG-0009/img/thumb.webp">' in card
+    assert ('src="./RG-0009/img/thumb.png" alt="Doll" data-lqip="data:image/webp;base64,AAAA" '
+            'loading="lazy" decoding="async" width="340" height="171"') in card
+    assert "card-320" not in card
+
+    # The streamed gallery renders from items.json: it gets the same thumbnail and size.
+    record = bg.feed_record("RG-0009", {"product_name": "Doll", "price": "9"})
+    assert record["thumb"] == {"webp": "img/thumb.webp", "src": "img/thumb.png",
+                               "lqip": "data:image/webp;base64,AAAA"}
+    assert (record["width"], record["height"]) == (340, 171)
+    assert "f.thumb.src" in bg.STREAM_JS and "data-lqip" in bg.STREAM_JS
+
+    page = bg.ensure_lqip_js(card + "\n</body>")
+    assert page.count("LQIP:") == 1 and bg.ensure_lqip_js(page) == page
+
+
+def test_derive_job_writes_variants_and_manifest_entry(tmp_path):
+    Image = pytest.importorskip("PIL.Image")
+    Image.new("RGBA", (700, 350), (200, 40, 40, 128)).save(tmp_path / "card.png")
+    entry = bi.derive_job(str(tmp_path), "card.png", "d" * 64)
+    assert entry["fallback"] == "png"
+    assert [w for w, _ in entry["variants"]["webp"]] == [320, 640, 700]
+    for rows in entry["variants"].values():
+        for w, name in rows:
+            with Image.open(tmp_path / bi.IMG_DIR / name) as im:
+                assert im.size[0] == w
+    json.dumps(entry)  # the manifest stays plain JSON
+
+
+def test_derive_thumb_job_fits_box_and_inlines_placeholder(tmp_path):
+    Image = pytest.importorskip("PIL.Image")
+    Image.new("RGB", (2000, 1000), (10, 120, 60)).save(tmp_path / "hero.jpeg")
+    thumb = bi.derive_thumb_job(str(tmp_path), "hero.jpeg", "d" * 64)
+    assert (thumb["width"], thumb["height"]) == (680, 340)
+    assert thumb["fallback"] == "thumb.jpg"
+    assert thumb["lqip"].startswith("data:image/webp;base64,") and len(thumb["lqip"]) < 1000
+    with Image.open(tmp_path / bi.IMG_DIR / "thumb.webp") as im:
+        assert im.size == (680, 340)
@@ -537,3 +537,210 @@ def test_rg0055_matches_golden_fixture():
     label = json.loads((ITEMS / "RG-0055" / "label.json").read_text(encoding="utf-8"))
     got = bip.render_page("RG-0055", label, ITEMS / "RG-0055")
     assert got == fixture.read_text(encoding="utf-8")
+
+
+# ---------------------------------------------------------------------------
+# Build manifest: --all / --all --check only touch SKUs whose inputs changed.
+# ---------------------------------------------------------------------------
+
+def _run_main(monkeypatch, items_root, *argv):
+    """Drive main() with argv against a tmp items tree; returns (rc, stdout)."""
+    import io
+    import contextlib
+
+    monkeypatch.setattr(bip, "ROOT", str(items_root))
+    monkeypatch.setattr(bip.sys, "argv", ["build_item_page.py", *argv])
+    buf = io.StringIO()
+    with contextlib.redirect_stdout(buf):
+        rc = bip.main()
+    return rc, buf.getvalue()
+
+
+def _counting_render(monkeypatch):
+    """Wrap render_page so a test can see which SKUs were (re-)rendered."""
+    rendered = []
+    real = bip.render_page
+
+    def spy(sku, label, item_dir=None):
+        rendered.append(sku)
+        return real(sku, label, item_dir)
+
+    monkeypatch.setattr(bip, "render_page", spy)
+    return rendered
+
+
+def test_manifest_all_rerenders_only_changed_items(tmp_path, monkeypatch):
+    items_root = tmp_path / "items"
+    for sku in ("RG-0001", "RG-0002"):
+        label = minimal_label()
+        label["sku"] = sku
+        _write_item(items_root, sku, label)
+    rendered = _counting_render(monkeypatch)
+
+    rc, _ = _run_main(monkeypatch, items_root, "--all")
+    assert rc == 0
+    assert rendered == ["RG-0001", "RG-0002"]
+    assert (items_root / ".build" / "pages.json").is_file()
+
+    # Nothing changed: no SKU is re-rendered.
+    rendered.clear()
+    rc, out = _run_main(monkeypatch, items_root, "--all")
+    assert rc == 0
+    assert rendered == []
+    assert "2 of 2 item(s) unchanged" in out
+
+    # Edit one label: only that SKU is re-rendered.
+    label = minimal_label()
+    label["sku"] = "RG-0002"
+    label["price"] = "70.00"
+    (items_root / "RG-0002" / "label.json").write_text(json.dumps(label), encoding="utf-8")
+    rendered.clear()
+    _run_main(monkeypatch, items_root, "--all")
+    assert rendered == ["RG-0002"]
+    assert "$70.00" in (items_root / "RG-0002" / "index.html").read_text(encoding="utf-8")
+
+    # --full ignores the manifest, but identical pages (and manifest) are not rewritten.
+    rendered.clear()
+    mtimes = {p: p.stat().st_mtime_ns for p in items_root.rglob("*.json")}
+    mtimes.update({p: p.stat().st_mtime_ns for p in items_root.rglob("index.html")})
+    _, out = _run_main(monkeypatch, items_root, "--all", "--full")
+    assert rendered == ["RG-0001", "RG-0002"]
+    assert "pages: 0 written, 2 unchanged, 0 skipped" in out
+    assert {p: p.stat().st_mtime_ns for p in mtimes} == mtimes
+
+
+def test_manifest_template_change_invalidates_every_entry(tmp_path, monkeypatch):
+    items_root = tmp_path / "items"
+    _write_item(items_root, "RG-0001", minimal_label())
+    rendered = _counting_render(monkeypatch)
+    _run_main(monkeypatch, items_root, "--all")
+
+    monkeypatch.setattr(bip, "GENERATOR_VERSION", bip.GENERATOR_VERSION + "-next")
+    rendered.clear()
+    _run_main(monkeypatch, items_root, "--all")
+    assert rendered == ["RG-0001"]
+
+    # An edited generator source (no version bump) is a new key too.
+    monkeypatch.setattr(bip, "_source_digest", "edited")
+    rendered.clear()
+    _run_main(monkeypatch, items_root, "--all")
+    assert rendered == ["RG-0001"]
+
+
+def test_manifest_touch_without_content_change_is_fresh(tmp_path, monkeypatch):
+    import os
+
+    items_root = tmp_path / "items"
+    d = _write_item(items_root, "RG-0001", minimal_label())
+    rendered = _counting_render(monkeypatch)
+    _run_main(monkeypatch, items_root, "--all")
+
+    st = os.stat(d / "label.json")
+    os.utime(d / "label.json", ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    rendered.clear()
+    _run_main(monkeypatch, items_root, "--all")
+    assert rendered == []
+
+
+def test_manifest_resized_label_named_image_rerenders(tmp_path, monkeypatch):
+    import os
+    import struct
+    import zlib
+
+    import imgprobe
+
+    def png(width, height):
+        ihdr = b"IHDR" + struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+        return (imgprobe.PNG_SIGNATURE + struct.pack(">I", 13) + ihdr
+                + struct.pack(">I", zlib.crc32(ihdr)))
+
+    items_root = tmp_path / "items"
+    label = minimal_label()
+    label["photos"] = {"hero": "front.png"}  # not a conventional hero/cutout name
+    d = _write_item(items_root, "RG-0001", label)
+    (d / "front.png").write_bytes(png(400, 300))
+    rendered = _counting_render(monkeypatch)
+    _run_main(monkeypatch, items_root, "--all")
+    assert 'width="400" height="300"' in (d / "index.html").read_text(encoding="utf-8")
+
+    (d / "front.png").write_bytes(png(800, 600))
+    st = os.stat(d / "front.png")
+    os.utime(d / "front.png", ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    rendered.clear()
+    _run_main(monkeypatch, items_root, "--all")
+    assert rendered == ["RG-0001"]
+    assert 'width="800" height="600"' in (d / "index.html").read_text(encoding="utf-8")
+
+
+def test_manifest_check_replays_recorded_drift(tmp_path, monkeypatch):
+    items_root = tmp_path / "items"
+    label = minimal_label()
+    label["page"] = {"story": "Curated story."}
+    _write_item(items_root, "RG-0055", label,
+                bip.render_page("RG-0055", label).replace("$65.00", "$45.00"))
+
+    rc, out = _run_main(monkeypatch, items_root, "--all", "--check")
+    assert rc == 1 and "DRIFT RG-0055" in out
+
+    # Unchanged inputs: the recorded drift is replayed without re-checking.
+    calls = []
+    monkeypatch.setattr(bip, "check_page", lambda *a: calls.append(a) or [])
+    rc, out = _run_main(monkeypatch, items_root, "--all", "--check")
+    assert rc == 1 and "DRIFT RG-0055" in out
+    assert calls == []
+    assert "1 of 1 item(s) unchanged" in out
+
+    # Fixing the page on disk makes the entry stale -> re-checked.
+    monkeypatch.undo()
+    (items_root / "RG-0055" / "index.html").write_text(
+        bip.render_page("RG-0055", label), encoding="utf-8")
+    rc, out = _run_main(monkeypatch, items_root, "--all", "--check")
+    assert rc == 0, out
+
+
+# ---------------------------------------------------------------------------
+# --jobs: pooled rendering / checking keeps SKU order and exit codes.
+# ---------------------------------------------------------------------------
+
+def _write_many(items_root, n, drift_every=0):
+    """n managed items; every `drift_every`-th page carries a stale price on disk."""
+    for i in range(1, n + 1):
+        sku = f"RG-{i:04d}"
+        label = minimal_label()
+        label["sku"] = sku
+        label["page"] = {"story": f"Story {i}."}
+        page = bip.render_page(sku, label)
+        if drift_every and i % drift_every == 0:
+            page = page.replace("$65.00", "$45.00")
+        _write_item(items_root, sku, label, page)
+
+
+def test_jobs_check_matches_sequential_output(tmp_path, monkeypatch):
+    items_root = tmp_path / "items"
+    n = bip.POOL_MIN_ITEMS + 6
+    _write_many(items_root, n, drift_every=7)
+
+    rc1, out1 = _run_main(monkeypatch, items_root, "--all", "--check", "--managed-only",
+                          "--full", "--jobs", "1")
+    rc2, out2 = _run_main(monkeypatch, items_root, "--all", "--check", "--managed-only",
+                          "--full", "--jobs", "3")
+    assert rc1 == rc2 == 1
+    assert out1 == out2
+    drift_skus = [line.split()[1].rstrip(":") for line in out2.splitlines()
+                  if line.startswith("DRIFT ")]
+    assert drift_skus == sorted(drift_skus) and len(drift_skus) == n // 7
+    assert f"managed pages checked: {n}, drifted: {n // 7}" in out2
+
+
+def test_jobs_generate_writes_every_page_in_order(tmp_path, monkeypatch):
+    items_root = tmp_path / "items"
+    n = bip.POOL_MIN_ITEMS + 2
+    _write_many(items_root, n, drift_every=1)  # every page stale, so every page is rewritten
+    bad = items_root / "RG-0003" / "label.json"
+    bad.write_text("{not json", encoding="utf-8")
+
+    rc, out = _run_main(monkeypatch, items_root, "--all", "--jobs", "4")
+    assert rc == 1  # the unreadable label
+    wrote = [line.split("/")[-2] for line in out.splitlines() if line.startswith("  wrote ")]
+    assert wrote == [f"RG-{i:04d}" for i in range(1, n + 1) if i != 3]
+    assert "  ! RG-0003: cannot read label.json" in out
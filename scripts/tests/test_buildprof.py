@@ -0,0 +1,68 @@
+"""Tests for buildprof.py — per-phase, per-SKU --profile reports."""
+import argparse
+import json
+
+import build_item_page as bip
+import buildprof
+from test_build_item_page import _write_item, minimal_label
+
+
+def _args(*argv):
+    ap = argparse.ArgumentParser()
+    buildprof.add_arguments(ap)
+    return ap.parse_args(list(argv))
+
+
+def test_phase_is_a_noop_without_a_session():
+    assert buildprof.phase("render", "RG-0001") is buildprof.phase("write")
+    with buildprof.session("tool", _args()):
+        assert buildprof._ACTIVE is None
+
+
+def test_sku_total_counts_outermost_phases_only():
+    rec = buildprof.Recorder()
+    with rec.phase("render", "RG-0001"):
+        with rec.phase("derive.details", "RG-0001"):
+            pass
+    with rec.phase("write", "RG-0001"):
+        pass
+    with rec.phase("discover"):
+        pass
+    data = buildprof.report(rec, "tool", 1.0, 0)
+    sku = data["skus"]["RG-0001"]
+    assert set(sku["phases"]) == {"render", "derive.details", "write"}
+    outer = sku["phases"]["render"]["seconds"] + sku["phases"]["write"]["seconds"]
+    assert abs(sku["seconds"] - outer) < 1e-5
+    assert data["phases"]["discover"]["calls"] == 1 and "discover" not in sku["phases"]
+
+
+def test_session_profiles_render_page(tmp_path, capsys):
+    out = tmp_path / "profile.json"
+    with buildprof.session("build_item_page", _args("--profile", str(out))):
+        bip.render_page("RG-0055", minimal_label(), str(tmp_path))
+    assert buildprof._ACTIVE is None
+    data = json.loads(out.read_text())
+    phases = data["skus"]["RG-0055"]["phases"]
+    assert {"render", "derive.seo_description", "derive.era_line", "derive.details"} <= set(phases)
+    assert data["skus"]["RG-0055"]["seconds"] == phases["render"]["seconds"]
+    err = capsys.readouterr().err
+    assert "slowest SKUs (1 profiled)" in err and str(out) in err
+
+
+def test_all_records_label_load_like_the_other_tools(tmp_path, monkeypatch, capsys):
+    _write_item(tmp_path, "RG-0055", minimal_label())
+    out = tmp_path / "profile.json"
+    monkeypatch.setattr(bip, "ROOT", str(tmp_path))
+    monkeypatch.setattr(bip.sys, "argv", ["build_item_page.py", "--all", "--dry-run",
+                                          "--profile", str(out)])
+    assert bip.main() == 0
+    assert json.loads(out.read_text())["phases"]["label_load"]["calls"] == 1
+
+
+def test_summary_sorts_slowest_first():
+    data = {"tool": "t", "argv": [], "wall_seconds": 1, "peak_traced_bytes": 0,
+            "phases": {"a": {"calls": 1, "seconds": 0.1, "net_bytes": 0},
+                       "b": {"calls": 1, "seconds": 0.3, "net_bytes": 0}},
+            "skus": {}}
+    lines = buildprof.summary(data).splitlines()
+    assert lines[3].split()[0] == "b" and lines[4].split()[0] == "a"
@@ -0,0 +1,101 @@
+"""Tests for catalog.py — the shared, cached RG-*/label.json loader."""
+import json
+import os
+
+import catalog
+
+
+def _item(root, sku, label=None, status=None, raw=None):
+    d = root / sku
+    d.mkdir(parents=True, exist_ok=True)
+    if raw is not None:
+        (d / "label.json").write_text(raw, encoding="utf-8")
+    elif label is not None:
+        (d / "label.json").write_text(json.dumps(label), encoding="utf-8")
+    if status is not None:
+        (d / "status.json").write_text(json.dumps(status), encoding="utf-8")
+    return d
+
+
+def _count_parses(monkeypatch):
+    parsed = []
+    real = catalog._parse
+
+    def spy(item_dir):
+        parsed.append(os.path.basename(str(item_dir)))
+        return real(item_dir)
+
+    monkeypatch.setattr(catalog, "_parse", spy)
+    return parsed
+
+
+def test_load_returns_sorted_typed_items(tmp_path):
+    _item(tmp_path, "RG-0002", {"sku": "RG-0002", "state": "Sold"}, {"status": "sold"})
+    _item(tmp_path, "RG-0001", {"sku": "RG-0001", "state": "Listed"})
+    (tmp_path / "RG-0003").mkdir()  # no label.json -> not an item
+
+    items = catalog.load(tmp_path)
+    assert list(items) == ["RG-0001", "RG-0002"]
+    assert items["RG-0001"].state == "Listed"
+    assert items["RG-0001"].status == {} and not items["RG-0001"].status_sold
+    assert items["RG-0002"].status_sold
+    assert catalog.discover(tmp_path, with_label=False) == ["RG-0001", "RG-0002", "RG-0003"]
+
+
+def test_bad_labels_become_error_items(tmp_path):
+    _item(tmp_path, "RG-0001", raw="{nope")
+    _item(tmp_path, "RG-0002", raw="[1, 2]")
+    items = catalog.load(tmp_path)
+    assert items["RG-0001"].error.startswith("Invalid JSON")
+    assert items["RG-0002"].error == "/: expected object, got array"
+    assert items["RG-0001"].label == {} and items["RG-0002"].label == {}
+
+
+def test_warm_load_skips_parsing_unchanged_items(tmp_path, monkeypatch):
+    _item(tmp_path, "RG-0001", {"sku": "RG-0001", "price": "1.00"})
+    _item(tmp_path, "RG-0002", {"sku": "RG-0002", "price": "2.00"})
+    parsed = _count_parses(monkeypatch)
+
+    catalog.load(tmp_path)
+    assert parsed == ["RG-0001", "RG-0002"]
+    assert os.path.isfile(catalog.cache_path(tmp_path))
+
+    parsed.clear()
+    items = catalog.load(tmp_path)
+    assert parsed == []
+    assert items["RG-0002"].label["price"] == "2.00"
+
+    # A changed label (new size) and a new status.json are both re-parsed.
+    _item(tmp_path, "RG-0001", {"sku": "RG-0001", "price": "10.00"})
+    _item(tmp_path, "RG-0002", status={"status": "sold"})
+    parsed.clear()
+    items = catalog.load(tmp_path)
+    assert parsed == ["RG-0001", "RG-0002"]
+    assert items["RG-0001"].label["price"] == "10.00"
+    assert items["RG-0002"].status_sold
+
+
+def test_corrupt_or_disabled_cache_falls_back_to_parsing(tmp_path, monkeypatch):
+    _item(tmp_path, "RG-0001", {"sku": "RG-0001"})
+    catalog.load(tmp_path)
+    with open(catalog.cache_path(tmp_path), "wb") as fh:
+        fh.write(b"garbage")
+    parsed = _count_parses(monkeypatch)
+    assert list(catalog.load(tmp_path)) == ["RG-0001"]
+    assert parsed == ["RG-0001"]
+
+    parsed.clear()
+    catalog.load(tmp_path, use_cache=False)
+    assert parsed == ["RG-0001"]
+
+
+def test_load_only_reads_the_given_skus_and_keeps_the_cache(tmp_path, monkeypatch):
+    for n in range(1, 4):
+        _item(tmp_path, f"RG-000{n}", {"sku": f"RG-000{n}"})
+    catalog.load(tmp_path)
+    _item(tmp_path, "RG-0002", {"sku": "RG-0002", "v": 2})
+    parsed = _count_parses(monkeypatch)
+    items = catalog.load(tmp_path, only={"RG-0002", "RG-0009"})
+    assert list(items) == ["RG-0002"] and items["RG-0002"].label["v"] == 2
+    assert parsed == ["RG-0002"]
+    assert len(catalog.load(tmp_path)) == 3 and parsed == ["RG-0002"]  # others still cached
@@ -0,0 +1,140 @@
+"""Tests for build_gallery.py's parse-once Gallery model and items.json feed.
+
+The model must serialize back to the exact input bytes, and reconcile() on top
+of it must insert cards in ascending-SKU order with the same whitespace the
+old string-splicing implementation produced. The feed must cover every card
+the grid shows, so --stream can drop static cards without losing items.
+"""
+import json
+
+import pytest
+
+import build_gallery as bg
+from conftest import index_page, label, write_item
+
+
+def _read_index():
+    return open(bg.INDEX, encoding="utf-8").read()
+
+
+def _page(skus):
+    return index_page([bg.render_card(bg.card_fields(s, label(s)), lazy=i >= bg.FIRST_SCREEN)
+                       for i, s in enumerate(skus)])
+
+
+@pytest.fixture
+def tree(gallery_root):
+    def make(*skus):
+        return {sku: write_item(gallery_root, sku) for sku in skus}
+    return make
+
+
+def test_round_trips_real_index_byte_for_byte():
+    text = _read_index()
+    doc = bg.Gallery(text)
+    assert str(doc) == text
+    assert doc.placeholder is not None
+    for sku, (start, end) in doc.spans().items():
+        assert text[start:end].lstrip(" \t") == doc.block(sku)
+
+
+def test_reconcile_restores_full_grid_in_sku_order(tree):
+    skus = [f"RG-00{n:02d}" for n in range(1, 9)]
+    items = tree(*skus)
+    full, *_ = bg.reconcile(_page(skus), items)
+
+    # Drop the first, a middle run and the last card; reconcile puts them back.
+    partial, inserted, skipped, _ = bg.reconcile(
+        _page([s for s in skus if s not in ("RG-0001", "RG-0004", "RG-0005", "RG-0008")]),
+        items)
+    assert inserted == ["RG-0001", "RG-0004", "RG-0005", "RG-0008"]
+    assert skipped == []
+    assert partial == full
+    assert sorted(bg.carded_skus(partial)) == list(bg.carded_skus(partial))
+    assert '<div class="stat-number" id="item-count">8</div>' in partial
+
+
+def test_reconcile_is_a_no_op_when_complete(tree):
+    items = tree("RG-0001", "RG-0002")
+    text, *_ = bg.reconcile(_page(["RG-0001", "RG-0002"]), items)
+    again, inserted, skipped, missing = bg.reconcile(text, items)
+    assert (again, inserted, skipped, missing) == (text, [], [], [])
+
+
+def test_reconcile_without_placeholder_fails(tree):
+    items = tree("RG-0001")
+    text = _page([]).replace(bg.PLACEHOLDER, "")
+    with pytest.raises(SystemExit):
+        bg.reconcile(text, items)
+
+
+def test_feed_covers_curated_cards_and_honors_status_json(tree, tmp_path):
+    items = tree("RG-0001", "RG-0002", "RG-0003")
+    items["RG-0001"].pop("state")  # a hand-curated legacy card with no label state
+    (tmp_path / "RG-0002" / "status.json").write_text('{"status": "sold"}')
+    text = _page(["RG-0001"])
+
+    feed = bg.build_feed(items, bg.gallery_skus(text, items))
+    assert [r["sku"] for r in feed] == ["RG-0001", "RG-0002", "RG-0003"]
+    assert set(feed[0]) == set(bg.FEED_FIELDS)
+    assert [r["sold"] for r in feed] == [False, True, False]
+    assert json.loads(bg.feed_text(feed)) == feed
+    assert bg.write_feed(feed) is True
+    assert bg.write_feed(feed) is False  # unchanged bytes are not rewritten
+
+
+_LEGACY_CARD = """<!-- RG-0001: Annie -->
+            <a href="./RG-0001/" class="item-card" data-category="books" data-status="sold" data-added="2025-11-26">
+                <div class="item-image">
+                    <span class="item-sku">RG-0001</span>
+                    <img src="./RG-0001/hero.jpeg" alt="Annie" style="max-width: 100%;">
+                </div>
+                <div class="item-info">
+                    <p class="item-category">Books & Paper</p>
+                    <h3 class="item-title">Little Orphan Annie &amp; Sandy</h3>
+                    <p class="item-era">1930s Americana</p>
+                    <div class="item-footer">
+                        <span class="item-price sold">Sold · $35.00</span>
+                    </div>
+                </div>
+            </a>"""
+
+
+def test_stream_keeps_legacy_card_image_and_category(tree, tmp_path):
+    items = tree("RG-0001", "RG-0002")
+    (tmp_path / "RG-0001" / "hero.png").unlink()
+    (tmp_path / "RG-0001" / "hero.jpeg").write_bytes(b"")
+    page = _page(["RG-0002"]).replace(
+        "<div class=\"items-grid\">\n", "<div class=\"items-grid\">\n            " + _LEGACY_CARD + "\n\n")
+    feed = bg.build_feed(items, bg.gallery_skus(page, items), page)
+    bg.write_feed(feed)
+    want = {"sku": "RG-0001", "slug": "books", "category": "Books & Paper",
+            "title": "Little Orphan Annie & Sandy", "era": "1930s Americana", "price": "$35.00",
+            "image": "hero.jpeg", "sold": True, "added": "2025-11-26"}
+    assert {k: feed[0][k] for k in want} == want
+    assert bg.card_fields("RG-0001", items["RG-0001"])["image"] == "hero.jpeg"
+
+    text, dropped = bg.stream(page, feed, first=0)
+    assert dropped == ["RG-0001", "RG-0002"]
+    # Once streamed, the dropped card's record survives a rebuild from labels.
+    assert bg.build_feed(items, bg.gallery_skus(text, items), text) == feed
+
+
+def test_stream_keeps_first_screenful_and_is_idempotent(tree):
+    skus = [f"RG-00{n:02d}" for n in range(1, 9)]
+    items = tree(*skus)
+    full, *_ = bg.reconcile(_page(skus), items)
+    feed = bg.build_feed(items, bg.gallery_skus(full, items))
+    bg.write_feed(feed)
+
+    text, dropped = bg.stream(full, feed, first=3)
+    assert dropped == skus[3:]
+    assert list(bg.carded_skus(text)) == skus[:3]
+    assert text.count(bg.STREAM_MARKER) == 1
+    assert bg.Gallery(text).placeholder is not None
+    assert '<div class="stat-number" id="item-count">8</div>' in text
+
+    again, dropped = bg.stream(text, feed, first=3)
+    assert (again, dropped) == (text, [])
+    # Dropped cards stay in the gallery through the feed.
+    assert bg.gallery_skus(text, items) == skus
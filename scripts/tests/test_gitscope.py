@@ -0,0 +1,80 @@
+"""Tests for gitscope.py — git-diff scoping for the --since checkers."""
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+import build_gallery as bg
+import gitscope
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "bench"))
+
+import synth  # noqa: E402
+
+
+def _git(root, *argv):
+    subprocess.run(["git", "-C", str(root), *argv], check=True, capture_output=True)
+
+
+def _commit_all(root):
+    _git(root, "add", "-A")
+    _git(root, "-c", "user.name=t", "-c", "user.email=t@t", "commit", "-qm", "x")
+
+
+@pytest.fixture
+def repo(tmp_path):
+    for sku in ("RG-0001", "RG-0002"):
+        (tmp_path / sku).mkdir()
+        (tmp_path / sku / "label.json").write_text(f'{{"sku": "{sku}"}}')
+    (tmp_path / "index.html").write_text("<html></html>")
+    _git(tmp_path, "init", "-q")
+    _commit_all(tmp_path)
+    return tmp_path
+
+
+def test_changed_skus_include_commits_and_working_tree(repo):
+    assert gitscope.affected("HEAD", repo) == set()
+    (repo / "RG-0002" / "label.json").write_text('{"sku": "RG-0002", "x": 1}')
+    _commit_all(repo)
+    (repo / "RG-0003").mkdir()
+    (repo / "RG-0003" / "label.json").write_text("{}")  # untracked
+    (repo / "docs.md").write_text("notes")
+    assert gitscope.affected("HEAD~1", repo) == {"RG-0002", "RG-0003"}
+
+
+def test_shared_inputs_and_unknown_revs_widen_to_everything(repo, capsys):
+    (repo / "template").mkdir()
+    (repo / "template" / "card.html").write_text("<a>")
+    assert gitscope.affected("HEAD", repo) is None
+    assert "shared input changed: template/card.html" in capsys.readouterr().err
+    assert gitscope.affected("no-such-rev", repo) is None
+    assert gitscope.affected("0" * 40, repo) is None
+    assert gitscope.shared_path("scripts/build_item_page.py")
+    assert not gitscope.shared_path("scripts/tests/test_output.py")
+
+
+def test_gallery_check_since_compares_only_changed_feed_records(tmp_path):
+    root = synth.generate(40, seed=1, out=str(tmp_path / "cat"))
+    synth.point_at(root)
+    try:
+        with open(bg.INDEX, encoding="utf-8") as fh:
+            text = fh.read()
+        items = bg.load_items()
+        bg.write_feed(bg.build_feed(items, bg.gallery_skus(text, items)))
+        listed = sorted(s for s in bg.gallery_skus(text, items) if s in bg.carded_skus(text))
+        sku, other = listed[0], listed[1]
+        assert not bg.stale_records(text, items, {sku, other})
+
+        label = dict(items[sku], product_name="Renamed in this PR")
+        with open(os.path.join(root, sku, "label.json"), "w", encoding="utf-8") as fh:
+            json.dump(label, fh)
+        scoped = bg.load_items(only={sku})
+        assert list(scoped) == [sku]
+        text, _ = bg.update_card(text, sku, scoped)  # the feed follows the card it shows
+        assert bg.stale_records(text, scoped, {sku})
+        assert not bg.stale_records(text, bg.load_items(only={other}), {other})
+        assert bg.check(text, scoped, True, {sku}) == 1
+    finally:
+        synth.point_at(synth.ROOT)
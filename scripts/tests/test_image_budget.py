@@ -0,0 +1,90 @@
+"""Tests for image_budget.py — per-role byte/megapixel budgets and --fix."""
+import json
+import struct
+import zlib
+
+import pytest
+
+import build_images
+import image_budget as ib
+import imgprobe
+
+CONFIG = [("hero", "hero.*", 1000, 1.0), ("qr", "qr-*", 100, 0.1), ("other", "*", 5000, 4.0)]
+
+
+def _png_header(width, height, pad=0):
+    """A PNG whose IHDR claims width x height (headers are all a check reads)."""
+    def chunk(kind, data):
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+    return (imgprobe.PNG_SIGNATURE + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+            + chunk(b"IDAT", b"\0" * pad) + chunk(b"IEND", b""))
+
+
+@pytest.fixture
+def root(tmp_path, monkeypatch):
+    for mod in (ib, build_images, imgprobe):
+        monkeypatch.setattr(mod, "ROOT", str(tmp_path))
+    monkeypatch.setattr(imgprobe, "_CACHE", None)
+    return tmp_path
+
+
+def test_role_is_first_matching_pattern():
+    assert ib.role_for("Hero.JPEG", CONFIG)[0] == "hero"
+    assert ib.role_for("qr-buy.png", CONFIG)[0] == "qr"
+    assert ib.role_for("detail-lid.jpeg", CONFIG)[0] == "other"
+
+
+def test_repo_config_covers_every_role():
+    config = ib.load_config()
+    assert config[-1][1] == "*"  # catch-all last, so nothing goes unchecked
+    assert ib.role_for("hero.jpeg", config)[2] <= 1048576  # the old 1 MB hero policy
+
+
+def test_check_reports_bytes_and_megapixels(root):
+    item = root / "RG-0001"
+    item.mkdir()
+    (item / "hero.png").write_bytes(_png_header(1200, 1000, pad=2000))
+    (item / "qr-buy.png").write_bytes(_png_header(100, 100))
+    (item / "notes.txt").write_text("x")
+    paths = ib.collect(["RG-0001"])
+    assert [p.rsplit("/", 1)[1] for p in paths] == ["hero.png", "qr-buy.png"]
+    problems = ib.check(paths[0], CONFIG)
+    assert len(problems) == 2 and "(hero)" in problems[0] and "1.2 MP > 1 MP" in problems[1]
+    assert ib.check(paths[1], CONFIG) == []
+
+
+def test_fix_bakes_orientation_downsizes_and_caches(root):
+    Image = pytest.importorskip("PIL.Image")
+    item = root / "RG-0001"
+    item.mkdir()
+    exif = Image.Exif()
+    exif[0x0112] = 6  # stored landscape, displayed portrait
+    Image.effect_noise((1600, 1200), 60).convert("RGB").save(
+        item / "hero.jpeg", quality=95, exif=exif.tobytes())
+    before = (item / "hero.jpeg").stat().st_size
+    config = [("hero", "hero.*", before // 2, 1.0)]
+
+    [row] = ib.fix(ib.collect(), config, jobs=1)
+    assert "rotated" in row["action"] and row["after"] == (item / "hero.jpeg").stat().st_size
+    with Image.open(item / "hero.jpeg") as im:
+        assert im.height > im.width and im.width * im.height <= 1e6
+        assert im.getexif().get(0x0112) is None
+    assert ib.check(str(item / "hero.jpeg"), config) == []
+
+    assert ib.fix(ib.collect(), config, jobs=1) == []  # cached by output hash + budget
+    cache = json.loads((root / ".build" / "budget.json").read_text())
+    assert len(cache["done"]) == 1
+
+
+def test_fix_keeps_flat_png_pixels_exact(root):
+    Image = pytest.importorskip("PIL.Image")
+    item = root / "RG-0001"
+    item.mkdir()
+    im = Image.new("RGB", (300, 300), (255, 255, 255))
+    im.paste((0, 0, 0), (50, 50, 250, 250))
+    im.save(item / "qr-buy.png", compress_level=0)
+
+    [row] = ib.fix(ib.collect(), [("qr", "qr-*", 65536, 0.5)], jobs=1)
+    assert "palette" in row["action"] and row["after"] < row["before"]
+    with Image.open(item / "qr-buy.png") as out:
+        assert out.mode == "P" and out.convert("RGB").tobytes() == im.tobytes()
@@ -0,0 +1,90 @@
+"""Tests for imgprobe.py — header-only PNG/JPEG sizes and EXIF orientation —
+and the width/height + lazy-loading attributes the generators emit from it."""
+import json
+import struct
+import zlib
+
+import pytest
+
+import build_gallery as bg
+import imgprobe
+
+
+def _chunk(kind, data):
+    return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+
+def _tiff(orientation):
+    # Little-endian TIFF header, one IFD entry: Orientation (0x0112), SHORT, count 1.
+    return (b"II*\x00" + struct.pack("<I", 8) + struct.pack("<H", 1)
+            + struct.pack("<HHIHH", 0x0112, 3, 1, orientation, 0) + b"\x00\x00\x00\x00")
+
+
+def _png(width, height, orientation=None):
+    ihdr = struct.pack(">IIBBBBB", width, height, 8, 6, 0, 0, 0)
+    exif = _chunk(b"eXIf", _tiff(orientation)) if orientation else b""
+    return (imgprobe.PNG_SIGNATURE + _chunk(b"IHDR", ihdr) + exif
+            + _chunk(b"IDAT", zlib.compress(b"\0" * 8)) + _chunk(b"IEND", b""))
+
+
+def _jpeg(width, height, orientation=None):
+    out = b"\xff\xd8" + b"\xff\xe0" + struct.pack(">H", 16) + b"JFIF\x00" + b"\x00" * 9
+    if orientation:
+        app1 = b"Exif\x00\x00" + _tiff(orientation)
+        out += b"\xff\xe1" + struct.pack(">H", len(app1) + 2) + app1
+    sof = struct.pack(">BHHB", 8, height, width, 3) + b"\x01\x11\x00\x02\x11\x00\x03\x11\x00"
+    return out + b"\xff\xc0" + struct.pack(">H", len(sof) + 2) + sof + b"\xff\xda"
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(imgprobe, "ROOT", str(tmp_path))
+    monkeypatch.setattr(imgprobe, "_CACHE", None)
+    monkeypatch.setattr(imgprobe, "_DIRTY", False)
+
+
+def test_probe_reads_png_and_jpeg_headers(tmp_path):
+    (tmp_path / "a.png").write_bytes(_png(1613, 1924))
+    (tmp_path / "b.png").write_bytes(_png(400, 300, orientation=6))
+    (tmp_path / "c.jpg").write_bytes(_jpeg(4032, 3024, orientation=6))
+    (tmp_path / "d.txt").write_bytes(b"not an image")
+    assert imgprobe.probe(tmp_path / "a.png") == (1613, 1924, 1)
+    assert imgprobe.probe(tmp_path / "b.png") == (400, 300, 6)
+    assert imgprobe.probe(tmp_path / "c.jpg") == (4032, 3024, 6)
+    assert imgprobe.probe(tmp_path / "d.txt") is None
+
+
+def test_size_applies_rotation_and_is_cached_by_stat(tmp_path, cache):
+    p = tmp_path / "c.jpg"
+    p.write_bytes(_jpeg(4032, 3024, orientation=6))
+    assert imgprobe.size(p) == (3024, 4032)
+    imgprobe.flush()
+    saved = json.loads((tmp_path / ".build" / "probe.json").read_text())
+    assert saved[str(p)][2] == [4032, 3024, 6]
+
+    p.write_bytes(_jpeg(800, 600) + b"\x00")  # new size -> re-probed
+    assert imgprobe.size(p) == (800, 600)
+    assert imgprobe.size(tmp_path / "missing.png") is None
+
+
+def test_fit_scales_down_only():
+    assert imgprobe.fit((1613, 1924), (340, 200)) == (168, 200)
+    assert imgprobe.fit((100, 50), (340, 200)) == (100, 50)
+
+
+def test_cards_carry_dims_and_load_lazily_past_first_screen(tmp_path, monkeypatch, cache):
+    monkeypatch.setattr(bg, "ROOT", str(tmp_path))
+    monkeypatch.setattr(bg, "FIRST_SCREEN", 1)
+    items = {}
+    for sku in ("RG-0001", "RG-0002"):
+        (tmp_path / sku).mkdir()
+        (tmp_path / sku / "hero.png").write_bytes(_png(800, 400))
+        items[sku] = {"sku": sku, "state": "Listed", "product_name": sku, "price": "1"}
+    page = ('        <div class="items-grid">\n\n            ' + bg.PLACEHOLDER
+            + "\n        </div>\n</body>\n")
+    text, inserted, *_ = bg.reconcile(page, items)
+    assert inserted == ["RG-0001", "RG-0002"]
+    doc = bg.Gallery(text)
+    assert 'width="340" height="170"' in doc.block("RG-0001")
+    assert 'loading="lazy"' not in doc.block("RG-0001")
+    assert 'loading="lazy" decoding="async" width="340"' in doc.block("RG-0002")
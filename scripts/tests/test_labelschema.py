@@ -0,0 +1,53 @@
+"""Tests for labelschema.py — the compiled label.json schema."""
+import pytest
+
+import catalog
+import labelschema
+
+PRINTABLE = {"sku": "RG-0001", "product_name": "Lamp", "attributes": "Brass",
+             "price": "$40.00", "condition": "Good", "condition_notes": "",
+             "qr_code_url": "https://square.link/u/abc"}
+
+
+def test_every_problem_is_reported_with_a_pointer():
+    label = {"sku": "RG-1", "price": 40, "state": "Gone",
+             "channels": {"square": {"price": 40.0}},
+             "shipping": {"weight_oz": -1}}
+    problems = dict(labelschema.LABEL.errors(label))
+    assert problems == {
+        "/sku": "'RG-1' does not match RG-\\d{4,}",
+        "/price": "expected string, got number",
+        "/state": "must be one of 'Draft', 'Listed', 'Sold', got 'Gone'",
+        "/channels/square/price": "expected string, got number",
+        "/shipping/weight_oz": "must be >= 0, got -1",
+    }
+    assert labelschema.LABEL.errors([1]) == [("", "expected object, got array")]
+
+
+def test_open_objects_and_closed_page_block():
+    label = {"sku": "RG-0001", "notes": {"anything": [1, 2]},
+             "page": {"seo_title": "Lamp", "hero_alt": "x"}}
+    assert labelschema.LABEL.errors(label) == [("/page/hero_alt", "unknown field")]
+
+
+def test_print_profile_requires_the_label_fields_and_folder_sku():
+    assert labelschema.PRINT_LABEL.errors(PRINTABLE, "RG-0001") == []
+    label = dict(PRINTABLE, condition=" ")
+    del label["qr_code_url"]
+    assert labelschema.PRINT_LABEL.errors(label, "RG-0002") == [
+        ("/qr_code_url", "required field is missing"),
+        ("/condition", "must not be empty"),
+        ("/sku", "'RG-0001' does not match folder (RG-0002)"),
+    ]
+    assert labelschema.LABEL.errors(label) == []
+
+    with pytest.raises(labelschema.LabelSchemaError) as e:
+        labelschema.PRINT_LABEL.check(label, "RG-0001")
+    assert str(e.value) == ("/qr_code_url: required field is missing; "
+                            "/condition: must not be empty")
+
+
+def test_repo_labels_pass_the_base_schema():
+    for sku in catalog.discover():
+        label = catalog.read_label(f"{catalog.ROOT}/{sku}")
+        assert labelschema.LABEL.errors(label, sku) == [], sku
@@ -0,0 +1,41 @@
+"""Tests for output.py — skip-unchanged, atomic generator writes."""
+import os
+
+import pytest
+
+import output
+
+
+def test_unchanged_bytes_are_not_rewritten(tmp_path):
+    path = tmp_path / "index.html"
+    path.write_text("<p>same</p>\n")
+    os.utime(path, ns=(1, 1))
+    tally = output.Tally()
+    assert output.write_text(str(path), "<p>same</p>\n", tally) == output.UNCHANGED
+    assert path.stat().st_mtime_ns == 1
+    assert output.write_text(str(path), "<p>new</p>\n", tally) == output.WRITTEN
+    assert path.read_text() == "<p>new</p>\n"
+    assert output.skip(tally) == output.SKIPPED
+    assert tally.summary() == "1 written, 1 unchanged, 1 skipped"
+
+
+def test_replace_keeps_mode_and_leaves_no_temp(tmp_path):
+    path = tmp_path / "items.json"
+    path.write_text("[]\n")
+    path.chmod(0o640)
+    output.write_text(str(path), "[1]\n", tally=None)
+    assert path.stat().st_mode & 0o777 == 0o640
+    assert os.listdir(tmp_path) == ["items.json"]
+
+
+def test_interrupted_write_leaves_the_old_file(tmp_path, monkeypatch):
+    path = tmp_path / "index.html"
+    path.write_text("old")
+
+    def interrupted(src, dst):
+        raise KeyboardInterrupt
+    monkeypatch.setattr(output.os, "replace", interrupted)
+    with pytest.raises(KeyboardInterrupt):
+        output.write_text(str(path), "new", tally=None)
+    assert path.read_text() == "old"
+    assert os.listdir(tmp_path) == ["index.html"]
@@ -0,0 +1,65 @@
+"""Tests for page_template.py — the compile-once segment/slot template engine."""
+import pathlib
+
+import build_item_page as bip
+import page_template as pt
+
+ITEMS = pathlib.Path(__file__).resolve().parents[2]  # the items/ repo root
+CARD_TEMPLATE = ITEMS / "template" / "rg-item-card-template.html"
+
+
+def test_render_fills_every_occurrence_in_one_pass():
+    tpl = pt.Template("<h1>__TITLE__</h1><p>__TITLE__ / __SKU__</p>")
+    assert tpl.tokens == {"TITLE", "SKU"}
+    assert tpl.render({"TITLE": "Tin", "SKU": "RG-0055"}) == "<h1>Tin</h1><p>Tin / RG-0055</p>"
+
+
+def test_render_is_single_pass_values_never_reexpanded():
+    # str.replace chaining would have expanded the __SKU__ inside the title value.
+    tpl = pt.Template("__TITLE__|__SKU__")
+    assert tpl.render({"TITLE": "about __SKU__", "SKU": "RG-1"}) == "about __SKU__|RG-1"
+
+
+def test_missing_value_keeps_literal_token():
+    tpl = pt.Template("a __KEEP__ b __SET__")
+    assert tpl.render({"SET": "x"}) == "a __KEEP__ b x"
+
+
+def test_template_edges_and_no_tokens():
+    assert pt.Template("__A__mid__B__").render({"A": "1", "B": "2"}) == "1mid2"
+    assert pt.Template("plain { css }").render({}) == "plain { css }"
+
+
+def test_brace_tokens_and_file_load_cache(tmp_path):
+    f = tmp_path / "t.html"
+    f.write_text("<title>{{ITEM_TITLE}}</title>${{PRICE}}", encoding="utf-8")
+    tpl = pt.load(f)
+    assert tpl.pattern is pt.BRACE_TOKENS
+    assert tpl.render({"ITEM_TITLE": "Tin", "PRICE": "65.00"}) == "<title>Tin</title>$65.00"
+    assert pt.load(f) is tpl  # unchanged file -> cached compile
+
+
+def test_page_template_matches_str_replace_chain():
+    label = {"sku": "RG-0001", "product_name": "Book — tail", "price": "19.50"}
+    values = bip.page_values("RG-0001", label)
+    legacy = bip._TEMPLATE
+    for name in bip.PAGE_TEMPLATE.tokens:
+        legacy = legacy.replace(f"__{name}__", values[name])
+    assert bip.render_page("RG-0001", label) == legacy
+
+
+def test_card_template_renders_through_the_same_path():
+    label = {
+        "sku": "RG-0055",
+        "product_name": "Widget — tail",
+        "price": "65.00",
+        "identity": {"maker": "Kreamer", "maker_location": "Brooklyn, NY"},
+        "channels": {"square": {"buy_link": "https://square.link/u/x"}},
+    }
+    html = bip.render_page("RG-0055", label, template=pt.load(CARD_TEMPLATE))
+    body = html.split("-->", 1)[1]  # skip the header comment's usage notes
+    assert "{{" not in body
+    assert "<title>Widget | Richmond General</title>" in body
+    assert '<span class="item-price">$65.00</span>' in body
+    assert 'href="https://square.link/u/x" class="buy-button"' in body
+    assert "Brooklyn, NY" in body
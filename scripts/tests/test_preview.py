@@ -0,0 +1,109 @@
+"""Tests for preview.py — on-demand page rendering, caching and the HTTP layer."""
+import gzip
+import json
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+import build_gallery as bg
+import preview
+from conftest import index_page, write_item, write_label
+
+
+@pytest.fixture
+def tree(gallery_root):
+    for sku in ("RG-0001", "RG-0002"):
+        write_item(gallery_root, sku, name="Tin")
+    (gallery_root / "index.html").write_text(index_page())
+    return gallery_root
+
+
+def test_page_is_rendered_in_memory_and_cached_by_inputs(tree):
+    pv = preview.Preview(str(tree))
+    first = pv.page("RG-0001")
+    assert b"Tin" in first.body and preview.RELOAD_PATH.encode() in first.body
+    assert not (tree / "RG-0001" / "index.html").exists()  # nothing written
+    assert pv.page("RG-0001") is first
+
+    write_label(tree, "RG-0001", name="Jar!")
+    second = pv.page("RG-0001")
+    assert second is not first and b"Jar!" in second.body and second.etag != first.etag
+    assert pv.page("RG-9999") is None
+
+
+def test_skipped_items_are_served_from_disk(tree):
+    write_label(tree, "RG-0002", state="Sold")
+    (tree / "RG-0002" / "index.html").write_text("<html><body>archived</body></html>")
+    body = preview.Preview(str(tree), live_reload=False).page("RG-0002").body
+    assert body == b"<html><body>archived</body></html>"
+
+
+def test_gallery_applies_pending_reconcile(tree):
+    pv = preview.Preview(str(tree), live_reload=False)
+    text = pv.resolve("/").body.decode()
+    assert list(bg.carded_skus(text)) == ["RG-0001", "RG-0002"]
+    assert "<!-- RG-0001" not in (tree / "index.html").read_text()
+    feed = json.loads(pv.resolve("/items.json").body)
+    assert [r["sku"] for r in feed] == ["RG-0001", "RG-0002"]
+
+
+def test_gallery_reads_labels_under_its_own_root(tree, tmp_path_factory, monkeypatch):
+    pv = preview.Preview(str(tree), live_reload=False)
+    monkeypatch.setattr(bg, "ROOT", str(tmp_path_factory.mktemp("elsewhere")))
+    assert sorted(pv._labels()) == ["RG-0001", "RG-0002"]
+
+
+def test_gallery_cache_follows_hero_files(tree):
+    pv = preview.Preview(str(tree), live_reload=False)
+    (tree / "RG-0002" / "hero.png").unlink()
+    assert list(bg.carded_skus(pv.resolve("/").body.decode())) == ["RG-0001"]
+    (tree / "RG-0002" / "hero.png").write_bytes(b"")
+    assert list(bg.carded_skus(pv.resolve("/").body.decode())) == ["RG-0001", "RG-0002"]
+
+
+def test_accepts_gzip_honors_q_values():
+    assert preview.accepts_gzip("gzip, deflate, br")
+    assert preview.accepts_gzip("br;q=1.0, gzip;q=0.5")
+    assert preview.accepts_gzip("*")
+    assert not preview.accepts_gzip("gzip;q=0")
+    assert not preview.accepts_gzip("gzip; q=0.000, *;q=1") and not preview.accepts_gzip("")
+    assert not preview.accepts_gzip("br, *;q=0")
+
+
+def test_lru_evicts_oldest(tree, monkeypatch):
+    monkeypatch.setattr(preview, "PAGE_CACHE", 1)
+    pv = preview.Preview(str(tree))
+    pv.page("RG-0001")
+    pv.page("RG-0002")
+    assert list(pv.pages) == ["RG-0002"]
+
+
+def test_http_etag_gzip_and_live_reload(tree):
+    server = preview.serve(port=0, live_reload=False, root=str(tree))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        req = urllib.request.Request(base + "/RG-0001/", headers={"Accept-Encoding": "gzip"})
+        with urllib.request.urlopen(req) as r:
+            etag = r.headers["ETag"]
+            assert r.headers["Content-Encoding"] == "gzip"
+            assert b"Tin" in gzip.decompress(r.read())
+        req = urllib.request.Request(base + "/RG-0001/", headers={"If-None-Match": etag,
+                                                                  "Accept-Encoding": "gzip"})
+        with pytest.raises(urllib.error.HTTPError) as err:
+            urllib.request.urlopen(req)
+        assert err.value.code == 304 and err.value.headers["Vary"] == "Accept-Encoding"
+        # The identity body is another representation: the gzip ETag doesn't validate it.
+        req = urllib.request.Request(base + "/RG-0001/", headers={"If-None-Match": etag})
+        with urllib.request.urlopen(req) as r:
+            assert r.headers["ETag"] != etag and "Content-Encoding" not in r.headers
+
+        events = urllib.request.urlopen(base + preview.RELOAD_PATH)
+        server.RequestHandlerClass.preview.notify(["RG-0001"])
+        assert events.readline() == b"data: reload\n"
+        events.close()
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,93 @@
+"""Tests for price_updates.py — label-vs-Square price deltas and the batched apply."""
+import json
+
+import catalog
+import price_updates
+
+
+def _label(sku, price, square_price, variation="V" + "X" * 23, **square):
+    square = dict(variation_id=f"{variation}{sku[-1]}", **square)
+    if square_price is not None:
+        square["price"] = square_price
+    return {"sku": sku, "price": price, "channels": {"square": square}}
+
+
+def _tree(root, *labels):
+    for label in labels:
+        d = root / label["sku"]
+        d.mkdir()
+        (d / "label.json").write_text(json.dumps(label, indent=2) + "\n", encoding="utf-8")
+    return catalog.load(root, use_cache=False)
+
+
+class FakeClient:
+    """BatchRetrieve / BatchUpsert over an in-memory catalog, counting calls."""
+
+    def __init__(self, variations):
+        self.objects = {v["id"]: v for v in variations}
+        self.calls = []
+
+    def batch_retrieve(self, ids, related=True):
+        self.calls.append(("retrieve", list(ids)))
+        return {i: json.loads(json.dumps(self.objects[i])) for i in ids if i in self.objects}, {}
+
+    def batch_upsert(self, objects):
+        self.calls.append(("upsert", [o["id"] for o in objects]))
+        for o in objects:
+            if o["version"] != self.objects[o["id"]]["version"]:
+                raise price_updates.squareapi.SquareError("VERSION_MISMATCH")
+            self.objects[o["id"]] = dict(o, version=o["version"] + 1)
+        return {o["id"]: o for o in objects}
+
+
+def _variation(vid, cents, version=1):
+    return {"type": "ITEM_VARIATION", "id": vid, "version": version,
+            "item_variation_data": {"item_id": "ITEM", "name": "Regular",
+                                    "price_money": {"amount": cents, "currency": "USD"}}}
+
+
+def test_deltas_compare_label_price_with_recorded_square_price(tmp_path):
+    items = _tree(tmp_path, _label("RG-0001", "45.00", "40.00"), _label("RG-0002", "$8", "8.00"),
+                  _label("RG-0003", "12.50", "10.00", status="delisted"),
+                  {"sku": "RG-0004", "price": "5.00"})
+    updates = price_updates.deltas(items)
+    assert updates == [{"variation_id": "V" + "X" * 23 + "1", "amount_cents": 4500,
+                        "sku": "RG-0001", "note": "$40.00 -> $45.00"}]
+    text = price_updates.dumps(updates)
+    assert text.startswith("[\n  {\"variation_id\"") and json.loads(text) == updates
+
+
+def test_apply_skips_current_prices_and_records_labels(tmp_path):
+    _tree(tmp_path, _label("RG-0001", "45.00", "40.00"), _label("RG-0002", "9.00", "8.00"))
+    v1, v2 = "V" + "X" * 23 + "1", "V" + "X" * 23 + "2"
+    client = FakeClient([_variation(v1, 4000), _variation(v2, 900)])
+    updates = price_updates.deltas(catalog.load(tmp_path, use_cache=False))
+
+    changes, unchanged, missing = price_updates.plan(client, updates + [
+        {"variation_id": "GONE", "amount_cents": 1, "sku": "RG-0009"}])
+    assert [u["sku"] for u, _, _ in changes] == ["RG-0001"] and changes[0][2] == 4000
+    assert [u["sku"] for u in unchanged] == ["RG-0002"] and missing[0]["variation_id"] == "GONE"
+
+    client.batch_upsert([price_updates.repriced(var, u["amount_cents"]) for u, var, _ in changes])
+    data = client.objects[v1]["item_variation_data"]
+    assert data["price_money"] == {"amount": 4500, "currency": "USD"} and data["item_id"] == "ITEM"
+    assert [c[0] for c in client.calls] == ["retrieve", "upsert"]
+
+    assert price_updates.record(str(tmp_path), [u for u, _, _ in changes] + unchanged) == []
+    assert price_updates.deltas(catalog.load(tmp_path, use_cache=False)) == []
+
+
+
+def test_unrecorded_square_prices_are_reported_and_diffed_live(tmp_path):
+    v1, v2, v3 = ("V" + "X" * 23 + n for n in "123")
+    items = _tree(tmp_path, _label("RG-0001", "45.00", None), _label("RG-0002", "9.00", None),
+                  _label("RG-0003", "5.00", None), _label("RG-0004", "5.00", None, status="delisted"))
+    assert price_updates.deltas(items) == []
+    unpriced = price_updates.unknown(items)
+    assert [u["sku"] for u in unpriced] == ["RG-0001", "RG-0002", "RG-0003"]
+
+    client = FakeClient([_variation(v1, 4000), _variation(v2, 900)])
+    updates, missing = price_updates.live_deltas(client, unpriced)
+    assert updates == [{"variation_id": v1, "amount_cents": 4500, "sku": "RG-0001",
+                        "note": "$40.00 -> $45.00 (live)"}]
+    assert [u["variation_id"] for u in missing] == [v3]
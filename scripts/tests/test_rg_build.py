@@ -0,0 +1,91 @@
+"""Tests for rg_build.py — the stale-target DAG orchestrator."""
+import sys
+
+import pytest
+
+import rg_build
+
+
+def _copy(src, dst):
+    """A command copying src -> dst (relative to the root) and logging the call."""
+    code = (f"import shutil; shutil.copyfile({src!r}, {dst!r}); "
+            f"open('calls.log', 'a').write({dst!r} + '\\n')")
+    return (sys.executable, "-c", code)
+
+
+def _targets(fail_sku=None):
+    check = ("import json, sys; skus = sys.argv[1:]; "
+             "open('calls.log', 'a').write(''.join(f'lint {s}\\n' for s in skus)); "
+             "open('runs.log', 'a').write('run\\n'); "
+             f"print(json.dumps([{{'sku': s, 'passed': s != {fail_sku!r}, 'checks': "
+             "[{'section': 'Label', 'level': 'fail', 'message': 'broken'}]} for s in skus]))")
+    return (
+        rg_build.Target("page", "page", inputs=("RG-0001/label.json",),
+                        outputs=("page.html",), command=_copy("RG-0001/label.json", "page.html")),
+        rg_build.Target("csv", "csv", inputs=("RG-*/label.json",), outputs=("out.csv",),
+                        command=_copy("RG-0002/label.json", "out.csv")),
+        rg_build.Target("lint", "lint", deps=("page",), inputs=("RG-*/label.json", "page.html"),
+                        per_sku=(sys.executable, "-c", check, "{skus}")),
+        rg_build.Target("all", "group", deps=("lint", "csv")),
+    )
+
+
+@pytest.fixture
+def root(tmp_path):
+    for sku in ("RG-0001", "RG-0002"):
+        (tmp_path / sku).mkdir()
+        (tmp_path / sku / "label.json").write_text(f'{{"sku": "{sku}"}}')
+    return tmp_path
+
+
+def _calls(root):
+    log = root / "calls.log"
+    calls = log.read_text().split("\n")[:-1] if log.exists() else []
+    log.unlink(missing_ok=True)
+    return sorted(calls)
+
+
+def test_select_orders_dependencies_first():
+    table = {t.name: t for t in _targets()}
+    order = rg_build.select(table, ["all"])
+    assert order.index("page") < order.index("lint") < order.index("all")
+    with pytest.raises(SystemExit):
+        rg_build.select(table, ["nope"])
+
+
+def test_images_are_derived_before_pages_and_gallery():
+    table = {t.name: t for t in rg_build.TARGETS}
+    order = rg_build.select(table, ["pages", "gallery"])
+    assert order[0] == "images" and table["images"].command[1] == "scripts/build_images.py"
+
+
+def test_only_stale_targets_rebuild(root):
+    lines = []
+    assert rg_build.build(["all"], root=str(root), targets=_targets(), log=lines.append) == 0
+    assert _calls(root) == ["lint RG-0001", "lint RG-0002", "out.csv", "page.html"]
+    assert (root / "runs.log").read_text() == "run\n"  # one process for every stale SKU
+
+    assert rg_build.build(["all"], root=str(root), targets=_targets(), log=lines.append) == 0
+    assert _calls(root) == []
+
+    # RG-0002's label feeds csv and RG-0002's lint only.
+    (root / "RG-0002" / "label.json").write_text('{"sku": "RG-0002", "x": 1}')
+    rg_build.build(["all"], root=str(root), targets=_targets(), log=lines.append)
+    assert _calls(root) == ["lint RG-0002", "out.csv"]
+
+
+def test_failures_block_dependents_and_stay_stale(root):
+    lines = []
+    assert rg_build.build(["lint"], root=str(root), targets=_targets("RG-0001"),
+                          log=lines.append) == 1
+    assert any(line.startswith("== lint: FAILED") for line in lines)
+    assert "--- RG-0001\n  Label: broken\n1 of 2 item(s) passed" in lines
+    _calls(root)
+    rg_build.build(["lint"], root=str(root), targets=_targets(), log=lines.append)
+    assert _calls(root) == ["lint RG-0001"]  # the passing SKU was recorded
+
+    broken = (rg_build.Target("page", "page", command=(sys.executable, "-c", "raise SystemExit(2)")),
+              rg_build.Target("lint", "lint", deps=("page",), command=_copy("page.html", "x")))
+    lines.clear()
+    assert rg_build.build(["lint"], root=str(root), targets=broken, log=lines.append) == 1
+    assert "== lint: not run (page failed)" in lines
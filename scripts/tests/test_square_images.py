@@ -0,0 +1,77 @@
+"""Tests for square_images.py — the label-derived Square upload set and its pre-sizing."""
+import json
+
+import pytest
+
+import build_images
+import square_images
+
+
+def _item(root, sku, photos, square=None, files=()):
+    d = root / sku
+    d.mkdir()
+    label = {"sku": sku, "product_name": "Lamp", "attributes": "Brass", "photos": photos}
+    if square is not None:
+        label["channels"] = {"square": square}
+    (d / "label.json").write_text(json.dumps(label))
+    for name in files:
+        (d / name).write_bytes(b"x")
+    return d
+
+
+def test_manifest_follows_photo_roles_and_skips_unlisted(tmp_path):
+    _item(tmp_path, "RG-0001", {"hero": "hero.jpeg", "square": "square.png", "card": "card.png",
+                                "details": ["detail-a.jpeg", "hero.jpeg", "detail-gone.jpeg"]},
+          {"object_id": "OBJ1"}, files=("hero.jpeg", "square.png", "card.png", "detail-a.jpeg"))
+    _item(tmp_path, "RG-0002", {}, {"object_id": "OBJ2", "status": "delisted"}, files=("hero.png",))
+    _item(tmp_path, "RG-0003", {}, None, files=("hero.png",))
+    _item(tmp_path, "RG-0004", {}, {"object_id": "OBJ4"}, files=("hero.png",))
+
+    uploads, missing = square_images.manifest(tmp_path)
+    assert [(u["sku"], u["object_id"], u["name"]) for u in uploads] == [
+        ("RG-0001", "OBJ1", "Lamp"),
+        ("RG-0001-square", "OBJ1", "Lamp - Square"),
+        ("RG-0001-detail1", "OBJ1", "Lamp - Detail 1"),
+        ("RG-0004", "OBJ4", "Lamp"),
+    ]
+    assert uploads[3]["source"] == str(tmp_path / "RG-0004" / "hero.png")
+    assert missing == ["RG-0001/detail-gone.jpeg"]
+    assert [u["sku"] for u in square_images.manifest(tmp_path, {"RG-0004"})[0]] == ["RG-0004"]
+
+
+def test_presize_downscales_flattens_and_caches(tmp_path, monkeypatch):
+    Image = pytest.importorskip("PIL.Image")
+    monkeypatch.setattr(build_images, "ROOT", str(tmp_path))
+    d = _item(tmp_path, "RG-0001", {"hero": "hero.jpeg", "cutout": "cutout.png"},
+              {"object_id": "OBJ1"})
+    Image.effect_noise((3000, 1500), 64).convert("RGB").save(d / "hero.jpeg", quality=98)
+    Image.new("RGBA", (400, 400), (0, 0, 0, 0)).save(d / "cutout.png")
+
+    uploads, _ = square_images.manifest(tmp_path)
+    stats = square_images.presize(uploads, jobs=1, root=tmp_path)
+    assert stats["encoded"] == 2 and stats["bytes_out"] < stats["bytes_in"]
+    with Image.open(uploads[0]["image_path"]) as im:
+        assert im.format == "JPEG" and max(im.size) == square_images.PROFILE["max_side"]
+    with Image.open(uploads[1]["image_path"]) as im:
+        assert im.mode == "RGB" and im.getpixel((0, 0)) == (255, 255, 255)
+
+    again, _ = square_images.manifest(tmp_path)
+    assert square_images.presize(again, jobs=1, root=tmp_path)["cached"] == 2
+    assert [u["image_path"] for u in again] == [u["image_path"] for u in uploads]
+
+
+def test_dedupe_keeps_one_upload_per_object_and_content(tmp_path, monkeypatch):
+    monkeypatch.setattr(build_images, "ROOT", str(tmp_path))
+    _item(tmp_path, "RG-0001", {"hero": "hero.png", "square": "square.png", "cutout": "cutout.png"},
+          {"object_id": "OBJ1"})
+    (tmp_path / "RG-0001" / "hero.png").write_bytes(b"same")
+    (tmp_path / "RG-0001" / "square.png").write_bytes(b"same")
+    (tmp_path / "RG-0001" / "cutout.png").write_bytes(b"other")
+    uploads, _ = square_images.manifest(tmp_path)
+    for up in uploads:
+        up["image_path"] = up["source"]
+
+    unique, duplicates = square_images.dedupe(uploads)
+    assert [u["sku"] for u in unique] == ["RG-0001", "RG-0001-cutout"]
+    assert [(d["sku"], k["sku"]) for d, k in duplicates] == [("RG-0001-square", "RG-0001")]
+    assert unique[0]["sha256"] == duplicates[0][0]["sha256"] != unique[1]["sha256"]
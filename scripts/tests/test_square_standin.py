@@ -0,0 +1,117 @@
+"""Tests for square_standin.py — the local Square stand-in, driven through squareapi.Client."""
+import json
+import random
+import sys
+
+import pytest
+
+import catalog
+import price_updates
+import squareapi
+from square_standin import Config, latency_sampler, serve
+
+
+def _client(standin, **kw):
+    kw.setdefault("sleep", lambda s: None)
+    return squareapi.Client("test-token", base=standin.base_url, **kw)
+
+
+def _new_item(name, cents):
+    return {"idempotency_key": f"create-{name}", "object": {
+        "type": "ITEM", "id": f"#{name}", "item_data": {"name": name, "variations": [
+            {"type": "ITEM_VARIATION", "id": f"#{name}-v", "item_variation_data": {
+                "item_id": f"#{name}", "name": "Regular", "pricing_type": "FIXED_PRICING",
+                "price_money": {"amount": cents, "currency": "USD"}}}]}}}
+
+
+def test_catalog_round_trip_images_versions_and_delete():
+    with serve(Config(seed=1)) as standin, _client(standin) as client:
+        resp = client.upsert_object(_new_item("Lamp", 4000))
+        assert resp.status == 200 and len(resp.body["id_mappings"]) == 2
+        oid = resp.body["catalog_object"]["id"]
+        assert client.upsert_object(_new_item("Lamp", 4000)).body == resp.body  # replayed
+
+        image = {"idempotency_key": "img-1", "object_id": oid,
+                 "image": {"type": "IMAGE", "id": "#img", "image_data": {"name": "Lamp"}}}
+        made = client.create_image(image, "hero.jpg", b"\xff\xd8jpeg", "image/jpeg")
+        assert made.status == 200
+        item = client.catalog_items([oid, "MISSING"])[oid]
+        assert item.image_names == {made.body["image"]["id"]: "Lamp"} and item.price_cents() == 4000
+
+        objects, _ = client.batch_retrieve(list(item.variations), related=False)
+        var = next(iter(objects.values()))
+        saved = client.batch_upsert([price_updates.repriced(var, 4500)])
+        assert client.catalog_items([oid])[oid].price_cents() == 4500
+        with pytest.raises(squareapi.SquareError, match="version does not match"):
+            client.batch_upsert([price_updates.repriced(var, 5000)])  # var's version is stale
+        assert next(iter(saved.values()))["version"] > var["version"]
+
+        deleted = client.delete_object(oid).body["deleted_object_ids"]
+        assert deleted == [oid, var["id"]]
+        assert client.retrieve_object(oid).status == 404
+
+
+def test_injected_faults_are_retried_under_concurrency():
+    config = Config(latency="uniform:1,5", rate_429=0.3, rate_5xx=0.2, retry_after=0, seed=4)
+    with serve(config) as standin, _client(standin, workers=8, retries=20) as client:
+        names = [f"Item {n}" for n in range(40)]
+        results = dict(client.map(lambda n: client.upsert_object(_new_item(n, 100)), names))
+        assert all(r.status == 200 for r in results.values())
+        assert len(standin.catalog.objects) == 80  # an item and a variation each, no duplicates
+        assert standin.faults["429"] and standin.faults["500"] + standin.faults["503"]
+        assert standin.requests["UpsertCatalogObject"] == 40 + sum(standin.faults.values())
+        assert sum(r.attempts for r in results.values()) == standin.requests["UpsertCatalogObject"]
+
+
+def test_price_updates_apply_against_standin_and_conflicts(tmp_path, monkeypatch):
+    with serve(Config(seed=2)) as standin, _client(standin) as client:
+        created = client.upsert_object(_new_item("Lamp", 4000)).body["catalog_object"]
+        vid = created["item_data"]["variations"][0]["id"]
+    d = tmp_path / "RG-0001"
+    d.mkdir()
+    label = {"sku": "RG-0001", "price": "45.00",
+             "channels": {"square": {"variation_id": vid, "price": "40.00"}}}
+    (d / "label.json").write_text(json.dumps(label, indent=2) + "\n", encoding="utf-8")
+    updates = tmp_path / "updates.json"
+    items = catalog.load(tmp_path, use_cache=False)
+    updates.write_text(price_updates.dumps(price_updates.deltas(items)))
+    monkeypatch.setenv("SQUARE_ACCESS_TOKEN", "test-token")
+    state = list(standin.catalog.objects.values())
+
+    with serve(Config(seed=3, rate_conflict=1.0), state) as conflicted:
+        monkeypatch.setattr(sys, "argv", ["price_updates.py", "--root", str(tmp_path),
+                                          "--apply", str(updates), "--base-url", conflicted.base_url])
+        assert price_updates.main() == 1
+        assert conflicted.faults["version_mismatch"] == 1
+    assert json.loads((d / "label.json").read_text())["channels"]["square"]["price"] == "40.00"
+
+    with serve(Config(seed=3), state) as clean:
+        monkeypatch.setattr(sys, "argv", ["price_updates.py", "--root", str(tmp_path),
+                                          "--apply", str(updates), "--base-url", clean.base_url])
+        assert price_updates.main() == 0
+        var = clean.catalog.objects[vid]["item_variation_data"]
+        assert var["price_money"]["amount"] == 4500
+    assert json.loads((d / "label.json").read_text())["channels"]["square"]["price"] == "45.00"
+
+
+def test_payment_links_auth_and_latency_specs():
+    with serve(Config(seed=5)) as standin, _client(standin) as client:
+        body = {"idempotency_key": "link-1", "quick_pay": {
+            "name": "Lamp", "price_money": {"amount": 4500, "currency": "USD"},
+            "location_id": "L1"}}
+        link = client.post("/online-checkout/payment-links", body).body["payment_link"]
+        assert link["url"].startswith("https://square.link/u/")
+        assert client.get(f"/online-checkout/payment-links/{link['id']}").body["payment_link"] == link
+        assert client.delete(f"/online-checkout/payment-links/{link['id']}").status == 200
+        assert client.get(f"/online-checkout/payment-links/{link['id']}").status == 404
+        assert client.post("/online-checkout/payment-links", {}).status == 400
+        anon = squareapi.Client("", base=standin.base_url)
+        anon._headers["Authorization"] = ""
+        assert anon.get("/catalog/object/X").status == 401
+
+    rng = random.Random(0)
+    assert latency_sampler("fixed:20", rng)() == 0.02
+    assert 0.01 <= latency_sampler("uniform:10,30", rng)() <= 0.03
+    assert latency_sampler("lognormal:40,0.5", rng)() > 0
+    with pytest.raises(ValueError, match="bad latency spec"):
+        latency_sampler("normal:40", rng)
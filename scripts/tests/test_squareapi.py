@@ -0,0 +1,187 @@
+"""Tests for squareapi.py — the pooled, retrying Square client."""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import squareapi
+
+
+def _item(oid, cents, images=()):
+    return {"type": "ITEM", "id": oid, "version": 7, "item_data": {
+        "name": oid, "image_ids": list(images),
+        "variations": [{"type": "ITEM_VARIATION", "id": f"{oid}-V", "version": 3,
+                        "item_variation_data": {"price_money": {"amount": cents}}}]}}
+
+
+CATALOG = {"A": _item("A", 4000, ["IA"]), "B": _item("B", 1250), "C": _item("C", 999),
+           "IA": {"type": "IMAGE", "id": "IA", "image_data": {"name": "Lamp hero"}}}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, as Square serves it
+
+    def log_message(self, *args):
+        pass
+
+    def _reply(self, status, body, headers=()):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for k, v in headers:
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        srv = self.server
+        with srv.lock:
+            srv.peers.add(self.client_address)
+            script = srv.script.pop(0) if srv.script else (200, {"object": {"id": "X"}}, ())
+        time.sleep(srv.delay)
+        self._reply(*script)
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        self.server.seen.append((self.path, self.headers["Content-Type"], body))
+        if self.path.endswith("/catalog/batch-retrieve"):
+            ids = json.loads(body)["object_ids"]
+            objects = [CATALOG[i] for i in ids if i in CATALOG]
+            images = [CATALOG[i] for o in objects for i in o["item_data"].get("image_ids", [])]
+            return self._reply(200, {"objects": objects, "related_objects": images})
+        if self.path.endswith("/catalog/batch-upsert"):
+            req = json.loads(body)
+            objects = [o for batch in req["batches"] for o in batch["objects"]]
+            if any(o.get("version") == 0 for o in objects):
+                return self._reply(400, {"errors": [{"code": "VERSION_MISMATCH",
+                                                     "detail": "Object version does not match"}]})
+            return self._reply(200, {"objects": [dict(o, version=o["version"] + 1)
+                                                 for o in objects]})
+        self._reply(200, {"image": {"id": "IMG1"}})
+
+
+@pytest.fixture
+def server():
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    srv.lock, srv.peers, srv.script, srv.seen, srv.delay = threading.Lock(), set(), [], [], 0
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    yield srv
+    srv.shutdown()
+    srv.server_close()
+
+
+def _client(srv, **kw):
+    sleeps = []
+    client = squareapi.Client("tok", base=f"http://127.0.0.1:{srv.server_port}/v2",
+                              sleep=sleeps.append, **kw)
+    return client, sleeps
+
+
+def test_retries_429_and_5xx_honouring_retry_after(server):
+    server.script = [(429, {"errors": []}, [("Retry-After", "2")]),
+                     (503, {"errors": []}, ()),
+                     (200, {"object": {"id": "ABC"}}, ())]
+    client, sleeps = _client(server, backoff=0.1)
+    resp = client.retrieve_object("ABCDEFGHIJKLMNOP")
+    assert resp.ok and resp.body == {"object": {"id": "ABC"}} and resp.attempts == 3
+    assert 2 <= sleeps[0] <= 2.1 and 0 <= sleeps[1] <= 0.2
+    assert client.stats.retries == 2
+    assert "GET /catalog/object/{id}" in client.stats.summary()
+
+    server.script = [(404, {"errors": [{"detail": "Object not found"}]}, ())]
+    resp = client.retrieve_object("MISSING")
+    assert resp.status == 404 and resp.attempts == 1
+    assert resp.error_detail() == "Object not found"
+
+    server.script = [(500, {}, ())] * 3
+    assert _client(server, retries=2)[0].get("/catalog/object/X").status == 500
+
+
+def test_endpoint_name_folds_only_square_ids():
+    name = squareapi.endpoint_name
+    assert name("GET", "/catalog/object/ABCDEFGHIJKLMNOP?x=1") == "GET /catalog/object/{id}"
+    assert name("DELETE", "/catalog/object/#temp-item") == "DELETE /catalog/object/{id}"
+    assert name("POST", "/catalog/batch-retrieve") == "POST /catalog/batch-retrieve"
+    assert name("POST", "/catalog/batch-upsert") == "POST /catalog/batch-upsert"
+    assert name("POST", "/online-checkout/payment-links") == "POST /online-checkout/payment-links"
+    assert name("GET", "/online-checkout/payment-links/QWERTY1234567890") == \
+        "GET /online-checkout/payment-links/{id}"
+
+
+def test_connection_failures_raise_after_retries():
+    client = squareapi.Client("tok", base="http://127.0.0.1:9/v2", retries=1, sleep=lambda s: None)
+    with pytest.raises(squareapi.SquareError, match="after 2 attempt"):
+        client.get("/catalog/object/X")
+
+
+def test_map_reuses_pooled_connections_concurrently(server):
+    server.delay = 0.05
+    client, _ = _client(server, workers=4)
+    start = time.perf_counter()
+    results = dict(client.map(lambda i: client.get(f"/catalog/object/{i}").status, range(16)))
+    assert results == dict.fromkeys(range(16), 200)
+    assert time.perf_counter() - start < 16 * 0.05 / 2
+    assert len(server.peers) <= 4  # one keep-alive connection per worker
+
+    boom = dict(client.map(lambda i: 1 / i, [0, 1]))
+    assert isinstance(boom[0], ZeroDivisionError) and boom[1] == 1
+
+
+def test_create_image_sends_multipart(server):
+    client, _ = _client(server)
+    resp = client.create_image({"idempotency_key": "k"}, "hero.jpeg", b"\xff\xd8JPEG", "image/jpeg")
+    assert resp.body["image"]["id"] == "IMG1"
+    path, ctype, body = server.seen[0]
+    assert path == "/v2/catalog/images" and ctype.startswith("multipart/form-data; boundary=")
+    assert b'name="request"' in body and b'{"idempotency_key": "k"}' in body
+    assert b'filename="hero.jpeg"\r\nContent-Type: image/jpeg\r\n\r\n\xff\xd8JPEG' in body
+
+
+def test_catalog_items_batches_ids_with_images_and_prices(server, monkeypatch):
+    monkeypatch.setattr(squareapi, "BATCH_RETRIEVE_LIMIT", 2)
+    client, _ = _client(server)
+    items = client.catalog_items(["A", "B", "C", "A", "GONE"])
+    assert len(server.seen) == 2  # 4 unique IDs, 2 per call
+    assert sorted(items) == ["A", "B", "C"]
+    assert items["A"].image_names == {"IA": "Lamp hero"} and items["A"].version == 7
+    assert items["A"].price_cents() == 4000 and items["B"].price_cents("B-V") == 1250
+    assert items["B"].variations == {"B-V": {"version": 3, "amount": 1250}}
+    assert squareapi.cents("$12.50") == 1250 and squareapi.cents("n/a") is None
+
+
+def test_upload_journal_survives_a_torn_line(tmp_path):
+    path = tmp_path / ".build" / "square-uploads.jsonl"
+    journal = squareapi.UploadJournal(str(path))
+    assert journal.get("RG-0001", "OBJ", "aa") is None
+    journal.record("RG-0001", "OBJ", "aa", "IMG1")
+    with open(path, "a") as fh:
+        fh.write('{"sku": "RG-0002", "obj')  # crash mid-write
+
+    journal = squareapi.UploadJournal(str(path))
+    assert journal.done == {("RG-0001", "OBJ", "aa"): "IMG1"}
+    journal.record("RG-0002", "OBJ", "bb", "IMG2")
+    assert squareapi.UploadJournal(str(path)).get("RG-0002", "OBJ", "bb") == "IMG2"
+
+    key = squareapi.image_idempotency_key("OBJ", "f" * 64)
+    assert key == squareapi.image_idempotency_key("OBJ", "f" * 64) and len(key) <= 128
+
+
+def test_batch_upsert_chunks_calls_and_keys_them_by_content(server, monkeypatch):
+    monkeypatch.setattr(squareapi, "BATCH_UPSERT_BATCH", 2)
+    monkeypatch.setattr(squareapi, "BATCH_UPSERT_TOTAL", 4)
+    client, _ = _client(server)
+    objects = [{"type": "ITEM_VARIATION", "id": f"V{i}", "version": 5} for i in range(6)]
+    out = client.batch_upsert(objects)
+    assert sorted(out) == [f"V{i}" for i in range(6)] and out["V0"]["version"] == 6
+    bodies = [json.loads(b) for _, _, b in server.seen]
+    assert [[len(b["objects"]) for b in body["batches"]] for body in bodies] == [[2, 2], [2]]
+
+    client.batch_upsert(objects)
+    keys = [json.loads(b)["idempotency_key"] for _, _, b in server.seen]
+    assert keys[:2] == keys[2:] and keys[0] != keys[1]
+
+    with pytest.raises(squareapi.SquareError, match="Object version does not match"):
+        client.batch_upsert([dict(objects[0], version=0)])
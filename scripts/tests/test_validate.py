@@ -0,0 +1,71 @@
+"""Tests for validate.py — the rules behind validate-item.sh / audit-items.sh."""
+import json
+
+import validate
+
+GOOD_LABEL = {"sku": "RG-0001", "product_name": "Lamp", "attributes": "Brass",
+              "price": "$40.00", "condition": "Good", "condition_notes": "",
+              "qr_code_url": "https://square.link/u/abc"}
+GOOD_HTML = ('<div class="flip-card" aria-label="x">'
+             '<a class="buy-button" href="https://square.link/u/abc">Buy</a></div>'
+             "<style>@media print {}</style>")
+
+
+def _item(root, sku, label=None, html=GOOD_HTML, files=("hero.jpeg", "qr-code.png"), sold=False):
+    d = root / sku
+    d.mkdir()
+    if label is not None:
+        (d / "label.json").write_text(json.dumps(label))
+    if html is not None:
+        (d / "index.html").write_text(html)
+    for name in files:
+        (d / name).write_bytes(b"x")
+    if sold:
+        (d / "status.json").write_text('{"status": "sold"}')
+    return str(d)
+
+
+def _levels(result):
+    return {c["message"]: c["level"] for c in result["checks"]}
+
+
+def test_complete_item_passes(tmp_path):
+    result = validate.evaluate(_item(tmp_path, "RG-0001", GOOD_LABEL))
+    assert result["passed"] and result["status"] == "available"
+    assert _levels(result)["label.json schema valid"] == validate.PASS
+    assert result["warnings"] == 1  # no working-images original
+
+
+def test_missing_files_bad_labels_and_placeholders_fail(tmp_path):
+    label = dict(GOOD_LABEL, sku="RG-0002")
+    del label["qr_code_url"]
+    path = _item(tmp_path, "RG-0002", label, html="<p>{{PRICE}} {{PRICE}}</p>", files=())
+    levels = _levels(validate.evaluate(path))
+    assert levels["qr-code.png MISSING"] == levels["hero.{jpeg|png} MISSING"] == validate.FAIL
+    assert levels["label.json invalid: /qr_code_url: required field is missing"] == validate.FAIL
+    assert levels["Found unreplaced placeholders:\n   - {{PRICE}}"] == validate.FAIL
+    assert levels["Square payment link missing"] == validate.FAIL
+
+    bad = dict(GOOD_LABEL, sku="RG-0003", price="forty")
+    assert "/price: 'forty' does not match" in validate.label_problem(
+        validate.load_folder(_item(tmp_path, "RG-0003", bad)))
+
+
+def test_sold_items_should_not_sell(tmp_path):
+    path = _item(tmp_path, "RG-0001", GOOD_LABEL, sold=True)
+    result = validate.evaluate(path)
+    assert result["passed"] and result["status"] == "sold"
+    assert _levels(result)["Square payment link present on sold archive item "
+                           "(consider removing checkout)"] == validate.WARN
+    audit = _levels(validate.evaluate(path, "audit"))
+    assert audit["Buy button still present on sold item"] == validate.WARN
+    assert audit["Brand colors missing"] == validate.FAIL
+
+
+def test_parallel_run_matches_serial(tmp_path):
+    (tmp_path / "assets" / "working-images").mkdir(parents=True)
+    (tmp_path / "assets" / "working-images" / "RG-0001-hero.jpeg").write_bytes(b"x")
+    paths = [_item(tmp_path, f"RG-000{n}", dict(GOOD_LABEL, sku=f"RG-000{n}")) for n in range(1, 6)]
+    serial = validate.run_all(paths, jobs=1)
+    assert validate.run_all(paths, jobs=3) == serial
+    assert [r["warnings"] for r in serial] == [0, 1, 1, 1, 1]
@@ -0,0 +1,78 @@
+"""Tests for watch.py — change sources and the one-SKU-per-change session."""
+import json
+
+import pytest
+
+import build_gallery as bg
+import watch
+from conftest import index_page, write_item, write_label
+
+
+@pytest.fixture
+def tree(gallery_root):
+    labels = [write_item(gallery_root, "RG-0001"), write_item(gallery_root, "RG-0002", state="Sold"),
+              write_item(gallery_root, "RG-0003", state="Draft")]
+    cards = [bg.render_card(bg.card_fields(lab["sku"], lab), lazy=False) for lab in labels[:2]]
+    (gallery_root / "index.html").write_text(index_page(cards, count=1))
+    return gallery_root
+
+
+def test_relevant_inputs_only():
+    assert watch.relevant("label.json") and watch.relevant("hero.JPEG")
+    assert not watch.relevant("index.html") and not watch.relevant(".label.json.swp")
+    assert watch.relevant("manifest.json", in_img=True)
+    assert not watch.relevant("cutout-640.webp", in_img=True)
+
+
+def test_session_patches_one_card_and_keeps_count(tree):
+    session = watch.Session(str(tree))
+    before = (tree / "index.html").read_text()
+    write_label(tree, "RG-0001", name="Renamed Tin")
+    report = session.apply("RG-0001")
+    assert "card" in report and "feed" in report
+
+    after = (tree / "index.html").read_text()
+    assert "Renamed Tin" in after
+    assert after.split("<!-- RG-0002")[1] == before.split("<!-- RG-0002")[1]
+    assert '<div class="stat-number" id="item-count">1</div>' in after
+    feed = json.loads((tree / "items.json").read_text())
+    assert [r["title"] for r in feed] == ["Renamed Tin", "Item RG-0002"]
+    assert (tree / "RG-0001" / "index.html").is_file()  # the page was rendered too
+    assert not (tree / "RG-0002" / "index.html").exists()  # Sold pages are skipped
+
+
+def test_session_inserts_newly_listed_item(tree):
+    session = watch.Session(str(tree))
+    write_label(tree, "RG-0003", state="Listed")
+    session.apply("RG-0003")
+    text = (tree / "index.html").read_text()
+    assert list(bg.carded_skus(text)) == ["RG-0001", "RG-0002", "RG-0003"]
+    assert '<div class="stat-number" id="item-count">2</div>' in text
+    assert [r["sku"] for r in json.loads((tree / "items.json").read_text())][-1] == "RG-0003"
+
+
+def test_session_rereads_gallery_rewritten_elsewhere(tree):
+    session = watch.Session(str(tree))
+    (tree / "index.html").write_text((tree / "index.html").read_text() + "<!-- edited -->\n")
+    write_label(tree, "RG-0001", name="Again")
+    session.apply("RG-0001")
+    assert (tree / "index.html").read_text().endswith("<!-- edited -->\n")
+
+
+@pytest.mark.parametrize("poll", [True, False])
+def test_sources_report_changed_sku(tree, poll):
+    try:
+        source = watch.open_source(str(tree), poll=poll, interval=0.01)
+    except OSError:
+        pytest.skip("inotify unavailable")
+    try:
+        write_label(tree, "RG-0002", state="Sold", name="x" * 40)  # new size
+        (tree / "RG-0001" / "index.html").write_text("ignored output")
+        changed = set()
+        for _ in range(50):
+            changed |= source.wait(0.05)
+            if changed:
+                break
+        assert changed == {"RG-0002"}
+    finally:
+        source.close()
@@ -1,9 +1,13 @@
 #!/usr/bin/env python3
 """Roll the canonical 'Tap for Story' chip into the inline-style item pages.
 
-Skips RG-0014 (old 'pill over image' structure, edited by hand). Idempotent.
+Skips RG-0014 (old 'pill over image' structure, edited by hand). Idempotent:
+pages are written through output.py, so an already-rolled-out page is not touched.
 """
-import re, glob, sys
+import re, glob, os, sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import output  # noqa: E402
 
 CHIP = """.flip-hint {
             display: inline-flex;
@@ -27,20 +31,19 @@ CHIP = """.flip-hint {
 changed, errors = [], []
 for f in sorted(glob.glob("RG-*/index.html")):
     if f.startswith("RG-0014"):   # old structure, handled by hand
-        continue
+        output.skip(); continue
     html = open(f, encoding="utf-8").read()
-    orig = html
     m = re.search(r"\.flip-hint\s*\{[^}]*\}", html)
     if not m:
-        errors.append(f"{f}: no .flip-hint rule found"); continue
+        errors.append(f"{f}: no .flip-hint rule found"); output.skip(); continue
     if "position: absolute" in m.group(0):
-        errors.append(f"{f}: unexpected pill-style .flip-hint (skipped)"); continue
+        errors.append(f"{f}: unexpected pill-style .flip-hint (skipped)"); output.skip(); continue
     if "flip-nudge" not in html:            # idempotency: only insert once
         html = html[:m.start()] + CHIP + html[m.end():]
     html = html.replace("Tap for story", "Tap for Story").replace("Tap to learn more", "Tap for Story")
-    if html != orig:
-        open(f, "w", encoding="utf-8").write(html); changed.append(f)
+    if output.write_text(f, html) == output.WRITTEN:
+        changed.append(f)
 
-print(f"changed {len(changed)} files")
+print(f"changed {len(changed)} files ({output.TALLY.summary()})")
 if errors:
     print("ERRORS:\n" + "\n".join(errors)); sys.exit(1)
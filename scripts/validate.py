@@ -0,0 +1,448 @@
+#!/usr/bin/env python3
+"""Item validation engine: the checks behind validate-item.sh and audit-items.sh.
+
+  validate.py RG-0007                  # validate one folder (exit 1 on any error)
+  validate.py RG-0007 RG-0008          # several folders; exit 1 if any fails
+  validate.py --all                    # every RG-* folder
+  validate.py --since origin/main      # only the items changed since REV (gitscope.py)
+  validate.py --audit                  # the design/accessibility audit of every item
+  validate.py --all --json             # machine-readable results, same exit code
+  validate.py --all --jobs 8           # evaluate over 8 worker processes
+
+Each item folder is read ONCE (one directory listing, index.html, label.json,
+status.json) into a ``Folder`` and every registered rule runs against that
+snapshot — no grep/stat subprocess per check. A rule belongs to a rule set
+(VALIDATE, the pre-deploy gate; AUDIT, the catalog-wide report) and a section
+of the report, and returns ``(level, message)`` or None when it doesn't apply.
+
+Pass/fail semantics are those of the shell scripts: validate fails an item on
+any FAIL (missing required file, invalid label metadata, unreplaced
+placeholder, missing Square link on an unsold item) and only warns on the
+rest; the audit is informational and always exits 0. validate-item.sh and
+audit-items.sh are now thin wrappers around this script.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable
+
+import catalog
+import gitscope
+import labelschema
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))  # items/
+WORKING_IMAGES = os.path.join("assets", "working-images")  # relative to the items root
+
+PASS = "pass"
+WARN = "warn"
+FAIL = "fail"
+INFO = "info"
+
+HERO_WARN_MB = 1.0
+
+
+@dataclass(frozen=True)
+class Folder:
+    """Everything the rules look at for one item, read once."""
+
+    sku: str
+    path: str
+    names: frozenset                    # entries in the folder
+    html: str | None = None             # index.html text, None when absent
+    label_text: str | None = None       # raw label.json, None when absent
+    sold: bool = False                  # status.json says sold
+    sizes: dict = field(default_factory=dict)   # hero.* name -> bytes
+    working: frozenset = frozenset()    # assets/working-images entries
+
+    def has(self, *names) -> bool:
+        return any(n in self.names for n in names)
+
+
+def _read(path) -> str | None:
+    try:
+        with open(path, encoding="utf-8", errors="replace") as fh:
+            return fh.read()
+    except OSError:
+        return None
+
+
+def load_folder(path: str, working=frozenset()) -> Folder:
+    with os.scandir(path) as it:
+        entries = {e.name: e for e in it}
+    sizes = {}
+    for name in ("hero.jpeg", "hero.png"):
+        if name in entries:
+            sizes[name] = entries[name].stat().st_size
+    return Folder(
+        sku=os.path.basename(os.path.normpath(path)),
+        path=path,
+        names=frozenset(entries),
+        html=_read(os.path.join(path, "index.html")) if "index.html" in entries else None,
+        label_text=_read(os.path.join(path, "label.json")) if "label.json" in entries else None,
+        sold="status.json" in entries and str(
+            catalog.read_status(path).get("status") or "").strip().lower() == "sold",
+        sizes=sizes,
+        working=frozenset(working),
+    )
+
+
+# ---------------------------------------------------------------------------
+# Rules. Registered in report order; each returns (level, message) or None.
+# ---------------------------------------------------------------------------
+
+@dataclass(frozen=True)
+class Rule:
+    section: str
+    check: Callable  # Folder -> (level, message) | None
+
+
+VALIDATE: list = []
+AUDIT: list = []
+RULESETS = {"validate": VALIDATE, "audit": AUDIT}
+
+
+def rule(ruleset: list, section: str):
+    """Decorator: append the check to ``ruleset`` under ``section``."""
+    def register(fn):
+        ruleset.append(Rule(section, fn))
+        return fn
+    return register
+
+
+def grep_rule(ruleset: list, section: str, pattern: str, ok: str, missing: str,
+              level: str = FAIL) -> None:
+    """Register "index.html matches ``pattern``" (skipped when there is no index.html)."""
+    rx = re.compile(pattern)
+
+    def check(f: Folder):
+        if f.html is None:
+            return None
+        return (PASS, ok) if rx.search(f.html) else (level, missing)
+    ruleset.append(Rule(section, check))
+
+
+def file_rule(ruleset: list, section: str, names: tuple, ok: str, missing: str) -> None:
+    """Register "the folder holds one of ``names``" (a FAIL when it doesn't)."""
+    ruleset.append(Rule(section, lambda f: (PASS, ok) if f.has(*names) else (FAIL, missing)))
+
+
+def label_problem(f: Folder) -> str | None:
+    """Why label.json fails the print schema (labelschema.PRINT_LABEL), or None."""
+    try:
+        payload = json.loads(f.label_text)
+    except ValueError as e:
+        return str(e)
+    problems = labelschema.PRINT_LABEL.errors(payload, f.sku)
+    return labelschema.describe(problems) if problems else None
+
+
+# -- validate (validate-item.sh) ---------------------------------------------
+
+file_rule(VALIDATE, "Required Files", ("index.html",), "index.html", "index.html MISSING")
+file_rule(VALIDATE, "Required Files", ("hero.jpeg", "hero.png"), "hero image",
+          "hero.{jpeg|png} MISSING")
+file_rule(VALIDATE, "Required Files", ("qr-code.png",), "qr-code.png", "qr-code.png MISSING")
+file_rule(VALIDATE, "Required Files", ("label.json",), "label.json", "label.json MISSING")
+
+
+@rule(VALIDATE, "Required Files")
+def svg_qr(f):
+    if f.has("qr-code.svg"):
+        return WARN, "qr-code.svg found (should use PNG only)"
+    return None
+
+
+@rule(VALIDATE, "Label Metadata")
+def label_metadata(f):
+    if f.label_text is None:
+        return None
+    problem = label_problem(f)
+    return (FAIL, f"label.json invalid: {problem}") if problem else (PASS, "label.json schema valid")
+
+
+@rule(VALIDATE, "Placeholder Check")
+def placeholders(f):
+    if f.html is None:
+        return None
+    found = sorted(set(re.findall(r"\{\{[A-Z_]*\}\}", f.html)))
+    if not found:
+        return PASS, "No unreplaced placeholders"
+    return FAIL, "Found unreplaced placeholders:" + "".join(f"\n   - {p}" for p in found)
+
+
+@rule(VALIDATE, "Working Images")
+def working_hero(f):
+    if f.working & {f"{f.sku}-hero.jpeg", f"{f.sku}-hero.png"}:
+        return PASS, "Original hero image in working-images"
+    return WARN, "No original hero image found in assets/working-images/"
+
+
+@rule(VALIDATE, "Content Check")
+def square_link(f):
+    """Sold-status consistency: a live item sells through Square, a sold archive doesn't."""
+    if f.html is None:
+        return None
+    linked = re.search(r"square.link", f.html) is not None
+    if f.sold:
+        return ((WARN, "Square payment link present on sold archive item (consider removing checkout)")
+                if linked else (PASS, "Sold archive item intentionally has no Square payment link"))
+    return (PASS, "Square payment link present") if linked else (FAIL, "Square payment link missing")
+
+
+grep_rule(VALIDATE, "Content Check", r"flip-card", "Flip card UI present",
+          "Flip card UI missing", WARN)
+grep_rule(VALIDATE, "Content Check", r"aria-", "Accessibility (ARIA) labels present",
+          "ARIA labels missing (accessibility)", WARN)
+grep_rule(VALIDATE, "Content Check", r"@media print", "Print styles present",
+          "Print styles missing", WARN)
+
+
+def _hero_size(name):
+    def check(f):
+        if name not in f.sizes:
+            return None
+        mb = int(f.sizes[name] * 100 / 1048576) / 100  # bc scale=2 truncates
+        if mb > HERO_WARN_MB:
+            return WARN, f"{name} is {mb:.2f}MB (recommend < 1MB)"
+        return PASS, f"{name} size OK ({mb:.2f}MB)"
+    return check
+
+
+for _name in ("hero.jpeg", "hero.png"):
+    VALIDATE.append(Rule("File Sizes", _hero_size(_name)))
+
+
+# -- audit (audit-items.sh) --------------------------------------------------
+
+file_rule(AUDIT, "Files", ("index.html",), "index.html", "index.html MISSING")
+file_rule(AUDIT, "Files", ("hero.jpeg", "hero.jpg", "hero.png"), "hero image", "hero image MISSING")
+file_rule(AUDIT, "Files", ("qr-code.png",), "qr-code.png", "qr-code.png MISSING")
+file_rule(AUDIT, "Files", ("label.json",), "label.json", "label.json MISSING")
+AUDIT.append(Rule("Files", lambda f: (INFO, f"status: {'sold' if f.sold else 'available'}")))
+
+grep_rule(AUDIT, "Design Elements", r"rg-gold", "Brand colors (CSS variables)",
+          "Brand colors missing")
+grep_rule(AUDIT, "Design Elements", r"flip-card", "Flip card UI", "Flip card UI missing")
+grep_rule(AUDIT, "Design Elements", r"Playfair Display", "Playfair Display font",
+          "Playfair Display font missing")
+grep_rule(AUDIT, "Design Elements", r"Source Sans Pro", "Source Sans Pro font",
+          "Source Sans Pro font missing")
+grep_rule(AUDIT, "Design Elements", r"sku-badge|SKU", "SKU badge", "SKU badge missing")
+grep_rule(AUDIT, "Design Elements", r"item-price|price", "Price display", "Price display missing")
+grep_rule(AUDIT, "Design Elements", r"story-section|story", "Story/provenance",
+          "Story/provenance missing")
+grep_rule(AUDIT, "Design Elements", r"details-grid|detail-item", "Details grid",
+          "Details grid missing")
+
+
+@rule(AUDIT, "Design Elements")
+def audit_square_link(f):
+    if f.html is None:
+        return None
+    if re.search(r"square.link", f.html):
+        m = re.search(r"square.link/u/[A-Za-z0-9]*", f.html)
+        link = m.group(0) if m else ""
+        if f.sold:
+            return WARN, f"Square payment link still present on sold item ({link})"
+        return PASS, f"Square payment link ({link})"
+    if f.sold:
+        return PASS, "Sold archive item has no Square payment link"
+    return FAIL, "Square payment link MISSING"
+
+
+@rule(AUDIT, "Design Elements")
+def audit_buy_button(f):
+    """Sold-status consistency for the actual interactive Buy element (not CSS)."""
+    if f.html is None:
+        return None
+    if re.search(r"<(a|button)[^>]*buy-button|>Buy Now<", f.html):
+        return (WARN, "Buy button still present on sold item") if f.sold else (PASS, "Buy Now button")
+    return (PASS, "Sold archive item has no Buy button") if f.sold else (FAIL, "Buy Now button missing")
+
+
+grep_rule(AUDIT, "Design Elements", r"qr-code", "QR code reference", "QR code reference missing")
+grep_rule(AUDIT, "Accessibility", r"aria-", "ARIA labels", "ARIA labels missing")
+grep_rule(AUDIT, "Accessibility", r"tabindex", "Keyboard navigation", "Keyboard navigation missing")
+grep_rule(AUDIT, "Accessibility", r"@media print", "Print styles", "Print styles missing")
+grep_rule(AUDIT, "Accessibility", r"richmondgeneral\.com|Richmond General", "Brand footer",
+          "Brand footer missing")
+
+
+# ---------------------------------------------------------------------------
+# Engine.
+# ---------------------------------------------------------------------------
+
+def evaluate(path: str, ruleset: str = "validate", working=frozenset()) -> dict:
+    """Run one rule set over one item folder; a JSON-able result."""
+    f = load_folder(path, working)
+    checks = []
+    for r in RULESETS[ruleset]:
+        result = r.check(f)
+        if result is not None:
+            checks.append({"section": r.section, "level": result[0], "message": result[1]})
+    errors = sum(c["level"] == FAIL for c in checks)
+    return {
+        "sku": f.sku,
+        "status": "sold" if f.sold else "available",
+        "passed": errors == 0,
+        "errors": errors,
+        "warnings": sum(c["level"] == WARN for c in checks),
+        "checks": checks,
+    }
+
+
+def working_images(root) -> frozenset:
+    try:
+        return frozenset(os.listdir(os.path.join(str(root), WORKING_IMAGES)))
+    except OSError:
+        return frozenset()
+
+
+def run_all(paths: list, ruleset: str = "validate", jobs: int = 1) -> list:
+    """evaluate() every folder (working images listed once per root), in input order."""
+    listed = {}
+    args = []
+    for p in paths:
+        root = os.path.dirname(os.path.abspath(p))
+        if root not in listed:
+            listed[root] = working_images(root)
+        args.append((p, ruleset, listed[root]))
+    if jobs <= 1 or len(args) <= 1:
+        return [evaluate(*a) for a in args]
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        chunk = max(1, len(args) // (jobs * 4))
+        return list(pool.map(evaluate, *zip(*args), chunksize=chunk))
+
+
+# ---------------------------------------------------------------------------
+# Reports.
+# ---------------------------------------------------------------------------
+
+RULE = "=" * 42
+
+
+class _Colors:
+    def __init__(self, on: bool):
+        codes = {"green": "0;32", "yellow": "1;33", "red": "0;31"}
+        for name, code in codes.items():
+            setattr(self, name, f"\033[{code}m" if on else "")
+        self.nc = "\033[0m" if on else ""
+
+
+def _sections(result):
+    """(section, [checks]) in rule order."""
+    out = []
+    for c in result["checks"]:
+        if not out or out[-1][0] != c["section"]:
+            out.append((c["section"], []))
+        out[-1][1].append(c)
+    return out
+
+
+def print_validate(result: dict, c: _Colors, trailer: bool = True) -> None:
+    marks = {PASS: f"{c.green}✓{c.nc}", WARN: f"{c.yellow}⚠{c.nc}", FAIL: f"{c.red}✗{c.nc}"}
+    sku = result["sku"]
+    print(f"{RULE}\nValidating: {sku}\n{RULE}\n")
+    print(f"Item Status: {result['status']}\n")
+    for section, checks in _sections(result):
+        print(f"{section}:")
+        for check in checks:
+            print(f"{marks[check['level']]} {check['message']}")
+        print()
+    print(RULE)
+    warnings = result["warnings"]
+    if result["passed"]:
+        print(f"{c.green}✓ Validation passed!{c.nc}")
+        if warnings:
+            print(f"{c.yellow}{warnings} warning(s) - review recommended{c.nc}")
+        if trailer:
+            print("\nReady to deploy:")
+            print(f"  {c.green}git add {sku}{c.nc}")
+            print(f"  {c.green}git commit -m \"Add {sku}: [Item Name]\"{c.nc}")
+            print(f"  {c.green}git push origin main{c.nc}")
+    else:
+        print(f"{c.red}✗ Validation failed with {result['errors']} error(s){c.nc}")
+        if warnings:
+            print(f"{c.yellow}{warnings} warning(s){c.nc}")
+        if trailer:
+            print("\nFix the errors above before deploying.")
+
+
+def print_audit(results: list) -> None:
+    marks = {PASS: "✅", WARN: "⚠️ ", FAIL: "❌", INFO: "ℹ️ "}
+    print(f"{RULE}\nRichmond General Item Audit\n{RULE}\n")
+    for result in results:
+        print("━" * 40)
+        print(f"📦 {result['sku']}")
+        print("━" * 40)
+        for i, (section, checks) in enumerate(_sections(result)):
+            print(("" if i == 0 else "\n") + f"{section}:")
+            for check in checks:
+                print(f"  {marks[check['level']]} {check['message']}")
+        print()
+    print(f"{RULE}\nAudit Complete\n{RULE}")
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Validate / audit item folders (one process, all rules).")
+    ap.add_argument("items", nargs="*", metavar="ITEM", help="item folders, e.g. RG-0007")
+    ap.add_argument("--all", action="store_true", help="every RG-* folder under --root")
+    gitscope.add_arguments(ap)
+    ap.add_argument("--audit", action="store_true",
+                    help="run the audit rules over every item (informational, exit 0)")
+    ap.add_argument("--root", default=ROOT, help="items/ root for --all / --since / --audit")
+    ap.add_argument("--json", action="store_true", help="print results as JSON")
+    ap.add_argument("--jobs", type=int, default=os.cpu_count() or 1, metavar="N",
+                    help="worker processes (default: CPU count)")
+    args = ap.parse_args()
+
+    if args.audit or args.all:
+        paths = [os.path.join(args.root, sku)
+                 for sku in catalog.discover(args.root, with_label=False)]
+    elif args.since:
+        scope = gitscope.affected(args.since, args.root)
+        skus = (catalog.discover(args.root, with_label=False) if scope is None
+                else sorted(s for s in scope if os.path.isdir(os.path.join(args.root, s))))
+        paths = [os.path.join(args.root, sku) for sku in skus]
+        if not paths and not args.json:
+            print(f"No item folders changed since {args.since}.")
+            return 0
+    elif args.items:
+        paths = args.items
+        for p in paths:
+            if not os.path.isdir(p):
+                print(f"Error: Folder {p} does not exist")
+                return 1
+    else:
+        ap.error("provide item folder(s), --all, --since REV or --audit")
+        return 2
+
+    ruleset = "audit" if args.audit else "validate"
+    results = run_all(paths, ruleset, args.jobs)
+    failed = [r["sku"] for r in results if not r["passed"]]
+    if args.json:
+        print(json.dumps(results, indent=2))
+    elif args.audit:
+        print_audit(results)
+    else:
+        colors = _Colors(sys.stdout.isatty())
+        for i, result in enumerate(results):
+            if i:
+                print()
+            print_validate(result, colors, trailer=len(results) == 1)
+        if len(results) > 1:
+            print(f"\n{len(results)} item(s) validated: {len(results) - len(failed)} passed, "
+                  f"{len(failed)} failed" + (f" ({', '.join(failed)})" if failed else ""))
+    if args.audit:
+        return 0
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,346 @@
+#!/usr/bin/env python3
+"""Watch mode: regenerate an item's page and gallery card as its files change.
+
+Intake edits label.json over and over; instead of re-running
+``build_item_page.py RG-XXXX`` and ``build_gallery.py --update-card RG-XXXX``
+after every save, leave this running:
+
+  build_item_page.py --watch          # or: watch.py
+  build_item_page.py --watch --poll   # stat polling instead of inotify
+
+Changes are picked up with inotify on Linux (one watch per RG-* folder, its
+img/ subfolder and the items root, for new folders), else by polling
+file stats every ``--interval`` seconds. A burst of writes (editor temp file +
+rename, several files saved together) is debounced: a SKU is processed once no
+event for it has arrived for ``--debounce`` seconds.
+
+The catalog, the gallery text and the items.json feed stay in memory between
+events, so each change costs one item's work:
+
+* the item's label.json / status.json are re-read (nothing else is);
+* its page is re-rendered through build_item_page.write_page (same skip rules:
+  Sold, protected pages and /buy/ redirects are left alone);
+* its card is patched with build_gallery.update_card — or inserted with
+  reconcile when it just became Listed — every other card byte-for-byte kept,
+  and #item-count recounted (from the feed on a streamed page);
+* its items.json record is replaced in place.
+
+index.html / items.json are re-read only when something else rewrote them.
+"""
+from __future__ import annotations
+
+import argparse
+import bisect
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+
+import build_gallery
+import build_images
+import build_item_page
+import catalog
+import imgprobe
+import labelschema
+import output
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))  # items/
+
+DEBOUNCE = 0.15
+POLL_INTERVAL = 0.5
+# Files in an item folder whose change affects its page or card.
+INPUTS = ("label.json", "status.json")
+IMG_INPUTS = ("manifest.json",)  # under RG-XXXX/img/
+
+
+def relevant(name: str, in_img: bool = False) -> bool:
+    """True when a changed file named ``name`` feeds the item's page or card."""
+    if in_img:
+        return name in IMG_INPUTS
+    return name in INPUTS or name.lower().endswith(imgprobe.IMAGE_EXTS)
+
+
+# ---------------------------------------------------------------------------
+# Change sources: wait(timeout) -> set of SKUs whose inputs changed.
+# ---------------------------------------------------------------------------
+
+_IN_MODIFY_MASK = 0x00000008 | 0x00000080 | 0x00000100 | 0x00000200 | 0x00000040
+# IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_MOVED_FROM
+_IN_ISDIR = 0x40000000
+_IN_Q_OVERFLOW = 0x00004000
+_IN_NONBLOCK = os.O_NONBLOCK
+_EVENT = struct.Struct("iIII")
+
+
+class InotifySource:
+    """Linux inotify through libc (ctypes); raises OSError where it is unavailable."""
+
+    def __init__(self, root: str):
+        libc_name = ctypes.util.find_library("c")
+        libc = ctypes.CDLL(libc_name, use_errno=True) if libc_name else None
+        if libc is None or not hasattr(libc, "inotify_init1"):
+            raise OSError("inotify is not available on this platform")
+        self._libc = libc
+        self.fd = libc.inotify_init1(_IN_NONBLOCK)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.root = root
+        self.watches = {}  # wd -> (sku or None for the root, in_img)
+        self._add(root, None, False)
+        for sku in catalog.discover(root, with_label=False):
+            self._add_item(sku)
+
+    def _add(self, path: str, sku, in_img: bool) -> None:
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(path), _IN_MODIFY_MASK)
+        if wd >= 0:
+            self.watches[wd] = (sku, in_img)
+
+    def _add_item(self, sku: str) -> None:
+        item_dir = os.path.join(self.root, sku)
+        self._add(item_dir, sku, False)
+        img_dir = os.path.join(item_dir, build_images.IMG_DIR)
+        if os.path.isdir(img_dir):
+            self._add(img_dir, sku, True)
+
+    def wait(self, timeout) -> set:
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return set()
+        changed = set()
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return changed
+        at = 0
+        while at + _EVENT.size <= len(data):
+            wd, mask, _, length = _EVENT.unpack_from(data, at)
+            name = data[at + _EVENT.size:at + _EVENT.size + length].split(b"\0", 1)[0]
+            name = os.fsdecode(name)
+            at += _EVENT.size + length
+            if mask & _IN_Q_OVERFLOW:  # events were lost: treat everything as changed
+                return set(catalog.discover(self.root))
+            sku, in_img = self.watches.get(wd, (None, False))
+            if sku is None:
+                if mask & _IN_ISDIR and name.startswith("RG-"):
+                    self._add_item(name)
+                    changed.add(name)
+            elif mask & _IN_ISDIR:
+                if name == build_images.IMG_DIR and not in_img:
+                    self._add(os.path.join(self.root, sku, name), sku, True)
+                    changed.add(sku)
+            elif relevant(name, in_img):
+                changed.add(sku)
+        return changed
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+class PollSource:
+    """Portable fallback: stat every watched input each ``interval`` seconds."""
+
+    def __init__(self, root: str, interval: float = POLL_INTERVAL):
+        self.root = root
+        self.interval = interval
+        self.snapshot = self._scan()
+
+    def _scan(self) -> dict:
+        out = {}
+        for sku in catalog.discover(self.root, with_label=False):
+            item_dir = os.path.join(self.root, sku)
+            for sub, in_img in (("", False), (build_images.IMG_DIR, True)):
+                try:
+                    entries = os.scandir(os.path.join(item_dir, sub))
+                except OSError:
+                    continue
+                with entries:
+                    for e in entries:
+                        if relevant(e.name, in_img) and e.is_file():
+                            st = e.stat()
+                            out[(sku, sub, e.name)] = (st.st_mtime_ns, st.st_size)
+        return out
+
+    def wait(self, timeout) -> set:
+        time.sleep(self.interval if timeout is None else min(self.interval, timeout))
+        before, self.snapshot = self.snapshot, self._scan()
+        return {key[0] for key in before.keys() ^ self.snapshot.keys()} | {
+            key[0] for key, sig in self.snapshot.items() if before.get(key, sig) != sig}
+
+    def close(self) -> None:
+        pass
+
+
+def open_source(root: str, poll: bool = False, interval: float = POLL_INTERVAL):
+    """InotifySource unless ``poll`` is set or inotify is unavailable; else PollSource."""
+    if not poll:
+        try:
+            return InotifySource(root)
+        except OSError as e:
+            print(f"  (inotify unavailable: {e}; polling every {interval}s)", file=sys.stderr)
+    return PollSource(root, interval)
+
+
+# ---------------------------------------------------------------------------
+# The in-memory session: one item's work per change.
+# ---------------------------------------------------------------------------
+
+def _stat_sig(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+class Session:
+    """The loaded catalog + gallery + feed, updated one SKU at a time."""
+
+    def __init__(self, root: str = ROOT):
+        self.root = root
+        self.items = catalog.load(root)
+        self.labels = {sku: it.label for sku, it in self.items.items() if it.error is None}
+        self._text_sig = self._feed_sig = None
+        self.text = self.feed = None
+        self._load_gallery()
+
+    def _load_gallery(self) -> None:
+        """(Re)read index.html and items.json when they changed on disk since last seen."""
+        sig = _stat_sig(build_gallery.INDEX)
+        if sig != self._text_sig or self.text is None:
+            with open(build_gallery.INDEX, encoding="utf-8") as fh:
+                self.text = fh.read()
+            self._text_sig = sig
+            self.feed = None  # membership depends on the page
+        sig = _stat_sig(build_gallery.FEED)
+        if sig != self._feed_sig or self.feed is None:
+            self.feed = build_gallery.build_feed(
+                self.labels, build_gallery.gallery_skus(self.text, self.labels), self.text)
+            self._feed_sig = sig
+
+    def reload_item(self, sku: str):
+        """Re-read one item's label.json + status.json; returns its Item."""
+        item_dir = os.path.join(self.root, sku)
+        status = catalog.read_status(item_dir)
+        try:
+            label = catalog.read_label(item_dir)
+            problems = labelschema.LABEL.errors(label)
+            error = labelschema.describe(problems) if problems else None
+        except (OSError, ValueError) as e:
+            label, error = {}, str(e)
+        item = catalog.Item(sku=sku, dir=item_dir, label=label if error is None else {},
+                            status=status, error=error)
+        self.items[sku] = item
+        if error is None:
+            self.labels[sku] = label
+        else:
+            self.labels.pop(sku, None)
+        return item
+
+    def update_page(self, item) -> str:
+        outcome = build_item_page.write_page(item.sku, item.dir, item.label)
+        return "page" if outcome == output.WRITTEN else ""
+
+    def update_gallery(self, item) -> list:
+        """Patch the item's card + feed record; returns what changed ("card", "feed")."""
+        self._load_gallery()
+        sku, label = item.sku, item.label
+        streamed = build_gallery.is_streamed(self.text)
+        doc = build_gallery.Gallery(self.text)
+        text = self.text
+        if sku in doc.index:
+            text, _ = build_gallery.update_card(text, sku, self.labels)
+        elif not streamed and build_gallery.should_be_carded({sku: label}):
+            try:
+                text, _, skipped, _ = build_gallery.reconcile(text, {sku: label})
+            except SystemExit as e:
+                print(f"  ! {sku}: {e}", file=sys.stderr)
+                skipped = []
+            for _, why in skipped:
+                print(f"  - {sku}: not carded yet ({why})")
+
+        feed = self._update_feed(item, text)
+        if streamed:
+            text = build_gallery.recount(text, build_gallery.available_count(feed))
+        changed = []
+        if text != self.text:
+            if build_gallery.write_index(text):
+                changed.append("card")
+            self.text, self._text_sig = text, _stat_sig(build_gallery.INDEX)
+        if build_gallery.write_feed(feed):
+            changed.append("feed")
+        self.feed, self._feed_sig = feed, _stat_sig(build_gallery.FEED)
+        return changed
+
+    def _update_feed(self, item, text: str) -> list:
+        """The feed with ``item``'s record replaced / inserted in SKU order (a new list)."""
+        sku = item.sku
+        feed = list(self.feed)
+        skus = [r["sku"] for r in feed]
+        at = bisect.bisect_left(skus, sku)
+        present = at < len(skus) and skus[at] == sku
+        member = present or sku in build_gallery.Gallery(text).index or (
+            build_gallery.should_be_carded({sku: item.label})
+            and not build_gallery.hero_problem(sku, item.label))
+        if not member:
+            return feed
+        record = build_gallery.record_for(sku, item.label, item.status_sold,
+                                          build_gallery.Gallery(text))
+        if present:
+            feed[at] = record
+        else:
+            feed.insert(at, record)
+        return feed
+
+    def apply(self, sku: str) -> str:
+        """Regenerate one SKU's outputs; returns a one-line report."""
+        start = time.perf_counter()
+        item = self.reload_item(sku)
+        if item.error is not None:
+            return f"  ! {sku}: {item.error}"
+        done = [self.update_page(item)] + self.update_gallery(item)
+        elapsed = (time.perf_counter() - start) * 1000
+        return f"  ~ {sku}: {', '.join(d for d in done if d) or 'no change'} ({elapsed:.0f} ms)"
+
+
+def run(poll: bool = False, debounce: float = DEBOUNCE, interval: float = POLL_INTERVAL,
+        root: str = ROOT) -> int:
+    """Watch until interrupted."""
+    session = Session(root)
+    source = open_source(root, poll, interval)
+    print(f"Watching {len(session.items)} item(s) under {root} "
+          f"({type(source).__name__.replace('Source', '').lower()}); Ctrl-C to stop.")
+    pending = {}  # sku -> monotonic time of its last event
+    try:
+        while True:
+            now = time.monotonic()
+            timeout = None if not pending else max(0.0, min(pending.values()) + debounce - now)
+            for sku in source.wait(timeout):
+                pending[sku] = time.monotonic()
+            now = time.monotonic()
+            for sku in sorted(s for s, t in pending.items() if now - t >= debounce):
+                del pending[sku]
+                if os.path.isfile(os.path.join(root, sku, "label.json")):
+                    print(session.apply(sku), flush=True)
+            imgprobe.flush()
+    except KeyboardInterrupt:
+        return 0
+    finally:
+        source.close()
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Regenerate item pages + gallery cards on change.")
+    ap.add_argument("--poll", action="store_true", help="poll file stats instead of inotify")
+    ap.add_argument("--debounce", type=float, default=DEBOUNCE, metavar="SECONDS",
+                    help=f"quiet period before a changed item is rebuilt (default {DEBOUNCE})")
+    ap.add_argument("--interval", type=float, default=POLL_INTERVAL, metavar="SECONDS",
+                    help=f"poll interval with --poll (default {POLL_INTERVAL})")
+    args = ap.parse_args()
+    return run(args.poll, args.debounce, args.interval)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
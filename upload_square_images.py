@@ -4,146 +4,67 @@ Richmond General - Square Image Uploader
 Uploads hero and detail images to Square catalog items via the Catalog API.
 
 Usage:
-  1. Put all images in the same folder as this script (or update paths below)
+  1. Each item to upload has `channels.square.object_id` and `photos` in its
+     label.json (hero, square, cutout, details); the upload set is derived
+     from them (scripts/square_images.py)
   2. Square token is auto-loaded from the shell env (`~/.zshrc` pulls it from
      macOS Keychain entry `SQUARE_ACCESS_TOKEN`). Fallback: project `.env`.
      To set the Keychain entry:
        security add-generic-password -U -a "$USER" -s SQUARE_ACCESS_TOKEN -w '<token>' -A
-  3. Run: python3 upload_square_images.py
+  3. Run: python3 upload_square_images.py [--workers 8]
+          python3 upload_square_images.py --sku RG-0055 --sku RG-0054
+          python3 upload_square_images.py --changed-since origin/main
+          python3 upload_square_images.py --base-url http://127.0.0.1:8787/v2
+     (the last against a local scripts/square_standin.py; SQUARE_API_BASE
+     does the same)
 
-Note: RG-0004 (Chase Japan Plaques) needs a hero image - only the maker's mark photo exists.
+Every image is first re-encoded to Square's channel profile (longest side
+2000 px) in a process pool and cached in .build/square-images/, so a 2 MB
+original goes up as a few hundred KB.
+
+Requests go through scripts/squareapi.py: pooled keep-alive connections, a
+bounded pool of upload workers, and retries with backoff on 429 / 5xx. The
+preflight fetches every catalog object with its images and variation prices
+in batch calls (1000 IDs each). Images whose name is already attached to the
+item are skipped, and label.json drift (price, image IDs) is reported.
+
+Finished uploads are journalled in .build/square-uploads.jsonl by SKU, object
+ID and image SHA-256. A rerun after a crash or network drop sends only the
+images the journal lacks (or records under an image ID no longer attached to
+the item), and their content-derived idempotency keys make a replayed request
+return the image Square already created.
 """
 
+import argparse
+import hashlib
 import os
-import json
-import requests
-from datetime import datetime
+import sys
 
-# Square API endpoint
-SQUARE_API_URL = "https://connect.squareup.com/v2/catalog/images"
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "scripts"))
 
-# === IMAGE MAPPING ===
-# Update paths if your files are named differently or in a different location
+import catalog  # noqa: E402
+import gitscope  # noqa: E402
+import square_images  # noqa: E402
+import squareapi  # noqa: E402
 
-ITEMS_TO_UPLOAD = [
-    # RG-0001: Little Orphan Annie
-    {
-        "sku": "RG-0001",
-        "object_id": "2A2VL6JA6VHOQLRLERFR5BZJ",
-        "image_path": "RG-0001-hero-converted.jpeg",
-        "name": "Little Orphan Annie Comic Strip Book",
-        "caption": "1979 Dover reprint - Harold Gray's 1931 strips"
-    },
-    
-    # RG-0002: Kings of the Forest - HERO
-    {
-        "sku": "RG-0002",
-        "object_id": "DLWJY2P7Q24CAY6YGAUY5JKP",
-        "image_path": "RG-0002-hero-converted.jpeg",
-        "name": "Kings of the Forest - Cover",
-        "caption": "1892 W.A. Foster - Victorian wildlife book with 235 illustrations"
-    },
-    # RG-0002: Kings of the Forest - TITLE PAGE
-    {
-        "sku": "RG-0002-detail1",
-        "object_id": "DLWJY2P7Q24CAY6YGAUY5JKP",
-        "image_path": "RG-0002-titlepage-converted.jpeg",
-        "name": "Kings of the Forest - Title Page",
-        "caption": "Title page with grizzly bear illustration"
-    },
-    # RG-0002: Kings of the Forest - INTERIOR
-    {
-        "sku": "RG-0002-detail2",
-        "object_id": "DLWJY2P7Q24CAY6YGAUY5JKP",
-        "image_path": "RG-0002-polarbear-converted.jpeg",
-        "name": "Kings of the Forest - Polar Bear Illustration",
-        "caption": "Sample illustration - Great White Bear (Arctic Regions)"
-    },
-    # RG-0002: Kings of the Forest - LOC LABEL
-    {
-        "sku": "RG-0002-detail3",
-        "object_id": "DLWJY2P7Q24CAY6YGAUY5JKP",
-        "image_path": "RG-0002-loc-label-converted.png",
-        "name": "Kings of the Forest - Library of Congress Label",
-        "caption": "Original LOC label - QL-706, Shelf F.73"
-    },
-    
-    # RG-0003: Bar Stool
-    {
-        "sku": "RG-0003",
-        "object_id": "QEQWAA7YTTH3T2OBFJLD2OCL",
-        "image_path": "RG-0003-hero-converted.jpeg",
-        "name": "Pressed-Back Oak Swivel Bar Stool",
-        "caption": "Early 1900s American oak - Victorian pressed back design"
-    },
-    
-    # RG-0004: Chase Japan Plaques - HERO (all 4 plaques)
-    {
-        "sku": "RG-0004",
-        "object_id": "K4N6V6AXMDYNUNSJ2TWOYJGG",
-        "image_path": "RG-0004-hero-all-converted.png",
-        "name": "Chase Japan Four Seasons Wall Plaques - Complete Set",
-        "caption": "1950s MCM ceramics - Hand-painted seasonal scenes (4pc set)"
-    },
-    # RG-0004: Chase Japan Plaques - DETAIL (winter closeup)
-    {
-        "sku": "RG-0004-detail1",
-        "object_id": "K4N6V6AXMDYNUNSJ2TWOYJGG",
-        "image_path": "RG-0004-hero-detail-converted.png",
-        "name": "Chase Japan Four Seasons - Winter Scene Detail",
-        "caption": "Close-up of hand-painted winter village scene"
-    },
-    # RG-0004: Chase Japan Plaques - MARK
-    {
-        "sku": "RG-0004-mark",
-        "object_id": "K4N6V6AXMDYNUNSJ2TWOYJGG",
-        "image_path": "RG-0004-mark-converted.png",
-        "name": "Chase Japan Four Seasons - Maker's Mark",
-        "caption": "Chase Japan Pegasus logo - 1950s MCM ceramics"
-    },
-    
-    # RG-0005: Bears Button
-    {
-        "sku": "RG-0005",
-        "object_id": "A55Q4TG7EJ2IJUDIFX3VHVAH",
-        "image_path": "RG-0005-hero-converted.jpeg",
-        "name": "Chicago Bears 1985 World Champions Button",
-        "caption": "Official NFL button on original card - ASCO Inc."
-    },
-    
-    # RG-0006: Disney Comics Cover - HERO
-    {
-        "sku": "RG-0006",
-        "object_id": "6LNKQICZM3TAVJG3TAF4O4YB",
-        "image_path": "RG-0006-hero-converted.jpeg",
-        "name": "Walt Disney's Comics and Stories Cover - May 1944",
-        "caption": "WWII-era Dell Comics cover - Walt Kelly art, professionally framed"
-    },
-    # RG-0006: Disney Comics Cover - DETAIL
-    {
-        "sku": "RG-0006-detail",
-        "object_id": "6LNKQICZM3TAVJG3TAF4O4YB",
-        "image_path": "RG-0006-detail-converted.png",
-        "name": "Disney Comics - Ration Points Detail",
-        "caption": "Second Hand Shoes - NO Ration Points - WWII wartime humor"
-    },
-]
+ROOT = os.path.dirname(os.path.abspath(__file__))  # items/
+JOURNAL = os.path.join(ROOT, ".build", "square-uploads.jsonl")
+
+
+
+def upload_image(client, item, journal):
+    """Upload a single image to Square catalog; returns (image_id, error).
+
+    The idempotency key comes from the image's SHA-256, and a success is
+    journalled before returning, so a rerun neither repeats nor duplicates it.
+    """
+    with open(item["image_path"], "rb") as img_file:
+        data = img_file.read()
+    sha256 = hashlib.sha256(data).hexdigest()
 
-def upload_image(token, item):
-    """Upload a single image to Square catalog."""
-    
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "Accept": "application/json",
-    }
-    
-    # Generate unique idempotency key
-    timestamp = datetime.now().strftime("%Y%m%d%H%M%S%f")
-    idempotency_key = f"{item['sku'].lower()}-image-{timestamp}"
-    
     # JSON payload
     payload = {
-        "idempotency_key": idempotency_key,
+        "idempotency_key": squareapi.image_idempotency_key(item["object_id"], sha256),
         "image": {
             "type": "IMAGE",
             "id": f"#temp-{item['sku']}",
@@ -154,61 +75,70 @@ def upload_image(token, item):
         },
         "object_id": item["object_id"]
     }
-    
-    # Check if image file exists
-    if not os.path.exists(item["image_path"]):
-        print(f"❌ {item['sku']}: Image not found at {item['image_path']}")
-        return None
-    
+
     # Determine content type
     ext = item["image_path"].lower().split(".")[-1]
     content_type = "image/jpeg" if ext in ["jpg", "jpeg"] else "image/png"
-    
-    # Prepare multipart form data
-    with open(item["image_path"], "rb") as img_file:
-        files = {
-            "request": (None, json.dumps(payload), "application/json"),
-            "image_file": (
-                os.path.basename(item["image_path"]),
-                img_file,
-                content_type
-            ),
-        }
-        
-        print(f"📤 Uploading {item['sku']}: {item['name']}...")
-        
-        try:
-            response = requests.post(SQUARE_API_URL, headers=headers, files=files)
-            result = response.json()
-            
-            if response.status_code == 200 and "image" in result:
-                image_id = result["image"]["id"]
-                print(f"   ✅ Success! Image ID: {image_id}")
-                return image_id
-            else:
-                errors = result.get("errors", [{"detail": "Unknown error"}])
-                error_msg = errors[0].get("detail", str(errors))
-                print(f"   ❌ Failed: {error_msg}")
-                return None
-                
-        except Exception as e:
-            print(f"   ❌ Exception: {str(e)}")
-            return None
 
-def check_object_exists(token, object_id):
-    """Return True if a catalog object exists, else False."""
-    headers = {"Authorization": f"Bearer {token}", "Accept": "application/json"}
     try:
-        r = requests.get(f"https://connect.squareup.com/v2/catalog/object/{object_id}", headers=headers)
-        return r.status_code == 200
-    except Exception:
-        return False
+        response = client.create_image(payload, os.path.basename(item["image_path"]),
+                                       data, content_type)
+    except squareapi.SquareError as e:
+        return None, str(e)
+    if response.ok and "image" in response.body:
+        image_id = response.body["image"]["id"]
+        journal.record(item["sku"], item["object_id"], sha256, image_id)
+        return image_id, None
+    return None, response.error_detail()
+
+
+def catalog_drift(snapshot, items, root=ROOT):
+    """Where Square disagrees with label.json: variation price, image IDs."""
+    drift = []
+    object_ids = {}
+    for it in items:
+        object_ids.setdefault(it["label_sku"], set()).add(it["object_id"])
+    for sku, oids in sorted(object_ids.items()):
+        try:
+            label = catalog.read_label(os.path.join(root, sku))
+        except (OSError, ValueError):
+            continue
+        square = (label.get("channels") or {}).get("square") or {}
+        for oid in sorted(oids):
+            item = snapshot.get(oid)
+            if item is None:
+                continue
+            want = squareapi.cents(label.get("price"))
+            have = item.price_cents(square.get("variation_id"))
+            if want is not None and have is not None and want != have:
+                drift.append(f"{sku}: label price ${want / 100:.2f}, Square ${have / 100:.2f}")
+            listed = square.get("image_ids")
+            if listed is not None and set(listed) != set(item.image_ids):
+                drift.append(f"{sku}: label image_ids {sorted(listed)}, "
+                             f"Square {sorted(item.image_ids)}")
+    return drift
 
 
 def main():
+    ap = argparse.ArgumentParser(description="Upload item images to Square catalog items.")
+    ap.add_argument("--workers", type=int, default=8,
+                    help="concurrent uploads (default: 8)")
+    ap.add_argument("--sku", action="append", default=[],
+                    help="only this item (repeatable), e.g. --sku RG-0055")
+    gitscope.add_arguments(ap, "--changed-since", shared=False)
+    ap.add_argument("--jobs", type=int, default=None,
+                    help="pre-sizing worker processes (default: CPU count)")
+    ap.add_argument("--journal", default=JOURNAL,
+                    help="finished-upload journal; reruns skip what it records "
+                         "(default: .build/square-uploads.jsonl)")
+    ap.add_argument("--base-url", default=squareapi.API_BASE,
+                    help="Square API base URL, e.g. a local scripts/square_standin.py "
+                         "(default: $SQUARE_API_BASE or production)")
+    args = ap.parse_args()
+
     # Get access token from env
     token = os.environ.get("SQUARE_ACCESS_TOKEN")
-    
+
     if not token:
         print("=" * 60)
         print("❌ ERROR: SQUARE_ACCESS_TOKEN not set!")
@@ -223,54 +153,98 @@ def main():
         print()
         print("Or open a new shell so ~/.zshrc re-exports the existing Keychain entry.")
         return
-    
+
     print("=" * 60)
     print("🏪 Richmond General - Square Image Uploader")
     print("=" * 60)
     print()
-    print(f"📁 Working directory: {os.getcwd()}")
-    print(f"📷 Images to upload: {len(ITEMS_TO_UPLOAD)}")
-    print()
 
-    # Preflight: verify catalog object IDs once per unique ID
-    print("🔎 Verifying catalog object IDs...")
-    unique_ids = {}
-    for it in ITEMS_TO_UPLOAD:
-        unique_ids[it["object_id"]] = unique_ids.get(it["object_id"], []) + [it["sku"]]
-    bad_ids = []
-    for oid, skus in unique_ids.items():
-        ok = check_object_exists(token, oid)
-        if ok:
-            print(f"   ✅ {oid} exists (items: {', '.join(skus)})")
-        else:
-            print(f"   ❌ {oid} NOT FOUND (items: {', '.join(skus)})")
-            bad_ids.extend(skus)
+    skus = set(args.sku) or None
+    if args.since:
+        changed = gitscope.affected(args.since, ROOT, shared=())
+        if changed is not None:
+            skus = changed if skus is None else skus & changed
+    uploads, missing = square_images.manifest(ROOT, skus)
+    for path in missing:
+        print(f"⏭️  {path}: Skipping - file not found")
+    print(f"📷 Images to upload: {len(uploads)} "
+          f"({len({it['label_sku'] for it in uploads})} item(s))")
+    stats = square_images.presize(uploads, args.jobs)
+    print(f"🗜️  Pre-sized for Square: {stats['bytes_in'] / 1e6:.1f} MB → "
+          f"{stats['bytes_out'] / 1e6:.1f} MB "
+          f"({stats['encoded']} encoded, {stats['cached']} cached)")
+    uploads, duplicates = square_images.dedupe(uploads)
+    for dup, kept in duplicates:
+        print(f"⏭️  {dup['sku']}: Skipping - same image as {kept['sku']}")
     print()
 
-    success = 0
-    failed = 0
-    skipped = 0
-    
-    for item in ITEMS_TO_UPLOAD:
-        if item["sku"] in bad_ids:
-            print(f"⏭️  {item['sku']}: Skipping - catalog object not found")
-            skipped += 1
-            continue
-        if not os.path.exists(item["image_path"]):
-            print(f"⏭️  {item['sku']}: Skipping - file not found")
-            skipped += 1
-            continue
-            
-        result = upload_image(token, item)
-        if result:
-            success += 1
-        else:
-            failed += 1
-    
-    print()
-    print("=" * 60)
-    print(f"Complete! ✅ {success} uploaded | ❌ {failed} failed | ⏭️ {skipped} skipped")
-    print("=" * 60)
+    journal = squareapi.UploadJournal(args.journal)
+    with squareapi.Client(token, base=args.base_url, workers=args.workers) as client:
+        # Preflight: every object, its images and variation prices in one batch call
+        print("🔎 Verifying catalog object IDs...")
+        unique_ids = {}
+        for it in uploads:
+            unique_ids[it["object_id"]] = unique_ids.get(it["object_id"], []) + [it["sku"]]
+        try:
+            snapshot = client.catalog_items(unique_ids)
+        except squareapi.SquareError as e:
+            print(f"   ❌ Preflight failed: {e}")
+            return
+        bad_ids = []
+        for oid, keys in unique_ids.items():
+            if oid in snapshot:
+                print(f"   ✅ {oid} exists (items: {', '.join(keys)})")
+            else:
+                print(f"   ❌ {oid} NOT FOUND (items: {', '.join(keys)})")
+                bad_ids.extend(keys)
+        print()
+
+        drift = catalog_drift(snapshot, uploads)
+        if drift:
+            print("⚠️  Catalog drift (label.json vs Square):")
+            for line in drift:
+                print(f"   - {line}")
+            print()
+
+        success = 0
+        failed = 0
+        skipped = len(missing) + len(duplicates)
+
+        queue = []
+        for item in uploads:
+            if item["sku"] in bad_ids:
+                print(f"⏭️  {item['sku']}: Skipping - catalog object not found")
+                skipped += 1
+                continue
+            current = snapshot[item["object_id"]]
+            if item["name"] in current.image_names.values():
+                print(f"⏭️  {item['sku']}: Skipping - image already attached")
+                skipped += 1
+                continue
+            # A journalled upload counts only while Square still has that image
+            # on the item; one deleted or detached since is uploaded again.
+            if journal.get(item["sku"], item["object_id"], item["sha256"]) in current.image_ids:
+                print(f"⏭️  {item['sku']}: Skipping - already uploaded (journal)")
+                skipped += 1
+                continue
+            queue.append(item)
+
+        print(f"📤 Uploading {len(queue)} image(s), {args.workers} at a time...")
+        for item, result in client.map(lambda it: upload_image(client, it, journal), queue):
+            image_id, error = result if isinstance(result, tuple) else (None, str(result))
+            if image_id:
+                print(f"   ✅ {item['sku']}: {item['name']} → Image ID: {image_id}")
+                success += 1
+            else:
+                print(f"   ❌ {item['sku']}: {item['name']} → Failed: {error}")
+                failed += 1
+
+        print()
+        print("=" * 60)
+        print(f"Complete! ✅ {success} uploaded | ❌ {failed} failed | ⏭️ {skipped} skipped")
+        print("=" * 60)
+        print("Square API latency:")
+        print(client.stats.summary())
 
 if __name__ == "__main__":
     main()